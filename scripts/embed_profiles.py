@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Embed LP mandates and fund theses for semantic search.
+
+Fills lp_profiles.mandate_embedding, funds.thesis_embedding and
+fund_ai_profiles.thesis_embedding for rows whose embedding is missing or
+was made by another model (see src/embeddings.py). Safe to rerun: only
+pending rows are embedded, and progress is committed batch by batch.
+
+Usage:
+    uv run python scripts/embed_profiles.py                  # DATABASE_URL, configured provider
+    uv run python scripts/embed_profiles.py --test           # TEST_DATABASE_URL instead
+    uv run python scripts/embed_profiles.py --provider hash  # Local hash embeddings
+    uv run python scripts/embed_profiles.py --reindex        # Rebuild ivfflat indexes afterwards
+
+Options:
+    --test          Use TEST_DATABASE_URL
+    --provider P    voyage or hash (default: EMBEDDING_PROVIDER)
+    --batch-size N  Texts per embedding request (default: EMBEDDING_BATCH_SIZE)
+    --reindex       Rebuild the ivfflat indexes, whose list centroids are
+                    fixed when built (do this after the first full load)
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import psycopg
+from psycopg.rows import dict_row
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import get_settings
+from src.embeddings import embed_pending, make_embedding_provider
+
+IVFFLAT_INDEXES = (
+    "idx_lp_profiles_mandate_embedding",
+    "idx_funds_thesis_embedding",
+    "idx_fund_ai_embedding",
+)
+
+
+async def run(url: str, provider_kind: str | None, batch_size: int | None, reindex: bool) -> None:
+    provider = make_embedding_provider(provider_kind)  # type: ignore[arg-type]
+    async with await psycopg.AsyncConnection.connect(url, row_factory=dict_row) as conn:
+        embedded = await embed_pending(conn, provider, batch_size)
+        for name, count in embedded.items():
+            print(f"  {name}: {count} embedded")
+
+        if reindex:
+            # REINDEX CONCURRENTLY cannot run inside a transaction block
+            await conn.set_autocommit(True)
+            for index in IVFFLAT_INDEXES:
+                print(f"  Rebuilding {index}...")
+                await conn.execute(f"REINDEX INDEX CONCURRENTLY {index}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Embed LP mandates and fund theses")
+    parser.add_argument("--test", action="store_true", help="Use TEST_DATABASE_URL")
+    parser.add_argument("--provider", choices=["voyage", "hash"], help="Embedding provider")
+    parser.add_argument("--batch-size", type=int, help="Texts per embedding request")
+    parser.add_argument("--reindex", action="store_true", help="Rebuild the ivfflat indexes afterwards")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    url = settings.test_database_url if args.test else settings.database_url
+    if not url:
+        print("ERROR: " + ("TEST_DATABASE_URL" if args.test else "DATABASE_URL") + " is not configured")
+        sys.exit(1)
+
+    print(f"Embedding with {args.provider or settings.embedding_provider}...")
+    asyncio.run(run(url, args.provider, args.batch_size, args.reindex))
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+"""Vectorized batch scoring of one fund against many LPs.
+
+calculate_match_score() scores a single fund/LP pair. Matching a fund
+against the whole LP universe that way re-normalizes every LP's lists and
+builds a dict per pair, which dominates the cost of generate-matches.
+
+This module compiles LP profiles once into columnar NumPy arrays:
+    - Strategy, geography and sector membership matrices (one boolean
+      column per distinct lowercased value, i.e. a bitset per LP)
+    - Fund size bounds as float64 columns
+    - ESG, emerging-manager and "has preferences" flags as boolean columns
+
+score_fund_against_lps() first finds the LPs passing every hard filter by
+intersecting inverted indexes (strategy postings, ESG and emerging-manager
+row sets, and sorted fund size bounds), then computes the weighted soft
+scores for those candidates only, in a single vectorized pass. Results are
+identical to calling calculate_match_score() for each LP, including
+rounding. The result reports the candidate count and pruning ratio.
+
+Example:
+    Score a fund against every LP::
+
+        from src.batch_matching import compile_lp_matrix, score_fund_against_lps
+
+        lp_matrix = compile_lp_matrix(lps)
+        scores = score_fund_against_lps(fund, lp_matrix)
+        for i in scores.indices_at_least(50):
+            result = scores.result(i)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+import numpy as np
+
+from src.lp_feature_store import LPFeatures, LPVocabulary, Vocabulary, normalize_sector
+from src.matching import (
+    _SCORING_WEIGHTS,
+    FundData,
+    LPData,
+    MatchResult,
+    ScoreBreakdown,
+    _normalize_string_list,
+    _to_float,
+    calculate_match_score,
+)
+
+# =============================================================================
+# Compiled LP Matrix
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class LPMatrix:
+    """LP profiles compiled into columnar arrays for batch scoring.
+
+    Row i of every array describes lps[i]. Membership matrix columns are
+    vocabulary codes, so a column exists for every code assigned when the
+    matrix was compiled.
+
+    Attributes:
+        lps: The source LP profiles or features, in row order.
+        vocab: Vocabulary the membership columns are coded against.
+        strategies: (n, strategies) membership matrix.
+        geographies: (n, geographies) membership matrix.
+        has_geographies: Whether the LP lists any geography.
+        geography_global: Whether the LP lists "global".
+        sectors: (n, sectors) membership matrix.
+        has_sectors: Whether the LP lists any sector.
+        esg_required: Whether the LP requires an ESG policy.
+        emerging_manager_ok: Whether the LP accepts emerging managers.
+        fund_size_min: Minimum fund size (0 when unset).
+        fund_size_max: Maximum fund size (inf when unset or 0).
+        min_fund_number: Minimum fund number (1 when unset).
+    """
+
+    lps: Sequence[LPData | LPFeatures]
+    vocab: LPVocabulary
+    strategies: np.ndarray
+    geographies: np.ndarray
+    has_geographies: np.ndarray
+    geography_global: np.ndarray
+    sectors: np.ndarray
+    has_sectors: np.ndarray
+    esg_required: np.ndarray
+    emerging_manager_ok: np.ndarray
+    fund_size_min: np.ndarray
+    fund_size_max: np.ndarray
+    min_fund_number: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.lps)
+
+    @cached_property
+    def candidate_index(self) -> LPCandidateIndex:
+        """Hard-filter inverted indexes, built on first use."""
+        return build_candidate_index(self)
+
+
+def _membership_matrix(rows: list[tuple[int, ...]], width: int) -> np.ndarray:
+    """Build a boolean membership matrix from per-row vocabulary codes.
+
+    Args:
+        rows: Vocabulary codes for each row.
+        width: Number of columns (vocabulary size).
+
+    Returns:
+        (len(rows), width) bool matrix.
+    """
+    row_idx: list[int] = []
+    col_idx: list[int] = []
+    for i, codes in enumerate(rows):
+        row_idx.extend([i] * len(codes))
+        col_idx.extend(codes)
+
+    matrix = np.zeros((len(rows), width), dtype=bool)
+    matrix[row_idx, col_idx] = True
+    return matrix
+
+
+def _columns(vocab: Vocabulary, terms: Iterable[str], width: int) -> np.ndarray:
+    """Matrix columns for the terms that are known to a vocabulary."""
+    cols = []
+    for term in terms:
+        code = vocab.lookup(term)
+        if code is not None and code < width:
+            cols.append(code)
+    return np.array(cols, dtype=np.intp)
+
+
+def compile_lp_matrix(lps: Sequence[LPData | LPFeatures]) -> LPMatrix:
+    """Compile LP profiles into an LPMatrix.
+
+    Accepts LPFeatures from the LP feature store, which are already
+    normalized, or raw LP dicts, which are normalized here once per LP
+    instead of once per pair.
+
+    Args:
+        lps: LP features, or LP profiles as returned by the lp_profiles query.
+
+    Returns:
+        LPMatrix ready for score_fund_against_lps().
+
+    Raises:
+        ValueError: If the LPFeatures were coded against different vocabularies.
+    """
+    vocab = next((lp.vocab for lp in lps if isinstance(lp, LPFeatures)), None) or LPVocabulary()
+    features = [
+        lp if isinstance(lp, LPFeatures) else LPFeatures.from_profile(lp, vocab)
+        for lp in lps
+    ]
+    if any(f.vocab is not vocab for f in features):
+        raise ValueError("LP features must share one vocabulary")
+
+    return LPMatrix(
+        lps=lps,
+        vocab=vocab,
+        strategies=_membership_matrix([f.strategy_codes for f in features], len(vocab.strategies)),
+        geographies=_membership_matrix([f.geography_codes for f in features], len(vocab.geographies)),
+        has_geographies=np.array([f.has_geographies for f in features], dtype=bool),
+        geography_global=np.array([f.geography_global for f in features], dtype=bool),
+        sectors=_membership_matrix([f.sector_codes for f in features], len(vocab.sectors)),
+        has_sectors=np.array([f.has_sectors for f in features], dtype=bool),
+        esg_required=np.array([f.esg_required for f in features], dtype=bool),
+        emerging_manager_ok=np.array([f.emerging_manager_ok for f in features], dtype=bool),
+        fund_size_min=np.array([f.fund_size_min for f in features], dtype=np.float64),
+        fund_size_max=np.array([f.fund_size_max for f in features], dtype=np.float64),
+        min_fund_number=np.array([f.min_fund_number for f in features], dtype=np.float64),
+    )
+
+
+# =============================================================================
+# Candidate Index
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class LPCandidateIndex:
+    """Inverted indexes over the hard-filter columns of an LPMatrix.
+
+    A fund's candidate set (the LPs passing every hard filter) is the
+    intersection of a few sorted row-id sets, so LPs failing a hard filter
+    never reach soft scoring.
+
+    Attributes:
+        strategy_postings: Row ids per strategy code.
+        esg_not_required: Row ids of LPs that do not require an ESG policy.
+        emerging_ok: Row ids of LPs that accept emerging managers.
+        min_order: Row ids sorted by fund_size_min.
+        min_sorted: fund_size_min in min_order order.
+        max_order: Row ids sorted by fund_size_max.
+        max_sorted: fund_size_max in max_order order.
+    """
+
+    strategy_postings: list[np.ndarray]
+    esg_not_required: np.ndarray
+    emerging_ok: np.ndarray
+    min_order: np.ndarray
+    min_sorted: np.ndarray
+    max_order: np.ndarray
+    max_sorted: np.ndarray
+
+
+def _sorted_interval(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Row ids and values sorted by value, leaving out NaN (never in range)."""
+    rows = np.flatnonzero(~np.isnan(values))
+    order = rows[np.argsort(values[rows], kind="stable")]
+    return order, values[order]
+
+
+def build_candidate_index(lp_matrix: LPMatrix) -> LPCandidateIndex:
+    """Build the hard-filter inverted indexes for an LPMatrix.
+
+    Args:
+        lp_matrix: Compiled LP matrix.
+
+    Returns:
+        LPCandidateIndex for find_candidates().
+    """
+    min_order, min_sorted = _sorted_interval(lp_matrix.fund_size_min)
+    max_order, max_sorted = _sorted_interval(lp_matrix.fund_size_max)
+    return LPCandidateIndex(
+        strategy_postings=[
+            np.flatnonzero(lp_matrix.strategies[:, col]) for col in range(lp_matrix.strategies.shape[1])
+        ],
+        esg_not_required=np.flatnonzero(~lp_matrix.esg_required),
+        emerging_ok=np.flatnonzero(lp_matrix.emerging_manager_ok),
+        min_order=min_order,
+        min_sorted=min_sorted,
+        max_order=max_order,
+        max_sorted=max_sorted,
+    )
+
+
+def find_candidates(fund: FundData, lp_matrix: LPMatrix) -> np.ndarray:
+    """Row ids of the LPs that pass every hard filter for a fund.
+
+    Equivalent to the strategy, ESG, emerging manager and fund size checks
+    in calculate_match_score(), evaluated by set intersection.
+
+    Args:
+        fund: Fund profile data.
+        lp_matrix: Compiled LP matrix (its index is built on first use).
+
+    Returns:
+        Sorted array of row ids.
+    """
+    index = lp_matrix.candidate_index
+    none = np.zeros(0, dtype=np.intp)
+
+    fund_strategy = (fund.get("strategy") or "").lower()
+    code = lp_matrix.vocab.strategies.lookup(fund_strategy) if fund_strategy else None
+    if code is None or code >= len(index.strategy_postings):
+        return none
+
+    target_size = _to_float(fund.get("target_size_mm"), 0)
+    if np.isnan(target_size):
+        return none
+
+    row_sets = [
+        index.strategy_postings[code],
+        index.min_order[: np.searchsorted(index.min_sorted, target_size, side="right")],
+        index.max_order[np.searchsorted(index.max_sorted, target_size, side="left"):],
+    ]
+    if not fund.get("esg_policy", False):
+        row_sets.append(index.esg_not_required)
+    fund_number: Any = fund.get("fund_number") or 1
+    if fund_number <= 2:
+        row_sets.append(index.emerging_ok)
+
+    # Intersect smallest-first so each step shrinks the working set quickly
+    row_sets.sort(key=len)
+    candidates = np.sort(row_sets[0])
+    for rows in row_sets[1:]:
+        if not len(candidates):
+            break
+        candidates = np.intersect1d(candidates, rows, assume_unique=True)
+    return candidates
+
+
+# =============================================================================
+# Batch Scores
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class BatchMatchScores:
+    """Scores for one fund against every row of an LPMatrix.
+
+    Only candidates (LPs passing all hard filters) are soft-scored; their
+    arrays are aligned with candidates. Every other LP scores 0, and
+    result() computes its full breakdown on demand. Values equal the
+    corresponding fields of calculate_match_score(fund, lps[i]).
+
+    Attributes:
+        fund: The fund that was scored.
+        lp_matrix: The LP matrix it was scored against.
+        candidates: Sorted row ids that passed the hard filters.
+        score: Final score per candidate.
+        geography: Geography soft score per candidate.
+        sector: Sector soft score per candidate.
+        track_record: Track record soft score per candidate.
+        size_fit: Size fit soft score per candidate.
+    """
+
+    fund: FundData
+    lp_matrix: LPMatrix
+    candidates: np.ndarray
+    score: np.ndarray
+    geography: np.ndarray
+    sector: np.ndarray
+    track_record: np.ndarray
+    size_fit: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.lp_matrix)
+
+    @property
+    def candidate_count(self) -> int:
+        """Number of LPs that reached soft scoring."""
+        return len(self.candidates)
+
+    @property
+    def pruning_ratio(self) -> float:
+        """Share of LPs eliminated by the hard filters (0.0-1.0)."""
+        total = len(self)
+        return 1 - self.candidate_count / total if total else 0.0
+
+    def all_scores(self) -> np.ndarray:
+        """Final score for every LP, in row order (0 where pruned)."""
+        scores = np.zeros(len(self), dtype=np.float64)
+        scores[self.candidates] = self.score
+        return scores
+
+    def indices_at_least(self, threshold: float) -> np.ndarray:
+        """Row indices whose score is at least threshold, in row order."""
+        if threshold > 0:
+            return self.candidates[self.score >= threshold]
+        return np.flatnonzero(self.all_scores() >= threshold)
+
+    def result(self, i: int) -> MatchResult:
+        """Build the MatchResult for row i.
+
+        Args:
+            i: Row index into the LPMatrix.
+
+        Returns:
+            The same MatchResult calculate_match_score() returns for lps[i].
+        """
+        pos = int(np.searchsorted(self.candidates, i))
+        if pos == len(self.candidates) or self.candidates[pos] != i:
+            # Pruned by the index; compute its breakdown for display
+            return calculate_match_score(self.fund, self.lp_matrix.lps[i])
+
+        breakdown = ScoreBreakdown(
+            strategy=100,
+            esg=100,
+            emerging_manager=100,
+            fund_size=100,
+            geography=float(self.geography[pos]),
+            sector=float(self.sector[pos]),
+            track_record=float(self.track_record[pos]),
+            size_fit=float(self.size_fit[pos]),
+        )
+        return MatchResult(
+            score=float(self.score[pos]),
+            score_breakdown=breakdown,
+            passed_hard_filters=True,
+        )
+
+    def results(self) -> Iterator[MatchResult]:
+        """Yield a MatchResult per row, in row order."""
+        for i in range(len(self)):
+            yield self.result(i)
+
+
+def _round1(values: np.ndarray) -> np.ndarray:
+    """Round to one decimal exactly like the builtin round(x, 1).
+
+    np.round scales by 10 before rounding, so a value whose scaled form lands
+    within float error of a .5 boundary can round the other way. Those few
+    values are rounded with the builtin instead.
+    """
+    rounded = np.round(values, 1)
+    scaled = values * 10
+    with np.errstate(invalid="ignore"):
+        near_half = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-6 * np.maximum(1.0, np.abs(scaled))
+    for i in np.flatnonzero(near_half):
+        rounded[i] = round(float(values[i]), 1)
+    return rounded
+
+
+# =============================================================================
+# Batch Scoring
+# =============================================================================
+
+
+def score_fund_against_lps(fund: FundData, lp_matrix: LPMatrix) -> BatchMatchScores:
+    """Score a fund against every LP in a compiled LPMatrix.
+
+    Finds the candidates passing the hard filters with find_candidates(),
+    then applies the same soft scores as calculate_match_score() to those
+    rows only, vectorized.
+
+    Args:
+        fund: Fund profile data.
+        lp_matrix: LPs compiled with compile_lp_matrix().
+
+    Returns:
+        BatchMatchScores covering every LP.
+    """
+    rows = find_candidates(fund, lp_matrix)
+    n = len(rows)
+    vocab = lp_matrix.vocab
+
+    fund_number: Any = fund.get("fund_number") or 1
+    target_size = _to_float(fund.get("target_size_mm"), 0)
+    size_min = lp_matrix.fund_size_min[rows]
+    size_max = lp_matrix.fund_size_max[rows]
+
+    # Geography: share of fund geographies the LP lists, 100 for "global"
+    fund_geo = fund.get("geographic_focus") or []
+    if fund_geo:
+        geo_cols = _columns(vocab.geographies, _normalize_string_list(fund_geo), lp_matrix.geographies.shape[1])
+        overlap = lp_matrix.geographies[np.ix_(rows, geo_cols)].sum(axis=1).astype(np.float64)
+        geo_score = np.where(lp_matrix.geography_global[rows], 100.0, (overlap / len(fund_geo)) * 100)
+        geo_score = np.where(lp_matrix.has_geographies[rows], geo_score, 50.0)
+    else:
+        geo_score = np.full(n, 50.0)
+
+    # Sector: share of fund sectors with a substring match in the LP's list
+    fund_sectors = fund.get("sector_focus") or []
+    if fund_sectors:
+        sector_terms = [vocab.sectors.term(c) for c in range(lp_matrix.sectors.shape[1])]
+        overlap = np.zeros(n, dtype=np.float64)
+        for fs in (normalize_sector(s) for s in fund_sectors):
+            matching_cols = np.array(
+                [col for col, ls in enumerate(sector_terms) if fs in ls or ls in fs],
+                dtype=np.intp,
+            )
+            overlap += lp_matrix.sectors[np.ix_(rows, matching_cols)].any(axis=1)
+        sector_score = np.where(lp_matrix.has_sectors[rows], (overlap / len(fund_sectors)) * 100, 50.0)
+    else:
+        sector_score = np.full(n, 50.0)
+
+    # Track record: partial credit below the LP's minimum fund number
+    min_fund_number = lp_matrix.min_fund_number[rows]
+    track_score = np.where(
+        fund_number >= min_fund_number,
+        100.0,
+        (fund_number / min_fund_number) * 100,
+    )
+
+    # Size fit: how centered the fund is in the LP's range (candidates are
+    # all within range, so unbounded ranges score 100)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        range_mid = (size_min + size_max) / 2
+        range_span = size_max - size_min
+        distance_from_mid = np.abs(target_size - range_mid)
+        centered = 100 - (distance_from_mid / range_span * 100)
+    centered = np.where(centered > 0.0, centered, 0.0)
+    bounded_fit = np.where(
+        range_span > 0,
+        centered,
+        np.where(target_size == size_min, 100.0, 0.0),
+    )
+    has_bounded_range = (size_min != 0) & (size_max < float("inf")) if target_size else np.zeros(n, dtype=bool)
+    size_fit_score = np.where(has_bounded_range, bounded_fit, 100.0)
+
+    geography = _round1(geo_score)
+    sector = _round1(sector_score)
+    track_record = _round1(track_score)
+    size_fit = _round1(size_fit_score)
+
+    # Accumulate in _SCORING_WEIGHTS order, as the scalar sum() does
+    soft_scores = {
+        "geography": geography,
+        "sector": sector,
+        "track_record": track_record,
+        "size_fit": size_fit,
+    }
+    weighted = np.zeros(n, dtype=np.float64)
+    for key, weight in _SCORING_WEIGHTS.items():
+        weighted = weighted + soft_scores[key] * weight
+
+    return BatchMatchScores(
+        fund=fund,
+        lp_matrix=lp_matrix,
+        candidates=rows,
+        score=_round1(weighted),
+        geography=geography,
+        sector=sector,
+        track_record=track_record,
+        size_fit=size_fit,
+    )
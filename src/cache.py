@@ -1,22 +1,43 @@
-"""Simple in-memory caching for search and matching results.
+"""Caching for search and matching results.
 
 Provides LRU caching for:
 - AI query parsing results (expensive Ollama calls)
 - Matching scores (fund-LP combinations)
 - Search results (database queries)
 
-The cache is process-local and resets on restart.
-For production, consider Redis or database-backed caching.
+and single-flight coalescing, so identical AI query parses that are in
+flight at the same time share one Ollama call.
+
+Entries live in a pluggable backend. MemoryBackend keeps them in the
+process and resets on restart; RedisBackend shares them between workers
+through a Redis-protocol server (settings.cache_backend), normally behind
+a TieredBackend whose small per-worker L1 saves the round trip for hot
+keys. LLM outputs are also persisted by src/llm_cache.py.
+
+Versioned caches are invalidated when the underlying tables change, either
+by polling or, with src/cache_invalidation.py, by Postgres NOTIFY.
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import importlib.util
 import logging
+import sys
 import time
-from collections import OrderedDict
-from dataclasses import dataclass
-from typing import Any
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any, TypedDict, cast
+
+import orjson
+
+from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +49,15 @@ class CacheEntry[T]:
     value: T
     created_at: float
     hits: int = 0
+    expires_at: float | None = None  # None = no expiry
+    size: int = 0  # Approximate bytes, when the backend is byte-bounded
+
+
+class _FreshnessEnvelope[T](TypedDict):
+    """What get_or_compute() stores: the value and when it stops being fresh."""
+
+    value: T
+    fresh_until: float | None  # None = always fresh
 
 
 @dataclass
@@ -37,6 +67,10 @@ class CacheStats:
     hits: int = 0
     misses: int = 0
     evictions: int = 0
+    errors: int = 0  # Backend failures, counted as misses too
+    stale_hits: int = 0  # Served past freshness while refreshing (get_or_compute)
+    refreshes: int = 0  # Background refreshes started by get_or_compute
+    evictions_by_cause: dict[str, int] = field(default_factory=dict)
 
     @property
     def hit_rate(self) -> float:
@@ -44,14 +78,690 @@ class CacheStats:
         total = self.hits + self.misses
         return (self.hits / total * 100) if total > 0 else 0.0
 
+    def record_eviction(self, cause: str, count: int = 1) -> None:
+        """Count evictions, e.g. "capacity", "version", "tag", "query", "entity"."""
+        if count:
+            self.evictions += count
+            self.evictions_by_cause[cause] = self.evictions_by_cause.get(cause, 0) + count
+
+
+# =============================================================================
+# Cache Backends
+# =============================================================================
+
+
+class CacheBackendError(Exception):
+    """A cache backend could not serve a request; treated as a miss."""
+
+
+class CacheBackend(ABC):
+    """Storage for cache entries, shared by LRUCache and VersionedLRUCache.
+
+    Backends store values under string keys with a TTL. Hit/miss
+    accounting stays in the cache classes; backends report evictions
+    they perform and raise CacheBackendError when they are unreachable.
+    """
+
+    kind: str = "backend"
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        """Get a value, or None if missing or expired."""
+
+    @abstractmethod
+    def get_many(self, keys: list[str]) -> list[Any | None]:
+        """Get several values at once, None for each miss."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl_seconds: int) -> int:
+        """Store a value (ttl_seconds 0 = no expiry).
+
+        Returns:
+            Number of entries evicted to make room.
+        """
+
+    @abstractmethod
+    def set_many(self, items: Mapping[str, Any], ttl_seconds: int) -> int:
+        """Store several values with the same TTL.
+
+        Returns:
+            Number of entries evicted to make room.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all values."""
+
+    def usage(self) -> dict[str, Any]:
+        """Memory use and admission counters, where the backend tracks them."""
+        return {}
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+
+class FrequencySketch:
+    """Approximate recent access counts of keys (count-min sketch).
+
+    Four rows of 4-bit counters, as in TinyLFU. Counts are halved after
+    sample_size increments so the sketch follows changing popularity.
+
+    Args:
+        capacity: Expected number of cached entries; sizes the sketch.
+    """
+
+    _DEPTH = 4
+    _MAX_COUNT = 15
+    # Odd 64-bit multipliers, one per row (multiplicative hashing)
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+
+    def __init__(self, capacity: int) -> None:
+        self._bits = max(4 * capacity - 1, 63).bit_length()  # Width: power of two >= 4 * capacity
+        self._rows = [bytearray(1 << self._bits) for _ in range(self._DEPTH)]
+        self.sample_size = 10 * max(capacity, 16)
+        self._additions = 0
+
+    def _indexes(self, key: str) -> list[int]:
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        return [((h * seed) & 0xFFFFFFFFFFFFFFFF) >> (64 - self._bits) for seed in self._SEEDS]
+
+    def increment(self, key: str) -> None:
+        """Record one access of key."""
+        for row, i in zip(self._rows, self._indexes(key), strict=True):
+            if row[i] < self._MAX_COUNT:
+                row[i] += 1
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            for row in self._rows:
+                for i, count in enumerate(row):
+                    row[i] = count >> 1
+            self._additions //= 2
+
+    def estimate(self, key: str) -> int:
+        """Approximate recent access count of key."""
+        return min(row[i] for row, i in zip(self._rows, self._indexes(key), strict=True))
+
+
+def approximate_size(value: Any) -> int:
+    """Approximate size of a cached value in bytes (its JSON encoding)."""
+    try:
+        return len(orjson.dumps(value, default=_orjson_default))
+    except TypeError:
+        return sys.getsizeof(value)
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU storage; values are kept as-is, not copied.
+
+    Bounded by entry count and, optionally, by approximate bytes measured
+    at insert time (see approximate_size()), so a cache of 100-row result
+    pages and a cache of tiny dicts can be given comparable budgets.
+
+    With admission enabled, new entries first enter a small window (1% of
+    the budget) and then compete with the least recently used entry for a
+    place in the main LRU: the one a frequency sketch has seen more often
+    recently stays (W-TinyLFU). A scan of one-off keys then cannot flush
+    the hot keys.
+
+    Args:
+        max_size: Maximum number of entries to keep.
+        max_bytes: Maximum approximate bytes of values (None = unbounded).
+        admission: Use the W-TinyLFU admission policy.
+    """
+
+    kind = "memory"
+
+    def __init__(self, max_size: int = 1000, max_bytes: int | None = None, admission: bool = False) -> None:
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.admission_rejects = 0
+        self._entries: OrderedDict[str, CacheEntry[Any]] = OrderedDict()
+        self._window: OrderedDict[str, CacheEntry[Any]] = OrderedDict()
+        self._sketch = FrequencySketch(max_size) if admission else None
+        self._window_size = max(1, max_size // 100)
+        self._window_bytes = max_bytes // 100 if max_bytes is not None else None
+
+    def _segment(self, key: str) -> OrderedDict[str, CacheEntry[Any]] | None:
+        if key in self._entries:
+            return self._entries
+        if key in self._window:
+            return self._window
+        return None
+
+    def get(self, key: str) -> Any | None:
+        if self._sketch is not None:
+            self._sketch.increment(key)
+
+        segment = self._segment(key)
+        if segment is None:
+            return None
+
+        entry = segment[key]
+        if entry.expires_at is not None and time.time() > entry.expires_at:
+            self._remove(segment, key)
+            return None
+
+        # Move to end (most recently used)
+        segment.move_to_end(key)
+        entry.hits += 1
+        return entry.value
+
+    def get_many(self, keys: list[str]) -> list[Any | None]:
+        return [self.get(key) for key in keys]
+
+    def _remove(self, segment: OrderedDict[str, CacheEntry[Any]], key: str) -> None:
+        entry = segment.pop(key)
+        self.bytes_used -= entry.size
+
+    def _over(self, count: int, size: int, max_count: int, max_bytes: int | None) -> bool:
+        return count > max_count or (max_bytes is not None and size > max_bytes)
+
+    def set(self, key: str, value: Any, ttl_seconds: int) -> int:
+        now = time.time()
+        entry = CacheEntry(
+            value=value,
+            created_at=now,
+            expires_at=now + ttl_seconds if ttl_seconds > 0 else None,
+            size=approximate_size(value) if self.max_bytes is not None else 0,
+        )
+        if self.max_bytes is not None and entry.size > self.max_bytes:
+            self.admission_rejects += 1  # Could never fit
+            self.delete(key)
+            return 0
+
+        # Replace in place (updates position)
+        segment = self._segment(key)
+        if segment is not None:
+            self._remove(segment, key)
+        elif self._sketch is not None:
+            self._sketch.increment(key)
+            segment = self._window
+        else:
+            segment = self._entries
+        segment[key] = entry
+        self.bytes_used += entry.size
+
+        if self._sketch is None:
+            return self._evict_main(len(self._entries), self.bytes_used)
+        return self._drain_window()
+
+    def _evict_main(self, count: int, size: int) -> int:
+        """Evict least recently used main entries until count/size fit."""
+        evicted = 0
+        while self._entries and self._over(count, size, self.max_size, self.max_bytes):
+            _, victim = self._entries.popitem(last=False)
+            self.bytes_used -= victim.size
+            count -= 1
+            size -= victim.size
+            evicted += 1
+        return evicted
+
+    def _drain_window(self) -> int:
+        """Move entries past the window's share into main, by frequency."""
+        evicted = 0
+        window_bytes = sum(e.size for e in self._window.values())
+        main_max = max(1, self.max_size - self._window_size)
+        main_max_bytes: int | None = None
+        if self.max_bytes is not None and self._window_bytes is not None:
+            main_max_bytes = self.max_bytes - self._window_bytes
+        while self._window and self._over(len(self._window), window_bytes, self._window_size, self._window_bytes):
+            key, candidate = self._window.popitem(last=False)
+            window_bytes -= candidate.size
+            main_count = len(self._entries) + 1
+            main_bytes = self.bytes_used - window_bytes
+
+            if self._entries and self._over(main_count, main_bytes, main_max, main_max_bytes):
+                victim_key = next(iter(self._entries))
+                if self._sketch is not None and self._sketch.estimate(key) <= self._sketch.estimate(victim_key):
+                    # The LRU victim is at least as popular; drop the candidate
+                    self.bytes_used -= candidate.size
+                    self.admission_rejects += 1
+                    evicted += 1
+                    continue
+                while self._entries and self._over(main_count, main_bytes, main_max, main_max_bytes):
+                    _, victim = self._entries.popitem(last=False)
+                    self.bytes_used -= victim.size
+                    main_count -= 1
+                    main_bytes -= victim.size
+                    evicted += 1
+
+            self._entries[key] = candidate
+        return evicted
+
+    def set_many(self, items: Mapping[str, Any], ttl_seconds: int) -> int:
+        return sum(self.set(key, value, ttl_seconds) for key, value in items.items())
+
+    def delete(self, key: str) -> None:
+        segment = self._segment(key)
+        if segment is not None:
+            self._remove(segment, key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._window.clear()
+        self.bytes_used = 0
+        self.admission_rejects = 0
+        if self._sketch is not None:
+            self._sketch = FrequencySketch(self.max_size)
+
+    def usage(self) -> dict[str, Any]:
+        return {
+            "bytes": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "admission_rejects": self.admission_rejects,
+        }
+
+    def __contains__(self, key: str) -> bool:
+        return self._segment(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._window)
+
+
+def _orjson_default(value: Any) -> Any:
+    """Encode types orjson does not handle natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, set | frozenset | tuple):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class RedisBackend(CacheBackend):
+    """Shared storage on a Redis-protocol server.
+
+    Values are serialized with orjson, so they come back as plain JSON
+    types (UUIDs and datetimes as strings, Decimals as floats). Reads of
+    several keys use one MGET and writes are pipelined SET ... PX calls,
+    so a batch costs a single round trip. Size is bounded by the server's
+    maxmemory policy rather than max_size.
+
+    Args:
+        client: A redis.Redis client (or compatible, e.g. fakeredis).
+        name: Cache name, used as the key namespace.
+    """
+
+    kind = "redis"
+
+    def __init__(self, client: Any, name: str) -> None:
+        from redis.exceptions import RedisError
+
+        self._client = client
+        self._prefix = f"lpxgp:cache:{name}:"
+        self._errors: tuple[type[BaseException], ...] = (RedisError, OSError)
+
+    def _dumps(self, value: Any) -> bytes | None:
+        try:
+            return orjson.dumps(value, default=_orjson_default)
+        except TypeError as e:
+            logger.warning(f"Not caching value in {self._prefix}*: {e}")
+            return None
+
+    @staticmethod
+    def _loads(raw: bytes | None) -> Any | None:
+        return None if raw is None else orjson.loads(raw)
+
+    def get(self, key: str) -> Any | None:
+        try:
+            raw = self._client.get(self._prefix + key)
+        except self._errors as e:
+            raise CacheBackendError(str(e)) from e
+        return self._loads(raw)
+
+    def get_many(self, keys: list[str]) -> list[Any | None]:
+        if not keys:
+            return []
+        try:
+            raws = self._client.mget([self._prefix + key for key in keys])
+        except self._errors as e:
+            raise CacheBackendError(str(e)) from e
+        return [self._loads(raw) for raw in raws]
+
+    def set(self, key: str, value: Any, ttl_seconds: int) -> int:
+        return self.set_many({key: value}, ttl_seconds)
+
+    def set_many(self, items: Mapping[str, Any], ttl_seconds: int) -> int:
+        encoded = [(key, data) for key, value in items.items() if (data := self._dumps(value)) is not None]
+        if not encoded:
+            return 0
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for key, data in encoded:
+                pipe.set(self._prefix + key, data, px=ttl_seconds * 1000 if ttl_seconds > 0 else None)
+            pipe.execute()
+        except self._errors as e:
+            raise CacheBackendError(str(e)) from e
+        return 0
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(self._prefix + key)
+        except self._errors as e:
+            raise CacheBackendError(str(e)) from e
+
+    def _keys(self) -> Iterable[bytes]:
+        return self._client.scan_iter(match=self._prefix + "*", count=500)
+
+    def clear(self) -> None:
+        try:
+            keys = list(self._keys())
+            if keys:
+                self._client.unlink(*keys)
+        except self._errors as e:
+            raise CacheBackendError(str(e)) from e
+
+    def __len__(self) -> int:
+        try:
+            return sum(1 for _ in self._keys())
+        except self._errors:
+            return 0
+
+
+@dataclass
+class TierStats:
+    """Where lookups of a two-tier cache were answered."""
+
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    l1_invalidations: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        total = self.l1_hits + self.l2_hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "l1_hit_rate": round(self.l1_hits / total * 100, 1) if total else 0.0,
+            "l2_hit_rate": round(self.l2_hits / total * 100, 1) if total else 0.0,
+            "l1_invalidations": self.l1_invalidations,
+        }
+
+
+class InvalidationBus:
+    """Tells other workers which L1 entries to drop, over Redis pub/sub.
+
+    Each message names a cache and the keys written there (None = all).
+    A listener thread queues incoming messages on the subscribed
+    TieredBackend, which applies them on its next operation, so L1 is
+    only ever touched from the request thread. Messages from this worker
+    are ignored.
+
+    Args:
+        client: A redis.Redis client.
+        channel: Pub/sub channel shared by all workers.
+    """
+
+    def __init__(self, client: Any, channel: str = "lpxgp:cache:invalidate") -> None:
+        self._client = client
+        self.channel = channel
+        self._origin = f"{id(self):x}-{time.time_ns():x}"
+        self._subscribers: dict[str, TieredBackend] = {}
+        self._thread: Any = None
+
+    def subscribe(self, name: str, backend: TieredBackend) -> None:
+        """Deliver invalidations for cache name to backend."""
+        self._subscribers[name] = backend
+        if self._thread is None:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.channel: self._on_message})
+                self._thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            except Exception as e:
+                # Without the listener, L1 staleness is bounded by its TTL
+                logger.warning(f"Cache invalidation listener not started: {e}")
+
+    def publish(self, name: str, keys: list[str] | None) -> None:
+        """Announce that keys of cache name changed (None = cleared)."""
+        message = {"origin": self._origin, "cache": name, "keys": keys}
+        try:
+            self._client.publish(self.channel, orjson.dumps(message))
+        except Exception as e:
+            logger.warning(f"Cache invalidation not published: {e}")
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        try:
+            data = orjson.loads(message["data"])
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            return
+        if data.get("origin") == self._origin:
+            return
+        backend = self._subscribers.get(data.get("cache"))
+        if backend is not None:
+            backend.pending_invalidations.append(data.get("keys"))
+
+    def close(self) -> None:
+        """Stop the listener thread."""
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+
+class TieredBackend(CacheBackend):
+    """A small in-process L1 in front of a shared L2.
+
+    Reads try L1 first and fill it from L2; writes go to both. L1 entries
+    live for l1_ttl_seconds at most, and writes by other workers evict
+    them early through the InvalidationBus.
+
+    Args:
+        l2: Shared backend (normally RedisBackend).
+        name: Cache name, used to route invalidations.
+        l1_max_size: Entry limit of the in-process tier.
+        l1_ttl_seconds: Lifetime of L1 entries (bounds staleness).
+        bus: Invalidation bus shared with other workers, if any.
+        l1_max_bytes: Approximate byte limit of the in-process tier.
+        l1_admission: Use W-TinyLFU admission for the in-process tier.
+    """
+
+    def __init__(
+        self,
+        l2: CacheBackend,
+        name: str,
+        l1_max_size: int = 256,
+        l1_ttl_seconds: int = 5,
+        bus: InvalidationBus | None = None,
+        l1_max_bytes: int | None = None,
+        l1_admission: bool = False,
+    ) -> None:
+        self.l1 = MemoryBackend(max_size=l1_max_size, max_bytes=l1_max_bytes, admission=l1_admission)
+        self.l2 = l2
+        self.name = name
+        self.kind = f"memory+{l2.kind}"
+        self.l1_ttl_seconds = l1_ttl_seconds
+        self.tier_stats = TierStats()
+        self.pending_invalidations: deque[list[str] | None] = deque()
+        self._bus = bus
+        if bus is not None:
+            bus.subscribe(name, self)
+
+    def _apply_invalidations(self) -> None:
+        while self.pending_invalidations:
+            keys = self.pending_invalidations.popleft()
+            if keys is None:
+                self.tier_stats.l1_invalidations += len(self.l1)
+                self.l1.clear()
+                continue
+            for key in keys:
+                if key in self.l1:
+                    self.l1.delete(key)
+                    self.tier_stats.l1_invalidations += 1
+
+    def _l1_ttl(self, ttl_seconds: int) -> int:
+        return min(ttl_seconds, self.l1_ttl_seconds) if ttl_seconds > 0 else self.l1_ttl_seconds
+
+    def get(self, key: str) -> Any | None:
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: list[str]) -> list[Any | None]:
+        self._apply_invalidations()
+        values = self.l1.get_many(keys)
+        missing = [i for i, value in enumerate(values) if value is None]
+        self.tier_stats.l1_hits += len(keys) - len(missing)
+        if not missing:
+            return values
+
+        # Each distinct key is read from L2 once; repeats are served by its fill
+        l2_keys = list(dict.fromkeys(keys[i] for i in missing))
+        try:
+            found = dict(zip(l2_keys, self.l2.get_many(l2_keys), strict=True))
+        except CacheBackendError:
+            self.tier_stats.misses += len(missing)
+            raise
+
+        fills = {}
+        for i in missing:
+            value = found[keys[i]]
+            if value is None:
+                self.tier_stats.misses += 1
+                continue
+            if keys[i] in fills:
+                self.tier_stats.l1_hits += 1
+            else:
+                self.tier_stats.l2_hits += 1
+                fills[keys[i]] = value
+            values[i] = value
+        # L2 TTLs are unknown here, so fills use the L1 TTL
+        self.l1.set_many(fills, self.l1_ttl_seconds)
+        return values
+
+    def set(self, key: str, value: Any, ttl_seconds: int) -> int:
+        return self.set_many({key: value}, ttl_seconds)
+
+    def set_many(self, items: Mapping[str, Any], ttl_seconds: int) -> int:
+        self._apply_invalidations()
+        evicted = self.l2.set_many(items, ttl_seconds)
+        self.l1.set_many(items, self._l1_ttl(ttl_seconds))
+        if self._bus is not None:
+            self._bus.publish(self.name, list(items))
+        return evicted
+
+    def delete(self, key: str) -> None:
+        self.l1.delete(key)
+        self.l2.delete(key)
+        if self._bus is not None:
+            self._bus.publish(self.name, [key])
+
+    def clear(self) -> None:
+        self.l1.clear()
+        self.pending_invalidations.clear()
+        self.tier_stats = TierStats()
+        self.l2.clear()
+        if self._bus is not None:
+            self._bus.publish(self.name, None)
+
+    def usage(self) -> dict[str, Any]:
+        return self.l1.usage()
+
+    def __len__(self) -> int:
+        return len(self.l2)
+
+
+_redis_client: Any = None
+_invalidation_bus: InvalidationBus | None = None
+
+
+def redis_available() -> bool:
+    """Whether the optional redis package is installed."""
+    return importlib.util.find_spec("redis") is not None
+
+
+def get_redis_client() -> Any:
+    """Get the shared Redis client, created on first use from settings."""
+    global _redis_client
+    if _redis_client is None:
+        import redis
+
+        settings = get_settings()
+        _redis_client = redis.Redis.from_url(
+            settings.redis_url or "redis://localhost:6379/0",
+            socket_timeout=settings.redis_socket_timeout_seconds,
+            socket_connect_timeout=settings.redis_socket_timeout_seconds,
+        )
+    return _redis_client
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    """Get the shared L1 invalidation bus, created on first use."""
+    global _invalidation_bus
+    if _invalidation_bus is None:
+        _invalidation_bus = InvalidationBus(get_redis_client())
+    return _invalidation_bus
+
+
+def close_cache_backends() -> None:
+    """Stop the invalidation listener and close the Redis client.
+
+    Called from the application lifespan on shutdown. No-op when the
+    in-process backend is used.
+    """
+    global _invalidation_bus, _redis_client
+    if _invalidation_bus is not None:
+        _invalidation_bus.close()
+        _invalidation_bus = None
+    if _redis_client is not None:
+        _redis_client.close()
+        _redis_client = None
+
+
+def make_cache_backend(
+    name: str, max_size: int, max_bytes: int | None = None, admission: bool = False
+) -> CacheBackend:
+    """Create the configured backend for a cache.
+
+    With Redis, a per-worker L1 (settings.cache_l1_max_size entries) sits
+    in front of the shared server unless disabled. Falls back to
+    MemoryBackend when Redis is selected but the redis package is not
+    installed or no REDIS_URL is set. Byte limits and admission apply to
+    the in-process storage; Redis memory is bounded by its maxmemory.
+
+    Args:
+        name: Cache name (Redis key namespace).
+        max_size: Entry limit for the in-process backend.
+        max_bytes: Approximate byte limit for the in-process backend.
+        admission: Use W-TinyLFU admission (if settings.cache_admission).
+
+    Returns:
+        A backend for LRUCache or VersionedLRUCache.
+    """
+    settings = get_settings()
+    admission = admission and settings.cache_admission
+    if settings.cache_backend == "redis":
+        if not redis_available():
+            logger.warning("CACHE_BACKEND=redis but redis is not installed; using in-process cache")
+        elif not settings.redis_url:
+            logger.warning("CACHE_BACKEND=redis but REDIS_URL is not set; using in-process cache")
+        else:
+            shared = RedisBackend(get_redis_client(), name=name)
+            if settings.cache_l1_max_size == 0:
+                return shared
+            return TieredBackend(
+                shared,
+                name=name,
+                l1_max_size=min(settings.cache_l1_max_size, max_size),
+                l1_ttl_seconds=settings.cache_l1_ttl_seconds,
+                bus=get_invalidation_bus(),
+                l1_max_bytes=max_bytes,
+                l1_admission=admission,
+            )
+    return MemoryBackend(max_size=max_size, max_bytes=max_bytes, admission=admission)
+
 
 class LRUCache[T]:
-    """Simple LRU cache with TTL support.
+    """LRU cache with TTL support.
 
     Args:
         max_size: Maximum number of entries to keep.
         ttl_seconds: Time-to-live for entries (0 = no expiry).
         name: Name for logging purposes.
+        backend: Where entries are stored. Defaults to a MemoryBackend.
+        max_bytes: Approximate byte limit of the default MemoryBackend.
+        admission: Use W-TinyLFU admission in the default MemoryBackend.
 
     Example:
         >>> cache = LRUCache[dict](max_size=100, ttl_seconds=300, name="search")
@@ -64,12 +774,21 @@ class LRUCache[T]:
         max_size: int = 1000,
         ttl_seconds: int = 300,
         name: str = "cache",
+        backend: CacheBackend | None = None,
+        max_bytes: int | None = None,
+        admission: bool = False,
     ) -> None:
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
         self.name = name
-        self._cache: OrderedDict[str, CacheEntry[T]] = OrderedDict()
+        self.backend = backend if backend is not None else MemoryBackend(max_size, max_bytes, admission)
         self._stats = CacheStats()
+        self._flight: SingleFlight[Any] = SingleFlight(name=name)
+        self._refreshing: dict[str, asyncio.Task[Any]] = {}
+
+    def _backend_error(self, e: CacheBackendError) -> None:
+        self._stats.errors += 1
+        logger.warning(f"Cache {self.name} backend error: {e}")
 
     def get(self, key: str) -> T | None:
         """Get value from cache if exists and not expired.
@@ -80,25 +799,27 @@ class LRUCache[T]:
         Returns:
             Cached value or None if miss/expired.
         """
-        if key not in self._cache:
-            self._stats.misses += 1
-            return None
+        return self.get_many([key])[0]
 
-        entry = self._cache[key]
+    def get_many(self, keys: list[str]) -> list[T | None]:
+        """Get several values in one backend round trip.
 
-        # Check TTL
-        if self.ttl_seconds > 0:
-            age = time.time() - entry.created_at
-            if age > self.ttl_seconds:
-                del self._cache[key]
-                self._stats.misses += 1
-                return None
+        Args:
+            keys: Cache keys.
 
-        # Move to end (most recently used)
-        self._cache.move_to_end(key)
-        entry.hits += 1
-        self._stats.hits += 1
-        return entry.value
+        Returns:
+            Cached values in key order, None for each miss.
+        """
+        try:
+            values = self.backend.get_many(keys)
+        except CacheBackendError as e:
+            self._backend_error(e)
+            values = [None] * len(keys)
+
+        hits = sum(value is not None for value in values)
+        self._stats.hits += hits
+        self._stats.misses += len(keys) - hits
+        return values
 
     def set(self, key: str, value: T) -> None:
         """Store value in cache.
@@ -107,22 +828,106 @@ class LRUCache[T]:
             key: Cache key.
             value: Value to cache.
         """
-        # Remove if exists (to update position)
-        if key in self._cache:
-            del self._cache[key]
+        self.set_many({key: value})
 
-        # Evict oldest if at capacity
-        while len(self._cache) >= self.max_size:
-            oldest_key = next(iter(self._cache))
-            del self._cache[oldest_key]
-            self._stats.evictions += 1
+    def set_many(self, items: Mapping[str, T]) -> None:
+        """Store several values in one backend round trip.
 
-        self._cache[key] = CacheEntry(value=value, created_at=time.time())
+        Args:
+            items: Mapping of cache key to value.
+        """
+        try:
+            self._stats.record_eviction("capacity", self.backend.set_many(items, self.ttl_seconds))
+        except CacheBackendError as e:
+            self._backend_error(e)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T | None]],
+        ttl: int | None = None,
+        stale_ttl: int = 0,
+    ) -> T | None:
+        """Get a value, computing it with loader() when missing.
+
+        Fresh values (younger than ttl) are returned as-is. Values up to
+        stale_ttl past that are returned immediately too, while exactly
+        one background task reloads them. On a cold miss, concurrent
+        callers for the key share one loader() call (SingleFlight), so an
+        expired hot entry cannot cause a stampede.
+
+        Keys used here hold a freshness envelope; read them only through
+        get_or_compute(). None results are returned but not cached.
+
+        Args:
+            key: Cache key.
+            loader: Zero-argument coroutine function computing the value.
+            ttl: Seconds a value is fresh (0 = forever). Defaults to
+                ttl_seconds.
+            stale_ttl: Further seconds a value may be served while it is
+                refreshed.
+
+        Returns:
+            The cached or computed value.
+
+        Raises:
+            Exception: Whatever loader() raises on a cold miss. Background
+                refresh errors are logged and the stale value kept.
+        """
+        ttl = self.ttl_seconds if ttl is None else ttl
+        entry = cast("_FreshnessEnvelope[T] | None", self.get(key))
+        if entry is not None:
+            fresh_until = entry["fresh_until"]
+            if fresh_until is None or time.time() < fresh_until:
+                return entry["value"]
+            self._stats.stale_hits += 1
+            if key not in self._refreshing:
+                self._stats.refreshes += 1
+                task = asyncio.create_task(self._refresh(key, loader, ttl, stale_ttl))
+                self._refreshing[key] = task
+                task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+            return entry["value"]
+
+        return await self._flight.do(key, lambda: self._load(key, loader, ttl, stale_ttl))
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T | None]],
+        ttl: int,
+        stale_ttl: int,
+    ) -> T | None:
+        value = await loader()
+        if value is not None:
+            envelope: _FreshnessEnvelope[T] = {"value": value, "fresh_until": time.time() + ttl if ttl > 0 else None}
+            try:
+                self._stats.record_eviction(
+                    "capacity", self.backend.set(key, envelope, ttl + stale_ttl if ttl > 0 else 0)
+                )
+            except CacheBackendError as e:
+                self._backend_error(e)
+        return value
+
+    async def _refresh(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T | None]],
+        ttl: int,
+        stale_ttl: int,
+    ) -> None:
+        try:
+            await self._flight.do(key, lambda: self._load(key, loader, ttl, stale_ttl))
+        except Exception as e:
+            logger.warning(f"Background refresh of {self.name} entry failed: {e}")
 
     def clear(self) -> None:
         """Clear all cached entries."""
-        self._cache.clear()
+        try:
+            self.backend.clear()
+        except CacheBackendError as e:
+            self._backend_error(e)
         self._stats = CacheStats()
+        self._flight.clear()
 
     @property
     def stats(self) -> CacheStats:
@@ -130,7 +935,7 @@ class LRUCache[T]:
         return self._stats
 
     def __len__(self) -> int:
-        return len(self._cache)
+        return len(self.backend)
 
 
 def make_cache_key(*args: Any, **kwargs: Any) -> str:
@@ -156,6 +961,98 @@ def make_cache_key(*args: Any, **kwargs: Any) -> str:
     return hashlib.sha256(key_str.encode()).hexdigest()
 
 
+# =============================================================================
+# Single-Flight Request Coalescing
+# =============================================================================
+
+
+@dataclass
+class SingleFlightStats:
+    """Statistics for request coalescing."""
+
+    leaders: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight[T]:
+    """Coalesce concurrent calls for the same key into one.
+
+    A cache is only filled once a call completes, so identical requests
+    arriving while it is in flight would each repeat it. With SingleFlight
+    the first caller (the leader) runs the call and every concurrent caller
+    with the same key awaits the leader's result instead. Errors propagate
+    to all of them. If the leader is cancelled, a waiter takes over.
+
+    Callers share the returned object, so treat it as read-only.
+
+    Args:
+        name: Name for logging purposes.
+
+    Example:
+        >>> flight = SingleFlight[dict](name="ai_query")
+        >>> filters = await flight.do(cache_key, lambda: call_ollama(query))
+    """
+
+    def __init__(self, name: str = "single_flight") -> None:
+        self.name = name
+        self._inflight: dict[str, asyncio.Future[T]] = {}
+        self._stats = SingleFlightStats()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn(), or await the in-flight call for the same key.
+
+        Args:
+            key: Cache key identifying the call.
+            fn: Zero-argument coroutine function performing the call.
+
+        Returns:
+            The result of the (possibly shared) call.
+        """
+        waited = False
+        while (future := self._inflight.get(key)) is not None:
+            if not waited:
+                waited = True
+                self._stats.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # This caller was cancelled
+                # The leader was cancelled; retry (possibly as leader)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self._stats.leaders += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys with a call in flight."""
+        return len(self._inflight)
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """Get coalescing statistics."""
+        return self._stats
+
+    def clear(self) -> None:
+        """Reset statistics (in-flight calls are left to finish)."""
+        self._stats = SingleFlightStats()
+
+
 # =============================================================================
 # Global Cache Instances
 # =============================================================================
@@ -166,6 +1063,7 @@ ai_query_cache: LRUCache[dict[str, Any]] = LRUCache(
     max_size=500,
     ttl_seconds=300,
     name="ai_query",
+    backend=make_cache_backend("ai_query", 500),
 )
 
 # Cache for matching scores (fund_id + lp_id -> score)
@@ -174,50 +1072,99 @@ match_score_cache: LRUCache[dict[str, Any]] = LRUCache(
     max_size=10000,
     ttl_seconds=600,
     name="match_score",
+    backend=make_cache_backend("match_score", 10000),
 )
 
-# Cache for search results
-# TTL: 2 minutes, Max: 200 entries
+# Cache for search results (pages of up to 100 rows, so bounded by bytes too)
+# TTL: 2 minutes, Max: 200 entries / 16 MiB, TinyLFU admission
 search_results_cache: LRUCache[list[dict[str, Any]]] = LRUCache(
     max_size=200,
     ttl_seconds=120,
     name="search_results",
+    backend=make_cache_backend("search_results", 200, max_bytes=16 * 1024 * 1024, admission=True),
 )
 
+# Cache for rendered-page data (dashboard counts, LP lists), filled through
+# get_or_compute() so expiring hot entries are refreshed in the background.
+# TTLs are chosen per key by the caller. Max: 1000 entries / 32 MiB, TinyLFU admission
+page_cache: LRUCache[Any] = LRUCache(
+    max_size=1000,
+    ttl_seconds=60,
+    name="page",
+    backend=make_cache_backend("page", 1000, max_bytes=32 * 1024 * 1024, admission=True),
+)
+
+# Cache for search query embeddings (one provider call per distinct query)
+# TTL: 1 hour, Max: 500 entries / 16 MiB (about 20 KB per 1024-d vector)
+query_embedding_cache: LRUCache[list[float]] = LRUCache(
+    max_size=500,
+    ttl_seconds=3600,
+    name="query_embedding",
+    backend=make_cache_backend("query_embedding", 500, max_bytes=16 * 1024 * 1024),
+)
+
+# Coalesces identical in-flight AI query parses (one Ollama call per key)
+ai_query_flight: SingleFlight[Any] = SingleFlight(name="ai_query")
+
+
+def _lru_stats(cache: LRUCache[Any]) -> dict[str, Any]:
+    """Size, hit rate, memory use and backend of one cache, per tier if tiered."""
+    stats: dict[str, Any] = {
+        "backend": cache.backend.kind,
+        "size": len(cache),
+        "hits": cache.stats.hits,
+        "misses": cache.stats.misses,
+        "hit_rate": round(cache.stats.hit_rate, 1),
+        "errors": cache.stats.errors,
+        "stale_hits": cache.stats.stale_hits,
+        "refreshes": cache.stats.refreshes,
+        "evictions": cache.stats.evictions,
+        "evictions_by_cause": dict(cache.stats.evictions_by_cause),
+        **cache.backend.usage(),
+    }
+    if isinstance(cache.backend, TieredBackend):
+        stats["tiers"] = cache.backend.tier_stats.as_dict()
+    return stats
+
 
 def get_cache_stats() -> dict[str, dict[str, Any]]:
     """Get statistics for all caches.
 
     Returns:
-        Dictionary with stats for each cache.
+        Dictionary with stats for each cache, including the persistent
+        LLM response cache.
     """
+    from src.llm_cache import llm_response_cache
+
     return {
         "ai_query": {
-            "size": len(ai_query_cache),
-            "hits": ai_query_cache.stats.hits,
-            "misses": ai_query_cache.stats.misses,
-            "hit_rate": round(ai_query_cache.stats.hit_rate, 1),
-        },
-        "match_score": {
-            "size": len(match_score_cache),
-            "hits": match_score_cache.stats.hits,
-            "misses": match_score_cache.stats.misses,
-            "hit_rate": round(match_score_cache.stats.hit_rate, 1),
-        },
-        "search_results": {
-            "size": len(search_results_cache),
-            "hits": search_results_cache.stats.hits,
-            "misses": search_results_cache.stats.misses,
-            "hit_rate": round(search_results_cache.stats.hit_rate, 1),
+            **_lru_stats(ai_query_cache),
+            "coalesced": ai_query_flight.stats.coalesced,
+            "in_flight": ai_query_flight.in_flight,
         },
+        "match_score": _lru_stats(match_score_cache),
+        "search_results": _lru_stats(search_results_cache),
+        "page": _lru_stats(page_cache),
+        "query_embedding": _lru_stats(query_embedding_cache),
+        "llm_response": llm_response_cache.get_stats(),
     }
 
 
 def clear_all_caches() -> None:
-    """Clear all caches. Useful for testing."""
+    """Clear all caches. Useful for testing.
+
+    The persistent LLM response cache keeps its rows; only its counters
+    are reset.
+    """
+    from src.llm_cache import llm_response_cache
+
     ai_query_cache.clear()
+    ai_query_flight.clear()
     match_score_cache.clear()
     search_results_cache.clear()
+    page_cache.clear()
+    query_embedding_cache.clear()
+    llm_response_cache.reset_stats()
     logger.info("All caches cleared")
 
 
@@ -234,6 +1181,8 @@ class DataVersion:
     row_count: int
     last_modified: str | None  # ISO timestamp or None
     checksum: str  # Hash of count + timestamp
+    # Moves only on polled changes; pushed changes are evicted per entity
+    base_checksum: str = ""
 
     @classmethod
     def compute(cls, entity_type: str, row_count: int, last_modified: Any) -> DataVersion:
@@ -245,15 +1194,28 @@ class DataVersion:
             row_count=row_count,
             last_modified=modified_str,
             checksum=checksum,
+            base_checksum=checksum,
         )
 
 
+# Entity types whose cached data a change to another entity type affects.
+# Organization rows carry LP and GP names and locations.
+_DEPENDENT_ENTITIES: dict[str, tuple[str, ...]] = {
+    "organization": ("organization", "lp", "gp"),
+}
+
+
 class CacheVersionManager:
     """Manages cache versions by polling database for changes.
 
     Uses row count + max(updated_at) as a lightweight change detector.
     Polls periodically to avoid hitting the database on every cache access.
 
+    When the change listener (src/cache_invalidation.py) is connected,
+    changes are pushed instead: apply_change() bumps the entity's version
+    and evicts registered caches right away, and polling stops after the
+    initial load.
+
     Example:
         >>> manager = CacheVersionManager(poll_interval=30)
         >>> versions = await manager.get_versions(conn)
@@ -268,9 +1230,12 @@ class CacheVersionManager:
             poll_interval: Seconds between database polls. Default 30.
         """
         self.poll_interval = poll_interval
+        self.push_connected = False
         self._versions: dict[str, DataVersion] = {}
         self._last_poll: float = 0
         self._combined_checksum: str = ""
+        self._push_seq = 0
+        self._caches: weakref.WeakSet[VersionedLRUCache[Any]] = weakref.WeakSet()
 
     @property
     def versions(self) -> dict[str, DataVersion]:
@@ -286,9 +1251,18 @@ class CacheVersionManager:
         return self._combined_checksum
 
     def is_stale(self) -> bool:
-        """Check if versions need refreshing."""
+        """Check if versions need refreshing.
+
+        Never stale once loaded while changes are being pushed.
+        """
+        if self.push_connected and self._last_poll > 0:
+            return False
         return time.time() - self._last_poll > self.poll_interval
 
+    def mark_stale(self) -> None:
+        """Force a poll on next use (e.g. after missing pushed changes)."""
+        self._last_poll = 0
+
     def update_from_db(self, db_stats: dict[str, dict[str, Any]]) -> bool:
         """Update versions from database statistics.
 
@@ -306,6 +1280,7 @@ class CacheVersionManager:
             >>> changed = manager.update_from_db(stats)
         """
         old_checksum = self._combined_checksum
+        old_versions = self._versions
         new_versions = {}
 
         for entity_type, stats in db_stats.items():
@@ -318,16 +1293,75 @@ class CacheVersionManager:
         self._versions = new_versions
         self._last_poll = time.time()
 
-        # Compute combined checksum
-        checksums = sorted(f"{k}:{v.checksum}" for k, v in new_versions.items())
-        self._combined_checksum = hashlib.md5("|".join(checksums).encode()).hexdigest()[:12]
+        self._update_combined_checksum()
 
         changed = old_checksum != "" and old_checksum != self._combined_checksum
         if changed:
             logger.info(f"Data version changed: {old_checksum} -> {self._combined_checksum}")
+            for entity_type, version in new_versions.items():
+                if old_versions.get(entity_type) != version:
+                    self._invalidate_caches(entity_type)
 
         return changed
 
+    def apply_change(
+        self,
+        entity_type: str,
+        entity_id: str | None,
+        operation: str,
+        row: dict[str, Any] | None = None,
+    ) -> None:
+        """Apply one pushed row change.
+
+        Bumps the version of the entity type (and of the entity types that
+        depend on it), keeps row counts current, and evicts the entries of
+        registered caches that mention the entity or could now match it.
+
+        Args:
+            entity_type: Changed entity type ('lp', 'gp', 'fund', 'organization').
+            entity_id: Id of the changed entity, if known.
+            operation: 'INSERT', 'UPDATE' or 'DELETE'.
+            row: Filterable columns of the new row, if known.
+        """
+        self._push_seq += 1
+        now = datetime.now(UTC).isoformat()
+        delta = {"INSERT": 1, "DELETE": -1}.get(operation, 0)
+
+        for affected in _DEPENDENT_ENTITIES.get(entity_type, (entity_type,)):
+            current = self._versions.get(affected)
+            row_count = current.row_count if current else 0
+            if affected == entity_type:
+                row_count = max(row_count + delta, 0)
+            previous = current.checksum if current else ""
+            self._versions[affected] = DataVersion(
+                entity_type=affected,
+                row_count=row_count,
+                last_modified=now,
+                checksum=hashlib.md5(f"{previous}|{affected}|{self._push_seq}|{entity_id}".encode()).hexdigest()[:8],
+                base_checksum=current.base_checksum if current else "",
+            )
+            for cache in list(self._caches):
+                cache.invalidate_entity(affected, entity_id, operation, row if affected == entity_type else None)
+
+        self._update_combined_checksum()
+        logger.debug(f"Pushed {operation} of {entity_type} {entity_id}")
+
+    def register_cache(self, cache: VersionedLRUCache[Any]) -> None:
+        """Evict entries of cache whenever a version it depends on changes."""
+        self._caches.add(cache)
+
+    def is_registered(self, cache: VersionedLRUCache[Any]) -> bool:
+        """Whether pushed changes are evicted from cache entry by entry."""
+        return cache in self._caches
+
+    def _invalidate_caches(self, entity_type: str) -> None:
+        for cache in list(self._caches):
+            cache.invalidate_by_entity(entity_type)
+
+    def _update_combined_checksum(self) -> None:
+        checksums = sorted(f"{k}:{v.checksum}" for k, v in self._versions.items())
+        self._combined_checksum = hashlib.md5("|".join(checksums).encode()).hexdigest()[:12]
+
     def has_entity_changed(self, entity_type: str, cached_checksum: str) -> bool:
         """Check if a specific entity type has changed.
 
@@ -343,6 +1377,25 @@ class CacheVersionManager:
             return True  # Unknown entity, assume changed
         return current.checksum != cached_checksum
 
+    def has_base_changed(self, entity_type: str, cached_base: str) -> bool:
+        """Check if an entity type changed other than through pushed changes.
+
+        Args:
+            entity_type: The entity type to check ('lp', 'gp', 'fund').
+            cached_base: The base checksum when the cache was created.
+
+        Returns:
+            True if a poll saw the entity change since cached_base.
+        """
+        current = self._versions.get(entity_type)
+        if current is None:
+            return True
+        return current.base_checksum != cached_base
+
+    def get_base_checksums(self) -> dict[str, str]:
+        """Get current base checksums for all entity types."""
+        return {k: v.base_checksum for k, v in self._versions.items()}
+
     def get_checksums(self) -> dict[str, str]:
         """Get current checksums for all entity types.
 
@@ -356,27 +1409,34 @@ class CacheVersionManager:
 version_manager = CacheVersionManager(poll_interval=30)
 
 
-@dataclass
-class VersionedCacheEntry[T]:
-    """Cache entry with version tracking for invalidation."""
-
-    value: T
-    created_at: float
-    checksums: dict[str, str]  # entity_type -> checksum at cache time
-    hits: int = 0
+def entity_tag(entity_type: str, entity_id: Any) -> str:
+    """Tag for cache entries that contain an entity, e.g. "lp:<org id>"."""
+    return f"{entity_type}:{entity_id}"
 
 
 class VersionedLRUCache[T]:
     """LRU cache with version-based invalidation.
 
     Extends basic LRU cache to track data versions and automatically
-    invalidate entries when underlying data changes.
+    invalidate entries when underlying data changes. Each entry is stored
+    in the backend together with the entity checksums at cache time.
+
+    Entries can be invalidated entity by entity instead of wholesale:
+    tag them with the entities they contain (entity_tag()) and, for query
+    results, the filters that produced them. A pushed change to entity X
+    then evicts only the entries tagged with X and the query entries whose
+    filters could match X's new row (decided by matcher, or assumed when
+    either is unknown). Untagged entries are evicted on any change of
+    their entity types, as are all entries when a poll sees a change.
 
     Args:
         entity_types: List of entity types this cache depends on.
         max_size: Maximum number of entries to keep.
         ttl_seconds: Time-to-live for entries (0 = no expiry).
         name: Name for logging purposes.
+        backend: Where entries are stored. Defaults to a MemoryBackend.
+        matcher: matcher(filters, row) is False if a row cannot match the
+            filters of a query entry.
 
     Example:
         >>> cache = VersionedLRUCache[list](
@@ -386,6 +1446,8 @@ class VersionedLRUCache[T]:
         ... )
         >>> cache.set("query1", results, version_manager)
         >>> result = cache.get("query1", version_manager)
+        >>> cache.set("page1", rows, version_manager,
+        ...           tags=[entity_tag("lp", r["id"]) for r in rows], filters=filters)
     """
 
     def __init__(
@@ -394,13 +1456,25 @@ class VersionedLRUCache[T]:
         max_size: int = 1000,
         ttl_seconds: int = 300,
         name: str = "cache",
+        backend: CacheBackend | None = None,
+        matcher: Callable[[dict[str, Any], dict[str, Any]], bool] | None = None,
+        max_bytes: int | None = None,
+        admission: bool = False,
     ) -> None:
         self.entity_types = entity_types
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
         self.name = name
-        self._cache: OrderedDict[str, VersionedCacheEntry[T]] = OrderedDict()
+        self.backend = backend if backend is not None else MemoryBackend(max_size, max_bytes, admission)
+        self.matcher = matcher
         self._stats = CacheStats()
+        # Entries written by this process, in LRU order, with their tags
+        self._index: OrderedDict[str, frozenset[str]] = OrderedDict()
+        self._tag_keys: dict[str, set[str]] = {}  # Reverse index: tag -> keys
+        self._queries: dict[str, dict[str, Any]] = {}  # Query entry key -> filters
+        self._untracked: set[str] = set()
+        # Pushed changes evict entries before they are next read
+        version_manager.register_cache(self)
 
     def get(self, key: str, vm: CacheVersionManager | None = None) -> T | None:
         """Get value from cache if exists, not expired, and versions match.
@@ -412,69 +1486,163 @@ class VersionedLRUCache[T]:
         Returns:
             Cached value or None if miss/expired/invalidated.
         """
-        if key not in self._cache:
+        try:
+            entry = self.backend.get(key)
+        except CacheBackendError as e:
+            self._stats.errors += 1
             self._stats.misses += 1
+            logger.warning(f"Cache {self.name} backend error: {e}")
             return None
 
-        entry = self._cache[key]
-
-        # Check TTL
-        if self.ttl_seconds > 0:
-            age = time.time() - entry.created_at
-            if age > self.ttl_seconds:
-                del self._cache[key]
-                self._stats.misses += 1
-                return None
+        if entry is None:
+            self._unindex(key)  # Expired or evicted by the backend
+            self._stats.misses += 1
+            return None
 
         # Check versions if manager provided
         if vm is not None:
+            # Pushed changes to tracked entries were evicted per entity, so
+            # only polled changes invalidate them here
+            per_entity = "base" in entry and key in self._index and vm.is_registered(self)
             for entity_type in self.entity_types:
-                cached_checksum = entry.checksums.get(entity_type, "")
-                if vm.has_entity_changed(entity_type, cached_checksum):
+                if per_entity:
+                    changed = vm.has_base_changed(entity_type, entry["base"].get(entity_type, ""))
+                else:
+                    changed = vm.has_entity_changed(entity_type, entry["checksums"].get(entity_type, ""))
+                if changed:
                     # Version mismatch - data changed
-                    del self._cache[key]
+                    self._evict([key], "version")
                     self._stats.misses += 1
                     logger.debug(f"Cache invalidated for {key}: {entity_type} changed")
                     return None
 
-        # Move to end (most recently used)
-        self._cache.move_to_end(key)
-        entry.hits += 1
+        if key in self._index:
+            self._index.move_to_end(key)
         self._stats.hits += 1
-        return entry.value
+        return entry["value"]
 
-    def set(self, key: str, value: T, vm: CacheVersionManager | None = None) -> None:
+    def set(
+        self,
+        key: str,
+        value: T,
+        vm: CacheVersionManager | None = None,
+        *,
+        tags: Iterable[str] = (),
+        filters: dict[str, Any] | None = None,
+    ) -> None:
         """Store value in cache with current version checksums.
 
         Args:
             key: Cache key.
             value: Value to cache.
             vm: Version manager to get current checksums.
+            tags: Entities the value contains (entity_tag()).
+            filters: Filters of the query that produced the value, if any.
         """
-        # Remove if exists (to update position)
-        if key in self._cache:
-            del self._cache[key]
+        tags = frozenset(tags)
+        tracked = bool(tags) or filters is not None
 
-        # Evict oldest if at capacity
-        while len(self._cache) >= self.max_size:
-            oldest_key = next(iter(self._cache))
-            del self._cache[oldest_key]
-            self._stats.evictions += 1
+        # Evict least recently used if at capacity
+        self._unindex(key)
+        while len(self._index) >= self.max_size:
+            oldest_key = next(iter(self._index))
+            self._evict([oldest_key], "capacity")
 
         # Get current checksums
-        checksums = vm.get_checksums() if vm else {}
+        entry: dict[str, Any] = {"value": value, "checksums": vm.get_checksums() if vm else {}}
+        if tracked:
+            entry["base"] = vm.get_base_checksums() if vm else {}
 
-        self._cache[key] = VersionedCacheEntry(
-            value=value,
-            created_at=time.time(),
-            checksums=checksums,
-        )
+        try:
+            self.backend.set(key, entry, self.ttl_seconds)
+        except CacheBackendError as e:
+            self._stats.errors += 1
+            logger.warning(f"Cache {self.name} backend error: {e}")
+            return
+
+        self._index[key] = tags
+        for tag in tags:
+            self._tag_keys.setdefault(tag, set()).add(key)
+        if filters is not None:
+            self._queries[key] = filters
+        if not tracked:
+            self._untracked.add(key)
+
+    def _unindex(self, key: str) -> None:
+        tags = self._index.pop(key, None)
+        if tags is None:
+            return
+        for tag in tags:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+        self._queries.pop(key, None)
+        self._untracked.discard(key)
+
+    def _evict(self, keys: Iterable[str], cause: str) -> int:
+        count = 0
+        for key in list(keys):
+            self._unindex(key)
+            try:
+                self.backend.delete(key)
+            except CacheBackendError as e:
+                self._stats.errors += 1
+                logger.warning(f"Cache {self.name} backend error: {e}")
+            count += 1
+        self._stats.record_eviction(cause, count)
+        return count
 
     def clear(self) -> None:
         """Clear all cached entries."""
-        self._cache.clear()
+        try:
+            self.backend.clear()
+        except CacheBackendError as e:
+            logger.warning(f"Cache {self.name} backend error: {e}")
+        self._index.clear()
+        self._tag_keys.clear()
+        self._queries.clear()
+        self._untracked.clear()
         self._stats = CacheStats()
 
+    def invalidate_entity(
+        self,
+        entity_type: str,
+        entity_id: str | None,
+        operation: str = "UPDATE",
+        row: dict[str, Any] | None = None,
+    ) -> int:
+        """Evict the entries a change to one entity can affect.
+
+        Args:
+            entity_type: Type of the changed entity.
+            entity_id: Id of the changed entity.
+            operation: 'INSERT', 'UPDATE' or 'DELETE'.
+            row: Filterable columns of the new row, if known.
+
+        Returns:
+            Number of entries invalidated.
+        """
+        if entity_type not in self.entity_types:
+            return 0
+
+        count = self._evict(self._tag_keys.get(entity_tag(entity_type, entity_id), ()), "tag")
+        count += self._evict(self._untracked, "entity")
+
+        # A deleted entity cannot start matching a query
+        if operation != "DELETE":
+            could_match = [
+                key
+                for key, filters in self._queries.items()
+                if row is None or self.matcher is None or self.matcher(filters, row)
+            ]
+            count += self._evict(could_match, "query")
+
+        if count:
+            logger.debug(f"Invalidated {count} entries in {self.name} due to {entity_type} {entity_id}")
+        return count
+
     def invalidate_by_entity(self, entity_type: str) -> int:
         """Invalidate all entries that depend on an entity type.
 
@@ -488,9 +1656,13 @@ class VersionedLRUCache[T]:
             return 0
 
         # Clear everything since all entries depend on this entity
-        count = len(self._cache)
+        count = len(self)
+        stats = self._stats
         self.clear()
-        logger.info(f"Invalidated {count} entries in {self.name} due to {entity_type} change")
+        self._stats = stats
+        self._stats.record_eviction("entity", count)
+        if count:
+            logger.info(f"Invalidated {count} entries in {self.name} due to {entity_type} change")
         return count
 
     @property
@@ -499,7 +1671,7 @@ class VersionedLRUCache[T]:
         return self._stats
 
     def __len__(self) -> int:
-        return len(self._cache)
+        return len(self.backend)
 
 
 # =============================================================================
@@ -526,19 +1698,23 @@ def fetch_db_versions_sync(conn: Any) -> dict[str, dict[str, Any]]:
         """)
         row = cur.fetchone()
 
-        # Try to get last modified times (may not exist in all schemas)
+        # Try to get last modified times (may not exist in all schemas).
+        # updated_at is bumped by triggers, so edits move the checksum too.
         try:
             cur.execute("""
                 SELECT
-                    (SELECT MAX(created_at) FROM organizations) as org_modified
+                    (SELECT MAX(updated_at) FROM organizations) as org_modified,
+                    (SELECT MAX(updated_at) FROM lp_profiles) as lp_modified
             """)
             modified_row = cur.fetchone()
             org_modified = modified_row.get("org_modified") if modified_row else None
+            lp_modified = modified_row.get("lp_modified") if modified_row else None
         except Exception:
             org_modified = None
+            lp_modified = None
 
     return {
-        "lp": {"count": row["lp_count"], "last_modified": org_modified},
+        "lp": {"count": row["lp_count"], "last_modified": lp_modified or org_modified},
         "gp": {"count": row["gp_count"], "last_modified": org_modified},
         "organization": {"count": row["org_count"], "last_modified": org_modified},
     }
@@ -0,0 +1,137 @@
+"""Push-based cache invalidation via Postgres LISTEN/NOTIFY.
+
+Triggers on the core tables (migration 018) NOTIFY the ``lpxgp_cache``
+channel with the changed table, entity id and operation. The listener
+keeps one dedicated connection LISTENing on that channel and applies each
+notification to the version manager, which bumps the entity's version and
+evicts the entries of registered VersionedLRUCaches that mention the entity
+or could now match it, within milliseconds of the commit.
+
+While the listener is connected the version manager stops polling. If the
+connection drops, polling resumes until it reconnects, and a resync poll
+runs after every (re)connect to cover changes made while disconnected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any
+
+import psycopg
+
+from src.cache import CacheVersionManager, version_manager
+from src.database import resolve_database_url
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "lpxgp_cache"
+"""NOTIFY channel used by notify_cache_invalidation()."""
+
+TABLE_ENTITIES: dict[str, str] = {
+    "organizations": "organization",
+    "lp_profiles": "lp",
+    "gp_profiles": "gp",
+    "funds": "fund",
+}
+"""Entity type tracked by the version manager for each notifying table."""
+
+_MAX_BACKOFF_SECONDS = 30.0
+
+
+class CacheInvalidationListener:
+    """Background task applying pushed row changes to cached data.
+
+    Example:
+        >>> cache_invalidation_listener.start()
+        >>> await cache_invalidation_listener.stop()
+
+    Args:
+        manager: Version manager to apply changes to.
+    """
+
+    def __init__(self, manager: CacheVersionManager = version_manager) -> None:
+        self.manager = manager
+        self._task: asyncio.Task[None] | None = None
+        self.notifications = 0
+        self.reconnects = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the listener task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> bool:
+        """Start listening on the running event loop.
+
+        Returns:
+            False if no database is configured.
+        """
+        if self.running:
+            return True
+        db_url = resolve_database_url()
+        if not db_url:
+            return False
+        self._task = asyncio.create_task(self._run(db_url), name="cache-invalidation-listener")
+        return True
+
+    async def stop(self) -> None:
+        """Cancel the listener and resume polling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.manager.push_connected = False
+
+    def handle(self, payload: str) -> bool:
+        """Apply one notification payload.
+
+        Args:
+            payload: JSON with table, id, op and (for LPs) the filterable
+                row columns, as sent by the trigger.
+
+        Returns:
+            False if the payload was malformed or names an untracked table.
+        """
+        try:
+            change: dict[str, Any] = json.loads(payload)
+            entity_type = TABLE_ENTITIES[change["table"]]
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring cache invalidation payload: {payload!r}")
+            return False
+
+        self.notifications += 1
+        self.manager.apply_change(entity_type, change.get("id"), change.get("op", "UPDATE"), change.get("row"))
+        return True
+
+    async def _run(self, db_url: str) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(db_url, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    # Changes made while disconnected were not pushed
+                    self.manager.mark_stale()
+                    self.manager.push_connected = True
+                    backoff = 1.0
+                    logger.info("Cache invalidation listener connected")
+                    async for notify in conn.notifies():
+                        self.handle(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener disconnected: {e}")
+            finally:
+                self.manager.push_connected = False
+
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, _MAX_BACKOFF_SECONDS)
+
+
+cache_invalidation_listener = CacheInvalidationListener()
+"""Process-wide listener, started in the app lifespan."""
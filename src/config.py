@@ -48,6 +48,15 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 Environment = Literal["development", "staging", "production"]
 """Valid environment names for deployment."""
 
+MatchContentMode = Literal["eager", "lazy"]
+"""When match explanations are generated: during the run, or on demand."""
+
+CacheBackendKind = Literal["memory", "redis"]
+"""Storage for the in-app caches: per-process memory, or a shared Redis server."""
+
+EmbeddingProviderKind = Literal["voyage", "hash"]
+"""Source of text embeddings: the Voyage AI API, or local feature hashing."""
+
 
 # =============================================================================
 # Settings Class
@@ -62,12 +71,55 @@ class Settings(BaseSettings):
 
     Attributes:
         database_url: PostgreSQL connection URL. None means no database.
+        db_pool_enabled: Serve get_db() connections from a shared pool.
+        db_pool_min_size: Minimum connections kept open by the pool.
+        db_pool_max_size: Maximum connections the pool may open.
+        db_pool_timeout_seconds: Wait limit for a free pooled connection.
+        db_pool_max_lifetime_seconds: Age at which pooled connections are recycled.
+        db_pool_max_idle_seconds: Idle time before surplus connections close.
+        count_estimate_threshold: Listing size above which totals are planner estimates.
         environment: Deployment environment (development/staging/production).
         debug: Enable debug mode. Must be False in production.
         openrouter_api_key: API key for OpenRouter LLM calls.
         voyage_api_key: API key for Voyage AI embeddings.
         ollama_base_url: Base URL for local Ollama instance.
         ollama_model: Default Ollama model for AI agents.
+        ollama_max_concurrency: Concurrent Ollama requests per worker.
+        openrouter_max_concurrency: Concurrent OpenRouter requests per worker.
+        match_content_timeout_seconds: Per-match LLM deadline before fallback.
+        match_content_mode: Generate match explanations eagerly or on demand.
+        match_content_background: Fill in deferred explanations in the background.
+        llm_streaming_enabled: Stream pitches and match explanations to the browser.
+        llm_breaker_failure_threshold: Consecutive LLM failures that open a breaker.
+        llm_breaker_reset_seconds: Time an open breaker rejects calls before a trial.
+        llm_adaptive_timeouts: Size LLM timeouts from observed p99 latency.
+        llm_timeout_p99_multiplier: Adaptive timeout as a multiple of p99 latency.
+        llm_timeout_min_seconds: Lower bound for adaptive LLM timeouts.
+        llm_cache_enabled: Cache LLM outputs in the llm_response_cache table.
+        llm_cache_ttl_seconds: Lifetime of a cached LLM output.
+        llm_cache_max_entries: Row limit enforced by cache eviction.
+        llm_cache_max_bytes: Total value size limit enforced by cache eviction.
+        search_rules_enabled: Parse common search queries without the LLM.
+        search_rules_min_confidence: Rule parser confidence needed to skip the LLM.
+        cache_backend: Storage for the search and matching caches.
+        redis_url: Redis server shared by all workers when cache_backend is redis.
+        redis_socket_timeout_seconds: Redis timeout before a lookup counts as a miss.
+        cache_l1_max_size: Per-worker L1 entries in front of Redis (0 = no L1).
+        cache_l1_ttl_seconds: Lifetime of L1 entries.
+        cache_push_invalidation: Invalidate caches on Postgres NOTIFY instead of polling.
+        cache_admission: Use W-TinyLFU admission for caches that enable it.
+        embedding_provider: Model that embeds mandates, theses and queries.
+        voyage_embedding_model: Voyage model used by the voyage provider.
+        embedding_batch_size: Texts sent per embedding request.
+        semantic_search_probes: ivfflat lists searched per semantic query.
+        hybrid_rrf_k: Reciprocal-rank fusion constant for search ranking.
+        hybrid_text_weight: Weight of the full-text rank in search ranking.
+        hybrid_vector_weight: Weight of the embedding rank in search ranking.
+        hybrid_filter_weight: Weight of the default page order in search ranking.
+        hybrid_candidates: Candidates taken from each ranking before fusion.
+        search_parse_budget_ms: Query parsing time before falling back to text search.
+        search_embed_budget_ms: Query embedding time before skipping semantic ranking.
+        search_retrieve_budget_ms: Expected fused search query time.
         langfuse_public_key: Langfuse public key for monitoring.
         langfuse_secret_key: Langfuse secret key for monitoring.
         langfuse_host: Langfuse API host URL.
@@ -114,6 +166,62 @@ class Settings(BaseSettings):
     )
     """TEST database connection URL. Can be safely reset, truncated, or deleted."""
 
+    db_pool_enabled: bool = Field(
+        default=True,
+        description="Serve get_db() connections from a shared pool",
+    )
+    """Use the process-wide connection pool opened in the app lifespan."""
+
+    db_pool_min_size: int = Field(
+        default=2,
+        ge=0,
+        le=100,
+        description="Connections kept open by the pool",
+    )
+    """Minimum number of connections the pool keeps open."""
+
+    db_pool_max_size: int = Field(
+        default=10,
+        ge=1,
+        le=100,
+        description="Maximum connections the pool may open",
+    )
+    """Hard cap on pool connections. Keep below the Postgres slot budget per worker."""
+
+    db_pool_timeout_seconds: float = Field(
+        default=10.0,
+        gt=0,
+        le=120,
+        description="Seconds to wait for a free pooled connection",
+    )
+    """How long get_db() waits for a connection before raising PoolTimeout."""
+
+    db_pool_max_lifetime_seconds: float = Field(
+        default=3600.0,
+        ge=60,
+        description="Seconds before a pooled connection is recycled",
+    )
+    """Maximum age of a pooled connection before it is replaced."""
+
+    db_pool_max_idle_seconds: float = Field(
+        default=600.0,
+        ge=10,
+        description="Seconds an idle connection above min_size is kept",
+    )
+    """Idle connections above min_size are closed after this long."""
+
+    count_estimate_threshold: int = Field(
+        default=100_000,
+        ge=0,
+        description="Row estimate above which listing totals are estimated (0 = always exact)",
+    )
+    """Listing totals larger than this come from the query planner.
+
+    Below it totals are exact COUNT(*)s. Above it the EXPLAIN row
+    estimate is returned and flagged as estimated, since counting every
+    match costs more than the page itself.
+    """
+
     # =========================================================================
     # Environment Settings
     # =========================================================================
@@ -162,6 +270,346 @@ class Settings(BaseSettings):
     )
     """Default model to use for Ollama-based AI features."""
 
+    ollama_max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Concurrent Ollama generation requests",
+    )
+    """Maximum in-flight Ollama requests, per match run and per worker.
+
+    Set this to the backend's parallelism (OLLAMA_NUM_PARALLEL); requests
+    beyond it only queue inside Ollama. It also sizes the shared Ollama
+    client's connection pool (src/llm_client.py).
+    """
+
+    openrouter_max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=256,
+        description="Concurrent OpenRouter requests",
+    )
+    """Maximum in-flight OpenRouter requests per worker.
+
+    Also sizes the shared OpenRouter client's connection pool.
+    """
+
+    match_content_timeout_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        le=600,
+        description="Deadline for one match explanation",
+    )
+    """Per-match deadline for LLM content before falling back to templates."""
+
+    match_content_mode: MatchContentMode = Field(
+        default="lazy",
+        description="When match explanations are generated",
+    )
+    """Match explanation generation mode.
+
+    "eager" generates LLM content for every match during generate-matches.
+    "lazy" stores scores with template text and generates LLM content the
+    first time a match is viewed (or from the background worker).
+    """
+
+    match_content_background: bool = Field(
+        default=True,
+        description="Generate deferred match explanations in the background",
+    )
+    """Run a low-priority worker that fills in deferred match explanations."""
+
+    llm_streaming_enabled: bool = Field(
+        default=True,
+        description="Stream LLM output to the browser as it is generated",
+    )
+    """Render pitches and pending match explanations while Ollama generates them.
+
+    When disabled, the page waits for the whole completion as before.
+    """
+
+    llm_breaker_failure_threshold: int = Field(
+        default=5,
+        ge=1,
+        le=100,
+        description="Consecutive failures that open an LLM backend's circuit breaker",
+    )
+    """Connection errors or timeouts in a row before a backend is skipped.
+
+    While the breaker is open, LLM calls fail immediately and callers use
+    their template or text-search fallbacks.
+    """
+
+    llm_breaker_reset_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        le=3600,
+        description="Seconds an open breaker rejects calls before a trial call",
+    )
+    """Background health probes usually close the breaker sooner."""
+
+    llm_adaptive_timeouts: bool = Field(
+        default=True,
+        description="Adapt LLM request timeouts to observed p99 latency",
+    )
+    """Shrink each call site's timeout towards its observed latency.
+
+    The call site's fixed timeout stays the upper bound.
+    """
+
+    llm_timeout_p99_multiplier: float = Field(
+        default=3.0,
+        ge=1.0,
+        le=20.0,
+        description="Adaptive timeout as a multiple of p99 latency",
+    )
+    """Headroom over the recent p99 latency before a call times out."""
+
+    llm_timeout_min_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        le=600,
+        description="Lower bound for adaptive LLM timeouts",
+    )
+    """Adaptive timeouts never drop below this, however fast recent calls were."""
+
+    llm_cache_enabled: bool = Field(
+        default=True,
+        description="Persist LLM outputs in the database cache",
+    )
+    """Reuse LLM outputs across restarts via the llm_response_cache table."""
+
+    llm_cache_ttl_seconds: int = Field(
+        default=30 * 24 * 3600,
+        ge=0,
+        description="Lifetime of a cached LLM output (0 = no expiry)",
+    )
+    """Seconds before a cached LLM output expires. 0 keeps entries until evicted."""
+
+    llm_cache_max_entries: int = Field(
+        default=100_000,
+        ge=100,
+        description="Maximum rows in the LLM response cache",
+    )
+    """Row limit for llm_response_cache; least recently hit rows are evicted."""
+
+    llm_cache_max_bytes: int = Field(
+        default=512 * 1024 * 1024,
+        ge=1024 * 1024,
+        description="Maximum total size of cached LLM outputs in bytes",
+    )
+    """Limit on the summed size_bytes of llm_response_cache; least recently hit rows are evicted."""
+
+    search_rules_enabled: bool = Field(
+        default=True,
+        description="Try the rule-based search query parser before the LLM",
+    )
+    """Parse common search queries (amounts, LP types, strategies, locations) locally."""
+
+    search_rules_min_confidence: float = Field(
+        default=1.0,
+        ge=0.0,
+        le=1.0,
+        description="Minimum rule parser confidence to skip the LLM",
+    )
+    """Share of meaningful query words the rules must explain to skip the LLM.
+
+    At 1.0 any unrecognized word (such as an LP name) sends the query to
+    the LLM. Lower values serve more queries locally but may drop words.
+    """
+
+    # =========================================================================
+    # Cache Settings
+    # =========================================================================
+
+    cache_backend: CacheBackendKind = Field(
+        default="memory",
+        description="Storage for the search and matching caches",
+    )
+    """Where LRUCache and VersionedLRUCache keep their entries.
+
+    "memory" keeps a private cache per worker process. "redis" shares one
+    cache between all workers through redis_url (needs the redis extra).
+    """
+
+    redis_url: str | None = Field(
+        default=None,
+        description="Redis URL for the shared cache (redis://host:6379/0)",
+    )
+    """Redis (or Redis-protocol compatible) server for cache_backend="redis"."""
+
+    redis_socket_timeout_seconds: float = Field(
+        default=0.25,
+        gt=0,
+        le=10,
+        description="Redis connect and read timeout",
+    )
+    """A cache lookup slower than this is treated as a miss."""
+
+    cache_l1_max_size: int = Field(
+        default=256,
+        ge=0,
+        description="Per-worker L1 cache entries in front of Redis (0 = disabled)",
+    )
+    """Size of the in-process tier used with cache_backend="redis".
+
+    Hot keys are served from worker memory without a Redis round trip.
+    Each cache's L1 is also capped at that cache's own max size.
+    """
+
+    cache_l1_ttl_seconds: int = Field(
+        default=5,
+        ge=1,
+        le=300,
+        description="Lifetime of per-worker L1 cache entries",
+    )
+    """Upper bound on L1 staleness if an invalidation message is lost.
+
+    Writes by other workers normally evict L1 entries within milliseconds
+    via Redis pub/sub.
+    """
+
+    cache_push_invalidation: bool = Field(
+        default=True,
+        description="Listen for Postgres NOTIFY to invalidate caches",
+    )
+    """Evict cached data as soon as the core tables change.
+
+    Needs the triggers from migration 018. While the listener is connected
+    the 30-second COUNT(*)/MAX(updated_at) polling is skipped; it resumes
+    whenever the listener is disconnected or this is disabled.
+    """
+
+    cache_admission: bool = Field(
+        default=True,
+        description="Use W-TinyLFU admission for the search and page caches",
+    )
+    """Keep hot keys when a burst of one-off keys arrives.
+
+    A full cache only admits a new entry if it has recently been requested
+    more often than the entry it would evict. Disable to fall back to
+    plain LRU eviction.
+    """
+
+    # =========================================================================
+    # Semantic Search Settings
+    # =========================================================================
+
+    embedding_provider: EmbeddingProviderKind = Field(
+        default="voyage",
+        description="Embedding model for semantic search",
+    )
+    """Where embeddings for mandates, theses and search queries come from.
+
+    "voyage" calls the Voyage AI API (needs voyage_api_key). "hash" embeds
+    locally by feature hashing of words: deterministic, free and offline,
+    but only captures shared vocabulary. Use it for tests and development.
+    Stored embeddings record their model, so switching re-embeds all rows.
+    """
+
+    voyage_embedding_model: str = Field(
+        default="voyage-3",
+        description="Voyage AI embedding model (1024 dimensions)",
+    )
+    """Model for embedding_provider="voyage". Must output 1024 dimensions."""
+
+    embedding_batch_size: int = Field(
+        default=64,
+        ge=1,
+        le=1000,
+        description="Texts per embedding request",
+    )
+    """Number of texts embedded per provider call by the embedding pipeline."""
+
+    semantic_search_probes: int = Field(
+        default=10,
+        ge=1,
+        le=1000,
+        description="ivfflat.probes for semantic search queries",
+    )
+    """Index lists scanned per approximate nearest-neighbour query.
+
+    More probes raise recall and latency. Setting it to the index's list
+    count (100 by default) makes the search exact.
+    """
+
+    # =========================================================================
+    # Hybrid Search Settings
+    # =========================================================================
+
+    hybrid_rrf_k: int = Field(
+        default=60,
+        ge=1,
+        description="Reciprocal-rank fusion constant",
+    )
+    """Damping constant k in weight / (k + rank) for LP/GP search ranking.
+
+    Larger values flatten the difference between top and lower ranks, so
+    agreement between rankings counts for more than a single first place.
+    """
+
+    hybrid_text_weight: float = Field(
+        default=1.0,
+        ge=0,
+        description="Weight of the full-text rank in hybrid search",
+    )
+    """Weight of the full-text ranking in the fused LP/GP search score."""
+
+    hybrid_vector_weight: float = Field(
+        default=1.0,
+        ge=0,
+        description="Weight of the embedding similarity rank in hybrid search",
+    )
+    """Weight of the semantic (embedding) ranking in the fused search score."""
+
+    hybrid_filter_weight: float = Field(
+        default=0.25,
+        ge=0,
+        description="Weight of the default page order in hybrid search",
+    )
+    """Weight of the page's default order (e.g. largest AUM first) as a prior.
+
+    Breaks near-ties between equally relevant matches in favour of the
+    results the page would list first without a search.
+    """
+
+    hybrid_candidates: int = Field(
+        default=200,
+        ge=1,
+        le=10_000,
+        description="Candidates taken from each ranking before fusion",
+    )
+    """Number of results each ranking (full-text, semantic) contributes."""
+
+    search_parse_budget_ms: int = Field(
+        default=2000,
+        ge=1,
+        description="Latency budget for parsing a search query",
+    )
+    """Time allowed for natural-language query parsing.
+
+    A parse over budget falls back to a plain text search; it completes in
+    the background and is cached for the next search.
+    """
+
+    search_embed_budget_ms: int = Field(
+        default=300,
+        ge=1,
+        description="Latency budget for embedding a search query",
+    )
+    """Time allowed for embedding the search text.
+
+    A slower embedding skips the semantic ranking for this search; it
+    completes in the background and is cached for the next search.
+    """
+
+    search_retrieve_budget_ms: int = Field(
+        default=250,
+        ge=1,
+        description="Latency budget for the fused search query",
+    )
+    """Expected time of the fused search query. Overruns are logged and counted."""
+
     # =========================================================================
     # Langfuse Monitoring (M3+)
     # =========================================================================
@@ -272,7 +720,7 @@ class Settings(BaseSettings):
         default=False,
         description="Enable semantic search (requires Voyage AI key)",
     )
-    """Feature flag for semantic search. Requires voyage_api_key."""
+    """Feature flag for semantic search. Requires voyage_api_key with the voyage provider."""
 
     enable_agent_matching: bool = Field(
         default=False,
@@ -453,6 +901,7 @@ def validate_settings_on_startup() -> None:
         - Production requires debug=False
         - Production cannot have localhost in CORS origins
         - Feature flags require corresponding API keys
+        - Connection pool min size must not exceed max size
 
     Call this function early in your main.py to fail fast if
     configuration is invalid.
@@ -485,8 +934,18 @@ def validate_settings_on_startup() -> None:
                     "localhost not allowed in CORS origins for production"
                 )
 
+        # Connection pool bounds
+        if settings.db_pool_min_size > settings.db_pool_max_size:
+            raise ValueError(
+                "db_pool_min_size cannot exceed db_pool_max_size"
+            )
+
         # Feature flag dependency validation
-        if settings.enable_semantic_search and not settings.voyage_api_key:
+        if (
+            settings.enable_semantic_search
+            and settings.embedding_provider == "voyage"
+            and not settings.voyage_api_key
+        ):
             raise ValueError(
                 "Voyage AI key required when semantic search is enabled"
             )
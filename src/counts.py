@@ -0,0 +1,177 @@
+"""Row counts for paginated listings.
+
+An exact ``COUNT(*)`` reads every matching row, so on a large table the
+count can cost more than the page it is shown with. This module counts
+once per filter set and data version (cached in page_cache), and for
+filters that match many rows returns the planner's row estimate instead:
+"about 120,000 LPs" is as useful as the exact figure and costs an
+EXPLAIN rather than a scan.
+
+    SELECT COUNT(*)                      -- exact, below the threshold
+    EXPLAIN (FORMAT JSON) SELECT 1 ...   -- "Plan Rows", above it
+
+Breakdowns such as LPs per type are answered with one query of FILTER
+aggregates rather than one COUNT(*) per group.
+
+Each function has a sync and an async form for the two kinds of cursor.
+
+Example:
+    >>> count = count_rows(cur, "organizations o", "o.is_gp = TRUE", [])
+    >>> count.value, count.exact
+    (1523, True)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from src.cache import make_cache_key, page_cache, version_manager
+from src.config import get_settings
+
+
+@dataclass(frozen=True)
+class Count:
+    """A row count and whether it is exact or a planner estimate."""
+
+    value: int
+    exact: bool = True
+
+
+def _count_key(kind: str, *parts: Any) -> str:
+    return make_cache_key("count", kind, version_manager.combined_checksum, *parts)
+
+
+def _plan_rows(row: Mapping[str, Any] | None) -> int | None:
+    """Top-level row estimate from an EXPLAIN (FORMAT JSON) result row."""
+    if not row:
+        return None
+    plan = row.get("QUERY PLAN")
+    if not (isinstance(plan, list) and plan and isinstance(plan[0], dict)):
+        return None
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (TypeError, KeyError, ValueError):
+        return None
+
+
+def _estimate_threshold(estimate_above: int | None) -> int:
+    return get_settings().count_estimate_threshold if estimate_above is None else estimate_above
+
+
+def _count_queries(from_sql: str, where_clause: str) -> tuple[str, str]:
+    explain = f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {from_sql} WHERE {where_clause}"
+    count = f"SELECT COUNT(*) AS total FROM {from_sql} WHERE {where_clause}"
+    return explain, count
+
+
+def _grouped_query(from_sql: str, groups: Mapping[str, str], where_clause: str) -> str:
+    columns = ", ".join(f"COUNT(*) FILTER (WHERE {condition}) AS {name}" for name, condition in groups.items())
+    return f"SELECT COUNT(*) AS total, {columns} FROM {from_sql} WHERE {where_clause}"
+
+
+def count_rows(
+    cur: Any,
+    from_sql: str,
+    where_clause: str,
+    params: list[Any],
+    estimate_above: int | None = None,
+) -> Count:
+    """Count the rows a listing query matches.
+
+    Args:
+        cur: Open database cursor (dict rows).
+        from_sql: FROM clause of the listing, joins included.
+        where_clause: WHERE condition of the listing.
+        params: Parameters of where_clause.
+        estimate_above: Planner estimate above which the estimate is
+            returned instead of an exact count (0 = always exact).
+            Defaults to settings.count_estimate_threshold.
+
+    Returns:
+        The count, cached until the data version changes.
+    """
+    threshold = _estimate_threshold(estimate_above)
+    key = _count_key("rows", from_sql, where_clause, params, threshold)
+    cached = page_cache.get(key)
+    if cached is not None:
+        return Count(**cached)
+
+    explain, count_query = _count_queries(from_sql, where_clause)
+    estimate = None
+    if threshold:
+        cur.execute(explain, params)
+        estimate = _plan_rows(cur.fetchone())
+    if estimate is not None and estimate > threshold:
+        count = Count(estimate, exact=False)
+    else:
+        cur.execute(count_query, params)
+        row = cur.fetchone()
+        count = Count(row["total"] if row else 0)
+
+    page_cache.set(key, {"value": count.value, "exact": count.exact})
+    return count
+
+
+async def count_rows_async(
+    cur: Any,
+    from_sql: str,
+    where_clause: str,
+    params: list[Any],
+    estimate_above: int | None = None,
+) -> Count:
+    """Async form of count_rows()."""
+    threshold = _estimate_threshold(estimate_above)
+    key = _count_key("rows", from_sql, where_clause, params, threshold)
+    cached = page_cache.get(key)
+    if cached is not None:
+        return Count(**cached)
+
+    explain, count_query = _count_queries(from_sql, where_clause)
+    estimate = None
+    if threshold:
+        await cur.execute(explain, params)
+        estimate = _plan_rows(await cur.fetchone())
+    if estimate is not None and estimate > threshold:
+        count = Count(estimate, exact=False)
+    else:
+        await cur.execute(count_query, params)
+        row = await cur.fetchone()
+        count = Count(row["total"] if row else 0)
+
+    page_cache.set(key, {"value": count.value, "exact": count.exact})
+    return count
+
+
+def grouped_counts(
+    cur: Any,
+    from_sql: str,
+    groups: Mapping[str, str],
+    where_clause: str = "TRUE",
+    params: list[Any] | None = None,
+) -> dict[str, int]:
+    """Count rows per group in a single scan.
+
+    Args:
+        cur: Open database cursor (dict rows).
+        from_sql: FROM clause, joins included.
+        groups: Result name -> SQL condition (constants only, no params).
+        where_clause: Condition applied to every group.
+        params: Parameters of where_clause.
+
+    Returns:
+        {"total": n, <group>: n, ...}, exact and cached until the data
+        version changes.
+    """
+    params = params or []
+    key = _count_key("grouped", from_sql, dict(groups), where_clause, params)
+    cached = page_cache.get(key)
+    if cached is not None:
+        return cached
+
+    cur.execute(_grouped_query(from_sql, groups, where_clause), params)
+    row = cur.fetchone()
+    counts = {name: (row[name] if row else 0) or 0 for name in ("total", *groups)}
+    page_cache.set(key, counts)
+    return counts
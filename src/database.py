@@ -1,10 +1,544 @@
 """Database utilities for LPxGP.
 
-This module provides database connection utilities.
+This module provides database connection utilities, including the
+process-wide connection pools that back ``get_db()`` and ``get_async_db()``.
+
+The pool is opened by the application lifespan (``open_pool``) and drained
+on shutdown (``close_pool``). While it is open, ``get_db()`` hands out
+pooled connections wrapped in ``PooledConnection``; calling ``close()`` on
+the wrapper returns the connection to the pool instead of closing it, so
+routers keep the familiar pattern::
+
+    conn = get_db()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                ...
+        finally:
+            conn.close()
+
+When no pool is open (scripts, tests without lifespan, pool disabled),
+``get_db()`` falls back to a direct ``psycopg.connect()``.
+
+Connections from both functions time every ``execute()`` through
+``TimedCursor``/``TimedAsyncCursor`` for the Prometheus metrics.
+
+Async handlers on hot paths use ``get_async_db()`` instead, which returns a
+``psycopg.AsyncConnection`` from an ``AsyncConnectionPool`` so queries
+don't block the event loop::
+
+    conn = await get_async_db()
+    if conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(...)
+                rows = await cur.fetchall()
+        finally:
+            await conn.close()
 """
 
 from __future__ import annotations
 
-from src.utils import get_db
+import os
+import threading
+import time
+from typing import Any
+
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from src.config import get_settings
+from src.logging_config import get_logger
+from src.metrics import observe_db_query
+
+logger = get_logger(__name__)
+
+__all__ = [
+    "AsyncPooledConnection",
+    "PoolMetrics",
+    "PooledConnection",
+    "TimedAsyncCursor",
+    "TimedCursor",
+    "close_async_pool",
+    "close_pool",
+    "get_async_db",
+    "get_async_pool",
+    "get_async_pool_stats",
+    "get_db",
+    "get_pool",
+    "get_pool_stats",
+    "open_async_pool",
+    "open_pool",
+    "resolve_database_url",
+]
+
+
+# =============================================================================
+# Connection URL
+# =============================================================================
+
+
+def resolve_database_url() -> str | None:
+    """Resolve the database URL used by ``get_db()`` and the shared pools.
+
+    IMPORTANT: This function automatically selects the appropriate database:
+    - In production: DATABASE_URL only, even if TEST_DATABASE_URL is set
+      (as ``Settings.active_database_url`` does)
+    - Otherwise prefers TEST_DATABASE_URL (settings or environment)
+    - Falls back to DATABASE_URL (settings or environment)
+
+    Returns:
+        PostgreSQL connection URL, or None if no database is configured.
+    """
+    settings = get_settings()
+
+    # Production never reads or writes the test database
+    if settings.is_production:
+        return settings.database_url or os.environ.get("DATABASE_URL") or None
+
+    # Check for test database first (from settings or env)
+    db_url = settings.test_database_url or os.environ.get("TEST_DATABASE_URL")
+
+    # Fall back to production database
+    if not db_url:
+        db_url = settings.database_url or os.environ.get("DATABASE_URL")
+
+    return db_url or None
+
+
+# =============================================================================
+# Pool Metrics
+# =============================================================================
+
+
+class PoolMetrics:
+    """Checkout wait-time counters for the connection pool.
+
+    psycopg_pool reports its own counters via ``get_stats()``; this adds
+    the wait observed by ``get_db()`` callers, which is what request
+    latency actually pays.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all counters."""
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_ms_total = 0.0
+            self.wait_ms_max = 0.0
+
+    def record_checkout(self, wait_ms: float) -> None:
+        """Record a successful checkout and how long it waited."""
+        with self._lock:
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            if wait_ms > self.wait_ms_max:
+                self.wait_ms_max = wait_ms
+
+    def record_timeout(self) -> None:
+        """Record a checkout that gave up waiting."""
+        with self._lock:
+            self.timeouts += 1
+
+    @property
+    def wait_ms_avg(self) -> float:
+        """Average checkout wait in milliseconds."""
+        return self.wait_ms_total / self.checkouts if self.checkouts else 0.0
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class TimedCursor(psycopg.Cursor[Any]):
+    """Cursor that reports the duration of each query to ``src.metrics``."""
+
+    def execute(self, query: Any, params: Any = None, **kwargs: Any) -> TimedCursor:
+        start = time.perf_counter()
+        try:
+            return super().execute(query, params, **kwargs)
+        finally:
+            observe_db_query(time.perf_counter() - start)
+
+    def executemany(self, query: Any, params_seq: Any, **kwargs: Any) -> None:
+        start = time.perf_counter()
+        try:
+            super().executemany(query, params_seq, **kwargs)
+        finally:
+            observe_db_query(time.perf_counter() - start)
+
+
+class TimedAsyncCursor(psycopg.AsyncCursor[Any]):
+    """Async counterpart of ``TimedCursor``."""
+
+    async def execute(self, query: Any, params: Any = None, **kwargs: Any) -> TimedAsyncCursor:
+        start = time.perf_counter()
+        try:
+            return await super().execute(query, params, **kwargs)
+        finally:
+            observe_db_query(time.perf_counter() - start)
+
+    async def executemany(self, query: Any, params_seq: Any, **kwargs: Any) -> None:
+        start = time.perf_counter()
+        try:
+            await super().executemany(query, params_seq, **kwargs)
+        finally:
+            observe_db_query(time.perf_counter() - start)
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+_async_pool: AsyncConnectionPool | None = None
+
+
+# =============================================================================
+# Pool Lifecycle
+# =============================================================================
+
+
+def open_pool(db_url: str | None = None) -> ConnectionPool | None:
+    """Open the process-wide connection pool.
+
+    Called from the application lifespan on startup. Opening does not
+    block on the database: connections are filled in the background, so
+    the app still starts if the database is briefly unavailable.
+
+    Args:
+        db_url: Connection URL. Defaults to ``resolve_database_url()``.
+
+    Returns:
+        The open pool, or None if no database is configured or pooling
+        is disabled.
+    """
+    global _pool
+
+    settings = get_settings()
+    if not settings.db_pool_enabled:
+        logger.info("Database pool disabled, using direct connections")
+        return None
+
+    db_url = db_url or resolve_database_url()
+    if not db_url:
+        return None
+
+    with _pool_lock:
+        if _pool is not None:
+            return _pool
+
+        pool = ConnectionPool(
+            db_url,
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+            timeout=settings.db_pool_timeout_seconds,
+            max_lifetime=settings.db_pool_max_lifetime_seconds,
+            max_idle=settings.db_pool_max_idle_seconds,
+            kwargs={"row_factory": dict_row, "cursor_factory": TimedCursor},
+            check=ConnectionPool.check_connection,
+            name="lpxgp",
+            open=False,
+        )
+        pool.open(wait=False)
+        _pool = pool
+        pool_metrics.reset()
+
+    logger.info(
+        f"Database pool opened (min={settings.db_pool_min_size}, "
+        f"max={settings.db_pool_max_size})"
+    )
+    return _pool
+
+
+def close_pool(timeout: float = 5.0) -> None:
+    """Drain and close the process-wide connection pool.
+
+    Called from the application lifespan on shutdown. Connections that
+    are checked out are given ``timeout`` seconds to be returned.
+
+    Args:
+        timeout: Seconds to wait for in-use connections.
+    """
+    global _pool
+
+    with _pool_lock:
+        pool, _pool = _pool, None
+
+    if pool is not None:
+        pool.close(timeout=timeout)
+        logger.info("Database pool closed")
+
+
+def get_pool() -> ConnectionPool | None:
+    """Get the process-wide pool if it is open."""
+    return _pool
+
+
+async def open_async_pool(db_url: str | None = None) -> AsyncConnectionPool | None:
+    """Open the process-wide async connection pool.
+
+    Uses the same ``db_pool_*`` settings as the sync pool. Both pools are
+    open while routers are being ported, so budget Postgres slots for
+    twice ``db_pool_max_size`` per worker.
+
+    Args:
+        db_url: Connection URL. Defaults to ``resolve_database_url()``.
+
+    Returns:
+        The open pool, or None if no database is configured or pooling
+        is disabled.
+    """
+    global _async_pool
+
+    settings = get_settings()
+    if not settings.db_pool_enabled:
+        return None
+
+    db_url = db_url or resolve_database_url()
+    if not db_url:
+        return None
+
+    if _async_pool is not None:
+        return _async_pool
+
+    pool = AsyncConnectionPool(
+        db_url,
+        min_size=settings.db_pool_min_size,
+        max_size=settings.db_pool_max_size,
+        timeout=settings.db_pool_timeout_seconds,
+        max_lifetime=settings.db_pool_max_lifetime_seconds,
+        max_idle=settings.db_pool_max_idle_seconds,
+        kwargs={"row_factory": dict_row, "cursor_factory": TimedAsyncCursor},
+        check=AsyncConnectionPool.check_connection,
+        name="lpxgp-async",
+        open=False,
+    )
+    await pool.open(wait=False)
+    _async_pool = pool
+    async_pool_metrics.reset()
+
+    logger.info("Async database pool opened")
+    return _async_pool
+
+
+async def close_async_pool(timeout: float = 5.0) -> None:
+    """Drain and close the process-wide async connection pool.
+
+    Args:
+        timeout: Seconds to wait for in-use connections.
+    """
+    global _async_pool
+
+    pool, _async_pool = _async_pool, None
+    if pool is not None:
+        await pool.close(timeout=timeout)
+        logger.info("Async database pool closed")
+
+
+def get_async_pool() -> AsyncConnectionPool | None:
+    """Get the process-wide async pool if it is open."""
+    return _async_pool
+
+
+# =============================================================================
+# Connections
+# =============================================================================
+
+
+class PooledConnection:
+    """A connection borrowed from the pool.
+
+    Proxies attribute access to the underlying psycopg connection.
+    ``close()`` returns the connection to the pool (rolling back any
+    uncommitted transaction) rather than closing the socket.
+    """
+
+    __slots__ = ("_conn", "_pool", "_returned")
+
+    def __init__(self, pool: ConnectionPool, conn: psycopg.Connection[Any]) -> None:
+        self._pool = pool
+        self._conn = conn
+        self._returned = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    @property
+    def closed(self) -> bool:
+        """True once the connection has been returned to the pool."""
+        return self._returned or self._conn.closed
+
+    def close(self) -> None:
+        """Return the connection to the pool. Safe to call twice."""
+        if self._returned:
+            return
+        self._returned = True
+        self._pool.putconn(self._conn)
+
+    def __enter__(self) -> PooledConnection:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self._conn.commit()
+        self.close()
+
+
+def get_db() -> psycopg.Connection[dict[str, Any]] | None:
+    """Get database connection if configured.
+
+    Returns a pooled connection when the pool is open, otherwise creates
+    a new psycopg connection with dict_row factory. Either way the caller
+    is responsible for calling ``close()``.
+
+    Returns:
+        psycopg Connection (or pooled proxy) with dict_row factory, or
+        None if no database is configured.
+
+    Raises:
+        psycopg_pool.PoolTimeout: If no pooled connection frees up within
+            ``db_pool_timeout_seconds``. Subclass of OperationalError, so
+            existing connection-error handling still applies.
+    """
+    pool = _pool
+    if pool is not None:
+        start = time.perf_counter()
+        try:
+            conn = pool.getconn()
+        except psycopg.OperationalError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_checkout((time.perf_counter() - start) * 1000)
+        return PooledConnection(pool, conn)  # type: ignore[return-value]
+
+    db_url = resolve_database_url()
+    if not db_url:
+        return None
+
+    return psycopg.connect(db_url, row_factory=dict_row, cursor_factory=TimedCursor)
+
+
+class AsyncPooledConnection:
+    """An async connection borrowed from the async pool.
+
+    Async counterpart of ``PooledConnection``: ``await conn.close()``
+    returns the connection to the pool.
+    """
+
+    __slots__ = ("_conn", "_pool", "_returned")
+
+    def __init__(self, pool: AsyncConnectionPool, conn: psycopg.AsyncConnection[Any]) -> None:
+        self._pool = pool
+        self._conn = conn
+        self._returned = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    @property
+    def closed(self) -> bool:
+        """True once the connection has been returned to the pool."""
+        return self._returned or self._conn.closed
+
+    async def close(self) -> None:
+        """Return the connection to the pool. Safe to call twice."""
+        if self._returned:
+            return
+        self._returned = True
+        await self._pool.putconn(self._conn)
+
+    async def __aenter__(self) -> AsyncPooledConnection:
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            await self._conn.commit()
+        await self.close()
+
+
+async def get_async_db() -> psycopg.AsyncConnection[dict[str, Any]] | None:
+    """Get an async database connection if configured.
+
+    Async counterpart of ``get_db()`` for handlers that must not block the
+    event loop. Returns a pooled connection when the async pool is open,
+    otherwise opens a new ``psycopg.AsyncConnection``. The caller is
+    responsible for ``await conn.close()``.
+
+    Returns:
+        psycopg AsyncConnection (or pooled proxy) with dict_row factory,
+        or None if no database is configured.
+
+    Raises:
+        psycopg_pool.PoolTimeout: If no pooled connection frees up within
+            ``db_pool_timeout_seconds``.
+    """
+    pool = _async_pool
+    if pool is not None:
+        start = time.perf_counter()
+        try:
+            conn = await pool.getconn()
+        except psycopg.OperationalError:
+            async_pool_metrics.record_timeout()
+            raise
+        async_pool_metrics.record_checkout((time.perf_counter() - start) * 1000)
+        return AsyncPooledConnection(pool, conn)  # type: ignore[return-value]
+
+    db_url = resolve_database_url()
+    if not db_url:
+        return None
+
+    return await psycopg.AsyncConnection.connect(db_url, row_factory=dict_row, cursor_factory=TimedAsyncCursor)
+
+
+def get_pool_stats() -> dict[str, Any]:
+    """Get connection pool metrics.
+
+    Returns:
+        Dict with pool sizing, saturation (share of max_size in use),
+        checkout wait times, and psycopg_pool's own counters. Only
+        ``enabled`` is present when no pool is open.
+    """
+    return _describe_pool(_pool, pool_metrics)
+
+
+def get_async_pool_stats() -> dict[str, Any]:
+    """Get async connection pool metrics.
+
+    Returns:
+        Same shape as ``get_pool_stats()``, for the async pool.
+    """
+    return _describe_pool(_async_pool, async_pool_metrics)
+
+
+def _describe_pool(
+    pool: ConnectionPool | AsyncConnectionPool | None,
+    metrics: PoolMetrics,
+) -> dict[str, Any]:
+    """Combine psycopg_pool counters with our checkout metrics."""
+    if pool is None:
+        return {"enabled": False}
+
+    stats = pool.get_stats()
+    size = stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    in_use = max(size - available, 0)
 
-__all__ = ["get_db"]
+    return {
+        "enabled": True,
+        "min_size": pool.min_size,
+        "max_size": pool.max_size,
+        "size": size,
+        "available": available,
+        "in_use": in_use,
+        "waiting": stats.get("requests_waiting", 0),
+        "saturation": round(in_use / pool.max_size, 3) if pool.max_size else 0.0,
+        "checkouts": metrics.checkouts,
+        "timeouts": metrics.timeouts,
+        "wait_ms_avg": round(metrics.wait_ms_avg, 2),
+        "wait_ms_max": round(metrics.wait_ms_max, 2),
+        "connections_errors": stats.get("connections_errors", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
@@ -0,0 +1,273 @@
+"""Text embeddings for semantic search.
+
+LP mandates and fund theses are embedded into the VECTOR(1024) columns
+created in migration 001 (lp_profiles.mandate_embedding,
+funds.thesis_embedding, fund_ai_profiles.thesis_embedding) and searched
+with pgvector (src/search.py semantic_lp_search).
+
+Providers are pluggable (settings.embedding_provider):
+    - VoyageEmbeddingProvider: the Voyage AI API, for production.
+    - HashEmbeddingProvider: local feature hashing of words and word
+      pairs. Deterministic and offline, so tests and development work
+      without an API key; similarity only reflects shared vocabulary.
+
+Every stored embedding records the provider's model id next to it, and
+searches only compare vectors from the same model. The pipeline
+(embed_pending) fills in missing or outdated embeddings in batches;
+migration 022 clears an embedding when its text changes.
+
+Run the pipeline with: uv run python scripts/embed_profiles.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import numpy as np
+
+from src.cache import make_cache_key, query_embedding_cache
+from src.config import EmbeddingProviderKind, get_settings
+from src.logging_config import get_logger
+from src.metrics import observe_llm_call
+
+logger = get_logger(__name__)
+
+# Dimensions of the VECTOR columns
+EMBEDDING_DIMENSIONS = 1024
+
+InputType = Literal["document", "query"]
+
+
+class EmbeddingProvider(ABC):
+    """Turns texts into EMBEDDING_DIMENSIONS-long unit vectors."""
+
+    model: str
+    """Id stored with each embedding; vectors from different ids are not comparable."""
+
+    @abstractmethod
+    async def embed(self, texts: Sequence[str], input_type: InputType = "document") -> list[list[float]]:
+        """Embed texts, one vector per text, in order.
+
+        Args:
+            texts: Texts to embed.
+            input_type: "document" for stored texts, "query" for searches.
+        """
+
+
+class VoyageEmbeddingProvider(EmbeddingProvider):
+    """Embeddings from the Voyage AI API."""
+
+    def __init__(self, api_key: str, model: str) -> None:
+        # Imported here so the app starts without loading the SDK
+        import voyageai
+
+        self._client = voyageai.AsyncClient(api_key=api_key)
+        self._model = model
+        self.model = f"voyage:{model}"
+
+    async def embed(self, texts: Sequence[str], input_type: InputType = "document") -> list[list[float]]:
+        start = time.perf_counter()
+        try:
+            result = await self._client.embed(list(texts), model=self._model, input_type=input_type)
+        except Exception:
+            observe_llm_call("voyage", self._model, None)
+            raise
+        observe_llm_call("voyage", self._model, time.perf_counter() - start)
+        return [list(vector) for vector in result.embeddings]
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class HashEmbeddingProvider(EmbeddingProvider):
+    """Feature-hashing embeddings computed locally.
+
+    Each word and adjacent word pair is hashed (BLAKE2b, so results are
+    stable across processes) to a signed position in the vector; the sum
+    is normalized to unit length. Texts sharing words get a high cosine
+    similarity.
+    """
+
+    model = "hash-v1"
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS) -> None:
+        self.dimensions = dimensions
+
+    def embed_one(self, text: str) -> list[float]:
+        """Embed a single text synchronously."""
+        words = _TOKEN_RE.findall(text.lower())
+        features = [(word, 1.0) for word in words]
+        features += [(f"{a} {b}", 0.5) for a, b in zip(words, words[1:], strict=False)]
+
+        vector = np.zeros(self.dimensions, dtype=np.float64)
+        for feature, weight in features:
+            digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+            sign = 1.0 if digest >> 63 else -1.0
+            vector[digest % self.dimensions] += sign * weight
+
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return [float(x) for x in vector]
+
+    async def embed(self, texts: Sequence[str], input_type: InputType = "document") -> list[list[float]]:
+        return [self.embed_one(text) for text in texts]
+
+
+def make_embedding_provider(kind: EmbeddingProviderKind | None = None) -> EmbeddingProvider:
+    """Create the provider named by kind (default: settings.embedding_provider).
+
+    Raises:
+        ValueError: If the voyage provider is selected without voyage_api_key.
+    """
+    settings = get_settings()
+    kind = kind or settings.embedding_provider
+    if kind == "hash":
+        return HashEmbeddingProvider()
+    if not settings.voyage_api_key:
+        raise ValueError("VOYAGE_API_KEY is required for embedding_provider=voyage")
+    return VoyageEmbeddingProvider(settings.voyage_api_key, settings.voyage_embedding_model)
+
+
+_provider: EmbeddingProvider | None = None
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """The configured provider, created on first use."""
+    global _provider
+    if _provider is None:
+        _provider = make_embedding_provider()
+    return _provider
+
+
+def to_pgvector(vector: Sequence[float]) -> str:
+    """pgvector text literal for a vector, for use as %s::vector."""
+    return "[" + ",".join(repr(float(x)) for x in vector) + "]"
+
+
+async def embed_query(text: str, provider: EmbeddingProvider | None = None) -> list[float]:
+    """Embed a search query, cached per model and text."""
+    provider = provider or get_embedding_provider()
+    key = make_cache_key("query_embedding", provider.model, text)
+    cached = query_embedding_cache.get(key)
+    if cached is not None:
+        return cached
+    [vector] = await provider.embed([text], input_type="query")
+    query_embedding_cache.set(key, vector)
+    return vector
+
+
+# =============================================================================
+# Embedding Pipeline
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class EmbeddingTarget:
+    """A text column and the embedding column it fills.
+
+    Attributes:
+        name: Label used in logs and results.
+        table: Table holding both columns, keyed by id.
+        text_column: Source text.
+        embedding_column: VECTOR column to fill.
+        model_column: Column recording the model of the embedding.
+    """
+
+    name: str
+    table: str
+    text_column: str
+    embedding_column: str
+    model_column: str
+
+    @property
+    def pending_sql(self) -> str:
+        """Rows with text but no embedding from the current model."""
+        return f"""
+            SELECT id, {self.text_column} AS text
+            FROM {self.table}
+            WHERE COALESCE({self.text_column}, '') <> ''
+              AND ({self.embedding_column} IS NULL OR {self.model_column} IS DISTINCT FROM %s)
+            ORDER BY id
+            LIMIT %s
+        """
+
+    @property
+    def update_sql(self) -> str:
+        return f"""
+            UPDATE {self.table}
+            SET {self.embedding_column} = %s::vector, {self.model_column} = %s
+            WHERE id = %s
+        """
+
+
+EMBEDDING_TARGETS = (
+    EmbeddingTarget("lp_mandates", "lp_profiles", "mandate_description", "mandate_embedding", "mandate_embedding_model"),
+    EmbeddingTarget("fund_theses", "funds", "investment_thesis", "thesis_embedding", "thesis_embedding_model"),
+)
+
+# fund_ai_profiles has no thesis text of its own: it mirrors its fund's vector
+SYNC_FUND_AI_PROFILES_SQL = """
+    UPDATE fund_ai_profiles fap
+    SET thesis_embedding = f.thesis_embedding
+    FROM funds f
+    WHERE f.id = fap.fund_id
+      AND f.thesis_embedding IS NOT NULL
+      AND fap.thesis_embedding IS DISTINCT FROM f.thesis_embedding
+"""
+
+
+async def embed_pending(
+    conn: Any,
+    provider: EmbeddingProvider | None = None,
+    batch_size: int | None = None,
+) -> dict[str, int]:
+    """Embed every mandate and thesis without a current embedding.
+
+    Works in batches of batch_size texts (one provider call each) and
+    commits after every batch, so an interrupted run keeps its progress
+    and a rerun continues where it stopped.
+
+    Args:
+        conn: Open async psycopg connection (dict rows).
+        provider: Embedding provider (default: the configured one).
+        batch_size: Texts per provider call (default: settings.embedding_batch_size).
+
+    Returns:
+        Number of rows embedded per target, plus "fund_ai_profiles"
+        synced from their funds.
+    """
+    provider = provider or get_embedding_provider()
+    batch_size = batch_size or get_settings().embedding_batch_size
+    embedded: dict[str, int] = {}
+
+    for target in EMBEDDING_TARGETS:
+        embedded[target.name] = 0
+        while True:
+            async with conn.cursor() as cur:
+                await cur.execute(target.pending_sql, [provider.model, batch_size])
+                rows = await cur.fetchall()
+                if not rows:
+                    break
+                vectors = await provider.embed([row["text"] for row in rows])
+                await cur.executemany(
+                    target.update_sql,
+                    [(to_pgvector(vector), provider.model, row["id"]) for row, vector in zip(rows, vectors, strict=True)],
+                )
+            await conn.commit()
+            embedded[target.name] += len(rows)
+            logger.info(f"Embedded {embedded[target.name]} {target.name} with {provider.model}")
+            if len(rows) < batch_size:
+                break
+
+    async with conn.cursor() as cur:
+        await cur.execute(SYNC_FUND_AI_PROFILES_SQL)
+        embedded["fund_ai_profiles"] = cur.rowcount
+    await conn.commit()
+    return embedded
@@ -0,0 +1,410 @@
+"""Hybrid ranking for the LP and GP search pages.
+
+A search runs in three stages, each with a latency budget in settings:
+
+    parse     natural-language query -> structured filters and search text
+              (search_parse_budget_ms)
+    embed     search text -> query embedding, with enable_semantic_search
+              (search_embed_budget_ms)
+    retrieve  one SQL query that ranks and fuses candidates
+              (search_retrieve_budget_ms)
+
+Structured filters (LP type, AUM, location, ...) are hard constraints.
+Within them, candidates come from two rankings: full-text matches
+(text_search_condition, ordered by text_search_rank) and the nearest
+embeddings (pgvector, ivfflat). Their scores are on unrelated scales, so
+they are fused by rank with weighted reciprocal-rank fusion (RRF):
+
+    hybrid_score = sum(weight / (hybrid_rrf_k + rank))
+
+over the text rank, the vector rank and the filter rank (the page's
+default order, e.g. largest AUM first, as a light prior). Each returned
+row carries these components. Without search text, results simply
+follow the default order.
+
+Stages over budget are logged and counted (lpxgp_search_budget_exceeded).
+A slow parse falls back to plain text search and a slow embedding skips
+the vector ranking; both keep running in the background and are cached
+for the next search. Retrieval is a single statement and is not cut short.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from src.config import get_settings
+from src.embeddings import embed_query, get_embedding_provider, to_pgvector
+from src.logging_config import get_logger
+from src.metrics import observe_search_stage
+from src.search import text_search_condition, text_search_rank
+
+logger = get_logger(__name__)
+
+SEARCH_PAGE_LIMIT = 100
+
+
+@dataclass(frozen=True)
+class HybridSource:
+    """An entity searched by the hybrid ranking.
+
+    Attributes:
+        entity: Label for logs and metrics ("lp" or "gp").
+        columns: Result columns, selected from from_sql.
+        from_sql: FROM clause with organizations aliased as o.
+        default_order: ORDER BY of the page without a search.
+        embedding_column: VECTOR column compared with the query.
+        model_column: Model id column of embedding_column.
+        vector_join: Extra JOIN reaching embedding_column, if not in from_sql.
+    """
+
+    entity: str
+    columns: str
+    from_sql: str
+    default_order: str
+    embedding_column: str
+    model_column: str
+    vector_join: str = ""
+
+
+LP_SOURCE = HybridSource(
+    entity="lp",
+    columns="""
+        o.id, o.name, o.hq_city, o.hq_country, o.website,
+        lp.lp_type, lp.total_aum_bn, lp.pe_allocation_pct,
+        lp.check_size_min_mm, lp.check_size_max_mm,
+        lp.geographic_preferences, lp.strategies""",
+    from_sql="organizations o JOIN lp_profiles lp ON lp.org_id = o.id",
+    default_order="lp.total_aum_bn DESC NULLS LAST",
+    embedding_column="lp.mandate_embedding",
+    model_column="lp.mandate_embedding_model",
+)
+
+# GPs have no text of their own to embed: they match by their funds' theses
+GP_SOURCE = HybridSource(
+    entity="gp",
+    columns="""
+        o.id, o.name, o.hq_city, o.hq_country, o.website,
+        gp.investment_philosophy, gp.team_size, gp.years_investing,
+        gp.spun_out_from, gp.notable_exits,
+        (SELECT COUNT(*) FROM funds f WHERE f.org_id = o.id) as fund_count,
+        CASE
+            WHEN gp.investment_philosophy ILIKE '%%buyout%%' THEN 'buyout'
+            WHEN gp.investment_philosophy ILIKE '%%growth%%' THEN 'growth'
+            WHEN gp.investment_philosophy ILIKE '%%venture%%' THEN 'venture'
+            WHEN gp.investment_philosophy ILIKE '%%real estate%%' THEN 'real_estate'
+            WHEN gp.investment_philosophy ILIKE '%%infrastructure%%' THEN 'infrastructure'
+            WHEN gp.investment_philosophy ILIKE '%%credit%%' THEN 'credit'
+            WHEN gp.investment_philosophy ILIKE '%%secondaries%%' THEN 'secondaries'
+            ELSE NULL
+        END as strategy""",
+    from_sql="organizations o JOIN gp_profiles gp ON gp.org_id = o.id",
+    default_order="gp.years_investing DESC NULLS LAST, o.name",
+    embedding_column="f.thesis_embedding",
+    model_column="f.thesis_embedding_model",
+    vector_join=" JOIN funds f ON f.org_id = o.id",
+)
+
+
+@dataclass(frozen=True)
+class QueryEmbedding:
+    """A search text's embedding and the model that produced it."""
+
+    vector: list[float]
+    model: str
+
+
+@dataclass(frozen=True)
+class HybridQuery:
+    """A built hybrid search query.
+
+    Attributes:
+        sql: The query.
+        params: Its parameters.
+        entity: Source entity, for metrics.
+        probes: ivfflat.probes to set first, when the vector ranking is used.
+        fused: Whether the SQL computes the score components itself;
+            otherwise rows follow the default order only.
+    """
+
+    sql: str
+    params: list[Any]
+    entity: str
+    probes: int | None = None
+    fused: bool = False
+
+
+# =============================================================================
+# Stage Budgets
+# =============================================================================
+
+
+@contextmanager
+def search_stage(entity: str, stage: str, budget_ms: int) -> Iterator[None]:
+    """Time a search stage, recording it and warning when over budget."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        over_budget = elapsed * 1000 > budget_ms
+        observe_search_stage(entity, stage, elapsed, over_budget)
+        if over_budget:
+            logger.warning(f"{entity} search {stage} took {elapsed * 1000:.0f}ms (budget {budget_ms}ms)")
+
+
+async def _within_budget[T](awaitable: Awaitable[T], entity: str, stage: str, budget_ms: int) -> T | None:
+    """Await with a deadline; None if the budget runs out first.
+
+    The awaited work is shielded, so it finishes in the background and
+    its result reaches the caches for the next search.
+    """
+    task = asyncio.ensure_future(awaitable)
+    # A task left running past the budget may fail unobserved
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    with search_stage(entity, stage, budget_ms):
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), budget_ms / 1000)
+        except TimeoutError:
+            return None
+
+
+async def parse_within_budget(parse: Awaitable[dict[str, Any]], search: str, entity: str) -> dict[str, Any]:
+    """Parsed filters, or a plain text search if parsing is over budget.
+
+    Args:
+        parse: Pending parse, e.g. parse_lp_search_query(search).
+        search: The raw search text.
+        entity: "lp" or "gp".
+    """
+    filters = await _within_budget(parse, entity, "parse", get_settings().search_parse_budget_ms)
+    if filters is None:
+        return {"text_search": search}
+    return filters
+
+
+async def search_embedding(text: str | None, entity: str) -> QueryEmbedding | None:
+    """Embed search text for the vector ranking.
+
+    Returns:
+        The embedding, or None when semantic search is disabled, there is
+        no text, or embedding failed or ran over budget.
+    """
+    settings = get_settings()
+    if not text or not settings.enable_semantic_search:
+        return None
+    try:
+        provider = get_embedding_provider()
+        vector = await _within_budget(embed_query(text, provider), entity, "embed", settings.search_embed_budget_ms)
+    except Exception as e:
+        logger.warning(f"Query embedding failed, searching without it: {e}")
+        return None
+    if vector is None:
+        return None
+    return QueryEmbedding(vector, provider.model)
+
+
+# =============================================================================
+# Query Building
+# =============================================================================
+
+# Default order only: the page as it looks without a search
+DEFAULT_ORDER_SQL = """
+    SELECT {columns}
+    FROM {from_sql}
+    WHERE {where_clause}
+    ORDER BY {default_order}
+    LIMIT %s
+"""
+
+TEXT_CTES = """
+    text_hits AS (
+        SELECT o.id, {rank_sql} AS score
+        FROM {from_sql}
+        WHERE ({where_clause}) AND {text_condition}
+        ORDER BY score DESC
+        LIMIT %s
+    ),
+    text_ranked AS (
+        SELECT id, score, row_number() OVER (ORDER BY score DESC) AS rank
+        FROM text_hits
+    ),"""
+
+# ORDER BY the distance expression with a LIMIT lets Postgres use the
+# ivfflat index. One org can match through several funds: keep its best.
+VECTOR_CTES = """
+    vector_hits AS (
+        SELECT id, MIN(distance) AS distance
+        FROM (
+            SELECT o.id, {embedding_column} <=> %s::vector AS distance
+            FROM {from_sql}{vector_join}
+            WHERE ({where_clause}) AND {model_column} = %s
+            ORDER BY {embedding_column} <=> %s::vector
+            LIMIT %s
+        ) nearest
+        GROUP BY id
+    ),
+    vector_ranked AS (
+        SELECT id, distance, row_number() OVER (ORDER BY distance) AS rank
+        FROM vector_hits
+    ),"""
+
+FUSED_SQL = """
+    WITH {ctes}
+    candidates AS (
+        {candidates}
+    ),
+    filter_ranked AS (
+        SELECT o.id, row_number() OVER (ORDER BY {default_order}, o.id) AS rank
+        FROM {from_sql}
+        JOIN candidates c ON c.id = o.id
+    )
+    SELECT
+        {columns},
+        t.rank AS text_rank,
+        t.score AS text_score,
+        {vector_columns},
+        fr.rank AS filter_rank,
+        {hybrid_score} AS hybrid_score
+    FROM {from_sql}
+    JOIN filter_ranked fr ON fr.id = o.id
+    LEFT JOIN text_ranked t ON t.id = o.id{vector_ranked_join}
+    ORDER BY hybrid_score DESC, {default_order}, o.id
+    LIMIT %s
+"""
+
+
+def _rrf_term(weight: float, rank_column: str, rrf_k: int) -> str:
+    """SQL for weight / (k + rank); 0 when the row is missing from the ranking."""
+    return f"COALESCE({float(weight)!r} / ({float(rrf_k)!r} + {rank_column}), 0)"
+
+
+def rrf_score(weight: float, rank: int | None, rrf_k: int) -> float:
+    """Python counterpart of _rrf_term for a single rank."""
+    return 0.0 if rank is None else weight / (rrf_k + rank)
+
+
+def build_hybrid_query(
+    source: HybridSource,
+    where_clause: str,
+    params: list[Any],
+    text: str | None = None,
+    embedding: QueryEmbedding | None = None,
+    limit: int = SEARCH_PAGE_LIMIT,
+) -> HybridQuery:
+    """Build the single-round-trip search query for a page.
+
+    Args:
+        source: LP_SOURCE or GP_SOURCE.
+        where_clause: Structured filters (without the text search).
+        params: Parameters of where_clause.
+        text: Search text, ranked by full-text relevance.
+        embedding: Query embedding for the vector ranking, if available.
+        limit: Number of results.
+
+    Returns:
+        The query. Without text it lists filtered rows in the default order.
+    """
+    if not text:
+        sql = DEFAULT_ORDER_SQL.format(
+            columns=source.columns,
+            from_sql=source.from_sql,
+            where_clause=where_clause,
+            default_order=source.default_order,
+        )
+        return HybridQuery(sql, [*params, limit], source.entity)
+
+    settings = get_settings()
+    candidates = settings.hybrid_candidates
+    rank_sql, rank_params = text_search_rank(text)
+    text_condition, text_params = text_search_condition(text)
+
+    ctes = TEXT_CTES.format(
+        rank_sql=rank_sql, from_sql=source.from_sql, where_clause=where_clause, text_condition=text_condition
+    )
+    query_params: list[Any] = [*rank_params, *params, *text_params, candidates]
+    candidate_sql = "SELECT id FROM text_hits"
+    score_terms = [_rrf_term(settings.hybrid_text_weight, "t.rank", settings.hybrid_rrf_k)]
+
+    if embedding is not None:
+        ctes += VECTOR_CTES.format(
+            embedding_column=source.embedding_column,
+            model_column=source.model_column,
+            from_sql=source.from_sql,
+            vector_join=source.vector_join,
+            where_clause=where_clause,
+        )
+        vector = to_pgvector(embedding.vector)
+        query_params += [vector, *params, embedding.model, vector, candidates]
+        candidate_sql += " UNION SELECT id FROM vector_hits"
+        vector_columns = "v.rank AS vector_rank,\n        1 - v.distance AS vector_similarity"
+        vector_ranked_join = "\n    LEFT JOIN vector_ranked v ON v.id = o.id"
+        score_terms.append(_rrf_term(settings.hybrid_vector_weight, "v.rank", settings.hybrid_rrf_k))
+    else:
+        vector_columns = "NULL::bigint AS vector_rank,\n        NULL::float8 AS vector_similarity"
+        vector_ranked_join = ""
+
+    score_terms.append(_rrf_term(settings.hybrid_filter_weight, "fr.rank", settings.hybrid_rrf_k))
+    sql = FUSED_SQL.format(
+        ctes=ctes,
+        candidates=candidate_sql,
+        default_order=source.default_order,
+        from_sql=source.from_sql,
+        columns=source.columns,
+        vector_columns=vector_columns,
+        hybrid_score=" + ".join(score_terms),
+        vector_ranked_join=vector_ranked_join,
+    )
+    probes = settings.semantic_search_probes if embedding is not None else None
+    return HybridQuery(sql, [*query_params, limit], source.entity, probes=probes, fused=True)
+
+
+# =============================================================================
+# Retrieval
+# =============================================================================
+
+
+def _with_default_scores(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Add score components to rows listed in the default order."""
+    settings = get_settings()
+    return [
+        {
+            **row,
+            "text_rank": None,
+            "text_score": None,
+            "vector_rank": None,
+            "vector_similarity": None,
+            "filter_rank": rank,
+            "hybrid_score": rrf_score(settings.hybrid_filter_weight, rank, settings.hybrid_rrf_k),
+        }
+        for rank, row in enumerate(rows, start=1)
+    ]
+
+
+async def hybrid_search_async(cur: Any, query: HybridQuery) -> list[dict[str, Any]]:
+    """Run a hybrid search query on an async cursor.
+
+    Returns:
+        Rows, best first, each with text_rank, text_score, vector_rank,
+        vector_similarity, filter_rank and hybrid_score.
+    """
+    with search_stage(query.entity, "retrieve", get_settings().search_retrieve_budget_ms):
+        if query.probes:
+            await cur.execute("SELECT set_config('ivfflat.probes', %s, true)", [str(query.probes)])
+        await cur.execute(query.sql, query.params)
+        rows = [dict(row) for row in await cur.fetchall()]
+    return rows if query.fused else _with_default_scores(rows)
+
+
+def hybrid_search(cur: Any, query: HybridQuery) -> list[dict[str, Any]]:
+    """Run a hybrid search query on a sync cursor (see hybrid_search_async)."""
+    with search_stage(query.entity, "retrieve", get_settings().search_retrieve_budget_ms):
+        if query.probes:
+            cur.execute("SELECT set_config('ivfflat.probes', %s, true)", [str(query.probes)])
+        cur.execute(query.sql, query.params)
+        rows = [dict(row) for row in cur.fetchall()]
+    return rows if query.fused else _with_default_scores(rows)
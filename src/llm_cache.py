@@ -0,0 +1,302 @@
+"""Persistent, content-addressed cache for LLM outputs.
+
+The in-process caches in src/cache.py reset on every deploy, and match
+explanations and pitch deck extractions were never cached at all. This
+module stores LLM outputs in the llm_response_cache table (migration 017),
+keyed by a SHA-256 of:
+    - namespace (which feature produced the output)
+    - model (an output from one model is never served for another)
+    - prompt template version (bump it when a prompt changes)
+    - normalized inputs (the query, or the rendered prompt)
+
+Entries expire after LLM_CACHE_TTL_SECONDS. Every so many writes the cache
+deletes expired rows and then the least recently hit rows beyond
+LLM_CACHE_MAX_ENTRIES or LLM_CACHE_MAX_BYTES. Reads are plain SELECTs; hits
+are batched in memory and recorded (hit_count, last_hit_at) with the next
+write, or once enough distinct keys are pending. Hits, misses, writes,
+evictions and errors are counted overall and per namespace.
+
+Without a database, or with LLM_CACHE_ENABLED=false, every lookup is a miss
+and writes are dropped. Database errors are logged and treated the same
+way; the cache never fails a request.
+
+Example:
+    Cache an LLM call::
+
+        from src.llm_cache import llm_cache_key, llm_response_cache
+
+        key = llm_cache_key("lp_search", model, LP_SEARCH_PROMPT_VERSION, query)
+        filters = await llm_response_cache.get("lp_search", key)
+        if filters is None:
+            filters = await call_llm(query)
+            await llm_response_cache.set("lp_search", key, filters, model, LP_SEARCH_PROMPT_VERSION)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from src.cache import CacheStats
+from src.config import get_settings
+from src.database import get_async_db
+
+logger = logging.getLogger(__name__)
+
+
+def llm_cache_key(namespace: str, model: str, prompt_version: str, inputs: Any) -> str:
+    """Content-address an LLM call.
+
+    Args:
+        namespace: Feature producing the output (e.g. "lp_search").
+        model: Model that produces the output.
+        prompt_version: Version of the prompt template.
+        inputs: JSON-serializable normalized inputs.
+
+    Returns:
+        SHA-256 hex digest.
+
+    Example:
+        >>> key = llm_cache_key("lp_search", "deepseek-r1:8b", "1", "pension funds")
+        >>> len(key)
+        64
+    """
+    payload = json.dumps(
+        [namespace, model, prompt_version, inputs],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class LLMCacheStats(CacheStats):
+    """Statistics for the persistent LLM cache."""
+
+    writes: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Stats as a JSON-serializable dict."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 1),
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+
+class LLMResponseCache:
+    """Database-backed LLM output cache.
+
+    Args:
+        eviction_interval: Run eviction after this many writes.
+        hit_flush_size: Record batched hits once this many distinct keys
+            are pending, even without a write.
+
+    Example:
+        >>> cache = LLMResponseCache()
+        >>> await cache.set("pitch_deck", key, extracted, model, "1")
+        >>> await cache.get("pitch_deck", key)
+    """
+
+    def __init__(self, eviction_interval: int = 200, hit_flush_size: int = 100) -> None:
+        self.eviction_interval = eviction_interval
+        self.hit_flush_size = hit_flush_size
+        self._stats = LLMCacheStats()
+        self._namespace_stats: dict[str, LLMCacheStats] = {}
+        self._writes_since_eviction = 0
+        # cache_key -> hits not yet recorded in the table
+        self._pending_hits: dict[str, int] = {}
+
+    def _count(self, namespace: str, field: str, n: int = 1) -> None:
+        ns_stats = self._namespace_stats.setdefault(namespace, LLMCacheStats())
+        setattr(self._stats, field, getattr(self._stats, field) + n)
+        setattr(ns_stats, field, getattr(ns_stats, field) + n)
+
+    async def get(self, namespace: str, key: str) -> Any | None:
+        """Get a cached output and queue the hit for recording.
+
+        Args:
+            namespace: Feature namespace (for metrics).
+            key: Key from llm_cache_key().
+
+        Returns:
+            The cached value, or None on a miss, expiry or error.
+        """
+        if not get_settings().llm_cache_enabled:
+            self._count(namespace, "misses")
+            return None
+
+        value = None
+        try:
+            conn = await get_async_db()
+            if conn:
+                try:
+                    async with conn.cursor() as cur:
+                        await cur.execute(
+                            """
+                            SELECT value FROM llm_response_cache
+                            WHERE cache_key = %s
+                              AND (expires_at IS NULL OR expires_at > NOW())
+                            """,
+                            (key,),
+                        )
+                        row = await cur.fetchone()
+                        if row:
+                            value = row["value"]
+                            self._pending_hits[key] = self._pending_hits.get(key, 0) + 1
+                        flush = len(self._pending_hits) >= self.hit_flush_size
+                        if flush:
+                            await self._flush_hits(cur)
+                    if flush:
+                        await conn.commit()
+                    else:
+                        await conn.rollback()
+                finally:
+                    await conn.close()
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            self._count(namespace, "errors")
+
+        self._count(namespace, "hits" if value is not None else "misses")
+        return value
+
+    async def set(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        model_version: str,
+        prompt_version: str,
+    ) -> None:
+        """Store an output, replacing any previous entry for the key.
+
+        Args:
+            namespace: Feature namespace.
+            key: Key from llm_cache_key().
+            value: JSON-serializable output.
+            model_version: Model that produced the output.
+            prompt_version: Prompt template version.
+        """
+        settings = get_settings()
+        if not settings.llm_cache_enabled:
+            return
+
+        serialized = json.dumps(value, default=str)
+        try:
+            conn = await get_async_db()
+            if not conn:
+                return
+            try:
+                async with conn.cursor() as cur:
+                    await cur.execute(
+                        """
+                        INSERT INTO llm_response_cache
+                            (cache_key, namespace, model_version, prompt_version, value, size_bytes, expires_at)
+                        VALUES (%s, %s, %s, %s, %s::jsonb, %s,
+                                CASE WHEN %s > 0 THEN NOW() + make_interval(secs => %s) END)
+                        ON CONFLICT (cache_key) DO UPDATE SET
+                            value = EXCLUDED.value,
+                            size_bytes = EXCLUDED.size_bytes,
+                            created_at = NOW(),
+                            expires_at = EXCLUDED.expires_at
+                        """,
+                        (
+                            key,
+                            namespace,
+                            model_version,
+                            prompt_version,
+                            serialized,
+                            len(serialized),
+                            settings.llm_cache_ttl_seconds,
+                            settings.llm_cache_ttl_seconds,
+                        ),
+                    )
+                    self._count(namespace, "writes")
+                    # Recency must be current before eviction ranks by it
+                    await self._flush_hits(cur)
+
+                    self._writes_since_eviction += 1
+                    if self._writes_since_eviction >= self.eviction_interval:
+                        self._writes_since_eviction = 0
+                        evicted = await self._evict(cur, settings.llm_cache_max_entries, settings.llm_cache_max_bytes)
+                        self._count(namespace, "evictions", evicted)
+                await conn.commit()
+            finally:
+                await conn.close()
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+            self._count(namespace, "errors")
+
+    async def _flush_hits(self, cur: Any) -> None:
+        """Record the pending hits in a single UPDATE."""
+        if not self._pending_hits:
+            return
+        hits, self._pending_hits = self._pending_hits, {}
+        await cur.execute(
+            """
+            UPDATE llm_response_cache AS c
+            SET hit_count = c.hit_count + h.hits, last_hit_at = NOW()
+            FROM unnest(%s::text[], %s::int[]) AS h(cache_key, hits)
+            WHERE c.cache_key = h.cache_key
+            """,
+            (list(hits), list(hits.values())),
+        )
+
+    async def _evict(self, cur: Any, max_entries: int, max_bytes: int) -> int:
+        """Delete expired rows, then the least recently hit beyond max_entries or max_bytes."""
+        await cur.execute("DELETE FROM llm_response_cache WHERE expires_at <= NOW()")
+        expired = max(cur.rowcount, 0)
+        await cur.execute(
+            """
+            DELETE FROM llm_response_cache
+            WHERE cache_key IN (
+                SELECT cache_key FROM (
+                    SELECT cache_key,
+                           ROW_NUMBER() OVER recency AS position,
+                           SUM(size_bytes) OVER recency AS running_bytes
+                    FROM llm_response_cache
+                    WINDOW recency AS (ORDER BY last_hit_at DESC, cache_key)
+                ) ranked
+                WHERE position > %s OR running_bytes > %s
+            )
+            """,
+            (max_entries, max_bytes),
+        )
+        evicted = expired + max(cur.rowcount, 0)
+        if evicted:
+            logger.info(f"LLM cache evicted {evicted} entries ({expired} expired)")
+        return evicted
+
+    @property
+    def stats(self) -> LLMCacheStats:
+        """Overall cache statistics."""
+        return self._stats
+
+    def get_stats(self) -> dict[str, Any]:
+        """Overall and per-namespace statistics.
+
+        Returns:
+            Overall stats, with a "namespaces" dict of per-namespace stats.
+        """
+        return {
+            **self._stats.as_dict(),
+            "namespaces": {ns: s.as_dict() for ns, s in sorted(self._namespace_stats.items())},
+        }
+
+    def reset_stats(self) -> None:
+        """Zero all counters and drop unrecorded hits. Useful for testing."""
+        self._stats = LLMCacheStats()
+        self._namespace_stats.clear()
+        self._pending_hits.clear()
+
+
+llm_response_cache = LLMResponseCache()
+"""Process-wide persistent LLM cache."""
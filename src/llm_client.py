@@ -0,0 +1,573 @@
+"""Shared HTTP clients for the LLM backends.
+
+Every LLM call used to open its own ``httpx.AsyncClient``, paying a fresh
+TCP (and for OpenRouter, TLS) handshake per request. This module keeps one
+long-lived, keep-alive client per backend instead:
+    - ollama: the local/self-hosted Ollama server (HTTP/1.1)
+    - openrouter: the OpenRouter API (HTTP/2 when the h2 package is installed)
+
+The clients are opened by the application lifespan (``open_llm_clients``)
+and closed on shutdown (``close_llm_clients``). Each backend also gets a
+concurrency limit (OLLAMA_MAX_CONCURRENCY, OPENROUTER_MAX_CONCURRENCY), so
+one feature cannot flood a backend, and a latency histogram per model,
+exposed on /api/status.
+
+Callers take the client and wrap each request in ``llm_call``::
+
+    async with llm_client("ollama") as client, llm_call("ollama", model):
+        response = await client.post(url, json=payload, timeout=15.0)
+
+When the clients are not open (scripts, tests without lifespan),
+``llm_client()`` falls back to a temporary client for the block and
+``llm_call()`` records latency without limiting concurrency.
+
+Each backend also has a circuit breaker. After LLM_BREAKER_FAILURE_THRESHOLD
+consecutive connection errors or timeouts it opens: ``llm_call()`` then
+raises LLMBackendUnavailable at once, so callers go straight to their
+template or text-search fallbacks instead of waiting out a timeout. A
+background probe checks the backend and closes the breaker when it
+answers again. Call sites that pass an ``operation`` to ``llm_call()`` can
+size their timeout from its observed p99 latency with ``llm_timeout()``::
+
+    timeout = llm_timeout("ollama", model, "search_parse", 15.0)
+    async with llm_client("ollama") as client, llm_call("ollama", model, "search_parse"):
+        response = await client.post(url, json=payload, timeout=timeout)
+
+``stream_ollama_generate()`` consumes Ollama's NDJSON stream and yields
+tokens as they are generated, so pages can render output as it arrives::
+
+    async for token in stream_ollama_generate(base_url, model, prompt, 180.0):
+        yield sse_event("token", token)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import importlib.util
+import json
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+import httpx
+
+from src.config import get_settings
+from src.logging_config import get_logger
+from src.metrics import observe_llm_call
+
+logger = get_logger(__name__)
+
+LLMBackend = Literal["ollama", "openrouter"]
+"""LLM backends with a shared client."""
+
+BACKENDS: tuple[LLMBackend, ...] = ("ollama", "openrouter")
+
+# Default per-request timeouts; callers pass their own per request
+_DEFAULT_TIMEOUT_SECONDS: dict[LLMBackend, float] = {"ollama": 300.0, "openrouter": 120.0}
+
+# Idle connections are kept this long for reuse between requests
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+# Per-operation latency samples kept for adaptive timeouts, and the number
+# needed before the timeout adapts
+RECENT_LATENCY_SAMPLES = 200
+MIN_TIMEOUT_SAMPLES = 20
+
+# Health checks sent while a breaker is open
+_PROBE_INTERVAL_SECONDS = 5.0
+_PROBE_TIMEOUT_SECONDS = 5.0
+_OPENROUTER_MODELS_URL = "https://openrouter.ai/api/v1/models"
+
+LATENCY_BUCKETS_SECONDS: tuple[float, ...] = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+"""Upper bounds of the latency histogram buckets; LLM calls take seconds."""
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+
+@dataclass
+class LatencyHistogram:
+    """Request latency distribution for one model.
+
+    Buckets are upper bounds in seconds; a final overflow bucket counts
+    slower requests.
+    """
+
+    buckets: tuple[float, ...] = LATENCY_BUCKETS_SECONDS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, seconds: float) -> None:
+        """Record one request's latency."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        """Histogram as a JSON-serializable dict, buckets keyed by upper bound."""
+        bounds = [str(b) for b in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_seconds": round(self.total_seconds / self.count, 3) if self.count else 0.0,
+            "max_seconds": round(self.max_seconds, 3),
+            "buckets": dict(zip(bounds, self.counts, strict=True)),
+        }
+
+
+# =============================================================================
+# Client Lifecycle
+# =============================================================================
+
+
+_clients: dict[LLMBackend, httpx.AsyncClient] = {}
+_limits: dict[LLMBackend, asyncio.Semaphore] = {}
+_max_concurrency: dict[LLMBackend, int] = {}
+_http2: dict[LLMBackend, bool] = {}
+_in_flight: dict[LLMBackend, int] = dict.fromkeys(BACKENDS, 0)
+_latency: dict[tuple[LLMBackend, str], LatencyHistogram] = {}
+_breakers: dict[LLMBackend, CircuitBreaker] = {}
+_probe_tasks: dict[LLMBackend, asyncio.Task[None]] = {}
+# Keyed by (backend, operation, model)
+_recent_latency: dict[tuple[LLMBackend, str, str], deque[float]] = {}
+_timeout_defaults: dict[tuple[LLMBackend, str, str], float] = {}
+
+
+def http2_available() -> bool:
+    """Whether the optional h2 package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def open_llm_clients() -> None:
+    """Open the shared client for every backend.
+
+    Called from the application lifespan on startup. Connections are made
+    on first use and then kept alive for reuse.
+    """
+    if _clients:
+        return
+
+    settings = get_settings()
+    concurrency: dict[LLMBackend, int] = {
+        "ollama": settings.ollama_max_concurrency,
+        "openrouter": settings.openrouter_max_concurrency,
+    }
+    http2 = http2_available()
+    if not http2:
+        logger.info("h2 not installed; OpenRouter requests use HTTP/1.1")
+
+    for backend in BACKENDS:
+        limit = concurrency[backend]
+        # Ollama serves plain HTTP/1.1; HTTP/2 is negotiated over TLS only
+        _http2[backend] = http2 and backend == "openrouter"
+        _clients[backend] = httpx.AsyncClient(
+            timeout=_DEFAULT_TIMEOUT_SECONDS[backend],
+            limits=httpx.Limits(
+                max_connections=limit,
+                max_keepalive_connections=limit,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            http2=_http2[backend],
+        )
+        _limits[backend] = asyncio.Semaphore(limit)
+        _max_concurrency[backend] = limit
+
+    logger.info(f"LLM clients opened (ollama={concurrency['ollama']}, openrouter={concurrency['openrouter']})")
+
+
+async def close_llm_clients() -> None:
+    """Close the shared clients and their connections, and stop breaker probes."""
+    for task in _probe_tasks.values():
+        task.cancel()
+    _probe_tasks.clear()
+    clients = list(_clients.values())
+    _clients.clear()
+    _limits.clear()
+    _max_concurrency.clear()
+    _http2.clear()
+    for client in clients:
+        await client.aclose()
+    if clients:
+        logger.info("LLM clients closed")
+
+
+def get_llm_client(backend: LLMBackend) -> httpx.AsyncClient | None:
+    """Get the shared client for a backend if the clients are open."""
+    return _clients.get(backend)
+
+
+# =============================================================================
+# Circuit Breakers
+# =============================================================================
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+class LLMBackendUnavailable(Exception):
+    """Raised by llm_call() while the backend's circuit breaker is open."""
+
+
+@dataclass
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one backend.
+
+    closed: calls go through; failure_threshold consecutive failures open
+    the breaker. open: calls are rejected until a background probe closes
+    it, or until reset_seconds pass, after which a single trial call is let
+    through (half_open). The trial's outcome closes or re-opens it.
+    """
+
+    failure_threshold: int = 5
+    reset_seconds: float = 30.0
+    state: BreakerState = "closed"
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    trips: int = 0
+    rejected: int = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; counts rejections."""
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = "half_open"
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call or probe."""
+        self.consecutive_failures = 0
+        self.state = "closed"
+
+    def record_failure(self) -> bool:
+        """Count a backend failure.
+
+        Returns:
+            True if this failure opened the breaker.
+        """
+        self.consecutive_failures += 1
+        if self.state == "half_open" or (
+            self.state == "closed" and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._open()
+            return True
+        return False
+
+    def end_trial(self) -> None:
+        """Re-open after a trial call that neither succeeded nor failed (e.g. cancelled)."""
+        if self.state == "half_open":
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def _open(self) -> None:
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.trips += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Breaker state as a JSON-serializable dict."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_seconds": round(time.monotonic() - self.opened_at, 1) if self.state != "closed" else 0.0,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+def _is_backend_failure(error: BaseException) -> bool:
+    """Whether an error means the backend is down or overloaded."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def get_circuit_breaker(backend: LLMBackend) -> CircuitBreaker:
+    """Get a backend's circuit breaker, created from the settings on first use."""
+    breaker = _breakers.get(backend)
+    if breaker is None:
+        settings = get_settings()
+        breaker = _breakers[backend] = CircuitBreaker(
+            failure_threshold=settings.llm_breaker_failure_threshold,
+            reset_seconds=settings.llm_breaker_reset_seconds,
+        )
+    return breaker
+
+
+def reset_circuit_breakers() -> None:
+    """Close all breakers and stop their probes. Useful for testing."""
+    for task in _probe_tasks.values():
+        task.cancel()
+    _probe_tasks.clear()
+    _breakers.clear()
+
+
+def _start_probe(backend: LLMBackend) -> None:
+    """Probe an open backend in the background until its breaker closes."""
+    task = _probe_tasks.get(backend)
+    if task is not None and not task.done():
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # No loop; the breaker half-opens after reset_seconds instead
+    _probe_tasks[backend] = loop.create_task(_probe_until_closed(backend), name=f"llm-probe-{backend}")
+
+
+async def _probe_until_closed(backend: LLMBackend) -> None:
+    breaker = get_circuit_breaker(backend)
+    while breaker.state != "closed":
+        await asyncio.sleep(_PROBE_INTERVAL_SECONDS)
+        if breaker.state != "closed" and await _probe(backend):
+            breaker.record_success()
+            logger.info(f"{backend} answered a health probe; circuit breaker closed")
+
+
+async def _probe(backend: LLMBackend) -> bool:
+    """Send a cheap health request to a backend."""
+    url = f"{get_settings().ollama_base_url}/api/tags" if backend == "ollama" else _OPENROUTER_MODELS_URL
+    try:
+        async with llm_client(backend) as client:
+            response = await client.get(url, timeout=_PROBE_TIMEOUT_SECONDS)
+    except httpx.HTTPError:
+        return False
+    return response.status_code < 500
+
+
+# =============================================================================
+# Adaptive Timeouts
+# =============================================================================
+
+
+def llm_timeout(backend: LLMBackend, model: str, operation: str, default_seconds: float) -> float:
+    """Timeout for a call, adapted to the call site's observed latency.
+
+    Once MIN_TIMEOUT_SAMPLES calls of the operation have been timed (via
+    ``llm_call(..., operation=...)``), the timeout is the p99 latency of
+    the recent ones times LLM_TIMEOUT_P99_MULTIPLIER, never below
+    LLM_TIMEOUT_MIN_SECONDS and never above default_seconds.
+
+    Args:
+        backend: Backend the call goes to.
+        model: Model the call uses.
+        operation: Call site name, e.g. "search_parse".
+        default_seconds: The call site's fixed timeout, used as the ceiling.
+
+    Returns:
+        Timeout in seconds.
+    """
+    _timeout_defaults[(backend, operation, model)] = default_seconds
+    settings = get_settings()
+    samples = _recent_latency.get((backend, operation, model))
+    if not settings.llm_adaptive_timeouts or samples is None or len(samples) < MIN_TIMEOUT_SAMPLES:
+        return default_seconds
+
+    adapted = max(settings.llm_timeout_min_seconds, _p99(samples) * settings.llm_timeout_p99_multiplier)
+    return round(min(default_seconds, adapted), 2)
+
+
+def _p99(samples: deque[float]) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+def _record_recent(backend: LLMBackend, operation: str, model: str, seconds: float) -> None:
+    samples = _recent_latency.get((backend, operation, model))
+    if samples is None:
+        samples = _recent_latency[(backend, operation, model)] = deque(maxlen=RECENT_LATENCY_SAMPLES)
+    samples.append(seconds)
+
+
+# =============================================================================
+# Requests
+# =============================================================================
+
+
+@asynccontextmanager
+async def llm_client(backend: LLMBackend) -> AsyncIterator[httpx.AsyncClient]:
+    """Use the shared client for a backend.
+
+    Falls back to a temporary client, closed when the block exits, if the
+    shared clients are not open.
+
+    Args:
+        backend: Backend to talk to.
+
+    Yields:
+        An HTTP client. Pass a per-request ``timeout=`` to its methods.
+
+    Example:
+        >>> async with llm_client("openrouter") as client:
+        ...     response = await client.post(OPENROUTER_URL, json=payload, timeout=120.0)
+    """
+    client = _clients.get(backend)
+    if client is not None:
+        yield client
+        return
+
+    async with httpx.AsyncClient(timeout=_DEFAULT_TIMEOUT_SECONDS[backend]) as temporary:
+        yield temporary
+
+
+@asynccontextmanager
+async def llm_call(backend: LLMBackend, model: str, operation: str | None = None) -> AsyncIterator[None]:
+    """Take a backend concurrency slot and time one request.
+
+    Latency is recorded per model when the block completes; a block that
+    raises is counted as an error instead. Connection errors, timeouts and
+    5xx ``HTTPStatusError``s count towards the backend's circuit breaker.
+
+    Args:
+        backend: Backend the request goes to.
+        model: Model the request uses.
+        operation: Call site name; its latencies feed ``llm_timeout()``.
+
+    Raises:
+        LLMBackendUnavailable: If the backend's circuit breaker is open.
+    """
+    breaker = get_circuit_breaker(backend)
+    if not breaker.allow():
+        raise LLMBackendUnavailable(f"{backend} circuit breaker is open")
+    trial = breaker.state == "half_open"
+
+    limit = _limits.get(backend)
+    if limit is not None:
+        await limit.acquire()
+
+    histogram = _latency.get((backend, model))
+    if histogram is None:
+        histogram = _latency[(backend, model)] = LatencyHistogram()
+
+    _in_flight[backend] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        histogram.errors += 1
+        observe_llm_call(backend, model, None)
+        if _is_backend_failure(e):
+            if operation is not None and isinstance(e, httpx.TimeoutException):
+                # Timed-out calls count at their elapsed time so the timeout can grow
+                _record_recent(backend, operation, model, time.perf_counter() - start)
+            if breaker.record_failure():
+                logger.warning(f"{backend} circuit breaker opened after {breaker.consecutive_failures} failures")
+                _start_probe(backend)
+        raise
+    else:
+        elapsed = time.perf_counter() - start
+        histogram.observe(elapsed)
+        observe_llm_call(backend, model, elapsed)
+        if operation is not None:
+            _record_recent(backend, operation, model, elapsed)
+        breaker.record_success()
+    finally:
+        if trial:
+            breaker.end_trial()
+        _in_flight[backend] -= 1
+        if limit is not None:
+            limit.release()
+
+
+async def stream_ollama_generate(
+    ollama_base_url: str,
+    ollama_model: str,
+    prompt: str,
+    timeout_seconds: float,
+) -> AsyncIterator[str]:
+    """Generate with Ollama and yield response tokens as they arrive.
+
+    Sends a streaming generate request ("stream": true) through the shared
+    Ollama client and parses the NDJSON reply line by line. The request
+    holds a concurrency slot until the stream ends or the caller stops
+    iterating.
+
+    Args:
+        ollama_base_url: Ollama API base URL.
+        ollama_model: Model to generate with.
+        prompt: Prompt to complete.
+        timeout_seconds: Read timeout between chunks (not for the whole
+            completion).
+
+    Yields:
+        Non-empty response text fragments, in order.
+
+    Raises:
+        httpx.HTTPError: If the request fails or Ollama returns an error
+            status.
+        ValueError: If Ollama reports an error inside the stream.
+    """
+    async with llm_client("ollama") as client, llm_call("ollama", ollama_model):
+        async with client.stream(
+            "POST",
+            f"{ollama_base_url}/api/generate",
+            json={"model": ollama_model, "prompt": prompt, "stream": True},
+            timeout=timeout_seconds,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise ValueError(f"Ollama stream error: {chunk['error']}")
+                if token := chunk.get("response"):
+                    yield token
+                if chunk.get("done"):
+                    return
+
+
+def get_llm_client_stats() -> dict[str, Any]:
+    """Get per-backend client state and per-model latency histograms.
+
+    Returns:
+        Dict keyed by backend with "open", "http2", "max_concurrency",
+        "in_flight", the circuit "breaker" state, a "models" dict of latency
+        histograms and "timeouts" (current adaptive timeout per operation
+        and model).
+    """
+    stats: dict[str, Any] = {}
+    for backend in BACKENDS:
+        stats[backend] = {
+            "open": backend in _clients,
+            "http2": _http2.get(backend, False),
+            "max_concurrency": _max_concurrency.get(backend),
+            "in_flight": _in_flight[backend],
+            "breaker": get_circuit_breaker(backend).as_dict(),
+            "models": {
+                model: histogram.as_dict()
+                for (b, model), histogram in sorted(_latency.items())
+                if b == backend
+            },
+            "timeouts": {
+                f"{operation}:{model}": {
+                    "samples": len(_recent_latency.get((b, operation, model), ())),
+                    "timeout_seconds": llm_timeout(b, model, operation, default),
+                }
+                for (b, operation, model), default in sorted(_timeout_defaults.items())
+                if b == backend
+            },
+        }
+    return stats
+
+
+def reset_llm_client_stats() -> None:
+    """Clear the latency histograms and samples. Useful for testing."""
+    _latency.clear()
+    _recent_latency.clear()
+    _timeout_defaults.clear()
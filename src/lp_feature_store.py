@@ -0,0 +1,459 @@
+"""In-process LP feature store for matching.
+
+Matching reads a handful of LP columns (strategies, geographies, sectors,
+size bounds and a few flags) for every LP on every run. Fetching them with
+``SELECT lp.*`` and re-normalizing the strings each time turns every match
+run into a full table scan plus tens of thousands of ``str.lower()`` calls.
+
+This module keeps those columns resident in a compact form:
+    - Vocabulary: interned strings mapped to small integer codes, one per
+      field (strategies, geographies, sectors)
+    - LPFeatures: a ``__slots__`` record per LP holding codes, floats and
+      flags, already normalized the way the scorers compare them
+    - LPFeatureStore: the process-wide collection, loaded once and then
+      refreshed incrementally by fetching only rows modified since the
+      last sync
+
+Refreshes are driven by the CacheVersionManager checksums in src/cache.py:
+when neither the "lp" nor the "organization" checksum has moved, refresh()
+does not query lp_profiles at all.
+
+Example:
+    Score a fund against the current LP universe::
+
+        from src.lp_feature_store import lp_feature_store
+
+        lp_feature_store.refresh(conn)
+        scores = score_fund_against_lps(fund, lp_feature_store.lp_matrix())
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+from collections.abc import Iterable
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from src.cache import refresh_versions_if_stale, version_manager
+from src.matching import _normalize_string_list, _to_float
+
+if TYPE_CHECKING:
+    from src.batch_matching import LPMatrix
+
+logger = logging.getLogger(__name__)
+
+# Entity types whose version checksums gate a delta fetch
+_TRACKED_ENTITIES = ("lp", "organization")
+
+# updated_at is the writer's transaction start time, so a row can commit
+# after a later-stamped one was already fetched. Delta fetches re-read this
+# window below the high-water mark; transactions open longer than this can
+# still be missed until the next full load.
+_DELTA_OVERLAP = timedelta(minutes=5)
+
+_FEATURE_COLUMNS = """
+    SELECT lp.org_id, o.is_lp,
+           lp.strategies, lp.geographic_preferences, lp.sector_preferences,
+           lp.fund_size_min_mm, lp.fund_size_max_mm,
+           lp.check_size_min_mm, lp.check_size_max_mm,
+           lp.min_fund_number, lp.esg_required, lp.emerging_manager_ok,
+           GREATEST(lp.updated_at, o.updated_at) AS modified_at
+    FROM lp_profiles lp
+    JOIN organizations o ON o.id = lp.org_id
+"""
+
+
+# =============================================================================
+# Vocabularies
+# =============================================================================
+
+
+class Vocabulary:
+    """Interned string <-> integer code mapping for one field.
+
+    Codes are assigned in first-seen order and never change, so records
+    built against a vocabulary stay valid as it grows.
+
+    Example:
+        >>> vocab = Vocabulary()
+        >>> vocab.code("buyout")
+        0
+        >>> vocab.lookup("venture") is None
+        True
+    """
+
+    __slots__ = ("_codes", "_lock", "_terms")
+
+    def __init__(self) -> None:
+        self._codes: dict[str, int] = {}
+        self._terms: list[str] = []
+        self._lock = threading.Lock()
+
+    def code(self, term: str) -> int:
+        """Get the code for a term, assigning one if it is new."""
+        code = self._codes.get(term)
+        if code is not None:
+            return code
+        with self._lock:
+            code = self._codes.get(term)
+            if code is None:
+                code = len(self._terms)
+                self._terms.append(sys.intern(term))
+                self._codes[self._terms[code]] = code
+            return code
+
+    def codes(self, terms: Iterable[str]) -> tuple[int, ...]:
+        """Get the distinct codes for terms, in first-seen order."""
+        known = self._codes
+        codes: list[int] = []
+        for term in terms:
+            code = known.get(term)
+            if code is None:
+                code = self.code(term)
+            if code not in codes:
+                codes.append(code)
+        return tuple(codes)
+
+    def lookup(self, term: str) -> int | None:
+        """Get the code for a term without assigning one."""
+        return self._codes.get(term)
+
+    def term(self, code: int) -> str:
+        """Get the term for a code."""
+        return self._terms[code]
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+
+class LPVocabulary:
+    """The vocabularies LP features are coded against.
+
+    Attributes:
+        strategies: Lowercased strategies.
+        geographies: Lowercased geographies.
+        sectors: Lowercased sectors with underscores replaced by spaces.
+    """
+
+    __slots__ = ("geographies", "sectors", "strategies")
+
+    def __init__(self) -> None:
+        self.strategies = Vocabulary()
+        self.geographies = Vocabulary()
+        self.sectors = Vocabulary()
+
+
+def normalize_sector(sector: str) -> str:
+    """Normalize a sector name for fuzzy comparison.
+
+    Example:
+        >>> normalize_sector("Health_Care")
+        'health care'
+    """
+    return sector.lower().replace("_", " ")
+
+
+# =============================================================================
+# LP Feature Records
+# =============================================================================
+
+
+class LPFeatures:
+    """Matching features for one LP, normalized once.
+
+    Attributes:
+        org_id: LP organization ID (as a string).
+        is_lp: Whether the organization is currently flagged as an LP.
+        vocab: Vocabulary the codes below refer to.
+        strategy_codes: Distinct lowercased strategy codes.
+        strategy_names: Distinct strategies as stored (case preserved).
+        geography_codes: Distinct lowercased geography codes.
+        has_geographies: Whether any geography preference is set.
+        geography_global: Whether "global" is among the geographies.
+        sector_codes: Distinct normalized sector codes.
+        sector_names: Distinct sectors as stored (case preserved).
+        has_sectors: Whether any sector preference is set.
+        fund_size_min: Minimum fund size (0 when unset).
+        fund_size_max: Maximum fund size (inf when unset or 0).
+        check_size_min: Minimum check size as stored (0 when unset).
+        check_size_max: Maximum check size as stored (inf when unset).
+        min_fund_number: Minimum fund number (1 when unset).
+        esg_required: Whether an ESG policy is required.
+        emerging_manager_ok: Whether emerging managers are acceptable.
+        modified_at: Latest of the profile and organization updated_at.
+    """
+
+    __slots__ = (
+        "check_size_max",
+        "check_size_min",
+        "emerging_manager_ok",
+        "esg_required",
+        "fund_size_max",
+        "fund_size_min",
+        "geography_codes",
+        "geography_global",
+        "has_geographies",
+        "has_sectors",
+        "is_lp",
+        "min_fund_number",
+        "modified_at",
+        "org_id",
+        "sector_codes",
+        "sector_names",
+        "strategy_codes",
+        "strategy_names",
+        "vocab",
+    )
+
+    check_size_max: Any
+    check_size_min: Any
+    emerging_manager_ok: bool
+    esg_required: bool
+    fund_size_max: float
+    fund_size_min: float
+    geography_codes: tuple[int, ...]
+    geography_global: bool
+    has_geographies: bool
+    has_sectors: bool
+    is_lp: bool
+    min_fund_number: Any
+    modified_at: Any
+    org_id: str | None
+    sector_codes: tuple[int, ...]
+    sector_names: tuple[str, ...]
+    strategy_codes: tuple[int, ...]
+    strategy_names: tuple[str, ...]
+    vocab: LPVocabulary
+
+    @classmethod
+    def from_profile(cls, profile: Any, vocab: LPVocabulary) -> LPFeatures:
+        """Build features from an lp_profiles row or LPData dict.
+
+        Args:
+            profile: Mapping with lp_profiles columns (missing keys allowed).
+            vocab: Vocabulary to code strings against.
+
+        Returns:
+            LPFeatures for the profile.
+        """
+        features = cls()
+        features.vocab = vocab
+        org_id = profile.get("org_id")
+        features.org_id = str(org_id) if org_id is not None else None
+        features.is_lp = bool(profile.get("is_lp", True))
+
+        strategies = profile.get("strategies") or []
+        features.strategy_codes = vocab.strategies.codes(_normalize_string_list(strategies))
+        features.strategy_names = tuple(dict.fromkeys(strategies))
+
+        geographies = profile.get("geographic_preferences") or []
+        geo_lower = _normalize_string_list(geographies)
+        features.geography_codes = vocab.geographies.codes(geo_lower)
+        features.has_geographies = bool(geographies)
+        features.geography_global = "global" in geo_lower
+
+        sectors = profile.get("sector_preferences") or []
+        features.sector_codes = vocab.sectors.codes([s.lower().replace("_", " ") for s in sectors])
+        features.sector_names = tuple(dict.fromkeys(sectors))
+        features.has_sectors = bool(sectors)
+
+        features.fund_size_min = _to_float(profile.get("fund_size_min_mm"), 0)
+        fund_size_max = _to_float(profile.get("fund_size_max_mm"), float("inf"))
+        features.fund_size_max = float("inf") if fund_size_max == 0 else fund_size_max
+        features.check_size_min = profile.get("check_size_min_mm") or 0
+        features.check_size_max = profile.get("check_size_max_mm") or float("inf")
+        features.min_fund_number = profile.get("min_fund_number") or 1
+        features.esg_required = bool(profile.get("esg_required", False))
+        features.emerging_manager_ok = bool(profile.get("emerging_manager_ok", False))
+        features.modified_at = profile.get("modified_at")
+        return features
+
+    def __repr__(self) -> str:
+        return f"LPFeatures(org_id={self.org_id!r})"
+
+
+# =============================================================================
+# Feature Store
+# =============================================================================
+
+
+class LPFeatureStore:
+    """Process-wide LP features, loaded once and refreshed by delta.
+
+    The first refresh() loads every LP. Later calls only query the database
+    when the "lp" or "organization" version checksum has changed since the
+    last sync, and then fetch just the rows modified since shortly before
+    the newest modified_at already held (see _DELTA_OVERLAP). Deleted
+    profiles are detected by comparing the held row count to the LP row
+    count in the version manager.
+
+    Example:
+        >>> store = LPFeatureStore()
+        >>> store.refresh(conn)
+        >>> matrix = store.lp_matrix()
+    """
+
+    def __init__(self) -> None:
+        self.vocab = LPVocabulary()
+        self._features: dict[str, LPFeatures] = {}
+        self._checksums: dict[str, str] = {}
+        self._high_water: Any = None
+        self._loaded = False
+        self._generation = 0
+        self._matrix: LPMatrix | None = None
+        self._matrix_generation = -1
+        self._lock = threading.Lock()
+        self._stats: dict[str, Any] = {
+            "full_loads": 0,
+            "delta_loads": 0,
+            "skipped_refreshes": 0,
+            "rows_fetched": 0,
+            "last_refresh_ms": 0.0,
+        }
+
+    def refresh(self, conn: Any) -> int:
+        """Bring the store up to date with the database.
+
+        Args:
+            conn: Database connection with cursor() method.
+
+        Returns:
+            Number of LP rows fetched (0 when nothing changed).
+        """
+        with self._lock:
+            start = time.perf_counter()
+            refresh_versions_if_stale(conn)
+
+            if not self._loaded:
+                fetched = self._full_load(conn)
+                self._stats["full_loads"] += 1
+            elif self._has_changed():
+                fetched = self._delta_load(conn)
+                self._stats["delta_loads"] += 1
+            else:
+                self._stats["skipped_refreshes"] += 1
+                return 0
+
+            self._checksums = version_manager.get_checksums()
+            self._stats["rows_fetched"] += fetched
+            self._stats["last_refresh_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            return fetched
+
+    def _has_changed(self) -> bool:
+        """Whether tracked version checksums moved since the last sync."""
+        return any(
+            version_manager.has_entity_changed(entity, self._checksums.get(entity, ""))
+            for entity in _TRACKED_ENTITIES
+        )
+
+    def _apply(self, rows: list[Any]) -> None:
+        """Upsert fetched rows and advance the high-water mark.
+
+        Rows already held at the same modified_at are skipped, so re-reading
+        the overlap window does not rebuild the matrix.
+        """
+        changed = False
+        for row in rows:
+            org_id = str(row["org_id"])
+            modified_at = row.get("modified_at")
+            held = self._features.get(org_id)
+            if held is not None and modified_at is not None and held.modified_at == modified_at:
+                continue
+            self._features[org_id] = LPFeatures.from_profile(row, self.vocab)
+            changed = True
+            if modified_at is not None and (self._high_water is None or modified_at > self._high_water):
+                self._high_water = modified_at
+        if changed:
+            self._generation += 1
+
+    def _full_load(self, conn: Any) -> int:
+        with conn.cursor() as cur:
+            cur.execute(_FEATURE_COLUMNS)
+            rows = cur.fetchall()
+
+        self._features = {}
+        self._high_water = None
+        self._apply(rows)
+        self._generation += 1  # Even an empty load replaces the old matrix
+        self._loaded = True
+        logger.info(f"LP feature store loaded {len(rows)} profiles")
+        return len(rows)
+
+    def _delta_load(self, conn: Any) -> int:
+        with conn.cursor() as cur:
+            if self._high_water is None:
+                cur.execute(_FEATURE_COLUMNS)
+            else:
+                cur.execute(
+                    _FEATURE_COLUMNS + " WHERE GREATEST(lp.updated_at, o.updated_at) >= %s",
+                    (self._high_water - _DELTA_OVERLAP,),
+                )
+            rows = cur.fetchall()
+            self._apply(rows)
+
+            # Deletes leave no modified row behind; reconcile IDs when the
+            # held count disagrees with the current LP row count
+            lp_version = version_manager.versions.get("lp")
+            if lp_version is not None and lp_version.row_count != len(self._features):
+                cur.execute("SELECT org_id FROM lp_profiles")
+                live = {str(r["org_id"]) for r in cur.fetchall()}
+                removed = [org_id for org_id in self._features if org_id not in live]
+                for org_id in removed:
+                    del self._features[org_id]
+                if removed:
+                    self._generation += 1
+
+        logger.debug(f"LP feature store delta: {len(rows)} changed profiles")
+        return len(rows)
+
+    def features(self) -> list[LPFeatures]:
+        """Features for organizations currently flagged as LPs."""
+        return [f for f in self._features.values() if f.is_lp]
+
+    def get(self, org_id: Any) -> LPFeatures | None:
+        """Features for one LP organization, if held."""
+        return self._features.get(str(org_id))
+
+    def lp_matrix(self) -> LPMatrix:
+        """Batch-scoring matrix over features(), rebuilt only after changes."""
+        from src.batch_matching import compile_lp_matrix
+
+        with self._lock:
+            if self._matrix is None or self._matrix_generation != self._generation:
+                self._matrix = compile_lp_matrix(self.features())
+                self._matrix_generation = self._generation
+            return self._matrix
+
+    def clear(self) -> None:
+        """Drop all held features; the next refresh() reloads everything."""
+        with self._lock:
+            self._features = {}
+            self._checksums = {}
+            self._high_water = None
+            self._loaded = False
+            self._generation += 1
+            self._matrix = None
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Store size, vocabulary sizes and refresh counters."""
+        return {
+            "loaded": self._loaded,
+            "size": len(self._features),
+            "vocabulary": {
+                "strategies": len(self.vocab.strategies),
+                "geographies": len(self.vocab.geographies),
+                "sectors": len(self.vocab.sectors),
+            },
+            **self._stats,
+        }
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+
+# Global feature store instance
+lp_feature_store = LPFeatureStore()
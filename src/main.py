@@ -39,8 +39,16 @@ from psycopg.rows import dict_row
 from pydantic import BaseModel, Field
 
 from src import auth
+from src.cache import close_cache_backends
+from src.cache_invalidation import cache_invalidation_listener
 from src.config import get_settings, validate_settings_on_startup
+from src.database import close_async_pool, close_pool, get_pool, open_async_pool, open_pool
+from src.database import get_db as pooled_get_db
+from src.llm_client import close_llm_clients, open_llm_clients
 from src.logging_config import get_logger
+from src.match_content import match_content_worker
+from src.metrics import mark_process_dead
+from src.middleware import setup_metrics
 from src.preferences import get_user_preferences
 from src.routers import (
     admin_router,
@@ -163,7 +171,8 @@ def is_valid_uuid(value: str) -> bool:
 def get_db() -> psycopg.Connection[dict[str, Any]] | None:
     """Get database connection if configured.
 
-    Creates a new psycopg connection with dict_row factory for easy
+    Returns a pooled connection when the shared pool is open, otherwise
+    creates a new psycopg connection with dict_row factory for easy
     data access. The caller is responsible for closing the connection.
 
     IMPORTANT: This function automatically selects the appropriate database:
@@ -185,6 +194,10 @@ def get_db() -> psycopg.Connection[dict[str, Any]] | None:
                 finally:
                     conn.close()
     """
+    pool = get_pool()
+    if pool is not None:
+        return pooled_get_db()
+
     settings = get_settings()
     db_url = settings.active_database_url
     if db_url:
@@ -214,8 +227,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan handler for startup and shutdown events.
 
     Handles application lifecycle events:
-    - Startup: Validates configuration, initializes resources
-    - Shutdown: Cleans up resources
+    - Startup: Validates configuration, opens the database connection pools
+      and the shared LLM clients, starts the deferred match content worker
+      and the cache invalidation listener
+    - Shutdown: Stops the worker and the listener, closes the LLM clients
+      and the shared cache connection, drains the connection pools and
+      retires this worker's live metrics
 
     Args:
         app: The FastAPI application instance.
@@ -235,10 +252,27 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.error(f"Configuration validation failed: {e}")
         raise
 
+    open_pool()
+    await open_async_pool()
+    open_llm_clients()
+
+    settings = get_settings()
+    if settings.match_content_mode == "lazy" and settings.match_content_background:
+        match_content_worker.start()
+    if settings.cache_push_invalidation:
+        cache_invalidation_listener.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down LPxGP application")
+    await match_content_worker.stop()
+    await cache_invalidation_listener.stop()
+    await close_llm_clients()
+    close_cache_backends()
+    await close_async_pool()
+    close_pool()
+    mark_process_dead()
 
 
 # Create FastAPI app
@@ -249,6 +283,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Request latency and DB query metrics, served at /metrics
+setup_metrics(app)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
@@ -0,0 +1,287 @@
+"""Deferred (on-demand) match explanations.
+
+Generating an LLM explanation for every qualifying match during
+generate-matches costs seconds per match, while users only open a handful
+of match detail pages. In lazy mode (MATCH_CONTENT_MODE=lazy) the match run
+stores scores with template text instead, marked with
+TEMPLATE_MODEL_VERSION, and the LLM content is filled in later:
+    - ensure_match_content(): on first view of a match, generate and
+      persist its content before rendering
+    - stream_match_content(): the same, but yields the content as the LLM
+      generates it, so the page can render first and fill it in live
+    - MatchContentWorker: a low-priority background worker that works
+      through a fund's pending matches, highest score first
+
+Content is persisted with the model that produced it in model_version. A
+failed generation leaves the match pending, so it is retried on the next
+view rather than freezing template text in place.
+
+Example:
+    Fill in a match's content before rendering it::
+
+        from src.match_content import ensure_match_content
+
+        content = await ensure_match_content(conn, match_id)
+        if content:
+            match = {**match, **content}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from typing import Any, cast
+
+from src.config import get_settings
+from src.database import get_async_db
+from src.matching import (
+    FundData,
+    LPData,
+    MatchContent,
+    MatchContentUpdate,
+    ScoreBreakdown,
+    generate_llm_match_content,
+    stream_llm_match_content,
+)
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_MODEL_VERSION = "template"
+"""model_version of matches whose content is still template text."""
+
+_MATCH_CONTEXT_QUERY = """
+    SELECT m.id, m.score_breakdown, m.model_version,
+           to_jsonb(f) || jsonb_build_object('gp_name', g.name) AS fund,
+           to_jsonb(lp) || jsonb_build_object(
+               'name', o.name, 'hq_city', o.hq_city, 'hq_country', o.hq_country
+           ) AS lp
+    FROM fund_lp_matches m
+    JOIN funds f ON f.id = m.fund_id
+    JOIN organizations g ON g.id = f.org_id
+    JOIN lp_profiles lp ON lp.org_id = m.lp_org_id
+    JOIN organizations o ON o.id = m.lp_org_id
+    WHERE m.id = %s
+"""
+
+
+# =============================================================================
+# On-Demand Generation
+# =============================================================================
+
+
+async def ensure_match_content(conn: Any, match_id: str) -> MatchContent | None:
+    """Generate and persist LLM content for a match that is still pending.
+
+    Args:
+        conn: Async database connection.
+        match_id: fund_lp_matches ID.
+
+    Returns:
+        The newly generated content, or None if the match does not exist,
+        already has LLM content, or generation failed (it stays pending).
+    """
+    row = await _fetch_pending(conn, match_id)
+    if row is None:
+        return None
+    return await _generate_and_store(conn, row)
+
+
+async def stream_match_content(conn: Any, match_id: str) -> AsyncIterator[MatchContentUpdate]:
+    """Stream LLM content for a pending match and persist it when complete.
+
+    Args:
+        conn: Async database connection.
+        match_id: fund_lp_matches ID.
+
+    Yields:
+        MatchContentUpdate as the content is generated. Nothing is yielded
+        if the match does not exist or already has LLM content; the stream
+        ends without a done=True update if generation failed (the match
+        stays pending).
+    """
+    row = await _fetch_pending(conn, match_id)
+    if row is None:
+        return
+
+    settings = get_settings()
+    async for update in stream_llm_match_content(
+        cast(FundData, row["fund"]),
+        cast(LPData, row["lp"]),
+        cast(ScoreBreakdown, row["score_breakdown"] or {}),
+        ollama_base_url=settings.ollama_base_url,
+        ollama_model=settings.ollama_model,
+        timeout_seconds=settings.match_content_timeout_seconds,
+    ):
+        if update["done"]:
+            await _store(conn, row, update["content"])
+        yield update
+
+
+async def _fetch_pending(conn: Any, match_id: str) -> dict[str, Any] | None:
+    """The match with its fund and LP profiles, if its content is pending.
+
+    Ends the read transaction, so the connection is not left idle in
+    transaction (holding its snapshot) while the LLM generates.
+    """
+    async with conn.cursor() as cur:
+        await cur.execute(_MATCH_CONTEXT_QUERY, (match_id,))
+        row = await cur.fetchone()
+    await conn.rollback()
+    if not row or row["model_version"] != TEMPLATE_MODEL_VERSION:
+        return None
+    return cast(dict[str, Any], row)
+
+
+async def _generate_and_store(conn: Any, row: dict[str, Any]) -> MatchContent | None:
+    """Generate LLM content for a pending match row and persist it."""
+    settings = get_settings()
+    content = await generate_llm_match_content(
+        cast(FundData, row["fund"]),
+        cast(LPData, row["lp"]),
+        cast(ScoreBreakdown, row["score_breakdown"] or {}),
+        ollama_base_url=settings.ollama_base_url,
+        ollama_model=settings.ollama_model,
+        timeout_seconds=settings.match_content_timeout_seconds,
+    )
+    if content is None:
+        return None
+    await _store(conn, row, content)
+    return content
+
+
+async def _store(conn: Any, row: dict[str, Any], content: MatchContent) -> None:
+    """Persist LLM content over a pending match's template text."""
+    settings = get_settings()
+    async with conn.cursor() as cur:
+        # Only replace template text; a concurrent viewer may have won
+        await cur.execute(
+            """
+            UPDATE fund_lp_matches
+            SET explanation = %s, talking_points = %s, concerns = %s, model_version = %s
+            WHERE id = %s AND model_version = %s
+            """,
+            (
+                content["explanation"],
+                content["talking_points"],
+                content["concerns"],
+                settings.ollama_model,
+                row["id"],
+                TEMPLATE_MODEL_VERSION,
+            ),
+        )
+    await conn.commit()
+
+
+# =============================================================================
+# Background Worker
+# =============================================================================
+
+
+class MatchContentWorker:
+    """Low-priority worker that fills in deferred match content.
+
+    Funds are queued after a lazy match run. The worker processes one match
+    at a time, highest score first, so it never takes more than one slot
+    of the LLM backend away from on-demand requests.
+
+    Example:
+        >>> match_content_worker.start()
+        >>> match_content_worker.enqueue_fund(fund_id)
+        >>> await match_content_worker.stop()
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[str] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self.generated = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the worker on the running event loop."""
+        if not self.running:
+            # Created here so the queue belongs to the running loop
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run(self._queue), name="match-content-worker")
+
+    async def stop(self) -> None:
+        """Cancel the worker and wait for it to exit."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._queue = None
+
+    def enqueue_fund(self, fund_id: str) -> bool:
+        """Queue a fund's pending matches for background generation.
+
+        Returns:
+            False if the worker is not running (content is then generated
+            on view only).
+        """
+        if not self.running or self._queue is None:
+            return False
+        self._queue.put_nowait(fund_id)
+        return True
+
+    async def _run(self, queue: asyncio.Queue[str]) -> None:
+        while True:
+            fund_id = await queue.get()
+            try:
+                await self.process_fund(fund_id)
+            except Exception as e:
+                logger.warning(f"Background match content for fund {fund_id} failed: {e}")
+            finally:
+                queue.task_done()
+
+    async def process_fund(self, fund_id: str) -> int:
+        """Generate content for a fund's pending matches.
+
+        Args:
+            fund_id: Fund whose pending matches to fill in.
+
+        Returns:
+            Number of matches that received LLM content.
+        """
+        conn = await get_async_db()
+        if not conn:
+            return 0
+
+        generated = 0
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT id FROM fund_lp_matches
+                    WHERE fund_id = %s AND model_version = %s
+                    ORDER BY score DESC
+                    """,
+                    (fund_id, TEMPLATE_MODEL_VERSION),
+                )
+                pending = [str(row["id"]) for row in await cur.fetchall()]
+
+            for match_id in pending:
+                row = await _fetch_pending(conn, match_id)
+                if row is None:
+                    continue  # Generated on view in the meantime
+                if await _generate_and_store(conn, row) is None:
+                    # The backend is unavailable; leave the rest for on-view
+                    break
+                generated += 1
+        finally:
+            await conn.close()
+
+        self.generated += generated
+        logger.info(f"Generated background content for {generated}/{len(pending)} matches of fund {fund_id}")
+        return generated
+
+
+match_content_worker = MatchContentWorker()
+"""Process-wide background worker, started in the app lifespan."""
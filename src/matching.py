@@ -6,7 +6,7 @@ LLM-powered content generation.
 
 Features:
     - Rule-based compatibility scoring with hard and soft filters
-    - LLM-powered match explanations via Ollama
+    - LLM-powered match explanations via Ollama, optionally streamed
     - Fallback template-based content generation
     - Detailed score breakdowns for transparency
 
@@ -39,14 +39,19 @@ Example:
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from typing import TYPE_CHECKING, Any, TypedDict
+from collections.abc import AsyncIterator, Callable, Sequence
+from typing import TYPE_CHECKING, Any, TypedDict, cast
 
 import httpx
 
+from src.llm_cache import llm_cache_key, llm_response_cache
+from src.llm_client import llm_call, llm_client, llm_timeout, stream_ollama_generate
+
 if TYPE_CHECKING:
-    pass
+    from src.lp_feature_store import LPFeatures
 
 
 # =============================================================================
@@ -106,6 +111,19 @@ class MatchContent(TypedDict):
     concerns: list[str]
 
 
+class MatchContentUpdate(TypedDict):
+    """Progress of a streamed match content generation.
+
+    Attributes:
+        content: Content parsed so far. The explanation may be cut off
+            mid-sentence and the lists may be incomplete until done.
+        done: Whether the completion finished and parsed as valid JSON.
+    """
+
+    content: MatchContent
+    done: bool
+
+
 class FundData(TypedDict, total=False):
     """Fund data structure for matching.
 
@@ -181,6 +199,9 @@ class LPData(TypedDict, total=False):
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+# Bump when _build_llm_prompt() changes so cached explanations are ignored
+MATCH_CONTENT_PROMPT_VERSION = "1"
+
 # Scoring weights for soft scores (must sum to 1.0)
 _SCORING_WEIGHTS: dict[str, float] = {
     "geography": 0.30,
@@ -251,7 +272,7 @@ def _normalize_string_list(items: list[str] | None) -> list[str]:
 # =============================================================================
 
 
-def calculate_match_score(fund: FundData, lp: LPData) -> MatchResult:
+def calculate_match_score(fund: FundData, lp: LPData | LPFeatures) -> MatchResult:
     """Calculate compatibility score between a fund and an LP.
 
     Evaluates multiple criteria to determine how well a fund matches
@@ -271,7 +292,8 @@ def calculate_match_score(fund: FundData, lp: LPData) -> MatchResult:
 
     Args:
         fund: Fund profile data containing strategy, size, focus areas, etc.
-        lp: LP profile data containing preferences and requirements.
+        lp: LP profile data containing preferences and requirements, or
+            its precompiled LPFeatures from the LP feature store.
 
     Returns:
         MatchResult containing:
@@ -285,6 +307,43 @@ def calculate_match_score(fund: FundData, lp: LPData) -> MatchResult:
         >>> result = calculate_match_score(fund, lp)
         >>> print(f"Score: {result['score']}, Passed: {result['passed_hard_filters']}")
     """
+    fund_strategy = (fund.get("strategy") or "").lower()
+    fund_geo = fund.get("geographic_focus") or []
+    fund_sectors = fund.get("sector_focus") or []
+
+    # Read the LP side once. Raw profiles are compared as strings, as they
+    # always were; coding them against a vocabulary would cost more than it
+    # saves for a single pair. LPFeatures are already normalized.
+    if isinstance(lp, dict):
+        lp_strategies = _normalize_string_list(lp.get("strategies"))
+        strategy_match = fund_strategy in lp_strategies if fund_strategy else False
+        esg_required = lp.get("esg_required", False)
+        emerging_manager_ok = lp.get("emerging_manager_ok", False)
+        fund_size_min = _to_float(lp.get("fund_size_min_mm"), 0)
+        # None/0 max is unlimited
+        fund_size_max = _to_float(lp.get("fund_size_max_mm"), float("inf")) or float("inf")
+        lp_geo = lp.get("geographic_preferences") or []
+        lp_geo_lower = _normalize_string_list(lp_geo) if fund_geo else []
+        has_geographies = bool(lp_geo)
+        geography_global = "global" in lp_geo_lower
+        lp_sectors = lp.get("sector_preferences") or []
+        lp_sectors_lower = [s.lower().replace("_", " ") for s in lp_sectors] if fund_sectors else []
+        has_sectors = bool(lp_sectors)
+        min_fund_number = lp.get("min_fund_number") or 1
+    else:
+        vocab = lp.vocab
+        strategy_match = vocab.strategies.lookup(fund_strategy) in lp.strategy_codes if fund_strategy else False
+        esg_required = lp.esg_required
+        emerging_manager_ok = lp.emerging_manager_ok
+        fund_size_min = lp.fund_size_min
+        fund_size_max = lp.fund_size_max
+        lp_geo_lower = [vocab.geographies.term(c) for c in lp.geography_codes] if fund_geo else []
+        has_geographies = lp.has_geographies
+        geography_global = lp.geography_global
+        lp_sectors_lower = [vocab.sectors.term(c) for c in lp.sector_codes] if fund_sectors else []
+        has_sectors = lp.has_sectors
+        min_fund_number = lp.min_fund_number
+
     score_breakdown: dict[str, int | float] = {}
 
     # =========================================================================
@@ -292,13 +351,9 @@ def calculate_match_score(fund: FundData, lp: LPData) -> MatchResult:
     # =========================================================================
 
     # 1. Strategy match - fund strategy must be in LP's acceptable strategies
-    lp_strategies = _normalize_string_list(lp.get("strategies"))
-    fund_strategy = (fund.get("strategy") or "").lower()
-    strategy_match = fund_strategy in lp_strategies if fund_strategy else False
     score_breakdown["strategy"] = 100 if strategy_match else 0
 
     # 2. ESG requirement - if LP requires ESG, fund must have ESG policy
-    esg_required = lp.get("esg_required", False)
     fund_esg = fund.get("esg_policy", False)
     esg_match = (not esg_required) or fund_esg
     score_breakdown["esg"] = 100 if esg_match else 0
@@ -306,20 +361,12 @@ def calculate_match_score(fund: FundData, lp: LPData) -> MatchResult:
     # 3. Emerging manager check - if fund is emerging, LP must allow it
     # Funds with fund_number <= 2 are considered emerging managers
     fund_number = fund.get("fund_number") or 1
-    emerging_manager_ok = lp.get("emerging_manager_ok", False)
     is_emerging = fund_number <= 2
     emerging_match = (not is_emerging) or emerging_manager_ok
     score_breakdown["emerging_manager"] = 100 if emerging_match else 0
 
     # 4. Fund size fit - fund target must be within LP's acceptable range
     target_size = _to_float(fund.get("target_size_mm"), 0)
-    fund_size_min = _to_float(lp.get("fund_size_min_mm"), 0)
-    fund_size_max = _to_float(lp.get("fund_size_max_mm"), float("inf"))
-
-    # Handle None/0 max as unlimited
-    if fund_size_max == 0:
-        fund_size_max = float("inf")
-
     size_match = fund_size_min <= target_size <= fund_size_max
     score_breakdown["fund_size"] = 100 if size_match else 0
 
@@ -336,15 +383,11 @@ def calculate_match_score(fund: FundData, lp: LPData) -> MatchResult:
     # =========================================================================
 
     # 5. Geography overlap (30% weight)
-    fund_geo = fund.get("geographic_focus") or []
-    lp_geo = lp.get("geographic_preferences") or []
-
-    if fund_geo and lp_geo:
+    if fund_geo and has_geographies:
         fund_geo_lower = _normalize_string_list(fund_geo)
-        lp_geo_lower = _normalize_string_list(lp_geo)
 
         # "Global" matches everything
-        if "global" in lp_geo_lower:
+        if geography_global:
             geo_score = 100.0
         else:
             overlap = sum(1 for g in fund_geo_lower if g in lp_geo_lower)
@@ -355,13 +398,9 @@ def calculate_match_score(fund: FundData, lp: LPData) -> MatchResult:
     score_breakdown["geography"] = round(geo_score, 1)
 
     # 6. Sector overlap (30% weight)
-    fund_sectors = fund.get("sector_focus") or []
-    lp_sectors = lp.get("sector_preferences") or []
-
-    if fund_sectors and lp_sectors:
+    if fund_sectors and has_sectors:
         # Normalize with underscore replacement for fuzzy matching
         fund_sectors_lower = [s.lower().replace("_", " ") for s in fund_sectors]
-        lp_sectors_lower = [s.lower().replace("_", " ") for s in lp_sectors]
 
         # Fuzzy matching - check for partial matches
         overlap = 0
@@ -377,7 +416,6 @@ def calculate_match_score(fund: FundData, lp: LPData) -> MatchResult:
     score_breakdown["sector"] = round(sector_score, 1)
 
     # 7. Track record score (20% weight)
-    min_fund_number = lp.get("min_fund_number") or 1
     if fund_number >= min_fund_number:
         track_score = 100.0
     else:
@@ -548,6 +586,8 @@ async def generate_match_content(
     score_breakdown: ScoreBreakdown,
     ollama_base_url: str = "http://localhost:11434",
     ollama_model: str = "deepseek-r1:8b",
+    client: httpx.AsyncClient | None = None,
+    timeout_seconds: float = 180.0,
 ) -> MatchContent:
     """Generate AI-powered match explanation using Ollama LLM.
 
@@ -561,6 +601,9 @@ async def generate_match_content(
         score_breakdown: Scores from calculate_match_score().
         ollama_base_url: Ollama API base URL. Defaults to localhost.
         ollama_model: Ollama model to use. Defaults to "deepseek-r1:8b".
+        client: HTTP client to use instead of the shared Ollama client.
+        timeout_seconds: Deadline for the whole call, after which the
+            template fallback is returned. Defaults to 180 seconds.
 
     Returns:
         MatchContent containing:
@@ -573,34 +616,236 @@ async def generate_match_content(
         >>> print(content["explanation"])
         "Strong fit: Fund's buyout strategy aligns well with LP's mandate..."
     """
+    content = await generate_llm_match_content(
+        fund,
+        lp,
+        score_breakdown,
+        ollama_base_url=ollama_base_url,
+        ollama_model=ollama_model,
+        client=client,
+        timeout_seconds=timeout_seconds,
+    )
+    if content:
+        return content
+
+    # Fallback to template-based content
+    return _generate_fallback_content(fund, lp, score_breakdown)
+
+
+async def generate_llm_match_content(
+    fund: FundData,
+    lp: LPData,
+    score_breakdown: ScoreBreakdown,
+    ollama_base_url: str = "http://localhost:11434",
+    ollama_model: str = "deepseek-r1:8b",
+    client: httpx.AsyncClient | None = None,
+    timeout_seconds: float = 180.0,
+    use_cache: bool = True,
+) -> MatchContent | None:
+    """Generate match content with the LLM only, without a fallback.
+
+    Same as generate_match_content(), but returns None instead of template
+    content when the LLM is unavailable, times out, or returns unparseable
+    output. Use it where a failed generation should be retried later.
+
+    Args:
+        fund: Fund profile data.
+        lp: LP profile data.
+        score_breakdown: Scores from calculate_match_score().
+        ollama_base_url: Ollama API base URL. Defaults to localhost.
+        ollama_model: Ollama model to use. Defaults to "deepseek-r1:8b".
+        client: HTTP client to use instead of the shared Ollama client.
+        timeout_seconds: Deadline for the whole call. Defaults to 180 seconds.
+        use_cache: Whether to read the persistent LLM cache. Defaults to True.
+
+    Returns:
+        MatchContent from the LLM (or the LLM cache), or None if it could
+        not be generated.
+    """
     # Build context prompt for the LLM
     prompt = _build_llm_prompt(fund, lp, score_breakdown)
 
+    # The prompt holds every input the output depends on, so it is the key
+    cache_key = llm_cache_key("match_content", ollama_model, MATCH_CONTENT_PROMPT_VERSION, prompt)
+    if use_cache:
+        cached = await llm_response_cache.get("match_content", cache_key)
+        if cached is not None:
+            return cast(MatchContent, cached)
+
     try:
-        async with httpx.AsyncClient(timeout=180.0) as client:
-            response = await client.post(
-                f"{ollama_base_url}/api/generate",
-                json={
-                    "model": ollama_model,
-                    "prompt": prompt,
-                    "stream": False,
-                },
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                raw_response = result.get("response", "").strip()
-
-                # Try to extract JSON from the response
-                content = _parse_llm_response(raw_response)
-                if content:
-                    return content
+        async with asyncio.timeout(timeout_seconds):
+            if client is None:
+                async with llm_client("ollama") as shared_client:
+                    response = await _post_generate(shared_client, ollama_base_url, ollama_model, prompt, timeout_seconds)
+            else:
+                response = await _post_generate(client, ollama_base_url, ollama_model, prompt, timeout_seconds)
+
+        if response.status_code == 200:
+            result = response.json()
+            raw_response = result.get("response", "").strip()
+
+            # Try to extract JSON from the response
+            content = _parse_llm_response(raw_response)
+            if content:
+                await llm_response_cache.set(
+                    "match_content", cache_key, content, ollama_model, MATCH_CONTENT_PROMPT_VERSION
+                )
+            return content
+
+    except TimeoutError:
+        logger.warning(f"Match content generation exceeded {timeout_seconds}s")
+    except Exception as e:
+        logger.warning(f"Ollama not available or error: {e}")
+
+    return None
+
+
+async def _post_generate(
+    client: httpx.AsyncClient,
+    ollama_base_url: str,
+    ollama_model: str,
+    prompt: str,
+    timeout_seconds: float,
+) -> httpx.Response:
+    """Send a non-streaming generate request to Ollama."""
+    timeout = llm_timeout("ollama", ollama_model, "match_content", timeout_seconds)
+    async with llm_call("ollama", ollama_model, "match_content"):
+        return await client.post(
+            f"{ollama_base_url}/api/generate",
+            json={
+                "model": ollama_model,
+                "prompt": prompt,
+                "stream": False,
+            },
+            timeout=timeout,
+        )
+
 
+async def stream_llm_match_content(
+    fund: FundData,
+    lp: LPData,
+    score_breakdown: ScoreBreakdown,
+    ollama_base_url: str = "http://localhost:11434",
+    ollama_model: str = "deepseek-r1:8b",
+    timeout_seconds: float = 180.0,
+    use_cache: bool = True,
+) -> AsyncIterator[MatchContentUpdate]:
+    """Stream match content from the LLM as it is generated.
+
+    Streaming counterpart of generate_llm_match_content(): the JSON
+    completion is parsed incrementally, and an update is yielded each time
+    the visible content changes. A cache hit yields a single final update.
+    The final update (done=True) is cached like a non-streamed result.
+
+    Args:
+        fund: Fund profile data.
+        lp: LP profile data.
+        score_breakdown: Scores from calculate_match_score().
+        ollama_base_url: Ollama API base URL. Defaults to localhost.
+        ollama_model: Ollama model to use. Defaults to "deepseek-r1:8b".
+        timeout_seconds: Deadline for the whole call. Defaults to 180 seconds.
+        use_cache: Whether to read the persistent LLM cache. Defaults to True.
+
+    Yields:
+        MatchContentUpdate with the content so far. If the LLM is
+        unavailable, times out, or returns unparseable output, the stream
+        ends without a done=True update.
+
+    Example:
+        >>> async for update in stream_llm_match_content(fund, lp, breakdown):
+        ...     render(update["content"]["explanation"])
+    """
+    prompt = _build_llm_prompt(fund, lp, score_breakdown)
+    cache_key = llm_cache_key("match_content", ollama_model, MATCH_CONTENT_PROMPT_VERSION, prompt)
+    if use_cache:
+        cached = await llm_response_cache.get("match_content", cache_key)
+        if cached is not None:
+            yield MatchContentUpdate(content=cast(MatchContent, cached), done=True)
+            return
+
+    parser = PartialJSONParser()
+    last: MatchContent | None = None
+    try:
+        async with asyncio.timeout(timeout_seconds):
+            async for token in stream_ollama_generate(ollama_base_url, ollama_model, prompt, timeout_seconds):
+                partial = parser.feed(token)
+                if partial is None:
+                    continue
+                content = _partial_match_content(partial)
+                if content != last:
+                    last = content
+                    yield MatchContentUpdate(content=content, done=False)
+    except TimeoutError:
+        logger.warning(f"Streamed match content exceeded {timeout_seconds}s")
+        return
     except Exception as e:
         logger.warning(f"Ollama not available or error: {e}")
+        return
 
-    # Fallback to template-based content
-    return _generate_fallback_content(fund, lp, score_breakdown)
+    final = _parse_llm_response(parser.text.strip())
+    if final:
+        await llm_response_cache.set("match_content", cache_key, final, ollama_model, MATCH_CONTENT_PROMPT_VERSION)
+        yield MatchContentUpdate(content=final, done=True)
+
+
+async def generate_match_contents(
+    matches: Sequence[tuple[FundData, LPData, ScoreBreakdown]],
+    ollama_base_url: str = "http://localhost:11434",
+    ollama_model: str = "deepseek-r1:8b",
+    max_concurrency: int = 4,
+    timeout_seconds: float = 60.0,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> list[MatchContent]:
+    """Generate match content for many matches with bounded concurrency.
+
+    All requests go through the shared Ollama client, and at most
+    max_concurrency of this run's requests are in flight at once. Size it
+    to the Ollama backend's parallelism; anything beyond that only queues
+    server-side. Each match gets its own deadline (starting when its
+    request is sent) and falls back to template content when it is
+    exceeded.
+
+    Args:
+        matches: (fund, lp, score_breakdown) for each match.
+        ollama_base_url: Ollama API base URL.
+        ollama_model: Ollama model to use.
+        max_concurrency: Maximum concurrent generate requests.
+        timeout_seconds: Per-match deadline.
+        on_progress: Called with (completed, total) after each match.
+
+    Returns:
+        MatchContent for each match, in input order.
+
+    Example:
+        >>> contents = await generate_match_contents(
+        ...     [(fund, lp, result["score_breakdown"]) for lp, result in matched],
+        ...     max_concurrency=settings.ollama_max_concurrency,
+        ... )
+    """
+    total = len(matches)
+    completed = 0
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async with llm_client("ollama") as client:
+
+        async def generate_one(fund: FundData, lp: LPData, breakdown: ScoreBreakdown) -> MatchContent:
+            nonlocal completed
+            async with semaphore:
+                content = await generate_match_content(
+                    fund,
+                    lp,
+                    breakdown,
+                    ollama_base_url=ollama_base_url,
+                    ollama_model=ollama_model,
+                    client=client,
+                    timeout_seconds=timeout_seconds,
+                )
+            completed += 1
+            if on_progress is not None:
+                on_progress(completed, total)
+            return content
+
+        return list(await asyncio.gather(*(generate_one(*match) for match in matches)))
 
 
 def _build_llm_prompt(
@@ -697,6 +942,129 @@ def _parse_llm_response(raw_response: str) -> MatchContent | None:
         return None
 
 
+def _partial_match_content(partial: dict[str, Any]) -> MatchContent:
+    """MatchContent from a partially parsed LLM response, ignoring non-string values."""
+
+    def strings(value: Any) -> list[str]:
+        return [item for item in value if isinstance(item, str)] if isinstance(value, list) else []
+
+    explanation = partial.get("explanation")
+    return MatchContent(
+        explanation=explanation if isinstance(explanation, str) else "",
+        talking_points=strings(partial.get("talking_points"))[:3],
+        concerns=strings(partial.get("concerns"))[:2],
+    )
+
+
+class PartialJSONParser:
+    """Incrementally parse a JSON object that is still being generated.
+
+    Text is fed in chunks as it streams in. After each chunk the object is
+    parsed as if the text ended there: an unterminated string is closed
+    and open arrays and objects are closed, dropping a trailing key or
+    value that cannot be completed yet. Text before the first "{" (such as
+    a markdown code fence) is ignored.
+
+    The bracket and string state is kept between chunks, so each chunk is
+    scanned once.
+
+    Example:
+        >>> parser = PartialJSONParser()
+        >>> parser.feed('{"explanation": "Strong fi')
+        {'explanation': 'Strong fi'}
+        >>> parser.feed('t", "talking_points": ["Track')
+        {'explanation': 'Strong fit', 'talking_points': ['Track']}
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self._start = -1
+        self._scanned = 0
+        self._closers: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._complete = False
+        # (end offset, closers) after which the prefix is valid once closed
+        self._checkpoints: list[tuple[int, str]] = []
+
+    def feed(self, chunk: str) -> dict[str, Any] | None:
+        """Add streamed text and parse the object so far.
+
+        Args:
+            chunk: Next piece of the completion.
+
+        Returns:
+            The object parsed so far, or None if it has not started yet.
+        """
+        self.text += chunk
+        if self._start < 0:
+            self._start = self.text.find("{")
+            if self._start < 0:
+                return None
+            self._scanned = self._start
+        self._scan()
+        return self.value()
+
+    def value(self) -> dict[str, Any] | None:
+        """The object parsed so far, or None if it has not started yet."""
+        if self._start < 0:
+            return None
+
+        body = self.text[self._start : self._scanned]
+        closers = "".join(reversed(self._closers))
+        if self._complete:
+            return self._loads(body)
+
+        # Best case: the text so far is valid once the open string is closed
+        tail = body[:-1] if self._escape else body
+        if self._in_string:
+            tail += '"'
+        parsed = self._loads(tail + closers)
+        if parsed is not None:
+            return parsed
+
+        for end, checkpoint_closers in reversed(self._checkpoints):
+            parsed = self._loads(self.text[self._start : end] + checkpoint_closers)
+            if parsed is not None:
+                return parsed
+        return None
+
+    def _scan(self) -> None:
+        """Advance the string and bracket state over newly fed text."""
+        while self._scanned < len(self.text) and not self._complete:
+            char = self.text[self._scanned]
+            self._scanned += 1
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._checkpoint()
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._closers.append("}" if char == "{" else "]")
+                self._checkpoint()
+            elif char in "}]":
+                if self._closers:
+                    self._closers.pop()
+                self._complete = not self._closers
+                self._checkpoint()
+
+    def _checkpoint(self) -> None:
+        self._checkpoints.append((self._scanned, "".join(reversed(self._closers))))
+
+    @staticmethod
+    def _loads(text: str) -> dict[str, Any] | None:
+        try:
+            parsed = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        return parsed if isinstance(parsed, dict) else None
+
+
 def _generate_fallback_content(
     fund: FundData,
     lp: LPData,
@@ -0,0 +1,268 @@
+"""Prometheus metrics for LPxGP.
+
+Exported at ``/metrics`` in the Prometheus text format:
+
+- HTTP request latency per method, route template and status class
+- Database query count and time, overall and per request
+- Connection pool size, availability, waiters, checkouts and timeouts
+- Cache hits, misses, evictions and bytes per cache
+- LLM call latency and errors per backend and model
+- LP/GP search stage latency and latency budget overruns
+
+Request, query and LLM metrics are recorded as they happen (see
+``src/middleware/metrics.py``, the cursor factories in ``src/database.py``
+and ``llm_call()``). Cache and pool counters already live in
+``get_cache_stats()`` and ``PoolMetrics``; ``sync_process_metrics()`` copies
+them into Prometheus metrics at most once a second from the request path,
+and on every scrape.
+
+Multiple workers:
+    With several uvicorn/gunicorn workers each process has its own
+    counters, and a scrape reaches only one of them. Set
+    ``PROMETHEUS_MULTIPROC_DIR`` to an empty directory shared by the
+    workers (wiped on deploy) and every worker writes its metrics there;
+    ``/metrics`` then aggregates all of them. Gauges are summed over live
+    workers. Without the variable, metrics are per process.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+"""Whether metrics are shared between worker processes."""
+
+SYNC_INTERVAL_SECONDS = 1.0
+"""Minimum time between copies of cache and pool counters."""
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+http_request_seconds = Histogram(
+    "lpxgp_http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+db_queries = Counter("lpxgp_db_queries", "Database queries executed")
+db_query_seconds = Histogram(
+    "lpxgp_db_query_duration_seconds",
+    "Database query latency",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+db_queries_per_request = Histogram(
+    "lpxgp_db_queries_per_request",
+    "Database queries executed while serving one request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+db_seconds_per_request = Histogram(
+    "lpxgp_db_seconds_per_request",
+    "Database time spent while serving one request",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+db_pool_connections = Gauge(
+    "lpxgp_db_pool_connections",
+    "Pool connections by state (size, available, in_use, max)",
+    ["pool", "state"],
+    multiprocess_mode="livesum",
+)
+db_pool_waiting = Gauge(
+    "lpxgp_db_pool_waiting",
+    "Requests waiting for a pool connection",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+db_pool_checkouts = Counter("lpxgp_db_pool_checkouts", "Pool connection checkouts", ["pool"])
+db_pool_timeouts = Counter("lpxgp_db_pool_timeouts", "Pool checkouts that timed out", ["pool"])
+
+cache_hits = Counter("lpxgp_cache_hits", "Cache hits", ["cache"])
+cache_misses = Counter("lpxgp_cache_misses", "Cache misses", ["cache"])
+cache_evictions = Counter("lpxgp_cache_evictions", "Cache evictions", ["cache"])
+cache_bytes = Gauge(
+    "lpxgp_cache_bytes",
+    "Approximate bytes held by byte-bounded caches",
+    ["cache"],
+    multiprocess_mode="livesum",
+)
+
+llm_request_seconds = Histogram(
+    "lpxgp_llm_request_duration_seconds",
+    "LLM call latency",
+    ["backend", "model"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0),
+)
+llm_errors = Counter("lpxgp_llm_errors", "LLM calls that raised", ["backend", "model"])
+
+search_stage_seconds = Histogram(
+    "lpxgp_search_stage_duration_seconds",
+    "LP/GP search latency per stage (parse, embed, retrieve)",
+    ["entity", "stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+search_budget_exceeded = Counter(
+    "lpxgp_search_budget_exceeded",
+    "LP/GP search stages that ran over their latency budget",
+    ["entity", "stage"],
+)
+
+
+# =============================================================================
+# Recording
+# =============================================================================
+
+
+@dataclass
+class RequestDbTally:
+    """Database work done on behalf of one request."""
+
+    queries: int = 0
+    seconds: float = 0.0
+
+
+_request_db: ContextVar[RequestDbTally | None] = ContextVar("lpxgp_request_db", default=None)
+
+
+def start_request_tally() -> RequestDbTally:
+    """Start counting database queries for the current request.
+
+    Tasks and threadpool calls started by the request inherit the tally.
+    """
+    tally = RequestDbTally()
+    _request_db.set(tally)
+    return tally
+
+
+def observe_db_query(seconds: float) -> None:
+    """Record one executed query."""
+    db_queries.inc()
+    db_query_seconds.observe(seconds)
+    tally = _request_db.get()
+    if tally is not None:
+        tally.queries += 1
+        tally.seconds += seconds
+
+
+def observe_request(method: str, route: str, status: int, seconds: float, tally: RequestDbTally) -> None:
+    """Record one served request and the database work it did."""
+    http_request_seconds.labels(method, route, f"{status // 100}xx").observe(seconds)
+    db_queries_per_request.labels(route).observe(tally.queries)
+    db_seconds_per_request.labels(route).observe(tally.seconds)
+
+
+def observe_llm_call(backend: str, model: str, seconds: float | None) -> None:
+    """Record one LLM call; seconds is None if it raised."""
+    if seconds is None:
+        llm_errors.labels(backend, model).inc()
+    else:
+        llm_request_seconds.labels(backend, model).observe(seconds)
+
+
+def observe_search_stage(entity: str, stage: str, seconds: float, over_budget: bool) -> None:
+    """Record one search stage; over_budget counts a latency budget overrun."""
+    search_stage_seconds.labels(entity, stage).observe(seconds)
+    if over_budget:
+        search_budget_exceeded.labels(entity, stage).inc()
+
+
+# =============================================================================
+# Cache and Pool Counters
+# =============================================================================
+
+_last_values: dict[tuple[Counter, tuple[str, ...]], float] = {}
+_last_sync = 0.0
+
+
+def _advance(counter: Counter, labels: tuple[str, ...], value: float) -> None:
+    """Increase a counter to a cumulative value read from elsewhere.
+
+    The source counters reset when their cache is cleared or pool reopened;
+    a value lower than last time is then counted from zero.
+    """
+    last = _last_values.get((counter, labels), 0.0)
+    delta = value - last if value >= last else value
+    if delta:
+        counter.labels(*labels).inc(delta)
+    _last_values[(counter, labels)] = value
+
+
+def sync_process_metrics(force: bool = False) -> None:
+    """Copy this worker's cache and pool stats into Prometheus metrics.
+
+    Args:
+        force: Sync even if the last sync was under SYNC_INTERVAL_SECONDS ago.
+    """
+    global _last_sync
+    now = time.monotonic()
+    if not force and now - _last_sync < SYNC_INTERVAL_SECONDS:
+        return
+    _last_sync = now
+
+    from src.cache import get_cache_stats
+    from src.database import get_async_pool_stats, get_pool_stats
+
+    for name, stats in get_cache_stats().items():
+        _advance(cache_hits, (name,), stats.get("hits", 0))
+        _advance(cache_misses, (name,), stats.get("misses", 0))
+        _advance(cache_evictions, (name,), stats.get("evictions", 0))
+        if "bytes" in stats:
+            cache_bytes.labels(name).set(stats["bytes"])
+
+    for pool, stats in (("sync", get_pool_stats()), ("async", get_async_pool_stats())):
+        if not stats.get("enabled"):
+            continue
+        for state in ("size", "available", "in_use"):
+            db_pool_connections.labels(pool, state).set(stats[state])
+        db_pool_connections.labels(pool, "max").set(stats["max_size"])
+        db_pool_waiting.labels(pool).set(stats["waiting"])
+        _advance(db_pool_checkouts, (pool,), stats["checkouts"])
+        _advance(db_pool_timeouts, (pool,), stats["timeouts"])
+
+
+# =============================================================================
+# Exposition
+# =============================================================================
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format.
+
+    Returns:
+        The body and its content type. Aggregates every worker when
+        PROMETHEUS_MULTIPROC_DIR is set.
+    """
+    sync_process_metrics(force=True)
+    registry: Any = REGISTRY
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the shared metrics directory.
+
+    Called from the application lifespan on shutdown; no-op unless
+    PROMETHEUS_MULTIPROC_DIR is set.
+    """
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
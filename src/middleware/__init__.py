@@ -1,4 +1,4 @@
-"""LPxGP Middleware - Security and error handling."""
+"""LPxGP Middleware - Security, error handling and metrics."""
 
 from src.middleware.csrf import (
     get_csrf_token,
@@ -9,6 +9,10 @@ from src.middleware.error_handler import (
     sanitize_error_message,
     setup_exception_handlers,
 )
+from src.middleware.metrics import (
+    MetricsMiddleware,
+    setup_metrics,
+)
 from src.middleware.rate_limit import (
     limiter,
     rate_limit_auth,
@@ -27,6 +31,9 @@ __all__ = [
     # CSRF
     "setup_csrf_protection",
     "get_csrf_token",
+    # Metrics
+    "setup_metrics",
+    "MetricsMiddleware",
     # Rate limiting
     "setup_rate_limiting",
     "limiter",
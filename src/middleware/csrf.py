@@ -29,6 +29,7 @@ EXEMPT_PATHS = {
     "/api/webhooks/",
     "/health",
     "/ready",
+    "/metrics",
 }
 
 
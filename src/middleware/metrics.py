@@ -0,0 +1,70 @@
+"""Request metrics middleware.
+
+Times every HTTP request and counts the database queries made while
+serving it, labelled by route template (``/api/v1/lps/{lp_id}``, not the
+raw path) so label cardinality stays bounded. Written as plain ASGI
+middleware rather than ``BaseHTTPMiddleware`` to keep per-request overhead
+to a few microseconds and to leave streaming responses untouched.
+"""
+
+import time
+from typing import Any
+
+from fastapi import FastAPI
+
+from src.metrics import observe_request, start_request_tally, sync_process_metrics
+
+# Static assets are served by a mount, which has no route template
+STATIC_PREFIX = "/static/"
+
+
+def route_label(scope: dict[str, Any]) -> str:
+    """Route template a request matched, for use as a metric label."""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", "unmatched")
+    if scope.get("path", "").startswith(STATIC_PREFIX):
+        return "/static"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware feeding the Prometheus metrics in src.metrics."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tally = start_request_tally()
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router records the matched route in scope
+            observe_request(scope["method"], route_label(scope), status, time.perf_counter() - start, tally)
+            sync_process_metrics()
+
+
+# ---------------------------------------------------------------------------
+# Setup Function
+# ---------------------------------------------------------------------------
+
+
+def setup_metrics(app: FastAPI) -> None:
+    """Record request metrics for every request to the application.
+
+    The metrics are served by the ``/metrics`` endpoint in the health router.
+    """
+    app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,191 @@
+"""Keyset (seek) pagination for the list APIs.
+
+``LIMIT n OFFSET k`` makes Postgres produce and discard k rows, so page
+500 of a large listing is much slower than page 1. Keyset pagination
+remembers the sort key of the last row instead and asks for the rows that
+sort after it::
+
+    WHERE (o.name, o.id) > (%s, %s::uuid)
+    ORDER BY o.name ASC, o.id ASC
+    LIMIT 21
+
+With an index on the sort columns every page costs the same. The sort key
+always ends in a unique column so the order is total. Nullable columns are
+best sorted through a COALESCE to a sentinel (with a matching expression
+index), which keeps the comparison a single indexable row comparison.
+
+The last row's key travels to the client as an opaque cursor token
+(URL-safe base64 of a JSON list). It is not signed: a forged token can
+only change where a listing starts.
+
+Example:
+    >>> order = (SortKey("o.name"), SortKey("o.id", cast="uuid"))
+    >>> seek_sql, seek_params = seek_condition(order, decode_cursor(token, len(order)))
+    >>> order_by = order_by_clause(order)
+    >>> next_cursor = page_cursor(rows, per_page, lambda row: (row["name"], row["id"]))
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+import orjson
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor token that was not produced by encode_cursor()."""
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """One column of a keyset sort order.
+
+    Attributes:
+        column: SQL expression, e.g. "lp.total_aum_bn".
+        descending: Sort high to low.
+        nullable: Column may be NULL; NULLs sort last in either direction.
+        cast: Postgres type the cursor value is cast to, e.g. "uuid".
+    """
+
+    column: str
+    descending: bool = False
+    nullable: bool = False
+    cast: str | None = None
+
+    @property
+    def placeholder(self) -> str:
+        return f"%s::{self.cast}" if self.cast else "%s"
+
+    @property
+    def order_sql(self) -> str:
+        direction = "DESC" if self.descending else "ASC"
+        return f"{self.column} {direction} NULLS LAST" if self.nullable else f"{self.column} {direction}"
+
+
+def _token_value(value: Any) -> Any:
+    if isinstance(value, UUID | Decimal):
+        return str(value)  # Exact; the SortKey cast restores the type
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page as a cursor token."""
+    raw = orjson.dumps([_token_value(v) for v in values])
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str | None, size: int) -> list[Any] | None:
+    """Decode a cursor token.
+
+    Args:
+        token: Token from a previous page's next_cursor, or None.
+        size: Number of sort keys the token must hold.
+
+    Returns:
+        The sort key values, or None if no token was given.
+
+    Raises:
+        InvalidCursor: If the token is malformed.
+    """
+    if not token:
+        return None
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Malformed cursor")
+    if any(isinstance(v, dict | list) for v in values):
+        raise InvalidCursor("Malformed cursor")
+    return values
+
+
+def order_by_clause(keys: Sequence[SortKey]) -> str:
+    """ORDER BY expression list for a keyset sort order."""
+    return ", ".join(key.order_sql for key in keys)
+
+
+def seek_condition(keys: Sequence[SortKey], values: Sequence[Any] | None) -> tuple[str, list[Any]]:
+    """WHERE condition selecting the rows that sort after a cursor.
+
+    Uses a row-value comparison, which Postgres answers with a single index
+    range scan, when every key has the same direction and only the first
+    may be NULL; otherwise expands the lexicographic comparison.
+
+    Args:
+        keys: Sort order, ending in a unique column.
+        values: Decoded cursor, or None for the first page.
+
+    Returns:
+        SQL condition and its parameters ("TRUE" for the first page).
+    """
+    if values is None:
+        return "TRUE", []
+
+    uniform = len({key.descending for key in keys}) == 1 and not any(key.nullable for key in keys[1:])
+    if uniform:
+        first, rest = keys[0], keys[1:]
+        op = "<" if first.descending else ">"
+        if values[0] is None:
+            # Already in the trailing NULLs of the first column
+            if not rest:
+                return "FALSE", []
+            cols = ", ".join(key.column for key in rest)
+            marks = ", ".join(key.placeholder for key in rest)
+            return f"({first.column} IS NULL AND ({cols}) {op} ({marks}))", list(values[1:])
+        cols = ", ".join(key.column for key in keys)
+        marks = ", ".join(key.placeholder for key in keys)
+        condition = f"({cols}) {op} ({marks})"
+        if first.nullable:
+            condition = f"({condition} OR {first.column} IS NULL)"
+        return condition, list(values)
+
+    clauses: list[str] = []
+    params: list[Any] = []
+    for i, key in enumerate(keys):
+        parts: list[str] = []
+        part_params: list[Any] = []
+        for prev, value in zip(keys[:i], values[:i], strict=True):
+            if value is None:
+                parts.append(f"{prev.column} IS NULL")
+            else:
+                parts.append(f"{prev.column} = {prev.placeholder}")
+                part_params.append(value)
+        value = values[i]
+        if value is None:
+            continue  # Nothing sorts after NULL within this column
+        after = f"{key.column} {'<' if key.descending else '>'} {key.placeholder}"
+        if key.nullable:
+            after = f"({after} OR {key.column} IS NULL)"
+        parts.append(after)
+        part_params.append(value)
+        clauses.append("(" + " AND ".join(parts) + ")")
+        params.extend(part_params)
+    return ("(" + " OR ".join(clauses) + ")" if clauses else "FALSE"), params
+
+
+def page_cursor(
+    rows: list[dict[str, Any]], per_page: int, key: Callable[[dict[str, Any]], Sequence[Any]]
+) -> str | None:
+    """Cursor for the page after rows, fetched with LIMIT per_page + 1.
+
+    Trims the look-ahead row from rows in place.
+
+    Args:
+        rows: Rows fetched for this page, as dicts.
+        per_page: Page size requested.
+        key: Sort key values of a row, in SortKey order.
+
+    Returns:
+        The next page's cursor, or None if this is the last page.
+    """
+    if len(rows) <= per_page:
+        return None
+    del rows[per_page:]
+    return encode_cursor(key(rows[-1]))
@@ -32,14 +32,19 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, TypedDict
-
-import httpx
+from typing import Any, TypedDict, cast
 
 from src.config import get_settings
+from src.llm_cache import llm_cache_key, llm_response_cache
+from src.llm_client import llm_call, llm_client, llm_timeout
 
 logger = logging.getLogger(__name__)
 
+OPENROUTER_MODEL = "anthropic/claude-3.5-sonnet"
+
+# Bump when EXTRACTION_PROMPT changes so cached extractions are ignored
+PITCH_DECK_PROMPT_VERSION = "1"
+
 
 # =============================================================================
 # Type Definitions for Extracted Data
@@ -246,7 +251,8 @@ async def analyze_pitch_deck(
     """Extract structured information from pitch deck text using LLM.
 
     Uses either OpenRouter (cloud) or Ollama (local) to analyze the pitch
-    deck text and extract structured data for enhanced matching.
+    deck text and extract structured data for enhanced matching. Successful
+    extractions are kept in the persistent LLM cache.
 
     Args:
         pitch_deck_text: Raw text extracted from the pitch deck.
@@ -272,11 +278,25 @@ async def analyze_pitch_deck(
         logger.info(f"Truncated pitch deck text to {max_chars} characters")
 
     settings = get_settings()
+    use_openrouter = bool(use_openrouter and settings.openrouter_api_key)
+    model = OPENROUTER_MODEL if use_openrouter else settings.ollama_model
 
-    if use_openrouter and settings.openrouter_api_key:
-        return await _analyze_with_openrouter(pitch_deck_text, settings)
+    # Re-uploads of the same deck (modulo whitespace) reuse the extraction
+    cache_key = llm_cache_key(
+        "pitch_deck", model, PITCH_DECK_PROMPT_VERSION, " ".join(pitch_deck_text.split())
+    )
+    cached = await llm_response_cache.get("pitch_deck", cache_key)
+    if cached is not None:
+        return cast(ExtractedPitchDeckData, cached)
+
+    if use_openrouter:
+        extracted = await _analyze_with_openrouter(pitch_deck_text, settings)
     else:
-        return await _analyze_with_ollama(pitch_deck_text, settings)
+        extracted = await _analyze_with_ollama(pitch_deck_text, settings)
+
+    if extracted:
+        await llm_response_cache.set("pitch_deck", cache_key, extracted, model, PITCH_DECK_PROMPT_VERSION)
+    return extracted
 
 
 async def _analyze_with_openrouter(
@@ -294,8 +314,9 @@ async def _analyze_with_openrouter(
     """
     prompt = EXTRACTION_PROMPT.format(pitch_deck_text=pitch_deck_text)
 
+    timeout = llm_timeout("openrouter", OPENROUTER_MODEL, "pitch_deck", 120.0)
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with llm_client("openrouter") as client, llm_call("openrouter", OPENROUTER_MODEL, "pitch_deck"):
             response = await client.post(
                 "https://openrouter.ai/api/v1/chat/completions",
                 headers={
@@ -305,7 +326,7 @@ async def _analyze_with_openrouter(
                     "X-Title": "LPxGP Pitch Deck Analyzer",
                 },
                 json={
-                    "model": "anthropic/claude-3.5-sonnet",
+                    "model": OPENROUTER_MODEL,
                     "messages": [
                         {
                             "role": "system",
@@ -318,6 +339,7 @@ async def _analyze_with_openrouter(
                     "temperature": 0.1,
                     "max_tokens": 4000,
                 },
+                timeout=timeout,
             )
 
             if response.status_code == 200:
@@ -350,8 +372,9 @@ async def _analyze_with_ollama(
     """
     prompt = EXTRACTION_PROMPT.format(pitch_deck_text=pitch_deck_text)
 
+    timeout = llm_timeout("ollama", settings.ollama_model, "pitch_deck", 300.0)
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
+        async with llm_client("ollama") as client, llm_call("ollama", settings.ollama_model, "pitch_deck"):
             response = await client.post(
                 f"{settings.ollama_base_url}/api/generate",
                 json={
@@ -359,6 +382,7 @@ async def _analyze_with_ollama(
                     "prompt": prompt,
                     "stream": False,
                 },
+                timeout=timeout,
             )
 
             if response.status_code == 200:
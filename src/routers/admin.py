@@ -24,6 +24,7 @@ from fastapi.templating import Jinja2Templates
 
 from src import auth
 from src.config import get_settings
+from src.counts import Count, count_rows, grouped_counts
 from src.logging_config import get_logger
 from src.utils import get_db
 
@@ -34,6 +35,15 @@ logger = get_logger(__name__)
 TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
+# LP type tiles on /admin/lps, counted together by grouped_counts()
+LP_TYPE_GROUPS = {
+    "pensions": "lp_type = 'pension'",
+    "endowments": "lp_type = 'endowment'",
+    "family_offices": "lp_type = 'family_office'",
+    "other": "lp_type NOT IN ('pension', 'endowment', 'family_office')",
+}
+ADMIN_LP_FROM = "lp_profiles lp JOIN organizations o ON lp.org_id = o.id"
+
 
 # =============================================================================
 # Helper Functions
@@ -457,60 +467,50 @@ async def admin_lps_page(
 
     lps: list[dict[str, Any]] = []
     stats: dict[str, int] = {"total": 0, "pensions": 0, "endowments": 0, "family_offices": 0, "other": 0}
+    total = Count(0)
 
     conn = get_db()
     if conn:
         try:
             with conn.cursor() as cur:
-                query = """
-                    SELECT lp.id, o.name, o.description, lp.lp_type,
-                           CONCAT(o.hq_city, ', ', o.hq_country) as location,
-                           lp.total_aum_bn, lp.is_active
-                    FROM lp_profiles lp
-                    JOIN organizations o ON lp.org_id = o.id
-                    WHERE 1=1
-                """
-                params: list = []
+                conditions = ["1=1"]
+                filter_params: list[Any] = []
 
                 if q:
-                    query += " AND o.name ILIKE %s"
-                    params.append(f"%{q}%")
+                    conditions.append("o.name ILIKE %s")
+                    filter_params.append(f"%{q}%")
 
                 if type:
-                    query += " AND lp.lp_type = %s"
-                    params.append(type)
+                    conditions.append("lp.lp_type = %s")
+                    filter_params.append(type)
 
-                query += " ORDER BY o.name LIMIT %s OFFSET %s"
-                params.extend([per_page, (page - 1) * per_page])
+                where_clause = " AND ".join(conditions)
+                query = f"""
+                    SELECT lp.id, o.name, o.description, lp.lp_type,
+                           CONCAT(o.hq_city, ', ', o.hq_country) as location,
+                           lp.total_aum_bn, lp.is_active
+                    FROM {ADMIN_LP_FROM}
+                    WHERE {where_clause}
+                    ORDER BY o.name LIMIT %s OFFSET %s
+                """
 
-                cur.execute(query, params)
+                cur.execute(query, [*filter_params, per_page, (page - 1) * per_page])
                 rows = cur.fetchall()
                 lps = [dict(row) for row in rows]
 
-                cur.execute("SELECT COUNT(*) FROM lp_profiles")
-                result = cur.fetchone()
-                stats["total"] = result["count"] if result else 0
+                # One scan for all the type tiles, cached per data version
+                stats = grouped_counts(cur, "lp_profiles", LP_TYPE_GROUPS)
 
-                cur.execute("SELECT COUNT(*) FROM lp_profiles WHERE lp_type = 'pension'")
-                result = cur.fetchone()
-                stats["pensions"] = result["count"] if result else 0
-
-                cur.execute("SELECT COUNT(*) FROM lp_profiles WHERE lp_type = 'endowment'")
-                result = cur.fetchone()
-                stats["endowments"] = result["count"] if result else 0
-
-                cur.execute("SELECT COUNT(*) FROM lp_profiles WHERE lp_type = 'family_office'")
-                result = cur.fetchone()
-                stats["family_offices"] = result["count"] if result else 0
-
-                cur.execute("SELECT COUNT(*) FROM lp_profiles WHERE lp_type NOT IN ('pension', 'endowment', 'family_office')")
-                result = cur.fetchone()
-                stats["other"] = result["count"] if result else 0
+                if q or type:
+                    total = count_rows(cur, ADMIN_LP_FROM, where_clause, filter_params)
+                else:
+                    total = Count(stats["total"])
 
         except Exception as e:
             logger.warning(f"Failed to fetch LPs from database: {e}")
             lps = mock_lps
             stats = {"total": 5, "pensions": 2, "endowments": 1, "family_offices": 1, "other": 1}
+            total = Count(len(lps))
         finally:
             conn.close()
     else:
@@ -521,8 +521,9 @@ async def admin_lps_page(
             lps = [lp for lp in lps if q.lower() in lp["name"].lower()]
         if type:
             lps = [lp for lp in lps if lp["lp_type"] == type]
+        total = Count(len(lps))
 
-    total_pages = max(1, (stats["total"] + per_page - 1) // per_page)
+    total_pages = max(1, (total.value + per_page - 1) // per_page)
 
     return templates.TemplateResponse(
         request,
@@ -532,6 +533,8 @@ async def admin_lps_page(
             "user": user,
             "lps": lps,
             "stats": stats,
+            "total": total.value,
+            "total_exact": total.exact,
             "page": page,
             "per_page": per_page,
             "total_pages": total_pages,
@@ -26,8 +26,10 @@ from fastapi.templating import Jinja2Templates
 
 from src import auth
 from src.config import get_settings
+from src.counts import count_rows
 from src.database import get_db
 from src.logging_config import get_logger
+from src.pagination import InvalidCursor, SortKey, decode_cursor, order_by_clause, page_cursor, seek_condition
 from src.utils import is_valid_uuid
 
 logger = get_logger(__name__)
@@ -38,6 +40,14 @@ router = APIRouter(tags=["funds"])
 templates_path = Path(__file__).parent.parent / "templates"
 templates = Jinja2Templates(directory=templates_path)
 
+# /api/v1/funds order: newest vintage first, then by name (keyset pagination)
+FUND_API_ORDER = (
+    SortKey("f.vintage_year", descending=True, nullable=True),
+    SortKey("f.name"),
+    SortKey("f.id", cast="uuid"),
+)
+FUND_FROM = "funds f JOIN organizations o ON o.id = f.org_id"
+
 
 def serialize_row(row: dict[str, Any]) -> dict[str, Any]:
     """Convert a database row dict to JSON-serializable format.
@@ -224,12 +234,17 @@ async def api_v1_funds(
     vintage_year: int | None = Query(None),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(True, description="Also return the total match count"),
 ) -> JSONResponse:
     """REST API endpoint for Fund search.
 
     Returns JSON for programmatic access.
     Supports filtering by strategy, status, vintage_year.
-    Supports pagination.
+    Supports cursor pagination (pass next_cursor back) and, more slowly
+    at depth, page numbers. The total is counted once per filter set and
+    data version (estimated for very broad filters, see total_exact), and
+    skipped with include_total=false.
     """
     user = auth.get_current_user(request)
     if not user:
@@ -241,14 +256,24 @@ async def api_v1_funds(
     if page < 1:
         page = 1
 
+    try:
+        after = decode_cursor(cursor, len(FUND_API_ORDER))
+    except InvalidCursor:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Invalid cursor", "code": "INVALID_CURSOR"},
+        )
+
     conn = get_db()
     if not conn:
         return JSONResponse(
             content={
                 "data": [],
                 "total": 0,
+                "total_exact": True,
                 "page": page,
                 "per_page": per_page,
+                "next_cursor": None,
             }
         )
 
@@ -275,41 +300,36 @@ async def api_v1_funds(
 
             where_clause = " AND ".join(conditions)
 
-            # Count total
-            count_query = f"""
-                SELECT COUNT(*) as total
-                FROM funds f
-                JOIN organizations o ON o.id = f.org_id
-                WHERE {where_clause}
-            """
-            cur.execute(count_query, params)
-            count_row = cur.fetchone()
-            total = count_row["total"] if count_row else 0
+            # Counted once per filter set and data version
+            total = count_rows(cur, FUND_FROM, where_clause, params) if include_total else None
 
-            # Fetch paginated results
-            offset = (page - 1) * per_page
+            # Fetch the page plus one row to tell whether there is a next one
+            seek_sql, seek_params = seek_condition(FUND_API_ORDER, after)
+            offset = 0 if after is not None else (page - 1) * per_page
             data_query = f"""
                 SELECT
                     f.id, f.name, f.strategy, f.status, f.vintage_year,
                     f.target_size_mm, f.hard_cap_mm, f.check_size_min_mm,
                     o.id as org_id, o.name as org_name
-                FROM funds f
-                JOIN organizations o ON o.id = f.org_id
-                WHERE {where_clause}
-                ORDER BY f.vintage_year DESC NULLS LAST, f.name
+                FROM {FUND_FROM}
+                WHERE {where_clause} AND {seek_sql}
+                ORDER BY {order_by_clause(FUND_API_ORDER)}
                 LIMIT %s OFFSET %s
             """
-            cur.execute(data_query, [*params, per_page, offset])
-            rows = cur.fetchall()
+            cur.execute(data_query, [*params, *seek_params, per_page + 1, offset])
+            rows = [dict(row) for row in cur.fetchall()]
+            next_cursor = page_cursor(rows, per_page, lambda row: (row["vintage_year"], row["name"], row["id"]))
 
-            data = [serialize_row(dict(row)) for row in rows]
+            data = [serialize_row(row) for row in rows]
 
             return JSONResponse(
                 content={
                     "data": data,
-                    "total": total,
+                    "total": total.value if total else None,
+                    "total_exact": total.exact if total else None,
                     "page": page,
                     "per_page": per_page,
+                    "next_cursor": next_cursor,
                 }
             )
     except Exception as e:
@@ -888,12 +908,10 @@ async def upload_pitch_deck(
 @router.post("/api/funds/{fund_id}/generate-matches", response_class=HTMLResponse)
 async def generate_matches_for_fund(request: Request, fund_id: str):
     """Generate AI-powered matches for a fund against all LPs."""
-    from src.matching import (
-        FundData,
-        LPData,
-        calculate_match_score,
-        generate_match_content,
-    )
+    from src.batch_matching import score_fund_against_lps
+    from src.lp_feature_store import lp_feature_store
+    from src.match_content import TEMPLATE_MODEL_VERSION, match_content_worker
+    from src.matching import FundData, LPData, _generate_fallback_content, generate_match_contents
 
     if not is_valid_uuid(fund_id):
         return HTMLResponse(
@@ -929,62 +947,108 @@ async def generate_matches_for_fund(request: Request, fund_id: str):
                     status_code=404
                 )
 
-            # Fetch all LP profiles with organization info
+        # Bring the LP feature store up to date (a delta fetch after the
+        # first run) and score the fund against every LP in one pass
+        lp_feature_store.refresh(conn)
+        lp_matrix = lp_feature_store.lp_matrix()
+        fund_data = cast(FundData, dict(fund))
+        scores = score_fund_against_lps(fund_data, lp_matrix)
+        logger.info(
+            f"Fund {fund_id}: {scores.candidate_count}/{len(scores)} LPs passed hard filters "
+            f"(pruning ratio {scores.pruning_ratio:.3f})"
+        )
+
+        # Only create matches for scores above threshold
+        matched = scores.indices_at_least(50)
+        matches_skipped = len(lp_matrix) - len(matched)
+        matched_ids = [lp_matrix.lps[i].org_id for i in matched]
+
+        with conn.cursor() as cur:
+            # Fetch full profiles for the matched LPs only (for LLM content)
             cur.execute("""
                 SELECT lp.*, o.name, o.hq_city, o.hq_country
                 FROM lp_profiles lp
                 JOIN organizations o ON o.id = lp.org_id
-                WHERE o.is_lp = true
-            """)
-            lps = cur.fetchall()
-
-            for lp in lps:
-                # Calculate match score (cast dict to TypedDict for type safety)
-                fund_data = cast(FundData, dict(fund))
-                lp_data = cast(LPData, dict(lp))
-                result = calculate_match_score(fund_data, lp_data)
-
-                # Only create matches for scores above threshold
-                if result["score"] >= 50:
-                    # Generate LLM content
-                    content = await generate_match_content(
-                        fund_data,
-                        lp_data,
-                        result["score_breakdown"],
-                        ollama_base_url=settings.ollama_base_url,
-                        ollama_model=settings.ollama_model
-                    )
-
-                    # Upsert match
-                    cur.execute("""
-                        INSERT INTO fund_lp_matches
-                            (fund_id, lp_org_id, score, score_breakdown, explanation, talking_points, concerns, model_version)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (fund_id, lp_org_id)
-                        DO UPDATE SET
-                            score = EXCLUDED.score,
-                            score_breakdown = EXCLUDED.score_breakdown,
-                            explanation = EXCLUDED.explanation,
-                            talking_points = EXCLUDED.talking_points,
-                            concerns = EXCLUDED.concerns,
-                            model_version = EXCLUDED.model_version,
-                            created_at = NOW()
-                    """, (
-                        fund_id,
-                        lp["org_id"],
-                        result["score"],
-                        json.dumps(result["score_breakdown"]),
-                        content["explanation"],
-                        content["talking_points"],
-                        content["concerns"],
-                        settings.ollama_model
-                    ))
-                    matches_generated += 1
-                else:
+                WHERE lp.org_id = ANY(%s::uuid[])
+            """, (matched_ids,))
+            lps_by_id = {str(lp["org_id"]): lp for lp in cur.fetchall()}
+
+            to_generate = []
+            for i, org_id in zip(matched, matched_ids, strict=True):
+                lp = lps_by_id.get(org_id)
+                if lp is None:
+                    # Deleted since the feature store last synced
                     matches_skipped += 1
+                    continue
+                to_generate.append((lp["org_id"], cast(LPData, dict(lp)), scores.result(i)))
+
+            lazy = settings.match_content_mode == "lazy"
+            if lazy:
+                # Store template text now; LLM content is generated when a
+                # match is first viewed or by the background worker
+                contents = [
+                    _generate_fallback_content(fund_data, lp_data, result["score_breakdown"])
+                    for _, lp_data, result in to_generate
+                ]
+                model_version = TEMPLATE_MODEL_VERSION
+            else:
+                # Generate LLM content concurrently, bounded by the backend's
+                # parallelism; slow matches fall back to template content
+                progress_step = max(1, len(to_generate) // 10)
+
+                def log_progress(completed: int, total: int) -> None:
+                    if completed % progress_step == 0 or completed == total:
+                        logger.info(f"Fund {fund_id}: generated content for {completed}/{total} matches")
+
+                # End the read transaction; the pooled connection must not
+                # sit idle in transaction for the whole generation
+                conn.commit()
+                contents = await generate_match_contents(
+                    [(fund_data, lp_data, result["score_breakdown"]) for _, lp_data, result in to_generate],
+                    ollama_base_url=settings.ollama_base_url,
+                    ollama_model=settings.ollama_model,
+                    max_concurrency=settings.ollama_max_concurrency,
+                    timeout_seconds=settings.match_content_timeout_seconds,
+                    on_progress=log_progress,
+                )
+                model_version = settings.ollama_model
+
+            # Upsert all matches in one batch
+            upserts = [
+                (
+                    fund_id,
+                    lp_org_id,
+                    result["score"],
+                    json.dumps(result["score_breakdown"]),
+                    content["explanation"],
+                    content["talking_points"],
+                    content["concerns"],
+                    model_version,
+                )
+                for (lp_org_id, _, result), content in zip(to_generate, contents, strict=True)
+            ]
+            if upserts:
+                cur.executemany("""
+                    INSERT INTO fund_lp_matches
+                        (fund_id, lp_org_id, score, score_breakdown, explanation, talking_points, concerns, model_version)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (fund_id, lp_org_id)
+                    DO UPDATE SET
+                        score = EXCLUDED.score,
+                        score_breakdown = EXCLUDED.score_breakdown,
+                        explanation = EXCLUDED.explanation,
+                        talking_points = EXCLUDED.talking_points,
+                        concerns = EXCLUDED.concerns,
+                        model_version = EXCLUDED.model_version,
+                        created_at = NOW()
+                """, upserts)
+            matches_generated = len(upserts)
 
             conn.commit()
 
+        if lazy and matches_generated and settings.match_content_background:
+            match_content_worker.enqueue_fund(fund_id)
+
         return HTMLResponse(
             content=f"""
             <div class="text-center p-4">
@@ -18,12 +18,16 @@ from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 
 from src import auth
+from src.counts import count_rows
 from src.database import get_db
+from src.hybrid_search import GP_SOURCE, build_hybrid_query, hybrid_search, parse_within_budget, search_embedding
 from src.logging_config import get_logger
+from src.pagination import InvalidCursor, SortKey, decode_cursor, order_by_clause, page_cursor, seek_condition
 from src.search import (
     build_gp_search_sql,
     is_natural_language_query,
     parse_gp_search_query,
+    text_search_condition,
 )
 from src.utils import is_valid_uuid, serialize_row
 
@@ -35,6 +39,10 @@ router = APIRouter(tags=["gps"])
 templates_path = Path(__file__).parent.parent / "templates"
 templates = Jinja2Templates(directory=templates_path)
 
+# /api/v1/gps order: by name, org id breaks ties (keyset pagination)
+GP_API_ORDER = (SortKey("o.name"), SortKey("o.id", cast="uuid"))
+GP_FROM = "organizations o JOIN gp_profiles gp ON gp.org_id = o.id"
+
 
 @router.get("/api/v1/gps", response_class=JSONResponse)
 async def api_v1_gps(
@@ -44,12 +52,17 @@ async def api_v1_gps(
     location: str | None = Query(None),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(True, description="Also return the total match count"),
 ) -> JSONResponse:
     """REST API endpoint for GP search.
 
     Returns JSON for programmatic access.
     Supports filtering by strategy, location.
-    Supports pagination.
+    Supports cursor pagination (pass next_cursor back) and, more slowly
+    at depth, page numbers. The total is counted once per filter set and
+    data version (estimated for very broad filters, see total_exact), and
+    skipped with include_total=false.
     """
     user = auth.get_current_user(request)
     if not user:
@@ -61,14 +74,24 @@ async def api_v1_gps(
     if page < 1:
         page = 1
 
+    try:
+        after = decode_cursor(cursor, len(GP_API_ORDER))
+    except InvalidCursor:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Invalid cursor", "code": "INVALID_CURSOR"},
+        )
+
     conn = get_db()
     if not conn:
         return JSONResponse(
             content={
                 "data": [],
                 "total": 0,
+                "total_exact": True,
                 "page": page,
                 "per_page": per_page,
+                "next_cursor": None,
             }
         )
 
@@ -78,8 +101,9 @@ async def api_v1_gps(
             params: list[Any] = []
 
             if search:
-                conditions.append("(o.name ILIKE %s OR o.hq_city ILIKE %s)")
-                params.extend([f"%{search}%", f"%{search}%"])
+                text_condition, text_params = text_search_condition(search)
+                conditions.append(text_condition)
+                params.extend(text_params)
 
             if strategy:
                 conditions.append("gp.investment_philosophy ILIKE %s")
@@ -91,41 +115,36 @@ async def api_v1_gps(
 
             where_clause = " AND ".join(conditions)
 
-            # Count total
-            count_query = f"""
-                SELECT COUNT(*) as total
-                FROM organizations o
-                JOIN gp_profiles gp ON gp.org_id = o.id
-                WHERE {where_clause}
-            """
-            cur.execute(count_query, params)
-            count_row = cur.fetchone()
-            total = count_row["total"] if count_row else 0
+            # Counted once per filter set and data version
+            total = count_rows(cur, GP_FROM, where_clause, params) if include_total else None
 
-            # Fetch paginated results
-            offset = (page - 1) * per_page
+            # Fetch the page plus one row to tell whether there is a next one
+            seek_sql, seek_params = seek_condition(GP_API_ORDER, after)
+            offset = 0 if after is not None else (page - 1) * per_page
             data_query = f"""
                 SELECT
                     o.id, o.name, o.hq_city, o.hq_country, o.website,
                     gp.investment_philosophy, gp.team_size, gp.years_investing,
                     (SELECT COUNT(*) FROM funds f WHERE f.org_id = o.id) as fund_count
-                FROM organizations o
-                JOIN gp_profiles gp ON gp.org_id = o.id
-                WHERE {where_clause}
-                ORDER BY o.name
+                FROM {GP_FROM}
+                WHERE {where_clause} AND {seek_sql}
+                ORDER BY {order_by_clause(GP_API_ORDER)}
                 LIMIT %s OFFSET %s
             """
-            cur.execute(data_query, [*params, per_page, offset])
-            rows = cur.fetchall()
+            cur.execute(data_query, [*params, *seek_params, per_page + 1, offset])
+            rows = [dict(row) for row in cur.fetchall()]
+            next_cursor = page_cursor(rows, per_page, lambda row: (row["name"], row["id"]))
 
-            data = [serialize_row(dict(row)) for row in rows]
+            data = [serialize_row(row) for row in rows]
 
             return JSONResponse(
                 content={
                     "data": data,
-                    "total": total,
+                    "total": total.value if total else None,
+                    "total_exact": total.exact if total else None,
                     "page": page,
                     "per_page": per_page,
+                    "next_cursor": next_cursor,
                 }
             )
     except Exception as e:
@@ -146,7 +165,9 @@ async def gps_page(
 ) -> HTMLResponse | RedirectResponse:
     """GPs page for browsing and searching GP profiles.
 
-    Requires authentication. Supports AI-powered natural language search.
+    Requires authentication. Supports AI-powered natural language search;
+    text searches list the most relevant GPs first, fusing full-text and
+    semantic rankings (src/hybrid_search.py).
     """
     user = auth.get_current_user(request)
     if not user:
@@ -162,6 +183,33 @@ async def gps_page(
         "strategies": [],
     }
 
+    # Check if search is natural language (AI parsing) or simple text
+    parsed_filters: dict[str, Any] = {}
+    text = search
+    if search and is_natural_language_query(search):
+        # Use AI to parse the query
+        parsed_filters = await parse_within_budget(parse_gp_search_query(search), search, "gp")
+        # Add strategy from dropdown if specified
+        if strategy:
+            parsed_filters["strategy"] = strategy
+        # Free text is ranked rather than filtered on
+        text = parsed_filters.get("text_search")
+        structured = {key: value for key, value in parsed_filters.items() if key != "text_search"}
+        where_clause, params = build_gp_search_sql(structured)
+    else:
+        # Simple text search
+        conditions = ["o.is_gp = TRUE"]
+        simple_params: list[Any] = []
+        if strategy:
+            conditions.append("gp.investment_philosophy ILIKE %s")
+            simple_params.append(f"%{strategy}%")
+        where_clause = " AND ".join(conditions)
+        params = simple_params
+
+    # Relevance (full-text and semantic) first when searching text
+    embedding = await search_embedding(text, "gp")
+    query = build_hybrid_query(GP_SOURCE, where_clause, params, text, embedding)
+
     conn = get_db()
     if not conn:
         return templates.TemplateResponse(request, "pages/gps.html", empty_response)
@@ -186,55 +234,7 @@ async def gps_page(
             """)
             strategies = [row["strategy"] for row in cur.fetchall() if row["strategy"]]
 
-            # Build query with optional filters
-            base_query = """
-                SELECT
-                    o.id, o.name, o.hq_city, o.hq_country, o.website,
-                    gp.investment_philosophy, gp.team_size, gp.years_investing,
-                    gp.spun_out_from, gp.notable_exits,
-                    (SELECT COUNT(*) FROM funds f WHERE f.org_id = o.id) as fund_count,
-                    CASE
-                        WHEN gp.investment_philosophy ILIKE '%%buyout%%' THEN 'buyout'
-                        WHEN gp.investment_philosophy ILIKE '%%growth%%' THEN 'growth'
-                        WHEN gp.investment_philosophy ILIKE '%%venture%%' THEN 'venture'
-                        WHEN gp.investment_philosophy ILIKE '%%real estate%%' THEN 'real_estate'
-                        WHEN gp.investment_philosophy ILIKE '%%infrastructure%%' THEN 'infrastructure'
-                        WHEN gp.investment_philosophy ILIKE '%%credit%%' THEN 'credit'
-                        WHEN gp.investment_philosophy ILIKE '%%secondaries%%' THEN 'secondaries'
-                        ELSE NULL
-                    END as strategy
-                FROM organizations o
-                JOIN gp_profiles gp ON gp.org_id = o.id
-                WHERE {where_clause}
-                ORDER BY gp.years_investing DESC NULLS LAST, o.name
-                LIMIT 100
-            """
-
-            # Check if search is natural language (AI parsing) or simple text
-            parsed_filters: dict[str, Any] = {}
-            if search and is_natural_language_query(search):
-                # Use AI to parse the query
-                parsed_filters = await parse_gp_search_query(search)
-                # Add strategy from dropdown if specified
-                if strategy:
-                    parsed_filters["strategy"] = strategy
-                where_clause, params = build_gp_search_sql(parsed_filters)
-            else:
-                # Simple text search
-                conditions = ["o.is_gp = TRUE"]
-                simple_params: list[Any] = []
-                if search:
-                    conditions.append("(o.name ILIKE %s OR o.hq_city ILIKE %s OR gp.investment_philosophy ILIKE %s)")
-                    simple_params.extend([f"%{search}%", f"%{search}%", f"%{search}%"])
-                if strategy:
-                    conditions.append("gp.investment_philosophy ILIKE %s")
-                    simple_params.append(f"%{strategy}%")
-                where_clause = " AND ".join(conditions)
-                params = simple_params
-
-            query = base_query.format(where_clause=where_clause)
-            cur.execute(query, params)
-            gps = cur.fetchall()
+            gps = hybrid_search(cur, query)
 
             # Calculate total funds
             total_funds = sum(gp["fund_count"] or 0 for gp in gps)
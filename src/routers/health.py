@@ -2,7 +2,9 @@
 
 This router provides:
 - /health: Basic health check (GET and HEAD)
-- /api/status: Detailed status with feature flags
+- /api/status: Detailed status with feature flags, pool metrics, LLM
+  client latency, circuit breaker state and adaptive timeouts
+- /metrics: Prometheus metrics (request latency, DB, pool, caches, LLM)
 """
 
 from __future__ import annotations
@@ -10,9 +12,12 @@ from __future__ import annotations
 from typing import Any
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from src.config import get_settings
+from src.database import get_async_pool_stats, get_pool_stats
+from src.llm_client import get_llm_client_stats
+from src.metrics import render_metrics
 
 router = APIRouter(tags=["health"])
 
@@ -37,11 +42,15 @@ async def health_check() -> dict[str, str]:
 async def api_status() -> dict[str, Any]:
     """API status with non-sensitive configuration info.
 
-    Returns current environment and feature flag status. Does not expose
-    any sensitive configuration values like API keys.
+    Returns current environment and feature flag status, plus database
+    pool metrics (wait time, saturation), per-model LLM latency
+    histograms, and per-backend circuit breaker state and adaptive
+    timeouts. Does not expose any sensitive
+    configuration values like API keys or connection strings.
 
     Returns:
-        JSON object with status, environment, and feature flags.
+        JSON object with status, environment, feature flags, pool stats
+        and LLM client stats.
     """
     settings = get_settings()
     return {
@@ -51,4 +60,19 @@ async def api_status() -> dict[str, Any]:
             "semantic_search": settings.enable_semantic_search,
             "agent_matching": settings.enable_agent_matching,
         },
+        "database_pool": get_pool_stats(),
+        "database_async_pool": get_async_pool_stats(),
+        "llm_clients": get_llm_client_stats(),
     }
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint.
+
+    Returns:
+        All metrics in the Prometheus text exposition format, aggregated
+        over every worker when PROMETHEUS_MULTIPROC_DIR is set.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
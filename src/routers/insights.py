@@ -25,6 +25,7 @@ from fastapi.templating import Jinja2Templates
 from src import auth
 from src.database import get_db
 from src.logging_config import get_logger
+from src.lp_feature_store import LPFeatures, LPVocabulary, lp_feature_store
 from src.utils import is_valid_uuid
 
 logger = get_logger(__name__)
@@ -171,7 +172,7 @@ async def get_mutual_interests(request: Request) -> HTMLResponse:
 # =============================================================================
 
 
-def calculate_fund_match_score(mandate: dict, fund: dict) -> dict[str, Any]:
+def calculate_fund_match_score(mandate: dict | LPFeatures, fund: dict) -> dict[str, Any]:
     """Calculate match score between LP mandate and fund.
 
     Scoring:
@@ -179,12 +180,19 @@ def calculate_fund_match_score(mandate: dict, fund: dict) -> dict[str, Any]:
     - Geography match: 30%
     - Check size fit: 20%
     - Sector match: 10%
+
+    The mandate may be an lp_profiles row or the LP's precompiled
+    LPFeatures from the LP feature store. A row is coded against its own
+    vocabulary, so ad-hoc mandates never grow the store's.
     """
+    if not isinstance(mandate, LPFeatures):
+        mandate = LPFeatures.from_profile(mandate, LPVocabulary())
+
     score_breakdown = {}
     total_score = 0.0
 
     # Strategy match (40%)
-    mandate_strategies = set(mandate.get("strategies") or [])
+    mandate_strategies = mandate.strategy_names
     fund_strategy = fund.get("strategy")
     if fund_strategy and fund_strategy in mandate_strategies:
         score_breakdown["strategy"] = 40
@@ -195,15 +203,16 @@ def calculate_fund_match_score(mandate: dict, fund: dict) -> dict[str, Any]:
         score_breakdown["strategy"] = 20  # No preference = partial match
 
     # Geography match (30%)
-    mandate_geos = set(mandate.get("geographic_preferences") or [])
+    geographies = mandate.vocab.geographies
+    mandate_geos = [geographies.term(c) for c in mandate.geography_codes]
     fund_geo = fund.get("geographic_focus")
-    if not mandate_geos:
+    if not mandate.has_geographies:
         score_breakdown["geography"] = 15  # No preference
         total_score += 15
-    elif fund_geo and any(g.lower() in fund_geo.lower() for g in mandate_geos):
+    elif fund_geo and any(g in fund_geo.lower() for g in mandate_geos):
         score_breakdown["geography"] = 30
         total_score += 30
-    elif "global" in [g.lower() for g in mandate_geos]:
+    elif mandate.geography_global:
         score_breakdown["geography"] = 25
         total_score += 25
     else:
@@ -211,8 +220,8 @@ def calculate_fund_match_score(mandate: dict, fund: dict) -> dict[str, Any]:
 
     # Check size fit (20%)
     fund_size = fund.get("target_size_mm") or 0
-    lp_min = mandate.get("check_size_min_mm") or 0
-    lp_max = mandate.get("check_size_max_mm") or float("inf")
+    lp_min = mandate.check_size_min
+    lp_max = mandate.check_size_max
 
     # Typical LP check is 1-5% of fund size
     typical_check_min = fund_size * 0.01
@@ -228,12 +237,12 @@ def calculate_fund_match_score(mandate: dict, fund: dict) -> dict[str, Any]:
         score_breakdown["check_size"] = 0
 
     # Sector match (10%)
-    mandate_sectors = set(mandate.get("sector_preferences") or [])
+    mandate_sectors = mandate.sector_names
     fund_sectors = set(fund.get("sectors") or [])
     if not mandate_sectors:
         score_breakdown["sector"] = 5
         total_score += 5
-    elif mandate_sectors & fund_sectors:
+    elif any(s in fund_sectors for s in mandate_sectors):
         score_breakdown["sector"] = 10
         total_score += 10
     else:
@@ -261,8 +270,9 @@ async def get_lp_fund_recommendations(request: Request) -> HTMLResponse:
             # Get LP's mandate
             cur.execute(
                 """
-                SELECT lp.strategies, lp.geographic_preferences, lp.sector_preferences,
-                       lp.check_size_min_mm, lp.check_size_max_mm
+                SELECT lp.org_id, lp.strategies, lp.geographic_preferences, lp.sector_preferences,
+                       lp.check_size_min_mm, lp.check_size_max_mm,
+                       GREATEST(lp.updated_at, o.updated_at) AS modified_at
                 FROM lp_profiles lp
                 JOIN organizations o ON o.id = lp.org_id
                 JOIN employment e ON e.org_id = o.id AND e.is_current = TRUE
@@ -302,10 +312,16 @@ async def get_lp_fund_recommendations(request: Request) -> HTMLResponse:
                     content='<div class="text-center py-8 text-navy-500">No funds available.</div>'
                 )
 
+            # Score with the LP's precompiled features, unless the store
+            # has not yet synced the latest edit to this mandate
+            features = lp_feature_store.get(mandate.get("org_id"))
+            if features is None or features.modified_at != mandate.get("modified_at"):
+                features = LPFeatures.from_profile(mandate, LPVocabulary())
+
             # Score and rank funds
             scored_funds = []
             for fund in funds:
-                score_result = calculate_fund_match_score(mandate, fund)
+                score_result = calculate_fund_match_score(features, fund)
                 if score_result["total_score"] >= 30:  # Minimum threshold
                     scored_funds.append({**fund, **score_result})
 
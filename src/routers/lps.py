@@ -18,12 +18,24 @@ from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 
 from src import auth
-from src.database import get_db
+from src.cache import make_cache_key, page_cache, version_manager
+from src.counts import count_rows_async
+from src.database import get_async_db, get_db
+from src.hybrid_search import (
+    LP_SOURCE,
+    HybridQuery,
+    build_hybrid_query,
+    hybrid_search_async,
+    parse_within_budget,
+    search_embedding,
+)
 from src.logging_config import get_logger
+from src.pagination import InvalidCursor, SortKey, decode_cursor, order_by_clause, page_cursor, seek_condition
 from src.search import (
     build_lp_search_sql,
     is_natural_language_query,
     parse_lp_search_query,
+    text_search_condition,
 )
 from src.shortlists import is_in_shortlist
 from src.utils import is_valid_uuid, serialize_row
@@ -36,6 +48,70 @@ router = APIRouter(tags=["lps"])
 templates_path = Path(__file__).parent.parent / "templates"
 templates = Jinja2Templates(directory=templates_path)
 
+# LP lists are fresh for 30 seconds and served stale (while one background
+# task reloads them) for two more minutes. Keys include the data version,
+# so pushed LP changes (src/cache_invalidation.py) take effect at once.
+LP_LIST_TTL_SECONDS = 30
+LP_LIST_STALE_SECONDS = 120
+LP_TYPES_TTL_SECONDS = 300
+LP_TYPES_STALE_SECONDS = 3600
+
+# /api/v1/lps order: largest first, unknown AUM (as -1) last, org id breaks
+# ties. Matches idx_lp_profiles_aum_keyset (migration 020) for keyset paging.
+LP_API_ORDER = (
+    SortKey("COALESCE(lp.total_aum_bn, -1)", descending=True, cast="numeric"),
+    SortKey("lp.org_id", descending=True, cast="uuid"),
+)
+LP_FROM = "organizations o JOIN lp_profiles lp ON lp.org_id = o.id"
+
+
+def _lp_sort_key(row: dict[str, Any]) -> tuple[Any, Any]:
+    """LP_API_ORDER values of a row, for its cursor."""
+    aum = row["total_aum_bn"]
+    return (aum if aum is not None else -1, row["id"])
+
+
+def _lp_list_key(*parts: Any) -> str:
+    """Cache key for an LP list, tied to the current data version."""
+    return make_cache_key("lps", version_manager.combined_checksum, *parts)
+
+
+async def _fetch_rows(query: str, params: list[Any]) -> list[dict[str, Any]] | None:
+    """Run a read query on its own connection.
+
+    Loaders may run in a background refresh after the request finished,
+    so they cannot share the request's connection.
+
+    Returns:
+        The rows, or None if no database is configured.
+    """
+    conn = await get_async_db()
+    if not conn:
+        return None
+    try:
+        async with conn.cursor() as cur:
+            await cur.execute(query, params)
+            return [dict(row) for row in await cur.fetchall()]
+    finally:
+        await conn.close()
+
+
+async def _search_rows(query: HybridQuery) -> list[dict[str, Any]] | None:
+    """Run a hybrid search on its own connection (see _fetch_rows).
+
+    Returns:
+        The rows with their score components, or None if no database is
+        configured.
+    """
+    conn = await get_async_db()
+    if not conn:
+        return None
+    try:
+        async with conn.cursor() as cur:
+            return await hybrid_search_async(cur, query)
+    finally:
+        await conn.close()
+
 
 @router.get("/lps", response_class=HTMLResponse, response_model=None)
 async def lps_page(
@@ -45,7 +121,10 @@ async def lps_page(
 ) -> HTMLResponse | RedirectResponse:
     """LPs page for browsing and searching LP profiles.
 
-    Requires authentication.
+    Requires authentication. Text searches list the most relevant LPs
+    first, fusing full-text and semantic rankings (src/hybrid_search.py).
+    The LP type dropdown and result lists are cached in page_cache with
+    stale-while-revalidate.
     """
     user = auth.get_current_user(request)
     if not user:
@@ -61,79 +140,77 @@ async def lps_page(
         "lp_types": [],
     }
 
-    conn = get_db()
-    if not conn:
-        return templates.TemplateResponse(request, "pages/lps.html", empty_response)
-
-    try:
-        with conn.cursor() as cur:
-            # Get distinct LP types for filter dropdown
-            cur.execute("""
-                SELECT DISTINCT lp_type FROM lp_profiles
-                WHERE lp_type IS NOT NULL
-                ORDER BY lp_type
-            """)
-            lp_types = [row["lp_type"] for row in cur.fetchall()]
-
-            # Build query with optional filters
-            base_query = """
-                SELECT
-                    o.id, o.name, o.hq_city, o.hq_country, o.website,
-                    lp.lp_type, lp.total_aum_bn, lp.pe_allocation_pct,
-                    lp.check_size_min_mm, lp.check_size_max_mm,
-                    lp.geographic_preferences, lp.strategies
-                FROM organizations o
-                JOIN lp_profiles lp ON lp.org_id = o.id
-                WHERE {where_clause}
-                ORDER BY lp.total_aum_bn DESC NULLS LAST
-                LIMIT 100
+    # Get distinct LP types for filter dropdown
+    lp_type_rows = await page_cache.get_or_compute(
+        _lp_list_key("types"),
+        lambda: _fetch_rows(
             """
+            SELECT DISTINCT lp_type FROM lp_profiles
+            WHERE lp_type IS NOT NULL
+            ORDER BY lp_type
+            """,
+            [],
+        ),
+        ttl=LP_TYPES_TTL_SECONDS,
+        stale_ttl=LP_TYPES_STALE_SECONDS,
+    )
+    if lp_type_rows is None:
+        return templates.TemplateResponse(request, "pages/lps.html", empty_response)
+    lp_types = [row["lp_type"] for row in lp_type_rows]
+
+    # Check if search is natural language (AI parsing) or simple text
+    parsed_filters: dict[str, Any] = {}
+    text = search
+    if search and is_natural_language_query(search):
+        # Use AI to parse the query
+        parsed_filters = await parse_within_budget(parse_lp_search_query(search), search, "lp")
+        # Add lp_type from dropdown if specified
+        if lp_type:
+            parsed_filters["lp_type"] = lp_type
+        # Free text is ranked rather than filtered on
+        text = parsed_filters.get("text_search")
+        structured = {key: value for key, value in parsed_filters.items() if key != "text_search"}
+        where_clause, params = build_lp_search_sql(structured)
+    else:
+        # Simple text search
+        conditions = ["o.is_lp = TRUE"]
+        simple_params: list[Any] = []
+        if lp_type:
+            conditions.append("lp.lp_type = %s")
+            simple_params.append(lp_type)
+        where_clause = " AND ".join(conditions)
+        params = simple_params
+
+    # Relevance (full-text and semantic) first when searching text,
+    # otherwise largest first
+    embedding = await search_embedding(text, "lp")
+    query = build_hybrid_query(LP_SOURCE, where_clause, params, text, embedding)
+    lps = await page_cache.get_or_compute(
+        _lp_list_key("page", where_clause, params, text, embedding.model if embedding else None),
+        lambda: _search_rows(query),
+        ttl=LP_LIST_TTL_SECONDS,
+        stale_ttl=LP_LIST_STALE_SECONDS,
+    )
+    if lps is None:
+        return templates.TemplateResponse(request, "pages/lps.html", empty_response)
 
-            # Check if search is natural language (AI parsing) or simple text
-            parsed_filters: dict[str, Any] = {}
-            if search and is_natural_language_query(search):
-                # Use AI to parse the query
-                parsed_filters = await parse_lp_search_query(search)
-                # Add lp_type from dropdown if specified
-                if lp_type:
-                    parsed_filters["lp_type"] = lp_type
-                where_clause, params = build_lp_search_sql(parsed_filters)
-            else:
-                # Simple text search
-                conditions = ["o.is_lp = TRUE"]
-                simple_params: list[Any] = []
-                if search:
-                    conditions.append("(o.name ILIKE %s OR o.hq_city ILIKE %s)")
-                    simple_params.extend([f"%{search}%", f"%{search}%"])
-                if lp_type:
-                    conditions.append("lp.lp_type = %s")
-                    simple_params.append(lp_type)
-                where_clause = " AND ".join(conditions)
-                params = simple_params
-
-            query = base_query.format(where_clause=where_clause)
-            cur.execute(query, params)
-            lps = cur.fetchall()
-
-        # Calculate stats
-        total_aum = sum(lp["total_aum_bn"] or 0 for lp in lps)
-
-        return templates.TemplateResponse(
-            request,
-            "pages/lps.html",
-            {
-                "title": "LPs - LPxGP",
-                "user": user,
-                "lps": lps,
-                "total_aum": total_aum,
-                "search": search or "",
-                "lp_type": lp_type or "",
-                "lp_types": lp_types,
-                "parsed_filters": parsed_filters,  # Show what AI extracted
-            },
-        )
-    finally:
-        conn.close()
+    # Calculate stats
+    total_aum = sum(lp["total_aum_bn"] or 0 for lp in lps)
+
+    return templates.TemplateResponse(
+        request,
+        "pages/lps.html",
+        {
+            "title": "LPs - LPxGP",
+            "user": user,
+            "lps": lps,
+            "total_aum": total_aum,
+            "search": search or "",
+            "lp_type": lp_type or "",
+            "lp_types": lp_types,
+            "parsed_filters": parsed_filters,  # Show what AI extracted
+        },
+    )
 
 
 @router.get("/api/v1/lps", response_class=JSONResponse)
@@ -147,12 +224,19 @@ async def api_v1_lps(
     strategy: str | None = Query(None),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(True, description="Also return the total match count"),
 ) -> JSONResponse:
     """REST API endpoint for LP search.
 
     Returns JSON for programmatic access.
     Supports filtering by type, AUM, location, strategy.
-    Supports pagination.
+    Pages with a cursor: pass the previous response's next_cursor to get
+    the next page at constant cost (page numbers still work but slow down
+    with depth). The total is counted once per filter set and data
+    version (a planner estimate, with total_exact false, for very broad
+    filters), and skipped with include_total=false. Pages are cached in
+    page_cache with stale-while-revalidate.
 
     Args:
         search: Text search or natural language query
@@ -161,11 +245,14 @@ async def api_v1_lps(
         aum_max: Maximum AUM in billions
         location: Filter by city or country
         strategy: Filter by investment strategy
-        page: Page number (1-indexed)
+        page: Page number (1-indexed), ignored with a cursor
         per_page: Results per page (max 100)
+        cursor: Continuation token from the previous page
+        include_total: Whether to return the total match count
 
     Returns:
-        JSON with data, total, page, per_page fields
+        JSON with data, total, total_exact, page, per_page and
+        next_cursor (None on the last page) fields
     """
     user = auth.get_current_user(request)
     if not user:
@@ -178,100 +265,110 @@ async def api_v1_lps(
     if page < 1:
         page = 1
 
-    conn = get_db()
-    if not conn:
+    try:
+        after = decode_cursor(cursor, len(LP_API_ORDER))
+    except InvalidCursor:
         return JSONResponse(
-            content={
-                "data": [],
-                "total": 0,
-                "page": page,
-                "per_page": per_page,
-            }
+            status_code=400,
+            content={"error": "Invalid cursor", "code": "INVALID_CURSOR"},
         )
 
-    try:
-        with conn.cursor() as cur:
-            # Build filters
-            conditions = ["o.is_lp = TRUE"]
-            params: list[Any] = []
-
-            # Text search
-            if search:
-                conditions.append("(o.name ILIKE %s OR o.hq_city ILIKE %s)")
-                params.extend([f"%{search}%", f"%{search}%"])
-
-            # LP type filter
-            if lp_type:
-                conditions.append("lp.lp_type = %s")
-                params.append(lp_type)
-
-            # AUM filters
-            if aum_min is not None:
-                conditions.append("lp.total_aum_bn >= %s")
-                params.append(aum_min)
-            if aum_max is not None:
-                conditions.append("lp.total_aum_bn <= %s")
-                params.append(aum_max)
-
-            # Location filter
-            if location:
-                conditions.append("(o.hq_city ILIKE %s OR o.hq_country ILIKE %s)")
-                params.extend([f"%{location}%", f"%{location}%"])
-
-            # Strategy filter
-            if strategy:
-                conditions.append("%s = ANY(lp.strategies)")
-                params.append(strategy)
-
-            where_clause = " AND ".join(conditions)
-
-            # Count total
-            count_query = f"""
-                SELECT COUNT(*) as total
-                FROM organizations o
-                JOIN lp_profiles lp ON lp.org_id = o.id
-                WHERE {where_clause}
-            """
-            cur.execute(count_query, params)
-            count_row = cur.fetchone()
-            total = count_row["total"] if count_row else 0
+    # Build filters
+    conditions = ["o.is_lp = TRUE"]
+    params: list[Any] = []
+
+    # Text search
+    if search:
+        text_condition, text_params = text_search_condition(search)
+        conditions.append(text_condition)
+        params.extend(text_params)
+
+    # LP type filter
+    if lp_type:
+        conditions.append("lp.lp_type = %s")
+        params.append(lp_type)
+
+    # AUM filters
+    if aum_min is not None:
+        conditions.append("lp.total_aum_bn >= %s")
+        params.append(aum_min)
+    if aum_max is not None:
+        conditions.append("lp.total_aum_bn <= %s")
+        params.append(aum_max)
+
+    # Location filter
+    if location:
+        conditions.append("(o.hq_city ILIKE %s OR o.hq_country ILIKE %s)")
+        params.extend([f"%{location}%", f"%{location}%"])
+
+    # Strategy filter
+    if strategy:
+        conditions.append("%s = ANY(lp.strategies)")
+        params.append(strategy)
+
+    where_clause = " AND ".join(conditions)
+    seek_sql, seek_params = seek_condition(LP_API_ORDER, after)
+    # Cursor pages start right after the cursor; numbered pages skip rows
+    offset = 0 if after is not None else (page - 1) * per_page
+
+    async def load_page() -> dict[str, Any] | None:
+        conn = await get_async_db()
+        if not conn:
+            return None
+        try:
+            async with conn.cursor() as cur:
+                # Counted once per filter set and data version
+                total = await count_rows_async(cur, LP_FROM, where_clause, params) if include_total else None
+
+                # One extra row tells whether there is a next page
+                data_query = f"""
+                    SELECT
+                        o.id, o.name, o.hq_city, o.hq_country, o.website,
+                        lp.lp_type, lp.total_aum_bn, lp.pe_allocation_pct,
+                        lp.check_size_min_mm, lp.check_size_max_mm,
+                        lp.geographic_preferences, lp.strategies
+                    FROM {LP_FROM}
+                    WHERE {where_clause} AND {seek_sql}
+                    ORDER BY {order_by_clause(LP_API_ORDER)}
+                    LIMIT %s OFFSET %s
+                """
+                await cur.execute(data_query, [*params, *seek_params, per_page + 1, offset])
+                rows = [dict(row) for row in await cur.fetchall()]
+
+            next_cursor = page_cursor(rows, per_page, _lp_sort_key)
+            return {
+                "data": [serialize_row(row) for row in rows],
+                "total": total.value if total else None,
+                "total_exact": total.exact if total else None,
+                "next_cursor": next_cursor,
+            }
+        finally:
+            await conn.close()
 
-            # Fetch paginated results
-            offset = (page - 1) * per_page
-            data_query = f"""
-                SELECT
-                    o.id, o.name, o.hq_city, o.hq_country, o.website,
-                    lp.lp_type, lp.total_aum_bn, lp.pe_allocation_pct,
-                    lp.check_size_min_mm, lp.check_size_max_mm,
-                    lp.geographic_preferences, lp.strategies
-                FROM organizations o
-                JOIN lp_profiles lp ON lp.org_id = o.id
-                WHERE {where_clause}
-                ORDER BY lp.total_aum_bn DESC NULLS LAST
-                LIMIT %s OFFSET %s
-            """
-            cur.execute(data_query, [*params, per_page, offset])
-            rows = cur.fetchall()
-
-            # Convert to list of dicts
-            data = [serialize_row(dict(row)) for row in rows]
-
-            return JSONResponse(
-                content={
-                    "data": data,
-                    "total": total,
-                    "page": page,
-                    "per_page": per_page,
-                }
-            )
+    try:
+        result = await page_cache.get_or_compute(
+            _lp_list_key("api_v1", where_clause, params, cursor, page, per_page, include_total),
+            load_page,
+            ttl=LP_LIST_TTL_SECONDS,
+            stale_ttl=LP_LIST_STALE_SECONDS,
+        )
     except Exception as e:
         logger.error(f"API v1 LP search error: {e}")
         return JSONResponse(
             status_code=500,
             content={"error": "Internal server error", "code": "SERVER_ERROR"},
         )
-    finally:
-        conn.close()
+
+    return JSONResponse(
+        content={
+            "data": result["data"] if result else [],
+            "total": result["total"] if result else 0,
+            "total_exact": result["total_exact"] if result else True,
+            "page": page,
+            "per_page": per_page,
+            "next_cursor": result["next_cursor"] if result else None,
+        }
+    )
 
 
 @router.get("/lps/{lp_id}", response_class=HTMLResponse, response_model=None)
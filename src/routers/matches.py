@@ -4,27 +4,31 @@ This router provides:
 - /matches: Matches page (HTML)
 - /matches/{lp_id}: Match detail page (HTML)
 - /api/match/{match_id}/detail: Match detail HTMX partial
+- /api/match/{match_id}/content/stream: Stream pending match content (SSE)
 - /api/match/{match_id}/generate-pitch: Generate AI pitch
+- /api/match/{match_id}/generate-pitch/stream: Stream AI pitch (SSE)
 - /api/match/{match_id}/feedback: Submit match feedback
 - /api/match/{match_id}/status: Update match pipeline status
 """
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
 
-import httpx
 from fastapi import APIRouter, Form, Query, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
 from src import auth
 from src.config import get_settings
-from src.database import get_db
+from src.database import get_async_db, get_db
+from src.llm_client import llm_call, llm_client, llm_timeout, stream_ollama_generate
 from src.logging_config import get_logger
+from src.match_content import TEMPLATE_MODEL_VERSION, ensure_match_content, stream_match_content
 from src.shortlists import is_in_shortlist
-from src.utils import is_valid_uuid
+from src.utils import is_valid_uuid, sse_event
 
 logger = get_logger(__name__)
 
@@ -34,6 +38,24 @@ router = APIRouter(tags=["matches"])
 templates_path = Path(__file__).parent.parent / "templates"
 templates = Jinja2Templates(directory=templates_path)
 
+# Server-Sent Events responses must not be cached or buffered by proxies
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+_PITCH_MATCH_QUERY = """
+    SELECT
+        m.id, m.score, m.explanation, m.talking_points, m.concerns,
+        o.name as lp_name, o.hq_city as lp_city,
+        lp.lp_type, lp.total_aum_bn,
+        f.name as fund_name, f.target_size_mm,
+        gp.name as gp_name
+    FROM fund_lp_matches m
+    JOIN organizations o ON o.id = m.lp_org_id
+    LEFT JOIN lp_profiles lp ON lp.org_id = m.lp_org_id
+    JOIN funds f ON f.id = m.fund_id
+    JOIN organizations gp ON gp.id = f.org_id
+    WHERE m.id = %s
+"""
+
 
 @router.get("/matches", response_class=HTMLResponse, response_model=None)
 async def matches_page(
@@ -76,15 +98,15 @@ async def matches_page(
         "selected_fund": None,
     }
 
-    conn = get_db()
+    conn = await get_async_db()
     if not conn:
         return templates.TemplateResponse(request, "pages/matches.html", empty_response)
 
     try:
-        with conn.cursor() as cur:
+        async with conn.cursor() as cur:
             # Fetch funds for the selector
-            cur.execute("SELECT id, name, status FROM funds ORDER BY name")
-            funds = cur.fetchall()
+            await cur.execute("SELECT id, name, status FROM funds ORDER BY name")
+            funds = await cur.fetchall()
 
             # Fetch matches with all related data in one efficient query
             # Build query conditionally to avoid psycopg NULL type inference issues
@@ -103,13 +125,13 @@ async def matches_page(
                 LEFT JOIN fund_lp_status s ON s.fund_id = m.fund_id AND s.lp_org_id = m.lp_org_id
             """
             if validated_fund_id:
-                cur.execute(
+                await cur.execute(
                     base_query + " WHERE m.fund_id = %s ORDER BY m.score DESC",
                     (validated_fund_id,),
                 )
             else:
-                cur.execute(base_query + " ORDER BY m.score DESC")
-            matches = cur.fetchall()
+                await cur.execute(base_query + " ORDER BY m.score DESC")
+            matches = await cur.fetchall()
 
         # Calculate stats
         scores = [m["score"] for m in matches if m["score"] is not None]
@@ -131,7 +153,7 @@ async def matches_page(
             },
         )
     finally:
-        conn.close()
+        await conn.close()
 
 
 @router.get("/matches/{lp_id}", response_class=HTMLResponse, response_model=None)
@@ -142,7 +164,9 @@ async def match_detail_page(
 ) -> HTMLResponse | RedirectResponse:
     """Match detail page showing AI analysis for LP-Fund pairing.
 
-    Requires authentication.
+    Requires authentication. With a fund_id, shows the stored match and
+    generates its deferred LLM content on first view; otherwise (or without
+    a database) shows demo data.
     """
     user = auth.get_current_user(request)
     if not user:
@@ -155,6 +179,24 @@ async def match_detail_page(
     if fund_id and not is_valid_uuid(fund_id):
         fund_id = None  # Fall back to default if invalid
 
+    # Stored match for this fund, when a database is configured
+    if fund_id:
+        stored = await _fetch_stored_match(fund_id, lp_id)
+        if stored:
+            lp, fund, match = stored
+            lp["in_shortlist"] = is_in_shortlist(user["id"], lp_id)
+            return templates.TemplateResponse(
+                request,
+                "pages/match-detail.html",
+                {
+                    "title": f"Match Analysis: {lp['name']} - LPxGP",
+                    "user": user,
+                    "lp": lp,
+                    "fund": fund,
+                    "match": match,
+                },
+            )
+
     # Mock data for offline mode
     mock_lp = {
         "id": lp_id,
@@ -201,6 +243,52 @@ async def match_detail_page(
     )
 
 
+async def _fetch_stored_match(
+    fund_id: str, lp_id: str
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]] | None:
+    """Load a fund-LP match for the detail page, generating deferred content.
+
+    Returns:
+        (lp, fund, match) dicts, or None without a database or match.
+    """
+    conn = await get_async_db()
+    if not conn:
+        return None
+
+    try:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                SELECT
+                    m.id, m.score, m.score_breakdown, m.explanation,
+                    m.talking_points, m.concerns, m.model_version,
+                    o.name as lp_name, f.name as fund_name, f.target_size_mm
+                FROM fund_lp_matches m
+                JOIN organizations o ON o.id = m.lp_org_id
+                JOIN funds f ON f.id = m.fund_id
+                WHERE m.fund_id = %s AND m.lp_org_id = %s
+            """,
+                (fund_id, lp_id),
+            )
+            row = await cur.fetchone()
+
+        if not row:
+            return None
+
+        match = dict(row)
+        if match["model_version"] == TEMPLATE_MODEL_VERSION:
+            # First view of a lazily generated match
+            content = await ensure_match_content(conn, str(match["id"]))
+            if content:
+                match.update(content)
+
+        lp = {"id": lp_id, "name": match["lp_name"]}
+        fund = {"id": fund_id, "name": match["fund_name"], "target_size_mm": match["target_size_mm"]}
+        return lp, fund, match
+    finally:
+        await conn.close()
+
+
 @router.get("/api/match/{match_id}/detail", response_class=HTMLResponse)
 async def match_detail(request: Request, match_id: str) -> HTMLResponse:
     """Get match detail for modal display (HTMX partial)."""
@@ -209,7 +297,7 @@ async def match_detail(request: Request, match_id: str) -> HTMLResponse:
             content="<p class='text-red-500'>Invalid match ID</p>", status_code=400
         )
 
-    conn = get_db()
+    conn = await get_async_db()
     if not conn:
         return HTMLResponse(
             content="<p class='text-navy-500'>Database not configured</p>",
@@ -217,12 +305,13 @@ async def match_detail(request: Request, match_id: str) -> HTMLResponse:
         )
 
     try:
-        with conn.cursor() as cur:
-            cur.execute(
+        async with conn.cursor() as cur:
+            await cur.execute(
                 """
                 SELECT
                     m.id, m.fund_id, m.lp_org_id, m.score,
                     m.score_breakdown, m.explanation, m.talking_points, m.concerns,
+                    m.model_version,
                     o.name as lp_name, o.hq_city as lp_city, o.hq_country as lp_country,
                     o.website as lp_website,
                     lp.lp_type, lp.total_aum_bn, lp.pe_allocation_pct,
@@ -239,20 +328,72 @@ async def match_detail(request: Request, match_id: str) -> HTMLResponse:
             """,
                 (match_id,),
             )
-            match = cur.fetchone()
+            match = await cur.fetchone()
 
         if not match:
             return HTMLResponse(
                 content="<p class='text-navy-500'>Match not found</p>", status_code=404
             )
 
+        settings = get_settings()
+        stream_content = False
+        if match["model_version"] == TEMPLATE_MODEL_VERSION:
+            # First view of a lazily generated match
+            if settings.llm_streaming_enabled:
+                # Render the template text now; the page streams the LLM content in
+                stream_content = True
+            else:
+                content = await ensure_match_content(conn, match_id)
+                if content:
+                    match = {**match, **content}
+
         return templates.TemplateResponse(
             request,
             "partials/match_detail_modal.html",
-            {"match": match},
+            {
+                "match": match,
+                "stream_content": stream_content,
+                "stream_pitch": settings.llm_streaming_enabled,
+            },
         )
     finally:
-        conn.close()
+        await conn.close()
+
+
+@router.get("/api/match/{match_id}/content/stream", response_model=None)
+async def stream_match_detail_content(match_id: str) -> StreamingResponse | HTMLResponse:
+    """Stream LLM content for a pending match as Server-Sent Events.
+
+    Events:
+        start: Sent immediately.
+        content: Content parsed so far (explanation, talking_points, concerns).
+        done: The final content, now persisted.
+        failed: No content could be generated; the template text stays.
+    """
+    if not is_valid_uuid(match_id):
+        return HTMLResponse(
+            content="<p class='text-red-500'>Invalid match ID</p>", status_code=400
+        )
+
+    conn = await get_async_db()
+    if not conn:
+        return HTMLResponse(
+            content="<p class='text-navy-500'>Database not configured</p>",
+            status_code=503,
+        )
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield sse_event("start", {})
+            async for update in stream_match_content(conn, match_id):
+                yield sse_event("done" if update["done"] else "content", update["content"])
+                if update["done"]:
+                    return
+            yield sse_event("failed", {})
+        finally:
+            await conn.close()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS)
 
 
 @router.post("/api/match/{match_id}/generate-pitch", response_class=HTMLResponse)
@@ -278,23 +419,7 @@ async def generate_pitch(
     try:
         # Fetch match data for pitch generation
         with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT
-                    m.id, m.score, m.explanation, m.talking_points, m.concerns,
-                    o.name as lp_name, o.hq_city as lp_city,
-                    lp.lp_type, lp.total_aum_bn,
-                    f.name as fund_name, f.target_size_mm,
-                    gp.name as gp_name
-                FROM fund_lp_matches m
-                JOIN organizations o ON o.id = m.lp_org_id
-                LEFT JOIN lp_profiles lp ON lp.org_id = m.lp_org_id
-                JOIN funds f ON f.id = m.fund_id
-                JOIN organizations gp ON gp.id = f.org_id
-                WHERE m.id = %s
-            """,
-                (match_id,),
-            )
+            cur.execute(_PITCH_MATCH_QUERY, (match_id,))
             match = cur.fetchone()
 
         if not match:
@@ -302,11 +427,122 @@ async def generate_pitch(
                 content="<p class='text-navy-500'>Match not found</p>", status_code=404
             )
 
-        # Build the prompt for pitch generation
-        talking_points = match.get("talking_points") or []
-        concerns = match.get("concerns") or []
+        prompt = _build_pitch_prompt(match, pitch_type, tone)
+
+        # Try to generate with Ollama (local dev) or return mock
+        settings = get_settings()
+        pitch_content = None
+
+        timeout = llm_timeout("ollama", settings.ollama_model, "pitch", 180.0)
+        try:
+            async with llm_client("ollama") as client, llm_call("ollama", settings.ollama_model, "pitch"):
+                response = await client.post(
+                    f"{settings.ollama_base_url}/api/generate",
+                    json={
+                        "model": settings.ollama_model,
+                        "prompt": prompt,
+                        "stream": False,
+                    },
+                    timeout=timeout,
+                )
+                if response.status_code == 200:
+                    result = response.json()
+                    pitch_content = result.get("response", "").strip()
+        except Exception as e:
+            logger.warning(f"Ollama not available: {e}")
+
+        # Fallback to mock pitch if Ollama unavailable
+        if not pitch_content:
+            pitch_content = _fallback_pitch(match, pitch_type)
+
+        return templates.TemplateResponse(
+            request,
+            "partials/pitch_result.html",
+            {
+                "match": match,
+                "pitch_type": pitch_type,
+                "tone": tone,
+                "pitch_content": pitch_content,
+            },
+        )
+    finally:
+        conn.close()
+
+
+@router.post("/api/match/{match_id}/generate-pitch/stream", response_model=None)
+async def stream_pitch(
+    request: Request,
+    match_id: str,
+    pitch_type: str = Form(default="email"),
+    tone: str = Form(default="professional"),
+) -> StreamingResponse | HTMLResponse:
+    """Generate an AI pitch, streaming it as Server-Sent Events.
+
+    Events:
+        start: Sent immediately.
+        token: Next piece of pitch text from Ollama.
+        done: The rendered pitch_result.html panel with the full pitch
+            (the template pitch if Ollama was unavailable).
+    """
+    if not is_valid_uuid(match_id):
+        return HTMLResponse(
+            content="<p class='text-red-500'>Invalid match ID</p>", status_code=400
+        )
+
+    conn = await get_async_db()
+    if not conn:
+        return HTMLResponse(
+            content="<p class='text-navy-500'>Database not configured</p>",
+            status_code=503,
+        )
+
+    try:
+        async with conn.cursor() as cur:
+            await cur.execute(_PITCH_MATCH_QUERY, (match_id,))
+            match = await cur.fetchone()
+    finally:
+        await conn.close()
+
+    if not match:
+        return HTMLResponse(
+            content="<p class='text-navy-500'>Match not found</p>", status_code=404
+        )
+
+    settings = get_settings()
+    prompt = _build_pitch_prompt(match, pitch_type, tone)
+
+    async def events() -> AsyncIterator[str]:
+        yield sse_event("start", {})
+        tokens: list[str] = []
+        try:
+            async for token in stream_ollama_generate(
+                settings.ollama_base_url, settings.ollama_model, prompt, 180.0
+            ):
+                tokens.append(token)
+                yield sse_event("token", token)
+        except Exception as e:
+            logger.warning(f"Ollama not available: {e}")
+            tokens = []
+
+        pitch_content = "".join(tokens).strip() or _fallback_pitch(match, pitch_type)
+        panel = templates.get_template("partials/pitch_result.html").render(
+            request=request,
+            match=match,
+            pitch_type=pitch_type,
+            tone=tone,
+            pitch_content=pitch_content,
+        )
+        yield sse_event("done", panel)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS)
 
-        prompt = f"""Generate a {tone} {pitch_type} pitch for a GP reaching out to an LP.
+
+def _build_pitch_prompt(match: dict[str, Any], pitch_type: str, tone: str) -> str:
+    """Build the LLM prompt for a pitch from a _PITCH_MATCH_QUERY row."""
+    talking_points = match.get("talking_points") or []
+    concerns = match.get("concerns") or []
+
+    return f"""Generate a {tone} {pitch_type} pitch for a GP reaching out to an LP.
 
 GP: {match['gp_name']}
 Fund: {match['fund_name']} (Target: ${match['target_size_mm']}M)
@@ -334,30 +570,12 @@ Generate a compelling {pitch_type} that:
 
 Output only the {pitch_type} content, no preamble."""
 
-        # Try to generate with Ollama (local dev) or return mock
-        settings = get_settings()
-        pitch_content = None
-
-        try:
-            async with httpx.AsyncClient(timeout=180.0) as client:
-                response = await client.post(
-                    f"{settings.ollama_base_url}/api/generate",
-                    json={
-                        "model": settings.ollama_model,
-                        "prompt": prompt,
-                        "stream": False,
-                    },
-                )
-                if response.status_code == 200:
-                    result = response.json()
-                    pitch_content = result.get("response", "").strip()
-        except Exception as e:
-            logger.warning(f"Ollama not available: {e}")
 
-        # Fallback to mock pitch if Ollama unavailable
-        if not pitch_content:
-            if pitch_type == "email":
-                pitch_content = f"""Subject: {match['fund_name']} - Investment Opportunity Aligned with {match['lp_name']}'s Strategy
+def _fallback_pitch(match: dict[str, Any], pitch_type: str) -> str:
+    """Template pitch used when Ollama is unavailable."""
+    talking_points = match.get("talking_points") or []
+    if pitch_type == "email":
+        return f"""Subject: {match['fund_name']} - Investment Opportunity Aligned with {match['lp_name']}'s Strategy
 
 Dear {match['lp_name']} Investment Team,
 
@@ -371,8 +589,7 @@ I would welcome the opportunity to schedule a brief call to discuss how {match['
 
 Best regards,
 {match['gp_name']} Team"""
-            else:
-                pitch_content = f"""{match['fund_name']} presents a compelling opportunity for {match['lp_name']}.
+    return f"""{match['fund_name']} presents a compelling opportunity for {match['lp_name']}.
 
 {match['explanation']}
 
@@ -383,19 +600,6 @@ Key highlights:
 
 Match score: {match['score']}%"""
 
-        return templates.TemplateResponse(
-            request,
-            "partials/pitch_result.html",
-            {
-                "match": match,
-                "pitch_type": pitch_type,
-                "tone": tone,
-                "pitch_content": pitch_content,
-            },
-        )
-    finally:
-        conn.close()
-
 
 @router.post("/api/match/{match_id}/feedback", response_class=HTMLResponse)
 async def match_feedback(
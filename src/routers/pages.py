@@ -15,8 +15,9 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 
 from src import auth
+from src.cache import page_cache
+from src.database import get_async_db
 from src.preferences import get_user_preferences
-from src.utils import get_db
 
 router = APIRouter(tags=["pages"])
 
@@ -24,6 +25,11 @@ router = APIRouter(tags=["pages"])
 TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
+# Dashboard counts are fresh for a minute and served stale (while one
+# request's background task recounts) for up to five more
+DASHBOARD_STATS_TTL_SECONDS = 60
+DASHBOARD_STATS_STALE_SECONDS = 300
+
 
 # =============================================================================
 # Page Routes
@@ -52,7 +58,7 @@ async def dashboard_page(request: Request) -> HTMLResponse | RedirectResponse:
     """Render the user dashboard (protected route).
 
     Requires authentication. Shows summary statistics for funds, LPs,
-    and matches.
+    and matches, cached in page_cache with stale-while-revalidate.
 
     Args:
         request: FastAPI request object.
@@ -64,33 +70,15 @@ async def dashboard_page(request: Request) -> HTMLResponse | RedirectResponse:
     if not user:
         return RedirectResponse(url="/login", status_code=303)
 
-    # Get stats for dashboard
-    stats: dict[str, int] = {
-        "total_funds": 0,
-        "total_lps": 0,
-        "total_matches": 0,
-        "active_outreach": 0,
-    }
-
-    conn = get_db()
-    if conn:
-        try:
-            with conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) FROM funds")
-                result = cur.fetchone()
-                stats["total_funds"] = result["count"] if result else 0
-
-                cur.execute("SELECT COUNT(*) FROM organizations WHERE is_lp = TRUE")
-                result = cur.fetchone()
-                stats["total_lps"] = result["count"] if result else 0
-
-                cur.execute("SELECT COUNT(*) FROM fund_lp_matches")
-                result = cur.fetchone()
-                stats["total_matches"] = result["count"] if result else 0
-        except Exception:
-            pass
-        finally:
-            conn.close()
+    try:
+        stats = await page_cache.get_or_compute(
+            "dashboard:stats",
+            _load_dashboard_stats,
+            ttl=DASHBOARD_STATS_TTL_SECONDS,
+            stale_ttl=DASHBOARD_STATS_STALE_SECONDS,
+        )
+    except Exception:
+        stats = None
 
     return templates.TemplateResponse(
         request,
@@ -98,11 +86,49 @@ async def dashboard_page(request: Request) -> HTMLResponse | RedirectResponse:
         {
             "title": "Dashboard - LPxGP",
             "user": user,
-            "stats": stats,
+            "stats": stats or _empty_dashboard_stats(),
         },
     )
 
 
+def _empty_dashboard_stats() -> dict[str, int]:
+    return {
+        "total_funds": 0,
+        "total_lps": 0,
+        "total_matches": 0,
+        "active_outreach": 0,
+    }
+
+
+async def _load_dashboard_stats() -> dict[str, int] | None:
+    """Count funds, LPs and matches for the dashboard.
+
+    Returns:
+        The counts, or None if no database is configured.
+    """
+    conn = await get_async_db()
+    if not conn:
+        return None
+
+    stats = _empty_dashboard_stats()
+    try:
+        async with conn.cursor() as cur:
+            await cur.execute("SELECT COUNT(*) FROM funds")
+            result = await cur.fetchone()
+            stats["total_funds"] = result["count"] if result else 0
+
+            await cur.execute("SELECT COUNT(*) FROM organizations WHERE is_lp = TRUE")
+            result = await cur.fetchone()
+            stats["total_lps"] = result["count"] if result else 0
+
+            await cur.execute("SELECT COUNT(*) FROM fund_lp_matches")
+            result = await cur.fetchone()
+            stats["total_matches"] = result["count"] if result else 0
+    finally:
+        await conn.close()
+    return stats
+
+
 @router.get("/settings", response_class=HTMLResponse, response_model=None)
 async def settings_page(request: Request) -> HTMLResponse | RedirectResponse:
     """Render the user settings page (protected route).
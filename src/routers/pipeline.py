@@ -19,7 +19,7 @@ from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, Field
 
 from src import auth
-from src.database import get_db
+from src.database import get_async_db, get_db
 from src.logging_config import get_logger
 from src.shortlists import get_user_shortlist
 from src.utils import is_valid_uuid
@@ -180,14 +180,14 @@ async def pipeline_page(
 
     funds: list[dict[str, Any]] = []
 
-    conn = get_db()
+    conn = await get_async_db()
     if conn:
         try:
-            with conn.cursor() as cur:
+            async with conn.cursor() as cur:
                 # Get user's funds based on their org_id
                 user_org_id = user.get("org_id")
                 if user_org_id:
-                    cur.execute(
+                    await cur.execute(
                         """
                         SELECT f.id, f.name
                         FROM funds f
@@ -196,13 +196,13 @@ async def pipeline_page(
                         """,
                         (user_org_id,),
                     )
-                    funds = cur.fetchall()
+                    funds = await cur.fetchall()
                 else:
                     # Admin/FA users without org_id see all funds
-                    cur.execute(
+                    await cur.execute(
                         "SELECT f.id, f.name FROM funds f ORDER BY f.name"
                     )
-                    funds = cur.fetchall()
+                    funds = await cur.fetchall()
 
                 # Build filter - only show pipeline items for user's funds
                 params: list[Any] = []
@@ -219,7 +219,7 @@ async def pipeline_page(
                     params.append(user_org_id)
 
                 # Get pipeline items
-                cur.execute(
+                await cur.execute(
                     f"""
                     SELECT
                         s.fund_id,
@@ -241,7 +241,7 @@ async def pipeline_page(
                     """,
                     params,
                 )
-                items = cur.fetchall()
+                items = await cur.fetchall()
 
                 # Group by stage
                 for item in items:
@@ -262,7 +262,7 @@ async def pipeline_page(
         except Exception as e:
             logger.error(f"Pipeline page error: {e}")
         finally:
-            conn.close()
+            await conn.close()
 
     return templates.TemplateResponse(
         request,
@@ -3,7 +3,20 @@
 This module provides natural language query parsing for LP search,
 converting queries like "50m or more aum" into structured SQL filters.
 
-Includes caching for expensive Ollama calls to improve performance.
+Parsed filters for expensive Ollama calls are cached in-process and in the
+persistent LLM cache (src/llm_cache.py), which survives restarts. Identical
+parses that are in flight at the same time share a single Ollama call.
+
+Common queries never reach Ollama: a deterministic rule-based parser
+(parse_query_with_rules) extracts amounts, LP types, strategies and
+locations in microseconds, and only queries it cannot fully explain fall
+through to the LLM.
+
+Free text is matched with Postgres full-text search over a weighted
+tsvector of organization name, location, LP mandate and GP thesis
+(text_search_condition), ranked by ts_rank (text_search_rank).
+semantic_lp_search finds LPs by meaning instead, comparing a query
+embedding with mandate embeddings (src/embeddings.py) through pgvector.
 """
 
 from __future__ import annotations
@@ -12,15 +25,23 @@ import json
 import logging
 import re
 import time
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Literal, cast
 
 import httpx
 
-from src.cache import ai_query_cache, make_cache_key
+from src.cache import ai_query_cache, ai_query_flight, make_cache_key
 from src.config import get_settings
+from src.embeddings import embed_query, get_embedding_provider, to_pgvector
+from src.llm_cache import llm_cache_key, llm_response_cache
+from src.llm_client import LLMBackendUnavailable, llm_call, llm_client, llm_timeout
 
 logger = logging.getLogger(__name__)
 
+# Bump when a prompt changes so persisted outputs from the old one are ignored
+LP_SEARCH_PROMPT_VERSION = "1"
+GP_SEARCH_PROMPT_VERSION = "1"
+
 
 async def parse_lp_search_query(
     query: str,
@@ -28,6 +49,10 @@ async def parse_lp_search_query(
 ) -> dict[str, Any]:
     """Use Ollama to parse natural language into structured filters.
 
+    Common queries that the rule-based parser fully understands (amounts,
+    LP types, strategies, locations) are served locally without Ollama;
+    see parse_query_with_rules().
+
     Args:
         query: Natural language search query (e.g., "50m or more aum")
         use_cache: Whether to use cache for results. Defaults to True.
@@ -43,6 +68,7 @@ async def parse_lp_search_query(
         - check_size_max: float (in millions)
         - text_search: str (fallback text to search)
         - _cache_hit: bool (whether result was from cache)
+        - _parser: str ("rules" or "llm")
         - _parse_time_ms: float (time taken to parse)
 
     Example:
@@ -52,19 +78,23 @@ async def parse_lp_search_query(
     """
     start_time = time.time()
 
+    fast = _parse_with_rules(query, "lp", start_time)
+    if fast is not None:
+        return fast
+
     # Check cache first
-    cache_key = make_cache_key("lp_search", query.lower().strip())
+    normalized_query = query.lower().strip()
+    cache_key = make_cache_key("lp_search", normalized_query)
     if use_cache:
         cached = ai_query_cache.get(cache_key)
         if cached is not None:
             result = cached.copy()
             result["_cache_hit"] = True
+            result["_parser"] = "llm"
             result["_parse_time_ms"] = round((time.time() - start_time) * 1000, 2)
             logger.info(f"Cache hit for query '{query}' ({result['_parse_time_ms']}ms)")
             return result
 
-    settings = get_settings()
-
     prompt = f"""You are a search query parser for an LP (Limited Partner) database.
 Extract structured filters from this search query. Return ONLY valid JSON.
 
@@ -85,53 +115,102 @@ Return ONLY a JSON object with the relevant filters. Example:
 
 JSON:"""
 
-    try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.post(
-                f"{settings.ollama_base_url}/api/generate",
-                json={
-                    "model": settings.ollama_model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.1,  # Low temperature for consistent parsing
-                    },
-                },
-            )
-            response.raise_for_status()
-
-            result = response.json()
-            text = result.get("response", "").strip()
-
-            # Try to extract JSON from the response
-            filters = _extract_json(text)
-            if filters:
-                # Cache the result (without metadata)
-                ai_query_cache.set(cache_key, filters)
-
-                # Add metadata and return
-                parse_time = round((time.time() - start_time) * 1000, 2)
-                filters["_cache_hit"] = False
-                filters["_parse_time_ms"] = parse_time
-                logger.info(f"Parsed query '{query}' -> {filters} ({parse_time}ms)")
-                return filters
-
-            logger.warning(f"Could not parse JSON from Ollama response: {text}")
-            parse_time = round((time.time() - start_time) * 1000, 2)
-            return {"text_search": query, "_cache_hit": False, "_parse_time_ms": parse_time}
-
-    except httpx.TimeoutException:
-        logger.warning("Ollama request timed out, falling back to text search")
-        parse_time = round((time.time() - start_time) * 1000, 2)
-        return {"text_search": query, "_cache_hit": False, "_parse_time_ms": parse_time}
-    except httpx.HTTPError as e:
-        logger.warning(f"Ollama HTTP error: {e}, falling back to text search")
-        parse_time = round((time.time() - start_time) * 1000, 2)
-        return {"text_search": query, "_cache_hit": False, "_parse_time_ms": parse_time}
-    except Exception as e:
-        logger.warning(f"Ollama error: {e}, falling back to text search")
-        parse_time = round((time.time() - start_time) * 1000, 2)
-        return {"text_search": query, "_cache_hit": False, "_parse_time_ms": parse_time}
+    filters, cache_hit = await _parse_with_ollama(
+        "lp_search", query, normalized_query, cache_key, prompt, LP_SEARCH_PROMPT_VERSION, use_cache
+    )
+
+    # Copy: the parsed filters are shared with the cache and coalesced callers
+    result = dict(filters)
+    result["_cache_hit"] = cache_hit
+    result["_parser"] = "llm"
+    result["_parse_time_ms"] = round((time.time() - start_time) * 1000, 2)
+    logger.info(f"Parsed query '{query}' -> {filters} ({result['_parse_time_ms']}ms)")
+    return result
+
+
+async def _parse_with_ollama(
+    namespace: str,
+    query: str,
+    normalized_query: str,
+    cache_key: str,
+    prompt: str,
+    prompt_version: str,
+    use_cache: bool,
+) -> tuple[dict[str, Any], bool]:
+    """Parse a query with Ollama after an in-process cache miss.
+
+    Concurrent parses of the same query are coalesced: the first caller
+    checks the persistent cache and calls Ollama, the rest await its result.
+
+    Args:
+        namespace: "lp_search" or "gp_search".
+        query: Original search query (used for the text search fallback).
+        normalized_query: Lowercased, stripped query.
+        cache_key: In-process cache key for the query.
+        prompt: Rendered parsing prompt.
+        prompt_version: Version of the prompt template.
+        use_cache: Whether to read and share cached or in-flight results.
+
+    Returns:
+        Tuple of (filters without metadata, whether they came from the
+        persistent cache). Falls back to {"text_search": query} on errors.
+    """
+    settings = get_settings()
+    llm_key = llm_cache_key(namespace, settings.ollama_model, prompt_version, normalized_query)
+
+    async def parse() -> tuple[dict[str, Any], bool]:
+        # Persistent cache shared across restarts and workers
+        if use_cache:
+            stored = await llm_response_cache.get(namespace, llm_key)
+            if stored is not None:
+                ai_query_cache.set(cache_key, stored)
+                logger.info(f"Persistent cache hit for {namespace} query '{query}'")
+                return stored, True
+
+        try:
+            timeout = llm_timeout("ollama", settings.ollama_model, "search_parse", 15.0)
+            async with llm_client("ollama") as client:
+                async with llm_call("ollama", settings.ollama_model, "search_parse"):
+                    response = await client.post(
+                        f"{settings.ollama_base_url}/api/generate",
+                        json={
+                            "model": settings.ollama_model,
+                            "prompt": prompt,
+                            "stream": False,
+                            "options": {
+                                "temperature": 0.1,  # Low temperature for consistent parsing
+                            },
+                        },
+                        timeout=timeout,
+                    )
+                    response.raise_for_status()
+
+                result = response.json()
+                text = result.get("response", "").strip()
+
+                # Try to extract JSON from the response
+                filters = _extract_json(text)
+                if isinstance(filters, dict) and filters:
+                    ai_query_cache.set(cache_key, filters)
+                    await llm_response_cache.set(namespace, llm_key, filters, settings.ollama_model, prompt_version)
+                    return filters, False
+
+                logger.warning(f"Could not parse JSON from Ollama response: {text}")
+
+        except LLMBackendUnavailable:
+            logger.info("Ollama circuit breaker open, falling back to text search")
+        except httpx.TimeoutException:
+            logger.warning("Ollama request timed out, falling back to text search")
+        except httpx.HTTPError as e:
+            logger.warning(f"Ollama HTTP error: {e}, falling back to text search")
+        except Exception as e:
+            logger.warning(f"Ollama error: {e}, falling back to text search")
+
+        return {"text_search": query}, False
+
+    if not use_cache:
+        return await parse()
+    return cast(tuple[dict[str, Any], bool], await ai_query_flight.do(cache_key, parse))
 
 
 def _extract_json(text: str) -> dict[str, Any] | None:
@@ -160,6 +239,57 @@ def _extract_json(text: str) -> dict[str, Any] | None:
     return None
 
 
+# =============================================================================
+# Full-Text Search
+# =============================================================================
+
+# Text search configuration of organizations.search_vector (migration 021)
+TEXT_SEARCH_CONFIG = "english"
+
+
+def text_search_condition(text: str) -> tuple[str, list[Any]]:
+    """WHERE condition matching organizations against free text.
+
+    Matches the full-text index over name, city, country, LP mandate and
+    GP thesis (organizations.search_vector), with trigram fallbacks for
+    name fragments, misspelled names and partial city names. Every branch
+    is served by a GIN index, so no column is scanned with a leading
+    wildcard.
+
+    Args:
+        text: Search text as typed, e.g. "ontario teachers".
+
+    Returns:
+        Tuple of (SQL condition on alias o, list of parameters)
+    """
+    pattern = f"%{text}%"
+    condition = (
+        f"(o.search_vector @@ websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', %s)"
+        " OR o.name ILIKE %s OR o.name %% %s OR o.hq_city ILIKE %s)"
+    )
+    return condition, [text, pattern, text, pattern]
+
+
+def text_search_rank(text: str) -> tuple[str, list[Any]]:
+    """Relevance of an organization to free text, for ORDER BY ... DESC.
+
+    ts_rank weighs name matches over location matches over mandate and
+    thesis matches; trigram similarity to the name lifts exact and
+    near-exact name hits above rows that only mention the words.
+
+    Args:
+        text: Search text, as passed to text_search_condition.
+
+    Returns:
+        Tuple of (SQL expression on alias o, list of parameters)
+    """
+    rank = (
+        f"(ts_rank(o.search_vector, websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', %s))"
+        " + similarity(o.name, %s))"
+    )
+    return rank, [text, text]
+
+
 def build_lp_search_sql(
     filters: dict[str, Any],
     base_conditions: list[str] | None = None,
@@ -223,13 +353,66 @@ def build_lp_search_sql(
 
     # Text search fallback
     if filters.get("text_search"):
-        conditions.append("(o.name ILIKE %s OR o.hq_city ILIKE %s)")
-        text_pattern = f"%{filters['text_search']}%"
-        params.extend([text_pattern, text_pattern])
+        text_condition, text_params = text_search_condition(filters["text_search"])
+        conditions.append(text_condition)
+        params.extend(text_params)
 
     return " AND ".join(conditions), params
 
 
+def lp_filters_could_match(filters: dict[str, Any], row: dict[str, Any]) -> bool:
+    """Whether an LP row could satisfy the filters of build_lp_search_sql.
+
+    Used as the matcher of versioned caches holding LP search results, so a
+    changed LP only evicts the queries it may now appear in. Columns missing
+    from row (e.g. organization fields) are assumed to match; NULL columns
+    fail their conditions, as in SQL.
+
+    Args:
+        filters: Dictionary of filters from parse_lp_search_query.
+        row: lp_profiles columns of the changed LP.
+
+    Returns:
+        False only if some filter certainly excludes the row.
+    """
+
+    def number(column: str) -> float | None:
+        value = row[column]
+        return None if value is None else float(value)
+
+    if filters.get("aum_min") is not None and "total_aum_bn" in row:
+        aum = number("total_aum_bn")
+        if aum is None or aum < float(filters["aum_min"]):
+            return False
+
+    if filters.get("aum_max") is not None and "total_aum_bn" in row:
+        aum = number("total_aum_bn")
+        if aum is None or aum > float(filters["aum_max"]):
+            return False
+
+    if filters.get("lp_type") and "lp_type" in row and row["lp_type"] != filters["lp_type"]:
+        return False
+
+    if filters.get("strategies") and "strategies" in row:
+        strategies = filters["strategies"]
+        if isinstance(strategies, str):
+            strategies = [strategies]
+        if not set(strategies) & set(row["strategies"] or []):
+            return False
+
+    if filters.get("check_size_min") is not None and "check_size_max_mm" in row:
+        check_max = number("check_size_max_mm")
+        if check_max is None or check_max < float(filters["check_size_min"]):
+            return False
+
+    if filters.get("check_size_max") is not None and "check_size_min_mm" in row:
+        check_min = number("check_size_min_mm")
+        if check_min is None or check_min > float(filters["check_size_max"]):
+            return False
+
+    return True
+
+
 def is_natural_language_query(query: str) -> bool:
     """Detect if a query looks like natural language vs simple text.
 
@@ -278,6 +461,379 @@ def is_natural_language_query(query: str) -> bool:
     return False
 
 
+# =============================================================================
+# Semantic Search
+# =============================================================================
+
+# LPs nearest to a query embedding by cosine distance. ORDER BY distance
+# with a LIMIT is what lets Postgres use the ivfflat index. Filters are
+# applied to the rows the index returns, so very selective filters can
+# yield fewer than the limit; raise the probes to search more lists.
+LP_SEMANTIC_SQL = """
+    SELECT
+        o.id, o.name, o.hq_city, o.hq_country, o.website,
+        lp.lp_type, lp.total_aum_bn, lp.strategies, lp.mandate_description,
+        1 - (lp.mandate_embedding <=> %s::vector) AS similarity
+    FROM organizations o
+    JOIN lp_profiles lp ON lp.org_id = o.id
+    WHERE {where_clause} AND lp.mandate_embedding_model = %s
+    ORDER BY lp.mandate_embedding <=> %s::vector
+    LIMIT %s
+"""
+
+
+def build_lp_semantic_sql(
+    embedding: list[float],
+    model: str,
+    filters: dict[str, Any] | None = None,
+    limit: int = 20,
+) -> tuple[str, list[Any]]:
+    """Build the nearest-mandate query for a query embedding.
+
+    Args:
+        embedding: Query vector from embed_query().
+        model: Model id of the embedding; only mandates embedded by the
+            same model are compared.
+        filters: Structured filters, as for build_lp_search_sql.
+        limit: Number of LPs to return.
+
+    Returns:
+        Tuple of (SQL query, list of parameters)
+    """
+    where_clause, params = build_lp_search_sql(filters or {})
+    vector = to_pgvector(embedding)
+    return LP_SEMANTIC_SQL.format(where_clause=where_clause), [vector, *params, model, vector, limit]
+
+
+async def semantic_lp_search(
+    cur: Any,
+    query: str,
+    filters: dict[str, Any] | None = None,
+    limit: int = 20,
+    probes: int | None = None,
+) -> list[dict[str, Any]]:
+    """Find the LPs whose mandates are closest in meaning to a query.
+
+    Approximate nearest-neighbour search on lp_profiles.mandate_embedding
+    (ivfflat). probes sets how many index lists are scanned, trading
+    latency for recall, for this transaction only.
+
+    Args:
+        cur: Open async cursor (dict rows).
+        query: Search text, e.g. "climate-focused infrastructure".
+        filters: Structured filters applied to the matches.
+        limit: Number of LPs to return.
+        probes: ivfflat.probes (default: settings.semantic_search_probes).
+
+    Returns:
+        LP rows, most similar first, each with a similarity in [-1, 1].
+    """
+    provider = get_embedding_provider()
+    embedding = await embed_query(query, provider)
+    probes = probes or get_settings().semantic_search_probes
+    await cur.execute("SELECT set_config('ivfflat.probes', %s, true)", [str(probes)])
+    sql, params = build_lp_semantic_sql(embedding, provider.model, filters, limit)
+    await cur.execute(sql, params)
+    return [dict(row) for row in await cur.fetchall()]
+
+
+# =============================================================================
+# Rule-Based Query Parsing
+# =============================================================================
+
+SearchKind = Literal["lp", "gp"]
+
+_NUM = r"(\d+(?:,\d{3})*(?:\.\d+)?)"
+_UNIT = r"(trillion|billion|million|thousand|mil|bn|mm|mn|tn|[kmbt])"
+_UNIT_DOLLARS = {
+    "k": 1e3,
+    "thousand": 1e3,
+    "m": 1e6,
+    "mm": 1e6,
+    "mn": 1e6,
+    "mil": 1e6,
+    "million": 1e6,
+    "b": 1e9,
+    "bn": 1e9,
+    "billion": 1e9,
+    "t": 1e12,
+    "tn": 1e12,
+    "trillion": 1e12,
+}
+
+_MIN_WORDS = r"over|above|more than|greater than|at least|minimum(?: of)?|min|exceeding|north of|>=?"
+_MAX_WORDS = r"under|below|less than|at most|up to|maximum(?: of)?|max|smaller than|south of|<=?"
+_MIN_SUFFIX = r"or more|or greater|or higher|or above|and above|and up|plus"
+_MAX_SUFFIX = r"or less|or lower|or below|and below|and under"
+
+_BETWEEN_RE = re.compile(rf"between\s+\$?{_NUM}\s*{_UNIT}?\s+and\s+\$?{_NUM}\s*{_UNIT}\b")
+_RANGE_RE = re.compile(rf"\$?{_NUM}\s*{_UNIT}?\s*(?:-|–|to)\s*\$?{_NUM}\s*{_UNIT}\b")
+_AMOUNT_RE = re.compile(
+    rf"(?:(?P<before>{_MIN_WORDS}|{_MAX_WORDS})\s*)?\$?(?P<number>{_NUM})\s*(?P<unit>{_UNIT})\b(?P<plus>\+)?"
+    rf"(?:\s+(?P<after>{_MIN_SUFFIX}|{_MAX_SUFFIX}))?"
+)
+_CHECK_SIZE_RE = re.compile(r"\b(?:check|cheque|ticket|commitment)s?\b")
+_AUM_RE = re.compile(r"\baum\b|\bassets\b")
+
+_TEAM_SIZE_RE = re.compile(
+    r"team(?:\s+size)?\s+(?:of\s+)?(?:(?:at least|over|more than)\s+)?(\d+)\+?"
+    r"|(\d+)\+?\s+(?:investment\s+)?(?:people|person|professionals|members)(?:\s+team)?"
+)
+_YEARS_RE = re.compile(
+    r"(?:(?:at least|over|more than)\s+)?(\d+)\+?\s+years?"
+    r"(?:\s+(?:of\s+)?(?:experience|investing|track record|history))?"
+    r"|track record of\s+(\d+)\+?\s+years?"
+)
+
+_LP_TYPE_PATTERNS: tuple[tuple[str, str], ...] = (
+    (r"pensions?(?:\s+(?:funds?|plans?|systems?))?", "pension"),
+    (r"endowments?", "endowment"),
+    (r"foundations?", "foundation"),
+    (r"family\s+offices?", "family_office"),
+    (r"sovereign(?:\s+wealth)?(?:\s+funds?)?|swfs?", "sovereign_wealth"),
+    (r"insurers?|insurance(?:\s+compan(?:y|ies))?", "insurance"),
+    (r"funds?\s+of\s+funds|fofs?", "fund_of_funds"),
+)
+_STRATEGY_PATTERNS: tuple[tuple[str, str], ...] = (
+    (r"buy[\s-]?outs?|lbos?", "buyout"),
+    (r"growth(?:\s+equity)?", "growth"),
+    (r"venture(?:\s+capital)?|vc", "venture"),
+    (r"real\s+estate|property", "real_estate"),
+    (r"infrastructure|infra", "infrastructure"),
+    (r"(?:private\s+)?credit|private\s+debt|direct\s+lending", "credit"),
+    (r"secondar(?:y|ies)", "secondaries"),
+)
+_LP_STRATEGIES = frozenset({"buyout", "growth", "venture", "real_estate", "infrastructure"})
+
+_LOCATIONS: dict[str, str] = {
+    # Regions
+    "europe": "Europe",
+    "european": "Europe",
+    "asia": "Asia",
+    "asian": "Asia",
+    "asia pacific": "Asia Pacific",
+    "apac": "Asia Pacific",
+    "middle east": "Middle East",
+    "africa": "Africa",
+    "latin america": "Latin America",
+    "latam": "Latin America",
+    "north america": "North America",
+    # Countries ("us" alone is usually the pronoun; see _US_RE)
+    "u.s.": "USA",
+    "u.s": "USA",
+    "usa": "USA",
+    "united states": "USA",
+    "uk": "United Kingdom",
+    "united kingdom": "United Kingdom",
+    "britain": "United Kingdom",
+    "uae": "UAE",
+    **{
+        name.lower(): name
+        for name in (
+            "Canada", "Australia", "Singapore", "Hong Kong", "Japan", "Germany", "France", "Switzerland",
+            "Netherlands", "Ireland", "Sweden", "Norway", "Denmark", "Italy", "Spain", "South Korea",
+            "China", "India", "Saudi Arabia", "Israel", "Brazil", "Mexico", "Argentina",
+        )
+    },
+    # US states
+    **{
+        name.lower(): name
+        for name in (
+            "New York", "California", "Texas", "Florida", "Illinois", "Pennsylvania", "Ohio", "Georgia",
+            "North Carolina", "Michigan", "New Jersey", "Virginia", "Washington", "Arizona", "Massachusetts",
+            "Tennessee", "Indiana", "Missouri", "Maryland", "Wisconsin", "Colorado", "Minnesota",
+            "South Carolina", "Alabama", "Louisiana", "Kentucky", "Oregon", "Oklahoma", "Connecticut", "Utah",
+        )
+    },
+    # Cities
+    "nyc": "New York",
+    "bay area": "San Francisco",
+    **{
+        name.lower(): name
+        for name in (
+            "Los Angeles", "San Francisco", "San Diego", "San Jose", "Sacramento", "Houston", "Dallas",
+            "Austin", "Miami", "Chicago", "Philadelphia", "Pittsburgh", "Boston", "Seattle", "Denver",
+            "Atlanta", "London", "Toronto", "Sydney", "Tokyo", "Frankfurt", "Paris", "Zurich", "Amsterdam",
+            "Dublin", "Stockholm", "Oslo", "Copenhagen", "Milan", "Madrid", "Seoul", "Shanghai", "Beijing",
+            "Mumbai", "Dubai", "Abu Dhabi", "Riyadh", "Tel Aviv", "Sao Paulo", "Mexico City",
+        )
+    },
+}
+# Longest names first so "new york" wins over "york", "mexico city" over "mexico"
+_LOCATION_RE = re.compile(
+    r"\b(" + "|".join(re.escape(name) for name in sorted(_LOCATIONS, key=len, reverse=True)) + r")(?!\w)"
+)
+# "us" is only a location after a preposition ("based in us"), never in "show us ..."
+_US_RE = re.compile(r"\b(?:in|from|across|within|throughout)\s+(us)\b")
+
+_NEGATION_RE = re.compile(r"\b(?:not|no|non|excluding|exclude|except|without|other than)\b")
+
+# Words that carry no filter on their own ("pension funds in texas")
+_FILLER_WORDS = frozenset(
+    """
+    a an the and or with in of for on to that who which from at by are is any all me us show find list search
+    lp lps limited partner partners investor investors institution institutions institutional allocator allocators
+    fund funds gp gps manager managers firm firms sponsor sponsors
+    based located headquartered hq focused focus focusing focuses oriented dedicated specialist specialists
+    invest invests investing investment investments strategy strategies allocation allocations exposure
+    interest interested active aum assets size sized check checks cheque ticket tickets commitment commitments
+    private equity pe capital
+    """.split()
+)
+
+
+@dataclass(frozen=True)
+class RuleParseResult:
+    """Filters extracted by the rule-based parser.
+
+    Attributes:
+        filters: Filters in the same shape as the LLM parsers return.
+        confidence: Share of meaningful query words the rules explained
+            (0.0 when nothing was extracted or the query is ambiguous).
+        unparsed: Meaningful words no rule explained.
+    """
+
+    filters: dict[str, Any]
+    confidence: float
+    unparsed: tuple[str, ...]
+
+
+def parse_query_with_rules(query: str, kind: SearchKind) -> RuleParseResult:
+    """Parse a search query with deterministic rules, without an LLM.
+
+    Recognizes dollar amounts and ranges (AUM and check size for LPs, fund
+    size for GPs), LP types, strategies, known locations and, for GPs,
+    team size and years of experience. Anything else (names, negations,
+    conflicting values) lowers the confidence so callers fall back to the
+    LLM parser.
+
+    Args:
+        query: Search query.
+        kind: "lp" or "gp", selecting the filter vocabulary.
+
+    Returns:
+        RuleParseResult with filters in the parse_lp_search_query /
+        parse_gp_search_query format (without metadata).
+
+    Example:
+        >>> parse_query_with_rules("pension funds in california with 100m+ aum", "lp").filters
+        {'aum_min': 0.1, 'lp_type': 'pension', 'location': 'California'}
+    """
+    text = re.sub(r"assets\s+under\s+management", "aum", query.lower()).strip()
+    filters: dict[str, Any] = {}
+    explained = 0
+    conflict = _NEGATION_RE.search(text) is not None
+
+    def consume(match: re.Match[str], group: int = 0) -> None:
+        nonlocal text, explained
+        start, end = match.span(group)
+        explained += len(re.findall(r"[a-z0-9]+", match.group(group)))
+        text = text[:start] + " " * (end - start) + text[end:]
+
+    def put(key: str, value: Any) -> None:
+        nonlocal conflict
+        if key in filters and filters[key] != value:
+            conflict = True
+        filters[key] = value
+
+    if kind == "gp":
+        while (match := _TEAM_SIZE_RE.search(text)) is not None:
+            put("team_size_min", int(match.group(1) or match.group(2)))
+            consume(match)
+        while (match := _YEARS_RE.search(text)) is not None:
+            put("years_investing_min", int(match.group(1) or match.group(2)))
+            consume(match)
+
+    for range_re in (_BETWEEN_RE, _RANGE_RE):
+        while (match := range_re.search(text)) is not None:
+            low, low_unit, high, high_unit = match.groups()
+            field = _amount_field(text, match, kind)
+            put(f"{field}_min", _scale_amount(low, low_unit or high_unit, field))
+            put(f"{field}_max", _scale_amount(high, high_unit, field))
+            consume(match)
+
+    while (match := _AMOUNT_RE.search(text)) is not None:
+        field = _amount_field(text, match, kind)
+        qualifier = match.group("before") or match.group("after") or ""
+        upper = bool(re.fullmatch(f"{_MAX_WORDS}|{_MAX_SUFFIX}", qualifier))
+        put(f"{field}_max" if upper else f"{field}_min", _scale_amount(match.group("number"), match.group("unit"), field))
+        consume(match)
+
+    if kind == "lp":
+        for pattern, lp_type in _LP_TYPE_PATTERNS:
+            for match in list(re.finditer(rf"\b(?:{pattern})\b", text)):
+                put("lp_type", lp_type)
+                consume(match)
+
+    strategies: list[str] = []
+    for pattern, strategy in _STRATEGY_PATTERNS:
+        if kind == "lp" and strategy not in _LP_STRATEGIES:
+            continue
+        for match in list(re.finditer(rf"\b(?:{pattern})\b", text)):
+            if strategy not in strategies:
+                strategies.append(strategy)
+            consume(match)
+    if strategies:
+        if kind == "lp":
+            filters["strategies"] = strategies
+        else:
+            put("strategy", strategies[0])
+            conflict = conflict or len(strategies) > 1
+
+    for match in list(_LOCATION_RE.finditer(text)):
+        put("location", _LOCATIONS[match.group(1)])
+        consume(match)
+    for match in list(_US_RE.finditer(text)):
+        put("location", "USA")
+        consume(match, 1)
+
+    unparsed = tuple(word for word in re.findall(r"[a-z0-9]+", text) if word not in _FILLER_WORDS)
+    if not filters or conflict:
+        confidence = 0.0
+    else:
+        confidence = explained / (explained + len(unparsed))
+    return RuleParseResult(filters=filters, confidence=round(confidence, 3), unparsed=unparsed)
+
+
+def _parse_with_rules(query: str, kind: SearchKind, start_time: float) -> dict[str, Any] | None:
+    """Serve a query from the rule-based parser if it is confident enough."""
+    settings = get_settings()
+    if not settings.search_rules_enabled:
+        return None
+
+    parsed = parse_query_with_rules(query, kind)
+    if parsed.confidence < settings.search_rules_min_confidence:
+        return None
+
+    result = dict(parsed.filters)
+    result["_cache_hit"] = False
+    result["_parser"] = "rules"
+    result["_parse_time_ms"] = round((time.time() - start_time) * 1000, 2)
+    logger.info(f"Rule-parsed {kind.upper()} query '{query}' -> {parsed.filters} ({result['_parse_time_ms']}ms)")
+    return result
+
+
+def _amount_field(text: str, match: re.Match[str], kind: SearchKind) -> str:
+    """Filter an amount belongs to: the nearest field keyword wins."""
+    if kind == "gp":
+        return "fund_size"
+
+    start, end = match.span()
+    best_distance, field = 25, "aum"
+    for keyword_re, candidate in ((_CHECK_SIZE_RE, "check_size"), (_AUM_RE, "aum")):
+        for keyword in keyword_re.finditer(text):
+            distance = max(start - keyword.end(), keyword.start() - end, 0)
+            if distance < best_distance:
+                best_distance, field = distance, candidate
+    return field
+
+
+def _scale_amount(number: str, unit: str, field: str) -> float:
+    """Convert "50", "m" to the field's unit (billions for AUM, else millions)."""
+    dollars = float(number.replace(",", "")) * _UNIT_DOLLARS[unit]
+    return round(dollars / (1e9 if field == "aum" else 1e6), 6)
+
+
 # =============================================================================
 # GP Search Functions
 # =============================================================================
@@ -289,6 +845,9 @@ async def parse_gp_search_query(
 ) -> dict[str, Any]:
     """Use Ollama to parse natural language into GP search filters.
 
+    Queries the rule-based parser fully understands skip Ollama, as in
+    parse_lp_search_query().
+
     Args:
         query: Natural language search query
         use_cache: Whether to use cache for results. Defaults to True.
@@ -303,22 +862,27 @@ async def parse_gp_search_query(
         - years_investing_min: int
         - text_search: str (fallback)
         - _cache_hit: bool
+        - _parser: str ("rules" or "llm")
         - _parse_time_ms: float
     """
     start_time = time.time()
 
-    cache_key = make_cache_key("gp_search", query.lower().strip())
+    fast = _parse_with_rules(query, "gp", start_time)
+    if fast is not None:
+        return fast
+
+    normalized_query = query.lower().strip()
+    cache_key = make_cache_key("gp_search", normalized_query)
     if use_cache:
         cached = ai_query_cache.get(cache_key)
         if cached is not None:
             result = cached.copy()
             result["_cache_hit"] = True
+            result["_parser"] = "llm"
             result["_parse_time_ms"] = round((time.time() - start_time) * 1000, 2)
             logger.info(f"Cache hit for GP query '{query}' ({result['_parse_time_ms']}ms)")
             return result
 
-    settings = get_settings()
-
     prompt = f"""You are a search query parser for a GP (General Partner/Fund Manager) database.
 Extract structured filters from this search query. Return ONLY valid JSON.
 
@@ -338,47 +902,17 @@ Return ONLY a JSON object with the relevant filters. Example:
 
 JSON:"""
 
-    try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.post(
-                f"{settings.ollama_base_url}/api/generate",
-                json={
-                    "model": settings.ollama_model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {"temperature": 0.1},
-                },
-            )
-            response.raise_for_status()
-
-            result = response.json()
-            text = result.get("response", "").strip()
-
-            filters = _extract_json(text)
-            if filters:
-                ai_query_cache.set(cache_key, filters)
-                parse_time = round((time.time() - start_time) * 1000, 2)
-                filters["_cache_hit"] = False
-                filters["_parse_time_ms"] = parse_time
-                logger.info(f"Parsed GP query '{query}' -> {filters} ({parse_time}ms)")
-                return filters
-
-            logger.warning(f"Could not parse JSON from Ollama response: {text}")
-            parse_time = round((time.time() - start_time) * 1000, 2)
-            return {"text_search": query, "_cache_hit": False, "_parse_time_ms": parse_time}
-
-    except httpx.TimeoutException:
-        logger.warning("Ollama request timed out, falling back to text search")
-        parse_time = round((time.time() - start_time) * 1000, 2)
-        return {"text_search": query, "_cache_hit": False, "_parse_time_ms": parse_time}
-    except httpx.HTTPError as e:
-        logger.warning(f"Ollama HTTP error: {e}, falling back to text search")
-        parse_time = round((time.time() - start_time) * 1000, 2)
-        return {"text_search": query, "_cache_hit": False, "_parse_time_ms": parse_time}
-    except Exception as e:
-        logger.warning(f"Ollama error: {e}, falling back to text search")
-        parse_time = round((time.time() - start_time) * 1000, 2)
-        return {"text_search": query, "_cache_hit": False, "_parse_time_ms": parse_time}
+    filters, cache_hit = await _parse_with_ollama(
+        "gp_search", query, normalized_query, cache_key, prompt, GP_SEARCH_PROMPT_VERSION, use_cache
+    )
+
+    # Copy: the parsed filters are shared with the cache and coalesced callers
+    result = dict(filters)
+    result["_cache_hit"] = cache_hit
+    result["_parser"] = "llm"
+    result["_parse_time_ms"] = round((time.time() - start_time) * 1000, 2)
+    logger.info(f"Parsed GP query '{query}' -> {filters} ({result['_parse_time_ms']}ms)")
+    return result
 
 
 def build_gp_search_sql(
@@ -421,8 +955,8 @@ def build_gp_search_sql(
 
     # Text search fallback
     if filters.get("text_search"):
-        conditions.append("(o.name ILIKE %s OR o.hq_city ILIKE %s OR gp.investment_philosophy ILIKE %s)")
-        text_pattern = f"%{filters['text_search']}%"
-        params.extend([text_pattern, text_pattern, text_pattern])
+        text_condition, text_params = text_search_condition(filters["text_search"])
+        conditions.append(text_condition)
+        params.extend(text_params)
 
     return " AND ".join(conditions), params
@@ -6,13 +6,12 @@ to avoid circular imports and code duplication.
 
 from __future__ import annotations
 
-import os
+import json
 from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
 import psycopg
-from psycopg.rows import dict_row
 
 
 def serialize_row(row: dict[str, Any]) -> dict[str, Any]:
@@ -56,11 +55,28 @@ def is_valid_uuid(value: str) -> bool:
         return False
 
 
+def sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message.
+
+    The data is JSON-encoded so it always fits on a single ``data:`` line,
+    whatever newlines the text contains.
+
+    Args:
+        event: Event name, dispatched to ``addEventListener(event, ...)``.
+        data: JSON-serializable payload.
+
+    Returns:
+        The message, terminated by a blank line.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 def get_db() -> psycopg.Connection[dict[str, Any]] | None:
     """Get database connection if configured.
 
-    Creates a new psycopg connection with dict_row factory for easy
-    data access. The caller is responsible for closing the connection.
+    Delegates to ``src.database.get_db``, which serves connections from the
+    shared pool when it is open and connects directly otherwise. The caller
+    is responsible for closing the connection (returning it to the pool).
 
     IMPORTANT: This function automatically selects the appropriate database:
     - In tests (pytest): Uses TEST_DATABASE_URL
@@ -70,18 +86,6 @@ def get_db() -> psycopg.Connection[dict[str, Any]] | None:
     Returns:
         psycopg Connection object with dict_row factory, or None if not configured.
     """
-    from src.config import get_settings
-
-    settings = get_settings()
-
-    # Check for test database first (from settings or env)
-    db_url = settings.test_database_url or os.environ.get("TEST_DATABASE_URL")
-
-    # Fall back to production database
-    if not db_url:
-        db_url = settings.database_url or os.environ.get("DATABASE_URL")
-
-    if not db_url:
-        return None
+    from src.database import get_db as _get_db
 
-    return psycopg.connect(db_url, row_factory=dict_row)
+    return _get_db()
@@ -0,0 +1,43 @@
+-- ============================================================================
+-- Migration 017: Persistent LLM Response Cache
+--
+-- Content-addressed cache for LLM outputs (search query parsing, match
+-- explanations, pitch deck extraction). Rows are keyed by a SHA-256 of
+-- (namespace, model, prompt version, normalized inputs), so identical
+-- requests hit the cache across deploys and workers.
+--
+-- entity_cache (migration 010) is keyed by (entity_type, entity_id UUID,
+-- cache_type), which does not fit free-text inputs such as search queries.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    cache_key       TEXT PRIMARY KEY,       -- SHA-256 hex of the inputs
+
+    -- What produced the value
+    namespace       TEXT NOT NULL,          -- e.g. 'lp_search', 'match_content'
+    model_version   TEXT NOT NULL,
+    prompt_version  TEXT NOT NULL,
+
+    -- Cached output
+    value           JSONB NOT NULL,
+    size_bytes      INTEGER NOT NULL DEFAULT 0,  -- counted against LLM_CACHE_MAX_BYTES
+
+    -- Validity and usage (eviction removes least recently hit rows first)
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at      TIMESTAMPTZ,
+    last_hit_at     TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    hit_count       INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires ON llm_response_cache(expires_at)
+    WHERE expires_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_hit ON llm_response_cache(last_hit_at);
+
+COMMENT ON TABLE llm_response_cache IS 'Content-addressed cache of LLM outputs, shared across deploys';
+
+-- Server-side cache: only privileged users may read it through the API
+ALTER TABLE llm_response_cache ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "llm_response_cache_privileged_only" ON llm_response_cache;
+CREATE POLICY "llm_response_cache_privileged_only" ON llm_response_cache
+    FOR ALL USING (is_privileged_user());
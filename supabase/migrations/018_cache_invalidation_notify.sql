@@ -0,0 +1,49 @@
+-- ============================================================================
+-- Migration 018: Push-based cache invalidation
+--
+-- Row-level triggers on the core tables NOTIFY the 'lpxgp_cache' channel
+-- with the table, the changed entity's id and the operation. The app
+-- listens on that channel (src/cache_invalidation.py), bumps the entity's
+-- data version and evicts dependent cache entries, so it no longer polls
+-- COUNT(*) / MAX(updated_at) to find out that data changed.
+--
+-- Payload: {"table": "lp_profiles", "id": "<org uuid>", "op": "UPDATE"}
+-- Profiles report their org_id, the id the app caches LPs and GPs by.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION notify_cache_invalidation()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed JSONB;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed := to_jsonb(OLD);
+    ELSE
+        changed := to_jsonb(NEW);
+    END IF;
+
+    PERFORM pg_notify(
+        'lpxgp_cache',
+        json_build_object(
+            'table', TG_TABLE_NAME,
+            'id', changed ->> TG_ARGV[0],
+            'op', TG_OP
+        )::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION notify_cache_invalidation() IS 'NOTIFY lpxgp_cache of a changed row; TG_ARGV[0] is the id column to report';
+
+CREATE TRIGGER notify_organizations_cache AFTER INSERT OR UPDATE OR DELETE ON organizations
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation('id');
+
+CREATE TRIGGER notify_lp_profiles_cache AFTER INSERT OR UPDATE OR DELETE ON lp_profiles
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation('org_id');
+
+CREATE TRIGGER notify_gp_profiles_cache AFTER INSERT OR UPDATE OR DELETE ON gp_profiles
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation('org_id');
+
+CREATE TRIGGER notify_funds_cache AFTER INSERT OR UPDATE OR DELETE ON funds
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation('id');
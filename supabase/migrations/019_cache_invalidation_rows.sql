@@ -0,0 +1,54 @@
+-- ============================================================================
+-- Migration 019: Filterable columns in cache invalidation notifications
+--
+-- Extends notify_cache_invalidation() (migration 018) with an optional
+-- "row" object holding the columns named in TG_ARGV[1..]. For LPs these
+-- are the columns LP search filters on, so the app can tell which cached
+-- query results a changed LP could newly appear in and keep the rest
+-- (src/search.py lp_filters_could_match). Text and embedding columns are
+-- left out to stay far below the 8000-byte NOTIFY payload limit.
+--
+-- Payload: {"table": "lp_profiles", "id": "<org uuid>", "op": "UPDATE",
+--           "row": {"lp_type": "pension", "total_aum_bn": 12.5, ...}}
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION notify_cache_invalidation()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed JSONB;
+    payload JSONB;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed := to_jsonb(OLD);
+    ELSE
+        changed := to_jsonb(NEW);
+    END IF;
+
+    payload := jsonb_build_object(
+        'table', TG_TABLE_NAME,
+        'id', changed ->> TG_ARGV[0],
+        'op', TG_OP
+    );
+
+    IF TG_NARGS > 1 AND TG_OP <> 'DELETE' THEN
+        payload := payload || jsonb_build_object(
+            'row',
+            (SELECT jsonb_object_agg(key, value)
+             FROM jsonb_each(changed)
+             WHERE key = ANY(TG_ARGV[1:TG_NARGS - 1]))
+        );
+    END IF;
+
+    PERFORM pg_notify('lpxgp_cache', payload::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION notify_cache_invalidation() IS 'NOTIFY lpxgp_cache of a changed row; TG_ARGV[0] is the id column to report, TG_ARGV[1..] the row columns to include';
+
+DROP TRIGGER IF EXISTS notify_lp_profiles_cache ON lp_profiles;
+
+CREATE TRIGGER notify_lp_profiles_cache AFTER INSERT OR UPDATE OR DELETE ON lp_profiles
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation(
+        'org_id', 'lp_type', 'total_aum_bn', 'strategies', 'check_size_min_mm', 'check_size_max_mm'
+    );
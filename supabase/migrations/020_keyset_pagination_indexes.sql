@@ -0,0 +1,21 @@
+-- ============================================================================
+-- Migration 020: Indexes for keyset pagination of the list APIs
+--
+-- /api/v1/lps, /api/v1/gps and /api/v1/funds page with a cursor holding the
+-- last row's sort key (src/pagination.py). Each index below matches one
+-- ORDER BY exactly, so a page is an index range scan that stops after
+-- per_page + 1 rows, whatever its depth.
+--
+-- LPs sort unknown AUM last through COALESCE(total_aum_bn, -1), which
+-- keeps the cursor comparison a single row comparison:
+--     (COALESCE(lp.total_aum_bn, -1), lp.org_id) < (%s, %s)
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_lp_profiles_aum_keyset
+    ON lp_profiles ((COALESCE(total_aum_bn, -1)) DESC, org_id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_organizations_gp_name_keyset
+    ON organizations (name, id) WHERE is_gp = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_funds_vintage_keyset
+    ON funds (vintage_year DESC NULLS LAST, name, id);
@@ -0,0 +1,112 @@
+-- ============================================================================
+-- Migration 021: Full-text search over organizations
+--
+-- LP and GP text search used ILIKE '%term%' over name, city and thesis
+-- columns. Only organizations.name had a trigram index, so every other
+-- column was scanned row by row. Search now matches one weighted tsvector
+-- per organization (src/search.py text_search_condition):
+--
+--     A  name
+--     B  hq_city, hq_country
+--     C  LP mandate_description, GP investment_philosophy (thesis)
+--
+-- A generated column cannot read the profile tables, so search_vector is
+-- kept up to date by triggers on organizations, lp_profiles and
+-- gp_profiles. Trigram indexes back the fuzzy fallbacks (name fragments,
+-- misspellings, partial city names) and the location and strategy
+-- filters, which still use ILIKE.
+-- ============================================================================
+
+ALTER TABLE organizations ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+
+COMMENT ON COLUMN organizations.search_vector IS 'Maintained by triggers; see organization_search_vector()';
+
+CREATE OR REPLACE FUNCTION organization_search_vector(
+    p_name TEXT,
+    p_city TEXT,
+    p_country TEXT,
+    p_mandate TEXT,
+    p_thesis TEXT
+)
+RETURNS TSVECTOR AS $$
+    SELECT setweight(to_tsvector('english', COALESCE(p_name, '')), 'A')
+        || setweight(to_tsvector('english', concat_ws(' ', p_city, p_country)), 'B')
+        || setweight(to_tsvector('english', concat_ws(' ', p_mandate, p_thesis)), 'C');
+$$ LANGUAGE sql IMMUTABLE;
+
+COMMENT ON FUNCTION organization_search_vector(TEXT, TEXT, TEXT, TEXT, TEXT) IS 'Weighted search document of an organization: name A, location B, mandate/thesis C';
+
+-- Organization fields changed: rebuild from NEW and the current profiles
+CREATE OR REPLACE FUNCTION set_organization_search_vector()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector := organization_search_vector(
+        NEW.name,
+        NEW.hq_city,
+        NEW.hq_country,
+        (SELECT mandate_description FROM lp_profiles WHERE org_id = NEW.id),
+        (SELECT investment_philosophy FROM gp_profiles WHERE org_id = NEW.id)
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Profile text changed: rebuild the owning organization's vector
+CREATE OR REPLACE FUNCTION refresh_organization_search_vector()
+RETURNS TRIGGER AS $$
+DECLARE
+    target UUID;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        target := OLD.org_id;
+    ELSE
+        target := NEW.org_id;
+    END IF;
+
+    UPDATE organizations o
+    SET search_vector = organization_search_vector(
+        o.name,
+        o.hq_city,
+        o.hq_country,
+        (SELECT mandate_description FROM lp_profiles WHERE org_id = o.id),
+        (SELECT investment_philosophy FROM gp_profiles WHERE org_id = o.id)
+    )
+    WHERE o.id = target;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS organizations_search_vector ON organizations;
+CREATE TRIGGER organizations_search_vector BEFORE INSERT OR UPDATE OF name, hq_city, hq_country ON organizations
+    FOR EACH ROW EXECUTE FUNCTION set_organization_search_vector();
+
+DROP TRIGGER IF EXISTS lp_profiles_search_vector ON lp_profiles;
+CREATE TRIGGER lp_profiles_search_vector AFTER INSERT OR UPDATE OF mandate_description OR DELETE ON lp_profiles
+    FOR EACH ROW EXECUTE FUNCTION refresh_organization_search_vector();
+
+DROP TRIGGER IF EXISTS gp_profiles_search_vector ON gp_profiles;
+CREATE TRIGGER gp_profiles_search_vector AFTER INSERT OR UPDATE OF investment_philosophy OR DELETE ON gp_profiles
+    FOR EACH ROW EXECUTE FUNCTION refresh_organization_search_vector();
+
+-- Backfill existing rows
+UPDATE organizations o
+SET search_vector = organization_search_vector(
+    o.name,
+    o.hq_city,
+    o.hq_country,
+    (SELECT mandate_description FROM lp_profiles WHERE org_id = o.id),
+    (SELECT investment_philosophy FROM gp_profiles WHERE org_id = o.id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_organizations_search_vector
+    ON organizations USING GIN (search_vector);
+
+-- Fuzzy fallback and location/strategy filters (pg_trgm, migration 001)
+CREATE INDEX IF NOT EXISTS idx_organizations_hq_city_trgm
+    ON organizations USING GIN (hq_city gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_organizations_hq_country_trgm
+    ON organizations USING GIN (hq_country gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_gp_profiles_philosophy_trgm
+    ON gp_profiles USING GIN (investment_philosophy gin_trgm_ops);
@@ -0,0 +1,59 @@
+-- ============================================================================
+-- Migration 022: Embedding pipeline bookkeeping
+--
+-- The VECTOR(1024) columns from migrations 001, 002 and 016 are filled by
+-- src/embeddings.py (scripts/embed_profiles.py) and searched by
+-- src/search.py semantic_lp_search.
+--
+-- * *_embedding_model records which model produced each vector. Vectors
+--   from different models are not comparable, so searches filter on it
+--   and switching models re-embeds every row.
+-- * Triggers clear an embedding when the text it was computed from
+--   changes, so the pipeline's "embedding IS NULL" scan finds it again.
+--
+-- ivfflat picks its list centroids when the index is built. The indexes
+-- from migration 001 were built on empty tables, so rebuild them once
+-- the first embeddings are loaded (embed_profiles.py --reindex does this):
+--     REINDEX INDEX CONCURRENTLY idx_lp_profiles_mandate_embedding;
+-- ============================================================================
+
+ALTER TABLE lp_profiles ADD COLUMN IF NOT EXISTS mandate_embedding_model TEXT;
+ALTER TABLE funds ADD COLUMN IF NOT EXISTS thesis_embedding_model TEXT;
+
+COMMENT ON COLUMN lp_profiles.mandate_embedding_model IS 'Embedding model of mandate_embedding, e.g. voyage:voyage-3';
+COMMENT ON COLUMN funds.thesis_embedding_model IS 'Embedding model of thesis_embedding, e.g. voyage:voyage-3';
+
+CREATE OR REPLACE FUNCTION clear_lp_mandate_embedding()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Keep embeddings written together with the text (the pipeline itself)
+    IF NEW.mandate_description IS DISTINCT FROM OLD.mandate_description
+       AND NEW.mandate_embedding IS NOT DISTINCT FROM OLD.mandate_embedding THEN
+        NEW.mandate_embedding := NULL;
+        NEW.mandate_embedding_model := NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION clear_fund_thesis_embedding()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.investment_thesis IS DISTINCT FROM OLD.investment_thesis
+       AND NEW.thesis_embedding IS NOT DISTINCT FROM OLD.thesis_embedding THEN
+        NEW.thesis_embedding := NULL;
+        NEW.thesis_embedding_model := NULL;
+        UPDATE fund_ai_profiles SET thesis_embedding = NULL WHERE fund_id = NEW.id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS lp_profiles_clear_mandate_embedding ON lp_profiles;
+CREATE TRIGGER lp_profiles_clear_mandate_embedding BEFORE UPDATE OF mandate_description ON lp_profiles
+    FOR EACH ROW EXECUTE FUNCTION clear_lp_mandate_embedding();
+
+DROP TRIGGER IF EXISTS funds_clear_thesis_embedding ON funds;
+CREATE TRIGGER funds_clear_thesis_embedding BEFORE UPDATE OF investment_thesis ON funds
+    FOR EACH ROW EXECUTE FUNCTION clear_fund_thesis_embedding();
+
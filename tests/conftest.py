@@ -7,6 +7,7 @@ Fixtures:
     client: Test client without database connection.
     client_with_db: Test client with mocked database.
     mock_db_connection: Mock psycopg connection.
+    llm_query_parsing: Send search queries to the (mocked) LLM parser.
     sample_*: Sample data for testing.
     sql_injection_payloads: Security test payloads.
     xss_payloads: XSS test payloads.
@@ -23,11 +24,13 @@ from __future__ import annotations
 import os
 from collections.abc import Generator
 from typing import TYPE_CHECKING, Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from src.cache import page_cache
+from src.llm_client import reset_circuit_breakers
 from src.main import app
 from src.preferences import _user_preferences
 from src.shortlists import _shortlists
@@ -241,17 +244,24 @@ def reset_in_memory_state() -> Generator[None, None, None]:
     """Reset in-memory state between tests.
 
     This fixture runs automatically before each test to ensure
-    a clean state for shortlists and user preferences.
+    a clean state for shortlists, user preferences, LLM circuit
+    breakers (so Ollama failures in one test cannot skip it in the next)
+    and cached page data (so one test's mocked rows cannot leak into
+    the next).
     """
     # Clear before test
     _shortlists.clear()
     _user_preferences.clear()
+    reset_circuit_breakers()
+    page_cache.clear()
 
     yield
 
     # Clear after test
     _shortlists.clear()
     _user_preferences.clear()
+    reset_circuit_breakers()
+    page_cache.clear()
 
 # =============================================================================
 # Core Application Fixtures
@@ -287,24 +297,33 @@ def client() -> Generator[TestClient, None, None]:
         patch("src.routers.insights.get_db", return_value=None),
         patch("src.routers.shortlist.get_db", return_value=None),
         # Routers that import from src.utils
-        patch("src.routers.pages.get_db", return_value=None),
         patch("src.routers.admin.get_db", return_value=None),
+        # Async handlers (get_async_db)
+        patch("src.routers.lps.get_async_db", new=AsyncMock(return_value=None)),
+        patch("src.routers.matches.get_async_db", new=AsyncMock(return_value=None)),
+        patch("src.routers.pipeline.get_async_db", new=AsyncMock(return_value=None)),
+        patch("src.routers.pages.get_async_db", new=AsyncMock(return_value=None)),
     ):
         yield TestClient(app)
 
 
 @pytest.fixture
-def client_with_db(mock_db_connection: MagicMock) -> Generator[TestClient, None, None]:
+def client_with_db(
+    mock_db_connection: MagicMock,
+    mock_async_db_connection: MagicMock,
+) -> Generator[TestClient, None, None]:
     """Create a test client with mocked database connection.
 
     Use this fixture when testing endpoints that require database access.
 
     Args:
         mock_db_connection: Mock database connection fixture.
+        mock_async_db_connection: Mock async connection for get_async_db().
 
     Yields:
         TestClient with mocked database.
     """
+    async_db = AsyncMock(return_value=mock_async_db_connection)
     # Patch get_db at all import locations with the mock connection
     # Only patch modules that actually import get_db
     with (
@@ -321,8 +340,12 @@ def client_with_db(mock_db_connection: MagicMock) -> Generator[TestClient, None,
         patch("src.routers.insights.get_db", return_value=mock_db_connection),
         patch("src.routers.shortlist.get_db", return_value=mock_db_connection),
         # Routers that import from src.utils
-        patch("src.routers.pages.get_db", return_value=mock_db_connection),
         patch("src.routers.admin.get_db", return_value=mock_db_connection),
+        # Async handlers (get_async_db)
+        patch("src.routers.lps.get_async_db", new=async_db),
+        patch("src.routers.matches.get_async_db", new=async_db),
+        patch("src.routers.pipeline.get_async_db", new=async_db),
+        patch("src.routers.pages.get_async_db", new=async_db),
     ):
         yield TestClient(app)
 
@@ -356,6 +379,35 @@ def mock_db_connection() -> MagicMock:
     return mock_conn
 
 
+@pytest.fixture
+def mock_async_db_connection() -> MagicMock:
+    """Create a mock psycopg AsyncConnection for testing.
+
+    Async counterpart of mock_db_connection for handlers that use
+    get_async_db(): cursor() is an async context manager and execute,
+    fetchone, fetchall, commit and close are awaitable.
+
+    Returns:
+        Mock async connection with cursor context manager configured.
+    """
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+
+    # Configure async cursor context manager
+    mock_conn.cursor.return_value.__aenter__ = AsyncMock(return_value=mock_cursor)
+    mock_conn.cursor.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    mock_cursor.execute = AsyncMock()
+    mock_cursor.fetchall = AsyncMock(return_value=[])
+    mock_cursor.fetchone = AsyncMock(return_value=None)
+
+    mock_conn.commit = AsyncMock()
+    mock_conn.rollback = AsyncMock()
+    mock_conn.close = AsyncMock()
+
+    return mock_conn
+
+
 @pytest.fixture
 def mock_db_with_data(
     sample_organizations: list[dict[str, Any]],
@@ -590,6 +642,22 @@ def clean_env() -> Generator[None, None, None]:
             os.environ[var] = value
 
 
+@pytest.fixture
+def llm_query_parsing() -> Generator[None, None, None]:
+    """Fixture that disables the rule-based search query parser.
+
+    Tests of the Ollama parsing path use it so that queries the rules
+    understand still reach the (mocked) LLM.
+
+    Yields:
+        None, with search_rules_enabled set to False.
+    """
+    from src.config import get_settings
+
+    with patch.object(get_settings(), "search_rules_enabled", False):
+        yield
+
+
 @pytest.fixture
 def production_env() -> Generator[None, None, None]:
     """Fixture that sets production environment configuration.
@@ -0,0 +1,291 @@
+"""Tests for the vectorized batch scorer.
+
+The batch scorer must agree exactly with calculate_match_score(), so most
+coverage is a Hypothesis property test comparing the two on random funds
+and LP universes.
+
+Run the benchmark with: uv run pytest tests/test_batch_matching.py -v -s -m slow
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from src.batch_matching import compile_lp_matrix, find_candidates, score_fund_against_lps
+from src.config import get_settings
+from src.lp_feature_store import lp_feature_store
+from src.matching import calculate_match_score
+
+# Small vocabularies so generated funds and LPs overlap often, with case,
+# underscore and substring variants that exercise normalization.
+STRATEGIES = ["buyout", "Buyout", "growth", "venture", "VENTURE", "credit", ""]
+GEOGRAPHIES = ["North America", "north america", "Europe", "Asia", "Global", "global", ""]
+SECTORS = ["technology", "tech", "healthcare", "health_care", "health care", "fintech", "", "Tech_Enabled"]
+
+optional_lists = st.one_of(st.none(), st.lists(st.sampled_from(GEOGRAPHIES), max_size=4))
+sizes = st.one_of(
+    st.none(),
+    st.integers(min_value=0, max_value=5000),
+    st.floats(min_value=0, max_value=5000, allow_nan=False),
+    st.decimals(min_value=0, max_value=5000, places=2, allow_nan=False, allow_infinity=False),
+)
+
+funds = st.fixed_dictionaries(
+    {},
+    optional={
+        "strategy": st.one_of(st.none(), st.sampled_from(STRATEGIES)),
+        "target_size_mm": sizes,
+        "fund_number": st.one_of(st.none(), st.integers(min_value=0, max_value=8)),
+        "geographic_focus": st.one_of(st.none(), st.lists(st.sampled_from(GEOGRAPHIES), max_size=4)),
+        "sector_focus": st.one_of(st.none(), st.lists(st.sampled_from(SECTORS), max_size=4)),
+        "esg_policy": st.booleans(),
+    },
+)
+
+lps = st.fixed_dictionaries(
+    {},
+    optional={
+        "strategies": st.one_of(st.none(), st.lists(st.sampled_from(STRATEGIES), max_size=4)),
+        "geographic_preferences": optional_lists,
+        "sector_preferences": st.one_of(st.none(), st.lists(st.sampled_from(SECTORS), max_size=4)),
+        "fund_size_min_mm": sizes,
+        "fund_size_max_mm": sizes,
+        "esg_required": st.booleans(),
+        "emerging_manager_ok": st.booleans(),
+        "min_fund_number": st.one_of(st.none(), st.integers(min_value=0, max_value=6)),
+    },
+)
+
+
+def assert_matches_scalar(fund: dict, lp_list: list[dict]) -> None:
+    """Assert batch results equal calculate_match_score() for every LP."""
+    scores = score_fund_against_lps(fund, compile_lp_matrix(lp_list))
+    scalar = [calculate_match_score(fund, lp) for lp in lp_list]
+    assert len(scores) == len(lp_list)
+    assert list(scores.results()) == scalar
+    assert scores.all_scores().tolist() == [r["score"] for r in scalar]
+    # Exactly the LPs passing the hard filters reach soft scoring
+    assert scores.candidates.tolist() == [i for i, r in enumerate(scalar) if r["passed_hard_filters"]]
+
+
+class TestBatchMatchesScalar:
+    """Batch scores are identical to the scalar scorer."""
+
+    @settings(max_examples=300, deadline=None)
+    @given(funds, st.lists(lps, max_size=12))
+    def test_property_matches_calculate_match_score(self, fund, lp_list):
+        assert_matches_scalar(fund, lp_list)
+
+    def test_perfect_match(self):
+        fund = {
+            "strategy": "venture",
+            "geographic_focus": ["North America", "Europe"],
+            "sector_focus": ["technology", "healthcare"],
+            "target_size_mm": 500,
+            "fund_number": 4,
+            "esg_policy": True,
+        }
+        lp = {
+            "strategies": ["venture", "growth"],
+            "geographic_preferences": ["North America", "Europe"],
+            "sector_preferences": ["technology", "healthcare"],
+            "fund_size_min_mm": 100,
+            "fund_size_max_mm": 1000,
+            "esg_required": True,
+            "min_fund_number": 3,
+        }
+        assert_matches_scalar(fund, [lp])
+
+    def test_rounding_at_half_boundaries(self):
+        """Soft scores landing near .x5 round like the builtin round()."""
+        fund = {
+            "strategy": "buyout",
+            "target_size_mm": 333,
+            "fund_number": 3,
+            "geographic_focus": ["Europe", "Asia", "North America"],
+            "sector_focus": ["tech", "fintech", "healthcare"],
+        }
+        lp_list = [
+            {
+                "strategies": ["buyout"],
+                "geographic_preferences": ["Europe"],
+                "sector_preferences": ["technology"],
+                "fund_size_min_mm": low,
+                "fund_size_max_mm": low + span,
+                "min_fund_number": 7,
+            }
+            for low in (1, 100, 250, 332.95)
+            for span in (0.3, 7, 1000, 2001)
+        ]
+        assert_matches_scalar(fund, lp_list)
+
+    def test_decimal_sizes(self):
+        fund = {"strategy": "growth", "target_size_mm": Decimal("250.50")}
+        lp = {"strategies": ["growth"], "fund_size_min_mm": Decimal("100"), "fund_size_max_mm": Decimal("400.25")}
+        assert_matches_scalar(fund, [lp])
+
+    def test_empty_universe(self):
+        scores = score_fund_against_lps({"strategy": "buyout"}, compile_lp_matrix([]))
+        assert len(scores) == 0
+        assert scores.pruning_ratio == 0.0
+        assert list(scores.indices_at_least(50)) == []
+
+
+class TestCandidatePruning:
+    """Hard filters evaluated by inverted-index intersection."""
+
+    def test_candidates_and_pruning_ratio(self):
+        fund = {"strategy": "buyout", "target_size_mm": 500, "fund_number": 3, "esg_policy": False}
+        lp_list = [
+            {"strategies": ["buyout"], "fund_size_min_mm": 100, "fund_size_max_mm": 1000},
+            {"strategies": ["venture"]},
+            {"strategies": ["buyout"], "esg_required": True},
+            {"strategies": ["Buyout"], "fund_size_min_mm": 600},
+            {"strategies": ["buyout"], "fund_size_max_mm": 499},
+            {"strategies": ["buyout", "growth"]},
+        ]
+        lp_matrix = compile_lp_matrix(lp_list)
+
+        assert find_candidates(fund, lp_matrix).tolist() == [0, 5]
+        scores = score_fund_against_lps(fund, lp_matrix)
+        assert scores.candidate_count == 2
+        assert scores.pruning_ratio == pytest.approx(4 / 6)
+
+    def test_size_bounds_are_inclusive(self):
+        lp_list = [{"strategies": ["buyout"], "fund_size_min_mm": 500, "fund_size_max_mm": 500}]
+        fund = {"strategy": "buyout", "target_size_mm": 500, "fund_number": 3}
+        assert find_candidates(fund, compile_lp_matrix(lp_list)).tolist() == [0]
+
+    def test_emerging_manager_filter(self):
+        lp_list = [{"strategies": ["buyout"], "emerging_manager_ok": ok} for ok in (True, False)]
+        fund = {"strategy": "buyout", "target_size_mm": 500, "fund_number": 1}
+        assert find_candidates(fund, compile_lp_matrix(lp_list)).tolist() == [0]
+
+    def test_unknown_strategy_prunes_everything(self):
+        lp_matrix = compile_lp_matrix([{"strategies": ["buyout"]}])
+        scores = score_fund_against_lps({"strategy": "credit", "target_size_mm": 10}, lp_matrix)
+        assert scores.candidate_count == 0
+        assert scores.pruning_ratio == 1.0
+        assert scores.result(0) == calculate_match_score({"strategy": "credit", "target_size_mm": 10}, {"strategies": ["buyout"]})
+
+
+class TestBatchScores:
+    """BatchMatchScores helpers."""
+
+    def test_indices_at_least_threshold(self):
+        fund = {"strategy": "buyout", "target_size_mm": 500, "fund_number": 3}
+        lp_list = [
+            {"strategies": ["buyout"], "fund_size_min_mm": 100, "fund_size_max_mm": 1000},
+            {"strategies": ["venture"]},
+            {"strategies": ["buyout"]},
+        ]
+        scores = score_fund_against_lps(fund, compile_lp_matrix(lp_list))
+
+        assert list(scores.indices_at_least(50)) == [0, 2]
+        assert scores.result(1)["score"] == 0
+        assert scores.result(1)["passed_hard_filters"] is False
+
+
+class TestGenerateMatchesEndpoint:
+    """generate_matches_for_fund scores the feature store with the batch engine."""
+
+    def test_only_lps_above_threshold_get_content(self, client_with_db, mock_db_connection):
+        fund = {"id": "f1", "name": "Fund I", "strategy": "buyout", "target_size_mm": 500, "fund_number": 3}
+        lp_rows = [
+            {"org_id": "lp-match", "name": "Match LP", "strategies": ["buyout"]},
+            {"org_id": "lp-miss", "name": "Miss LP", "strategies": ["venture"]},
+        ]
+        cursor = mock_db_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = fund
+        cursor.fetchall.return_value = lp_rows
+        content = {"explanation": "Fits", "talking_points": [], "concerns": []}
+        committed_before_generation = []
+
+        async def generate_content(*args, **kwargs):
+            committed_before_generation.append(mock_db_connection.commit.called)
+            return content
+
+        lp_feature_store.clear()
+        with (
+            patch("src.lp_feature_store.refresh_versions_if_stale"),
+            patch.object(get_settings(), "match_content_mode", "eager"),
+            patch("src.matching.generate_match_content", new=AsyncMock(side_effect=generate_content)) as generate,
+        ):
+            response = client_with_db.post(
+                "/api/funds/00000000-0000-0000-0000-000000000001/generate-matches"
+            )
+
+        assert response.status_code == 200
+        assert "Found 1 matching LPs" in response.text
+        assert "1 LPs did not meet criteria" in response.text
+        generate.assert_awaited_once()
+        assert committed_before_generation == [True]
+        upsert_params = cursor.executemany.call_args.args[1][0]
+        assert upsert_params[1] == "lp-match"
+        assert upsert_params[2] == calculate_match_score(fund, lp_rows[0])["score"]
+        lp_feature_store.clear()
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+
+def _random_lp(rng: random.Random) -> dict:
+    low = rng.choice([None, 50, 100, 250, 500])
+    return {
+        "strategies": rng.sample(STRATEGIES[:5], rng.randint(1, 3)),
+        "geographic_preferences": rng.sample(GEOGRAPHIES[:5], rng.randint(0, 3)),
+        "sector_preferences": rng.sample(SECTORS[:6], rng.randint(0, 3)),
+        "fund_size_min_mm": low,
+        "fund_size_max_mm": (low or 0) + rng.choice([0, 500, 2000]),
+        "esg_required": rng.random() < 0.3,
+        "emerging_manager_ok": rng.random() < 0.5,
+        "min_fund_number": rng.choice([None, 1, 2, 3]),
+    }
+
+
+@pytest.mark.slow
+class TestBatchScoringBenchmark:
+    """Batch vs scalar scoring over a large LP universe."""
+
+    def test_batch_faster_than_scalar_loop(self):
+        rng = random.Random(42)
+        lp_list = [_random_lp(rng) for _ in range(20_000)]
+        fund = {
+            "strategy": "buyout",
+            "target_size_mm": 600,
+            "fund_number": 2,
+            "geographic_focus": ["North America", "Europe"],
+            "sector_focus": ["technology", "healthcare"],
+            "esg_policy": True,
+        }
+
+        start = time.perf_counter()
+        scalar = [calculate_match_score(fund, lp) for lp in lp_list]
+        scalar_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        lp_matrix = compile_lp_matrix(lp_list)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        scores = score_fund_against_lps(fund, lp_matrix)
+        batch_ms = (time.perf_counter() - start) * 1000
+
+        print(f"\n  Scoring 1 fund against {len(lp_list):,} LPs:")
+        print("  " + "-" * 50)
+        print(f"    Scalar loop:        {scalar_ms:8.1f}ms")
+        print(f"    Compile LP matrix:  {compile_ms:8.1f}ms (once per LP set)")
+        print(f"    Batch score:        {batch_ms:8.1f}ms")
+        print(f"    Speedup:            {scalar_ms / batch_ms:8.1f}x")
+
+        assert [r["score"] for r in scalar] == scores.all_scores().tolist()
+        assert batch_ms * 5 < scalar_ms
@@ -0,0 +1,268 @@
+"""Tests for pluggable cache backends.
+
+Covers the in-process MemoryBackend with its byte limits and W-TinyLFU
+admission, the Redis-protocol RedisBackend (against fakeredis), the
+two-tier L1/L2 backend and its cross-worker invalidation, backend errors
+degrading to cache misses, and choosing a backend from settings.
+"""
+
+from __future__ import annotations
+
+import time
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.cache import (
+    CacheBackendError,
+    CacheVersionManager,
+    InvalidationBus,
+    LRUCache,
+    MemoryBackend,
+    RedisBackend,
+    TieredBackend,
+    VersionedLRUCache,
+    approximate_size,
+    get_cache_stats,
+    make_cache_backend,
+    page_cache,
+)
+from src.config import get_settings
+
+
+@pytest.fixture
+def redis_backend() -> RedisBackend:
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisBackend(fakeredis.FakeRedis(), name="test")
+
+
+class TestMemoryBackend:
+    """Today's in-process behavior."""
+
+    def test_evicts_least_recently_used(self):
+        cache: LRUCache[int] = LRUCache(max_size=2, ttl_seconds=0, name="test")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get_many(["a", "b", "c"]) == [1, None, 3]
+        assert cache.stats.evictions == 1
+
+    def test_ttl_expiry(self):
+        backend = MemoryBackend(max_size=10)
+        backend.set("a", 1, ttl_seconds=1)
+        with patch("src.cache.time.time", return_value=time.time() + 2):
+            assert backend.get("a") is None
+        assert len(backend) == 0
+
+    def test_values_are_not_copied(self):
+        cache: LRUCache[dict] = LRUCache(name="test")
+        value = {"a": 1}
+        cache.set("k", value)
+        assert cache.get("k") is value
+
+
+class TestSizeBoundedMemory:
+    """Byte limits and W-TinyLFU admission."""
+
+    def test_evicts_until_bytes_fit(self):
+        backend = MemoryBackend(max_size=100, max_bytes=350)
+        for key in "abcd":
+            backend.set(key, "x" * 100, ttl_seconds=0)
+
+        assert [key in backend for key in "abcd"] == [False, True, True, True]
+        assert backend.usage()["bytes"] == 3 * approximate_size("x" * 100)
+
+    def test_oversized_value_is_not_stored(self):
+        backend = MemoryBackend(max_size=100, max_bytes=50)
+        backend.set("big", "x" * 100, ttl_seconds=0)
+
+        assert "big" not in backend
+        assert backend.usage() == {"bytes": 0, "max_bytes": 50, "admission_rejects": 1}
+
+    def test_one_off_keys_do_not_flush_hot_keys(self):
+        backend = MemoryBackend(max_size=100, admission=True)
+        for i in range(100):
+            backend.set(f"hot{i}", i, ttl_seconds=0)
+        for _ in range(3):
+            backend.get_many([f"hot{i}" for i in range(100)])
+
+        for i in range(1000):
+            backend.set(f"scan{i}", i, ttl_seconds=0)
+
+        assert sum(f"hot{i}" in backend for i in range(100)) >= 90  # Sketch collisions admit a few
+        assert backend.usage()["admission_rejects"] >= 900
+
+    def test_plain_lru_without_admission(self):
+        backend = MemoryBackend(max_size=100)
+        for i in range(100):
+            backend.set(f"hot{i}", i, ttl_seconds=0)
+        for i in range(100):
+            backend.set(f"scan{i}", i, ttl_seconds=0)
+
+        assert not any(f"hot{i}" in backend for i in range(100))
+
+    def test_usage_in_cache_stats(self):
+        page_cache.set("dashboard", {"lps": 7})
+
+        stats = get_cache_stats()["page"]
+
+        assert stats["bytes"] == approximate_size({"lps": 7})
+        assert stats["admission_rejects"] == 0
+
+
+class TestRedisBackend:
+    """Shared storage through a Redis-protocol server."""
+
+    def test_round_trip_with_mget(self, redis_backend):
+        cache: LRUCache[dict] = LRUCache(name="test", backend=redis_backend)
+        cache.set_many({"a": {"score": Decimal("85.5"), "tags": {"lp"}}, "b": {"score": 1}})
+
+        assert cache.get_many(["a", "missing", "b"]) == [{"score": 85.5, "tags": ["lp"]}, None, {"score": 1}]
+        assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+        assert len(cache) == 2
+
+    def test_ttl_is_set_on_server(self, redis_backend):
+        redis_backend.set("a", 1, ttl_seconds=60)
+        redis_backend.set("b", 1, ttl_seconds=0)
+
+        assert 0 < redis_backend._client.pttl("lpxgp:cache:test:a") <= 60_000
+        assert redis_backend._client.pttl("lpxgp:cache:test:b") == -1
+
+    def test_unserializable_values_are_skipped(self, redis_backend):
+        redis_backend.set("a", object(), ttl_seconds=60)
+        assert redis_backend.get("a") is None
+
+    def test_clear_only_touches_own_namespace(self, redis_backend):
+        other = RedisBackend(redis_backend._client, name="other")
+        redis_backend.set("a", 1, ttl_seconds=0)
+        other.set("a", 2, ttl_seconds=0)
+
+        redis_backend.clear()
+
+        assert len(redis_backend) == 0
+        assert other.get("a") == 2
+
+    def test_versioned_cache(self, redis_backend):
+        cache: VersionedLRUCache[list] = VersionedLRUCache(entity_types=["lp"], name="test", backend=redis_backend)
+        manager = CacheVersionManager(poll_interval=60)
+        manager.update_from_db({"lp": {"count": 100, "last_modified": None}})
+
+        cache.set("q", [1, 2], manager)
+        assert cache.get("q", manager) == [1, 2]
+
+        manager.update_from_db({"lp": {"count": 101, "last_modified": None}})
+        assert cache.get("q", manager) is None
+        assert len(cache) == 0
+
+
+class TestTieredBackend:
+    """A per-worker L1 in front of the shared L2."""
+
+    def test_per_tier_hits(self):
+        l2 = MemoryBackend(max_size=10)
+        l2.set("shared", 1, ttl_seconds=0)
+        cache: LRUCache[int] = LRUCache(name="test", backend=TieredBackend(l2, name="test"))
+
+        assert cache.get_many(["shared", "shared", "missing"]) == [1, 1, None]
+        cache.set("own", 2)
+        assert cache.get("own") == 2
+
+        assert cache.backend.tier_stats.as_dict() == {
+            "l1_hits": 2,
+            "l2_hits": 1,
+            "misses": 1,
+            "l1_hit_rate": 50.0,
+            "l2_hit_rate": 25.0,
+            "l1_invalidations": 0,
+        }
+
+    def test_l1_entries_expire_first(self):
+        l2 = MemoryBackend(max_size=10)
+        tiered = TieredBackend(l2, name="test", l1_ttl_seconds=1)
+        tiered.set("a", 1, ttl_seconds=300)
+        l2.set("a", 2, ttl_seconds=300)  # Written elsewhere, notification lost
+
+        assert tiered.get("a") == 1
+        with patch("src.cache.time.time", return_value=time.time() + 2):
+            assert tiered.get("a") == 2
+
+    def test_writes_by_other_workers_evict_l1(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        workers = []
+        for _ in range(2):
+            client = fakeredis.FakeRedis(server=server)
+            bus = InvalidationBus(client)
+            workers.append((TieredBackend(RedisBackend(client, name="test"), name="test", bus=bus), bus))
+        (first, first_bus), (second, second_bus) = workers
+
+        first.set("a", 1, ttl_seconds=60)
+        assert second.get("a") == 1  # Now in the second worker's L1
+        first.set("a", 2, ttl_seconds=60)
+
+        deadline = time.monotonic() + 2
+        while not second.pending_invalidations and time.monotonic() < deadline:
+            time.sleep(0.01)
+        first_bus.close()
+        second_bus.close()
+
+        assert second.get("a") == 2
+        assert second.tier_stats.l1_invalidations == 1
+        assert not first.pending_invalidations  # Own writes are ignored
+
+
+def test_backend_errors_are_misses():
+    backend = MagicMock(spec=MemoryBackend)
+    backend.get_many.side_effect = CacheBackendError("connection refused")
+    backend.set_many.side_effect = CacheBackendError("connection refused")
+    cache: LRUCache[int] = LRUCache(name="test", backend=backend)
+
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.stats.misses == 1
+    assert cache.stats.errors == 2
+
+
+class TestMakeCacheBackend:
+    """The backend follows settings.cache_backend."""
+
+    def test_memory_by_default(self):
+        assert isinstance(make_cache_backend("test", 10), MemoryBackend)
+
+    def test_falls_back_without_redis_package(self):
+        settings = get_settings()
+        with (
+            patch.object(settings, "cache_backend", "redis"),
+            patch.object(settings, "redis_url", "redis://localhost:6379/0"),
+            patch("src.cache.redis_available", return_value=False),
+        ):
+            assert isinstance(make_cache_backend("test", 10), MemoryBackend)
+
+    def test_redis_when_configured(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        settings = get_settings()
+        with (
+            patch.object(settings, "cache_backend", "redis"),
+            patch.object(settings, "redis_url", "redis://localhost:6379/0"),
+            patch.object(settings, "cache_l1_max_size", 0),
+            patch("src.cache.get_redis_client", return_value=fakeredis.FakeRedis()),
+        ):
+            assert isinstance(make_cache_backend("test", 10), RedisBackend)
+
+    def test_l1_in_front_of_redis(self):
+        settings = get_settings()
+        with (
+            patch.object(settings, "cache_backend", "redis"),
+            patch.object(settings, "redis_url", "redis://localhost:6379/0"),
+            patch("src.cache.get_redis_client", return_value=MagicMock()),
+            patch("src.cache.RedisBackend", return_value=MemoryBackend()),
+            patch("src.cache.get_invalidation_bus", return_value=None),
+        ):
+            backend = make_cache_backend("test", 10)
+
+        assert isinstance(backend, TieredBackend)
+        assert backend.l1.max_size == 10
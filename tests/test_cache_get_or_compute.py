@@ -0,0 +1,142 @@
+"""Tests for stale-while-revalidate caching.
+
+Covers LRUCache.get_or_compute(): fresh hits, stampede protection on cold
+misses, serving stale values while one background task refreshes them,
+refresh failures, and its use by the dashboard and LP list endpoints.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.cache import LRUCache, page_cache
+
+MOCK_USER = {
+    "id": "test-user-id",
+    "email": "test@example.com",
+    "name": "Test User",
+    "role": "gp",
+    "org_id": None,
+}
+
+
+class Loader:
+    """Counting loader returning 1, 2, 3, ... after a short delay."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.calls = 0
+        self.fail = fail
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        return self.calls
+
+
+def later(seconds: float):
+    """Patch the cache clock forward."""
+    return patch("src.cache.time.time", return_value=time.time() + seconds)
+
+
+@pytest.fixture
+def cache() -> LRUCache[int]:
+    return LRUCache(name="test")
+
+
+class TestGetOrCompute:
+    """Fresh, cold and stale lookups."""
+
+    async def test_cold_miss_runs_loader_once(self, cache):
+        loader = Loader()
+
+        results = await asyncio.gather(*(cache.get_or_compute("k", loader, ttl=10) for _ in range(20)))
+
+        assert results == [1] * 20
+        assert loader.calls == 1
+
+    async def test_fresh_value_is_not_reloaded(self, cache):
+        loader = Loader()
+        await cache.get_or_compute("k", loader, ttl=10)
+
+        with later(5):
+            assert await cache.get_or_compute("k", loader, ttl=10) == 1
+
+        assert loader.calls == 1
+
+    async def test_stale_value_served_while_one_task_refreshes(self, cache):
+        loader = Loader()
+        await cache.get_or_compute("k", loader, ttl=10, stale_ttl=60)
+
+        with later(20):
+            stale = await asyncio.gather(*(cache.get_or_compute("k", loader, ttl=10, stale_ttl=60) for _ in range(5)))
+            await asyncio.sleep(0.05)
+            refreshed = await cache.get_or_compute("k", loader, ttl=10, stale_ttl=60)
+
+        assert stale == [1] * 5
+        assert refreshed == 2
+        assert loader.calls == 2
+        assert (cache.stats.stale_hits, cache.stats.refreshes) == (5, 1)
+
+    async def test_expired_past_stale_window_is_a_miss(self, cache):
+        loader = Loader()
+        await cache.get_or_compute("k", loader, ttl=10, stale_ttl=60)
+
+        with later(100):
+            assert await cache.get_or_compute("k", loader, ttl=10, stale_ttl=60) == 2
+
+    async def test_failed_refresh_keeps_stale_value(self, cache):
+        await cache.get_or_compute("k", Loader(), ttl=10, stale_ttl=60)
+        failing = Loader(fail=True)
+
+        with later(20):
+            assert await cache.get_or_compute("k", failing, ttl=10, stale_ttl=60) == 1
+            await asyncio.sleep(0.05)
+            assert await cache.get_or_compute("k", failing, ttl=10, stale_ttl=60) == 1
+
+    async def test_cold_miss_errors_propagate_and_none_is_not_cached(self, cache):
+        with pytest.raises(ConnectionError):
+            await cache.get_or_compute("k", Loader(fail=True))
+
+        async def nothing() -> None:
+            return None
+
+        assert await cache.get_or_compute("k", nothing) is None
+        assert len(cache) == 0
+
+
+class TestEndpoints:
+    """Dashboard counts and LP lists are served from page_cache."""
+
+    def test_dashboard_counts_cached(self, client, mock_async_db_connection):
+        cursor = mock_async_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = {"count": 7}
+
+        with (
+            patch("src.auth.get_current_user", return_value=MOCK_USER),
+            patch("src.routers.pages.get_async_db", return_value=mock_async_db_connection) as get_db,
+        ):
+            for _ in range(3):
+                assert client.get("/dashboard").status_code == 200
+
+        assert get_db.call_count == 1
+        assert page_cache.stats.hits == 2
+
+    def test_api_v1_lps_cached_per_query(self, authenticated_client, mock_async_db_connection):
+        cursor = mock_async_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = {"total": 1}
+        cursor.fetchall.return_value = [{"id": "lp-1", "name": "Pension LP"}]
+
+        with patch("src.routers.lps.get_async_db", return_value=mock_async_db_connection) as get_db:
+            first = authenticated_client.get("/api/v1/lps?lp_type=pension").json()
+            again = authenticated_client.get("/api/v1/lps?lp_type=pension").json()
+            authenticated_client.get("/api/v1/lps?lp_type=endowment")
+
+        assert first == again
+        assert first["data"] == [{"id": "lp-1", "name": "Pension LP"}]
+        assert get_db.call_count == 2
@@ -0,0 +1,209 @@
+"""Tests for push-based cache invalidation.
+
+Covers applying pushed row changes to the version manager, eviction of
+registered caches (per tagged entity and per query filter), polling being
+skipped while changes are pushed, and the NOTIFY payload handling of the
+listener.
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.cache import CacheVersionManager, VersionedLRUCache, entity_tag
+from src.cache_invalidation import CacheInvalidationListener
+from src.search import lp_filters_could_match
+
+
+@pytest.fixture
+def manager() -> CacheVersionManager:
+    vm = CacheVersionManager(poll_interval=30)
+    vm.update_from_db(
+        {
+            "lp": {"count": 10, "last_modified": None},
+            "gp": {"count": 5, "last_modified": None},
+            "organization": {"count": 15, "last_modified": None},
+            "fund": {"count": 8, "last_modified": None},
+        }
+    )
+    return vm
+
+
+def payload(table: str, op: str = "UPDATE", entity_id: str = "org-1") -> str:
+    return json.dumps({"table": table, "id": entity_id, "op": op})
+
+
+class TestApplyChange:
+    """Pushed changes move versions without a poll."""
+
+    def test_update_bumps_only_that_entity(self, manager):
+        before = manager.get_checksums()
+
+        manager.apply_change("lp", "org-1", "UPDATE")
+
+        after = manager.get_checksums()
+        assert after["lp"] != before["lp"]
+        assert after["gp"] == before["gp"]
+        assert manager.versions["lp"].row_count == 10
+
+    def test_insert_and_delete_track_row_count(self, manager):
+        manager.apply_change("lp", "org-2", "INSERT")
+        manager.apply_change("lp", "org-1", "DELETE")
+        manager.apply_change("lp", "org-3", "DELETE")
+
+        assert manager.versions["lp"].row_count == 9
+
+    def test_organization_change_affects_profiles(self, manager):
+        before = manager.get_checksums()
+
+        manager.apply_change("organization", "org-1", "UPDATE")
+
+        assert all(manager.get_checksums()[e] != before[e] for e in ("organization", "lp", "gp"))
+
+    def test_evicts_dependent_caches(self, manager):
+        lp_cache: VersionedLRUCache[str] = VersionedLRUCache(entity_types=["lp"], name="lp")
+        fund_cache: VersionedLRUCache[str] = VersionedLRUCache(entity_types=["fund"], name="fund")
+        manager.register_cache(lp_cache)
+        manager.register_cache(fund_cache)
+        lp_cache.set("q", "lps", manager)
+        fund_cache.set("q", "funds", manager)
+
+        manager.apply_change("lp", "org-1", "UPDATE")
+
+        assert len(lp_cache) == 0
+        assert fund_cache.get("q", manager) == "funds"
+
+
+class TestTagInvalidation:
+    """A change to one entity evicts only the entries it can affect."""
+
+    @pytest.fixture
+    def cache(self, manager) -> VersionedLRUCache[list]:
+        cache: VersionedLRUCache[list] = VersionedLRUCache(
+            entity_types=["lp"], name="lp_search", matcher=lp_filters_could_match
+        )
+        manager.register_cache(cache)
+        cache.set("page:x", ["X"], manager, tags=[entity_tag("lp", "X")])
+        cache.set("pensions", ["Y"], manager, tags=[entity_tag("lp", "Y")], filters={"lp_type": "pension"})
+        cache.set("endowments", ["Z"], manager, tags=[entity_tag("lp", "Z")], filters={"lp_type": "endowment"})
+        return cache
+
+    def test_update_evicts_tagged_and_matching_queries(self, manager, cache):
+        manager.apply_change("lp", "X", "UPDATE", {"lp_type": "pension"})
+
+        assert cache.get("page:x", manager) is None
+        assert cache.get("pensions", manager) is None  # X may now be a result
+        assert cache.get("endowments", manager) == ["Z"]
+        assert cache.stats.evictions_by_cause == {"tag": 1, "query": 1}
+
+    def test_delete_evicts_only_tagged(self, manager, cache):
+        manager.apply_change("lp", "Y", "DELETE")
+
+        assert cache.get("pensions", manager) is None
+        assert cache.get("page:x", manager) == ["X"]
+        assert cache.get("endowments", manager) == ["Z"]
+
+    def test_unknown_row_evicts_all_queries(self, manager, cache):
+        manager.apply_change("organization", "X", "UPDATE")
+
+        assert len(cache) == 0
+        assert cache.stats.evictions_by_cause == {"tag": 1, "query": 2}
+
+    def test_untagged_entries_evicted_on_any_change(self, manager, cache):
+        cache.set("count", [3], manager)
+
+        manager.apply_change("lp", "W", "UPDATE", {"lp_type": "other"})
+
+        assert cache.get("count", manager) is None
+        assert cache.get("page:x", manager) == ["X"]
+        assert cache.stats.evictions_by_cause == {"entity": 1}
+
+    def test_polled_change_still_invalidates(self, manager, cache):
+        manager.update_from_db({"lp": {"count": 11, "last_modified": None}})
+
+        assert cache.get("page:x", manager) is None
+
+    def test_reverse_index_cleared_on_capacity_eviction(self, manager):
+        cache: VersionedLRUCache[list] = VersionedLRUCache(entity_types=["lp"], max_size=1, name="small")
+        manager.register_cache(cache)
+        cache.set("a", [1], manager, tags=[entity_tag("lp", "A")])
+        cache.set("b", [2], manager, tags=[entity_tag("lp", "B")])
+
+        manager.apply_change("lp", "A", "UPDATE")
+
+        assert cache.get("b", manager) == [2]
+        assert cache.stats.evictions_by_cause == {"capacity": 1}
+
+
+@pytest.mark.parametrize(
+    ("filters", "row", "expected"),
+    [
+        ({"lp_type": "pension"}, {"lp_type": "pension"}, True),
+        ({"lp_type": "pension"}, {"lp_type": "endowment"}, False),
+        ({"aum_min": 10}, {"total_aum_bn": 5.0}, False),
+        ({"aum_min": 10}, {"total_aum_bn": None}, False),
+        ({"strategies": ["buyout"]}, {"strategies": ["growth", "buyout"]}, True),
+        ({"strategies": "venture"}, {"strategies": ["buyout"]}, False),
+        ({"check_size_min": 50}, {"check_size_max_mm": 25}, False),
+        ({"location": "Boston"}, {"lp_type": "pension"}, True),  # Organization column, unknown
+    ],
+)
+def test_lp_filters_could_match(filters, row, expected):
+    assert lp_filters_could_match(filters, row) is expected
+
+
+def test_polling_skipped_while_pushed(manager):
+    manager.push_connected = True
+    assert manager.is_stale() is False
+
+    manager.mark_stale()
+    assert manager.is_stale() is True  # Resync once after (re)connecting
+
+    manager.push_connected = False
+    manager.update_from_db({"lp": {"count": 10, "last_modified": None}})
+    assert manager.is_stale() is False  # Within poll_interval
+
+
+class TestListenerPayloads:
+    """NOTIFY payloads from the migration 018 triggers."""
+
+    def test_profile_change_applied(self, manager):
+        listener = CacheInvalidationListener(manager)
+        before = manager.get_checksums()["gp"]
+
+        assert listener.handle(payload("gp_profiles", "INSERT")) is True
+
+        assert manager.get_checksums()["gp"] != before
+        assert manager.versions["gp"].row_count == 6
+        assert listener.notifications == 1
+
+    def test_row_columns_reach_the_matcher(self, manager):
+        cache: VersionedLRUCache[list] = VersionedLRUCache(
+            entity_types=["lp"], name="lp_search", matcher=lp_filters_could_match
+        )
+        manager.register_cache(cache)
+        cache.set("endowments", [], manager, filters={"lp_type": "endowment"})
+        change = {"table": "lp_profiles", "id": "org-1", "op": "UPDATE", "row": {"lp_type": "pension"}}
+
+        CacheInvalidationListener(manager).handle(json.dumps(change))
+
+        assert cache.get("endowments", manager) == []
+
+    @pytest.mark.parametrize("bad", ["not json", payload("people"), json.dumps({"id": "x"}), "null"])
+    def test_malformed_or_untracked_ignored(self, manager, bad):
+        listener = CacheInvalidationListener(manager)
+        before = manager.get_checksums()
+
+        assert listener.handle(bad) is False
+
+        assert manager.get_checksums() == before
+        assert listener.notifications == 0
+
+    async def test_start_without_database(self, monkeypatch):
+        monkeypatch.setattr("src.cache_invalidation.resolve_database_url", lambda: None)
+        listener = CacheInvalidationListener(CacheVersionManager())
+
+        assert listener.start() is False
+        assert listener.running is False
@@ -0,0 +1,127 @@
+"""Tests for the listing count service (src/counts.py).
+
+Covers exact counts below the estimate threshold, planner estimates above
+it, caching per data version, grouped counts in a single query, and the
+total_exact flag on the /api/v1 list endpoints and /admin/lps.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.cache import version_manager
+from src.counts import Count, count_rows, count_rows_async, grouped_counts
+from src.routers.admin import LP_TYPE_GROUPS
+
+MOCK_USER = {
+    "id": "test-user-id",
+    "email": "test@example.com",
+    "name": "Test User",
+    "role": "gp",
+    "org_id": None,
+}
+
+
+def plan(rows: int) -> dict:
+    """EXPLAIN (FORMAT JSON) result row as psycopg returns it."""
+    return {"QUERY PLAN": [{"Plan": {"Node Type": "Seq Scan", "Plan Rows": rows}}]}
+
+
+def executed(cur: MagicMock) -> list[str]:
+    return [call.args[0] for call in cur.execute.call_args_list]
+
+
+class TestCountRows:
+    """Exact or estimated totals for one filter set."""
+
+    def test_small_result_counted_exactly(self):
+        cur = MagicMock()
+        cur.fetchone.side_effect = [plan(40), {"total": 37}]
+
+        count = count_rows(cur, "funds f", "f.status = %s", ["raising"], estimate_above=1000)
+
+        assert count == Count(37, exact=True)
+        assert executed(cur)[0].startswith("EXPLAIN (FORMAT JSON) SELECT 1 FROM funds f WHERE f.status = %s")
+        assert "COUNT(*)" in executed(cur)[1]
+
+    def test_broad_filter_uses_planner_estimate(self):
+        cur = MagicMock()
+        cur.fetchone.side_effect = [plan(250_000)]
+
+        count = count_rows(cur, "organizations o", "o.is_lp = TRUE", [], estimate_above=1000)
+
+        assert count == Count(250_000, exact=False)
+        assert not any("COUNT(*)" in query for query in executed(cur))
+
+    def test_zero_threshold_always_exact(self):
+        cur = MagicMock()
+        cur.fetchone.return_value = {"total": 250_000}
+
+        assert count_rows(cur, "organizations o", "TRUE", [], estimate_above=0) == Count(250_000)
+        assert len(executed(cur)) == 1
+
+    def test_cached_until_data_version_changes(self):
+        cur = MagicMock()
+        cur.fetchone.side_effect = [plan(5), {"total": 5}, plan(6), {"total": 6}]
+
+        first = count_rows(cur, "funds f", "TRUE", [], estimate_above=1000)
+        again = count_rows(cur, "funds f", "TRUE", [], estimate_above=1000)
+        with patch.object(type(version_manager), "combined_checksum", "changed"):
+            after_write = count_rows(cur, "funds f", "TRUE", [], estimate_above=1000)
+
+        assert (first.value, again.value, after_write.value) == (5, 5, 6)
+        assert cur.execute.call_count == 4
+
+    async def test_async_cursor(self):
+        cur = MagicMock(execute=AsyncMock(), fetchone=AsyncMock(return_value=plan(2_000_000)))
+
+        count = await count_rows_async(cur, "organizations o", "TRUE", [], estimate_above=1000)
+
+        assert count == Count(2_000_000, exact=False)
+
+
+def test_grouped_counts_single_query():
+    cur = MagicMock()
+    cur.fetchone.return_value = {"total": 10, "pensions": 4, "endowments": 3, "family_offices": 2, "other": 1}
+
+    counts = grouped_counts(cur, "lp_profiles", LP_TYPE_GROUPS)
+    grouped_counts(cur, "lp_profiles", LP_TYPE_GROUPS)
+
+    assert counts == {"total": 10, "pensions": 4, "endowments": 3, "family_offices": 2, "other": 1}
+    assert cur.execute.call_count == 1
+    assert "COUNT(*) FILTER (WHERE lp_type = 'pension') AS pensions" in executed(cur)[0]
+
+
+class TestEndpoints:
+    """Listings report whether their total is exact."""
+
+    def test_admin_lps_counts_types_in_one_query(self, client_with_db, mock_db_connection):
+        cursor = mock_db_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = []
+        cursor.fetchone.return_value = {"total": 9, "pensions": 3, "endowments": 2, "family_offices": 2, "other": 2}
+
+        with patch("src.auth.get_current_user", return_value=MOCK_USER):
+            response = client_with_db.get("/admin/lps")
+
+        assert response.status_code == 200
+        assert sum("COUNT(*)" in query for query in executed(cursor)) == 1
+
+    def test_api_reports_estimated_total(self, client_with_db, mock_db_connection):
+        cursor = mock_db_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = plan(5_000_000)
+        cursor.fetchall.return_value = []
+
+        with patch("src.auth.get_current_user", return_value=MOCK_USER):
+            body = client_with_db.get("/api/v1/gps").json()
+
+        assert (body["total"], body["total_exact"]) == (5_000_000, False)
+
+    def test_api_reports_exact_total(self, client_with_db, mock_async_db_connection):
+        cursor = mock_async_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.side_effect = [plan(12), {"total": 11}]
+        cursor.fetchall.return_value = []
+
+        with patch("src.auth.get_current_user", return_value=MOCK_USER):
+            body = client_with_db.get("/api/v1/lps?lp_type=pension").json()
+
+        assert (body["total"], body["total_exact"]) == (11, True)
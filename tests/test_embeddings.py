@@ -0,0 +1,290 @@
+"""Tests for the embedding pipeline and semantic LP search (migration 022).
+
+Covers the hash embedding provider, query embedding caching, the batch
+pipeline, the nearest-mandate query built in src/search.py, and a
+benchmark of ivfflat recall@10 against exact search as probes grow.
+
+Run the benchmark with: uv run pytest tests/test_embeddings.py -v -s -m slow
+"""
+
+from __future__ import annotations
+
+import math
+import statistics
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import psycopg
+import pytest
+from psycopg.rows import dict_row
+
+from src.cache import query_embedding_cache
+from src.config import get_settings
+from src.embeddings import (
+    EMBEDDING_DIMENSIONS,
+    HashEmbeddingProvider,
+    embed_pending,
+    embed_query,
+    to_pgvector,
+)
+from src.search import build_lp_semantic_sql, semantic_lp_search
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b, strict=True))
+
+
+class TestHashEmbeddingProvider:
+    """Local feature-hashing embeddings."""
+
+    def test_unit_vector_of_configured_dimensions(self):
+        vector = HashEmbeddingProvider().embed_one("Infrastructure and real assets")
+
+        assert len(vector) == EMBEDDING_DIMENSIONS
+        assert math.isclose(math.sqrt(sum(x * x for x in vector)), 1.0)
+
+    def test_deterministic(self):
+        provider = HashEmbeddingProvider()
+
+        assert provider.embed_one("Climate infrastructure") == provider.embed_one("climate  INFRASTRUCTURE")
+
+    def test_shared_words_are_more_similar(self):
+        provider = HashEmbeddingProvider()
+        query = provider.embed_one("climate infrastructure")
+        related = provider.embed_one("Infrastructure funds with a climate focus")
+        unrelated = provider.embed_one("Early-stage software venture capital")
+
+        assert _cosine(query, related) > _cosine(query, unrelated)
+
+    def test_empty_text_is_zero_vector(self):
+        assert not any(HashEmbeddingProvider().embed_one(""))
+
+    async def test_embed_preserves_order(self):
+        provider = HashEmbeddingProvider()
+
+        vectors = await provider.embed(["buyout", "venture"])
+
+        assert vectors == [provider.embed_one("buyout"), provider.embed_one("venture")]
+
+
+class TestEmbedQuery:
+    """Query embeddings are cached per model and text."""
+
+    def test_to_pgvector(self):
+        assert to_pgvector([0.5, -1, 0.0]) == "[0.5,-1.0,0.0]"
+
+    async def test_cached_per_text(self):
+        query_embedding_cache.clear()
+        provider = HashEmbeddingProvider()
+        provider.embed = AsyncMock(wraps=provider.embed)
+
+        first = await embed_query("secondaries", provider)
+        second = await embed_query("secondaries", provider)
+        await embed_query("co-investment", provider)
+
+        assert first == second
+        assert provider.embed.await_count == 2
+        assert provider.embed.await_args_list[0].kwargs == {"input_type": "query"}
+        query_embedding_cache.clear()
+
+
+class TestEmbedPending:
+    """Batch pipeline over the embedding targets."""
+
+    @pytest.fixture
+    def conn(self):
+        conn = MagicMock()
+        cursor = MagicMock()
+        conn.cursor.return_value.__aenter__ = AsyncMock(return_value=cursor)
+        conn.cursor.return_value.__aexit__ = AsyncMock(return_value=False)
+        cursor.execute = AsyncMock()
+        cursor.executemany = AsyncMock()
+        cursor.rowcount = 1
+        conn.commit = AsyncMock()
+        return conn, cursor
+
+    async def test_embeds_in_batches_and_commits_each(self, conn):
+        conn, cursor = conn
+        cursor.fetchall = AsyncMock(
+            side_effect=[
+                # LP mandates: one full batch, then a short one
+                [{"id": "lp-1", "text": "buyout"}, {"id": "lp-2", "text": "growth"}],
+                [{"id": "lp-3", "text": "venture"}],
+                # Fund theses: none pending
+                [],
+            ]
+        )
+        provider = HashEmbeddingProvider()
+
+        embedded = await embed_pending(conn, provider, batch_size=2)
+
+        assert embedded == {"lp_mandates": 3, "fund_theses": 0, "fund_ai_profiles": 1}
+        assert cursor.executemany.await_count == 2
+        update_sql, rows = cursor.executemany.await_args_list[1].args
+        assert "UPDATE lp_profiles" in update_sql
+        assert rows == [(to_pgvector(provider.embed_one("venture")), "hash-v1", "lp-3")]
+        # Two LP batches plus the fund_ai_profiles sync
+        assert conn.commit.await_count == 3
+
+    async def test_pending_query_selects_other_models(self, conn):
+        conn, cursor = conn
+        cursor.fetchall = AsyncMock(return_value=[])
+
+        await embed_pending(conn, HashEmbeddingProvider(), batch_size=50)
+
+        pending_sql, params = cursor.execute.await_args_list[0].args
+        assert "FROM lp_profiles" in pending_sql
+        assert "mandate_embedding_model IS DISTINCT FROM %s" in pending_sql
+        assert params == ["hash-v1", 50]
+
+
+class TestSemanticSearch:
+    """Nearest-mandate query."""
+
+    def test_params_follow_placeholders(self):
+        sql, params = build_lp_semantic_sql([1.0, 0.0], "hash-v1", {"lp_type": "pension"}, limit=5)
+
+        assert "ORDER BY lp.mandate_embedding <=> %s::vector" in sql
+        assert sql.replace("%%", "").count("%s") == len(params)
+        assert params[0] == params[-2] == "[1.0,0.0]"
+        assert params[-3:-1] == ["hash-v1", "[1.0,0.0]"]
+        assert params[-1] == 5
+
+    async def test_sets_probes_for_transaction(self):
+        query_embedding_cache.clear()
+        cursor = MagicMock()
+        cursor.execute = AsyncMock()
+        cursor.fetchall = AsyncMock(return_value=[{"id": "lp-1", "similarity": 0.8}])
+
+        with patch("src.search.get_embedding_provider", return_value=HashEmbeddingProvider()):
+            rows = await semantic_lp_search(cursor, "climate infrastructure", probes=25)
+
+        probes_sql, probes_params = cursor.execute.await_args_list[0].args
+        assert probes_sql == "SELECT set_config('ivfflat.probes', %s, true)"
+        assert probes_params == ["25"]
+        assert "lp.mandate_embedding_model = %s" in cursor.execute.await_args_list[1].args[0]
+        assert rows == [{"id": "lp-1", "similarity": 0.8}]
+        query_embedding_cache.clear()
+
+
+# =============================================================================
+# ANN Recall Benchmark
+# =============================================================================
+
+
+BENCH_LPS = 20_000
+BENCH_QUERIES = [
+    "climate infrastructure",
+    "early stage software venture",
+    "emerging managers private credit",
+    "healthcare buyout north america",
+    "asia growth equity secondaries",
+    "real estate debt europe",
+    "impact investing education",
+    "co-investment energy transition",
+]
+BENCH_PROBES = [1, 5, 10, 20, 100]
+TOP_K = 10
+
+# Mandates built from independent word lists so neighbours are not trivial
+SEED_SQL = """
+    WITH orgs AS (
+        INSERT INTO organizations (name, website, is_lp)
+        SELECT 'Embedding Bench LP ' || i, 'https://bench.example/embed/' || i, TRUE
+        FROM generate_series(1, %s) AS i
+        RETURNING id, split_part(website, '/', 5)::int AS i
+    )
+    INSERT INTO lp_profiles (org_id, lp_type, mandate_description)
+    SELECT
+        id,
+        'pension',
+        (ARRAY['climate', 'healthcare', 'software', 'energy', 'education', 'consumer', 'logistics',
+               'fintech', 'agriculture', 'real estate', 'industrial', 'media'])[1 + i % 12]
+        || ' ' || (ARRAY['infrastructure', 'buyout', 'venture', 'growth equity', 'private credit',
+                        'secondaries', 'co-investment', 'debt', 'impact investing'])[1 + (i / 12) % 9]
+        || ' in ' || (ARRAY['north america', 'europe', 'asia', 'latin america', 'africa',
+                           'middle east', 'oceania'])[1 + (i / 108) % 7]
+        || ' for ' || (ARRAY['emerging managers', 'established managers', 'early stage',
+                            'late stage', 'transition', 'sustainability', 'mid market',
+                            'large cap'])[1 + (i / 756) % 8]
+        || ' program ' || i
+    FROM orgs
+"""
+
+EXACT_SQL = """
+    SELECT lp.mandate_embedding <=> %s::vector AS distance
+    FROM lp_profiles lp
+    WHERE lp.mandate_embedding_model = %s
+    ORDER BY distance
+    LIMIT %s
+"""
+
+
+@pytest.mark.slow
+class TestAnnRecallBenchmark:
+    """ivfflat recall@10 and latency by probes, inside a rolled-back transaction."""
+
+    @pytest.fixture(scope="class")
+    def conn(self):
+        settings = get_settings()
+        if not settings.test_database_url:
+            pytest.skip("TEST_DATABASE_URL not configured")
+        provider = HashEmbeddingProvider()
+        with psycopg.connect(settings.test_database_url, row_factory=dict_row) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT 1 FROM information_schema.columns"
+                    " WHERE table_name = 'lp_profiles' AND column_name = 'mandate_embedding_model'"
+                )
+                if cur.fetchone() is None:
+                    pytest.skip("Apply migration 022_embedding_pipeline.sql first")
+                cur.execute(SEED_SQL, [BENCH_LPS])
+                cur.execute(
+                    "SELECT lp.id, lp.mandate_description FROM lp_profiles lp"
+                    " JOIN organizations o ON o.id = lp.org_id"
+                    " WHERE o.website LIKE 'https://bench.example/embed/%'"
+                )
+                rows = cur.fetchall()
+                cur.executemany(
+                    "UPDATE lp_profiles SET mandate_embedding = %s::vector, mandate_embedding_model = %s WHERE id = %s",
+                    [(to_pgvector(provider.embed_one(r["mandate_description"])), provider.model, r["id"]) for r in rows],
+                )
+                # Centroids are chosen at build time: rebuild on the seeded data
+                cur.execute("REINDEX INDEX idx_lp_profiles_mandate_embedding")
+                cur.execute("ANALYZE lp_profiles")
+            yield conn
+            conn.rollback()
+
+    def test_recall_by_probes(self, conn):
+        provider = HashEmbeddingProvider()
+        queries = [to_pgvector(provider.embed_one(q)) for q in BENCH_QUERIES]
+
+        # Exact k-th nearest distance per query, without the index
+        thresholds = []
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL enable_indexscan = off")
+            for vector in queries:
+                cur.execute(EXACT_SQL, [vector, provider.model, TOP_K])
+                thresholds.append(cur.fetchall()[-1]["distance"])
+            cur.execute("RESET enable_indexscan")
+
+        print(f"\n  Semantic LP search at {BENCH_LPS:,} mandates, recall@{TOP_K} vs exact:")
+        print("  " + "-" * 52)
+        recalls = {}
+        for probes in BENCH_PROBES:
+            hits, timings = 0, []
+            with conn.cursor() as cur:
+                cur.execute("SELECT set_config('ivfflat.probes', %s, true)", [str(probes)])
+                for vector, threshold in zip(queries, thresholds, strict=True):
+                    start = time.perf_counter()
+                    cur.execute(EXACT_SQL, [vector, provider.model, TOP_K])
+                    found = cur.fetchall()
+                    timings.append((time.perf_counter() - start) * 1000)
+                    # Ties at the k-th distance count as hits
+                    hits += sum(1 for row in found if row["distance"] <= threshold + 1e-9)
+            recalls[probes] = hits / (TOP_K * len(queries))
+            print(f"    probes {probes:4d}   recall {recalls[probes]:.3f}   p50 {statistics.median(timings):7.2f} ms")
+
+        ordered = [recalls[p] for p in BENCH_PROBES]
+        assert ordered == sorted(ordered)
+        assert recalls[BENCH_PROBES[-1]] >= 0.99
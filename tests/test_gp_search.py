@@ -62,9 +62,10 @@ class TestBuildGpSearchSql:
         """Text search should search name, city, and philosophy."""
         filters = {"text_search": "Sequoia"}
         where_clause, params = build_gp_search_sql(filters)
+        # Philosophy (thesis) text is part of the full-text search vector
+        assert "o.search_vector @@ websearch_to_tsquery" in where_clause
         assert "o.name ILIKE" in where_clause
         assert "o.hq_city ILIKE" in where_clause
-        assert "gp.investment_philosophy ILIKE" in where_clause
         assert "%Sequoia%" in params
 
     def test_multiple_filters(self):
@@ -119,6 +120,7 @@ class TestNaturalLanguageDetection:
         assert is_natural_language_query("managers based in Europe") is True
 
 
+@pytest.mark.usefixtures("llm_query_parsing")
 class TestParseGpSearchQuery:
     """Tests for GP search query parsing."""
 
@@ -0,0 +1,339 @@
+"""Tests for hybrid LP/GP search ranking (src/hybrid_search.py).
+
+Covers the fused query built for each combination of rankings, the
+score components of returned rows, the per-stage latency budgets, the
+/lps and /gps pages, and a benchmark of the fused query's latency against
+its budget at 20k LPs.
+
+Run the benchmark with: uv run pytest tests/test_hybrid_search.py -v -s -m slow
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import psycopg
+import pytest
+from prometheus_client import REGISTRY
+from psycopg.rows import dict_row
+
+from src.cache import query_embedding_cache
+from src.config import get_settings
+from src.embeddings import HashEmbeddingProvider, to_pgvector
+from src.hybrid_search import (
+    GP_SOURCE,
+    LP_SOURCE,
+    QueryEmbedding,
+    build_hybrid_query,
+    hybrid_search,
+    hybrid_search_async,
+    parse_within_budget,
+    search_embedding,
+    search_stage,
+)
+
+MOCK_USER = {
+    "id": "test-user-id",
+    "email": "test@example.com",
+    "name": "Test User",
+    "role": "gp",
+    "org_id": None,
+}
+
+EMBEDDING = QueryEmbedding([0.6, 0.8], "hash-v1")
+
+
+def placeholders(sql: str) -> int:
+    return sql.replace("%%", "").count("%s")
+
+
+class TestBuildHybridQuery:
+    """One query per search, ranking inside the structured filters."""
+
+    def test_without_text_uses_default_order(self):
+        query = build_hybrid_query(LP_SOURCE, "o.is_lp = TRUE AND lp.lp_type = %s", ["pension"])
+
+        assert "ORDER BY lp.total_aum_bn DESC NULLS LAST" in query.sql
+        assert "text_hits" not in query.sql
+        assert query.params == ["pension", 100]
+        assert not query.fused
+        assert query.probes is None
+
+    def test_text_fuses_full_text_and_default_order(self):
+        query = build_hybrid_query(LP_SOURCE, "o.is_lp = TRUE AND lp.lp_type = %s", ["pension"], "climate")
+
+        assert query.fused
+        assert "o.search_vector @@ websearch_to_tsquery" in query.sql
+        assert "vector_hits" not in query.sql
+        assert "NULL::bigint AS vector_rank" in query.sql
+        assert "ORDER BY hybrid_score DESC, lp.total_aum_bn DESC NULLS LAST" in query.sql
+        assert placeholders(query.sql) == len(query.params)
+        # Rank, filter, text condition, candidate and page limit parameters
+        assert query.params[:3] == ["climate", "climate", "pension"]
+        assert query.params[-2:] == [get_settings().hybrid_candidates, 100]
+
+    def test_embedding_adds_vector_ranking(self):
+        query = build_hybrid_query(LP_SOURCE, "o.is_lp = TRUE", [], "climate", EMBEDDING)
+
+        assert "ORDER BY lp.mandate_embedding <=> %s::vector" in query.sql
+        assert "lp.mandate_embedding_model = %s" in query.sql
+        assert "UNION SELECT id FROM vector_hits" in query.sql
+        assert placeholders(query.sql) == len(query.params)
+        assert query.params.count(to_pgvector(EMBEDDING.vector)) == 2
+        assert "hash-v1" in query.params
+        assert query.probes == get_settings().semantic_search_probes
+
+    def test_gp_vector_ranking_uses_fund_theses(self):
+        query = build_hybrid_query(GP_SOURCE, "o.is_gp = TRUE", [], "healthcare buyout", EMBEDDING)
+
+        assert "JOIN funds f ON f.org_id = o.id" in query.sql
+        assert "MIN(distance)" in query.sql
+        assert "ORDER BY hybrid_score DESC, gp.years_investing DESC NULLS LAST, o.name" in query.sql
+        assert placeholders(query.sql) == len(query.params)
+
+    def test_weights_are_float_literals(self):
+        settings = get_settings()
+        with (
+            patch.object(settings, "hybrid_rrf_k", 10),
+            patch.object(settings, "hybrid_text_weight", 2),
+            patch.object(settings, "hybrid_filter_weight", 0),
+        ):
+            query = build_hybrid_query(LP_SOURCE, "o.is_lp = TRUE", [], "calpers")
+
+        # Integer literals would make Postgres divide as integers
+        assert "COALESCE(2.0 / (10.0 + t.rank), 0)" in query.sql
+        assert "COALESCE(0.0 / (10.0 + fr.rank), 0)" in query.sql
+
+
+class TestRetrieval:
+    """Rows carry their score components."""
+
+    async def test_default_order_rows_get_filter_scores(self):
+        cursor = MagicMock()
+        cursor.execute = AsyncMock()
+        cursor.fetchall = AsyncMock(return_value=[{"id": "a"}, {"id": "b"}])
+
+        rows = await hybrid_search_async(cursor, build_hybrid_query(LP_SOURCE, "o.is_lp = TRUE", []))
+
+        assert [row["filter_rank"] for row in rows] == [1, 2]
+        assert rows[0]["text_rank"] is None and rows[0]["vector_similarity"] is None
+        assert rows[0]["hybrid_score"] > rows[1]["hybrid_score"]
+        assert cursor.execute.await_count == 1
+
+    def test_vector_ranking_sets_probes_first(self):
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [{"id": "a", "hybrid_score": 0.03}]
+
+        rows = hybrid_search(cursor, build_hybrid_query(LP_SOURCE, "o.is_lp = TRUE", [], "climate", EMBEDDING))
+
+        probes_sql, probes_params = cursor.execute.call_args_list[0].args
+        assert probes_sql == "SELECT set_config('ivfflat.probes', %s, true)"
+        assert probes_params == [str(get_settings().semantic_search_probes)]
+        assert "vector_hits" in cursor.execute.call_args_list[1].args[0]
+        assert rows == [{"id": "a", "hybrid_score": 0.03}]
+
+
+class TestStageBudgets:
+    """Each stage is timed; slow parse and embed stages degrade."""
+
+    def test_overrun_is_counted(self):
+        labels = {"entity": "lp", "stage": "retrieve"}
+        before = REGISTRY.get_sample_value("lpxgp_search_budget_exceeded_total", labels) or 0.0
+
+        with search_stage("lp", "retrieve", budget_ms=1):
+            time.sleep(0.005)
+
+        assert REGISTRY.get_sample_value("lpxgp_search_budget_exceeded_total", labels) == before + 1
+
+    async def test_slow_parse_falls_back_to_text_search(self):
+        finished = asyncio.Event()
+
+        async def slow_parse() -> dict:
+            await asyncio.sleep(0.05)
+            finished.set()
+            return {"aum_min": 1.0}
+
+        with patch.object(get_settings(), "search_parse_budget_ms", 10):
+            filters = await parse_within_budget(slow_parse(), "big pensions", "lp")
+
+        assert filters == {"text_search": "big pensions"}
+        # The parse itself keeps running, so its result reaches the cache
+        await asyncio.wait_for(finished.wait(), 1)
+
+    async def test_parse_within_budget_returns_filters(self):
+        async def parse() -> dict:
+            return {"aum_min": 1.0}
+
+        assert await parse_within_budget(parse(), "big pensions", "lp") == {"aum_min": 1.0}
+
+    async def test_no_embedding_when_semantic_search_disabled(self):
+        with patch.object(get_settings(), "enable_semantic_search", False):
+            assert await search_embedding("climate", "lp") is None
+
+    async def test_embedding_with_semantic_search(self):
+        query_embedding_cache.clear()
+        with (
+            patch.object(get_settings(), "enable_semantic_search", True),
+            patch("src.hybrid_search.get_embedding_provider", return_value=HashEmbeddingProvider()),
+        ):
+            embedding = await search_embedding("climate", "lp")
+
+        assert embedding.model == "hash-v1"
+        assert embedding.vector == HashEmbeddingProvider().embed_one("climate")
+        query_embedding_cache.clear()
+
+    async def test_slow_embedding_skips_vector_ranking(self):
+        query_embedding_cache.clear()
+        provider = HashEmbeddingProvider()
+
+        async def slow_embed(texts, input_type="document"):
+            await asyncio.sleep(0.05)
+            return [provider.embed_one(text) for text in texts]
+
+        provider.embed = slow_embed
+        with (
+            patch.object(get_settings(), "enable_semantic_search", True),
+            patch.object(get_settings(), "search_embed_budget_ms", 10),
+            patch("src.hybrid_search.get_embedding_provider", return_value=provider),
+        ):
+            assert await search_embedding("climate", "lp") is None
+            await asyncio.sleep(0.1)
+            # Finished in the background: the next search has it at once
+            assert await search_embedding("climate", "lp") is not None
+        query_embedding_cache.clear()
+
+
+class TestPages:
+    """/lps and /gps rank searches with the fused query."""
+
+    def test_lps_parsed_text_is_ranked_not_filtered(self, client_with_db, mock_async_db_connection):
+        cursor = mock_async_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = []
+        parsed = {"lp_type": "pension", "text_search": "climate"}
+
+        with (
+            patch("src.auth.get_current_user", return_value=MOCK_USER),
+            patch("src.routers.lps.parse_lp_search_query", new=AsyncMock(return_value=parsed)),
+        ):
+            response = client_with_db.get("/lps?search=pension+funds+focused+on+climate")
+
+        query, params = cursor.execute.await_args.args
+        assert response.status_code == 200
+        assert "lp.lp_type = %s" in query
+        # The text condition only selects full-text candidates
+        assert query.count("o.search_vector @@") == 1
+        assert "ORDER BY hybrid_score DESC" in query
+        assert params[:2] == ["climate", "climate"]
+
+    def test_gps_without_search_keeps_default_order(self, client_with_db, mock_db_connection):
+        cursor = mock_db_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = []
+
+        with patch("src.auth.get_current_user", return_value=MOCK_USER):
+            response = client_with_db.get("/gps?strategy=buyout")
+
+        query, params = cursor.execute.call_args.args
+        assert response.status_code == 200
+        assert "hybrid_score" not in query
+        assert "ORDER BY gp.years_investing DESC NULLS LAST, o.name" in query
+        assert params == ["%buyout%", 100]
+
+
+# =============================================================================
+# Fused Query Latency Benchmark
+# =============================================================================
+
+
+BENCH_LPS = 20_000
+BENCH_SEARCHES = ["climate infrastructure", "teachers pension", "venture capital europe", "secondaries"]
+
+SEED_SQL = """
+    WITH orgs AS (
+        INSERT INTO organizations (name, hq_city, website, is_lp)
+        SELECT
+            (ARRAY['Ontario', 'Nordic', 'Pacific', 'Alpine', 'Harbor', 'Summit'])[1 + i % 6]
+            || ' ' || (ARRAY['Teachers', 'Municipal', 'Health', 'University'])[1 + (i / 6) % 4]
+            || ' Pension ' || i,
+            (ARRAY['Toronto', 'Oslo', 'Singapore', 'Zurich', 'Boston'])[1 + i % 5],
+            'https://bench.example/hybrid/' || i,
+            TRUE
+        FROM generate_series(1, %s) AS i
+        RETURNING id, split_part(website, '/', 5)::int AS i
+    )
+    INSERT INTO lp_profiles (org_id, lp_type, total_aum_bn, mandate_description)
+    SELECT
+        id,
+        'pension',
+        (i % 500) + 0.5,
+        (ARRAY['climate', 'healthcare', 'software', 'energy', 'consumer', 'logistics'])[1 + i % 6]
+        || ' ' || (ARRAY['infrastructure', 'buyout', 'venture capital', 'growth equity', 'private credit',
+                        'secondaries'])[1 + (i / 6) % 6]
+        || ' in ' || (ARRAY['north america', 'europe', 'asia', 'latin america'])[1 + (i / 36) % 4]
+    FROM orgs
+"""
+
+
+@pytest.mark.slow
+class TestFusedQueryLatencyBenchmark:
+    """Fused query latency at 20k LPs, inside a rolled-back transaction."""
+
+    @pytest.fixture(scope="class")
+    def conn(self):
+        settings = get_settings()
+        if not settings.test_database_url:
+            pytest.skip("TEST_DATABASE_URL not configured")
+        provider = HashEmbeddingProvider()
+        with psycopg.connect(settings.test_database_url, row_factory=dict_row) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT 1 FROM information_schema.columns"
+                    " WHERE table_name = 'lp_profiles' AND column_name = 'mandate_embedding_model'"
+                )
+                if cur.fetchone() is None:
+                    pytest.skip("Apply migrations 021 and 022 first")
+                cur.execute(SEED_SQL, [BENCH_LPS])
+                cur.execute(
+                    "SELECT lp.id, lp.mandate_description FROM lp_profiles lp"
+                    " JOIN organizations o ON o.id = lp.org_id"
+                    " WHERE o.website LIKE 'https://bench.example/hybrid/%'"
+                )
+                rows = cur.fetchall()
+                cur.executemany(
+                    "UPDATE lp_profiles SET mandate_embedding = %s::vector, mandate_embedding_model = %s WHERE id = %s",
+                    [(to_pgvector(provider.embed_one(r["mandate_description"])), provider.model, r["id"]) for r in rows],
+                )
+                cur.execute("REINDEX INDEX idx_lp_profiles_mandate_embedding")
+                cur.execute("ANALYZE organizations")
+                cur.execute("ANALYZE lp_profiles")
+            yield conn
+            conn.rollback()
+
+    def test_fused_query_within_budget(self, conn):
+        provider = HashEmbeddingProvider()
+        budget_ms = get_settings().search_retrieve_budget_ms
+
+        print(f"\n  Hybrid LP search at {BENCH_LPS:,} LPs (ms, budget {budget_ms}):")
+        print("  " + "-" * 60)
+        p95s = []
+        for text in BENCH_SEARCHES:
+            embedding = QueryEmbedding(provider.embed_one(text), provider.model)
+            query = build_hybrid_query(LP_SOURCE, "o.is_lp = TRUE", [], text, embedding)
+            timings = []
+            with conn.cursor() as cur:
+                for _ in range(20):
+                    start = time.perf_counter()
+                    rows = hybrid_search(cur, query)
+                    timings.append((time.perf_counter() - start) * 1000)
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            p95s.append(p95)
+            top = rows[0]
+            print(
+                f"    {text:26s} p50 {statistics.median(timings):7.2f} p95 {p95:7.2f}"
+                f"   top: text #{top['text_rank']} vector #{top['vector_rank']}"
+            )
+            assert rows == sorted(rows, key=lambda row: row["hybrid_score"], reverse=True)
+
+        assert max(p95s) < budget_ms
@@ -0,0 +1,266 @@
+"""Tests for the persistent, content-addressed LLM response cache.
+
+Covers key derivation, reads/writes/eviction against a mock async
+connection, failure handling, and the wiring into search query parsing,
+match content generation and pitch deck analysis.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from src.cache import clear_all_caches
+from src.config import get_settings
+from src.llm_cache import LLMResponseCache, llm_cache_key, llm_response_cache
+from src.matching import MATCH_CONTENT_PROMPT_VERSION, generate_llm_match_content
+from src.pitch_deck_analyzer import analyze_pitch_deck
+from src.search import parse_gp_search_query, parse_lp_search_query
+
+CONTENT = {"explanation": "Cached fit", "talking_points": ["a"], "concerns": ["b"]}
+
+
+@pytest.fixture
+def cache_conn(mock_async_db_connection: MagicMock) -> Generator[MagicMock, None, None]:
+    """Serve the mock async connection to the LLM cache."""
+    with patch("src.llm_cache.get_async_db", new=AsyncMock(return_value=mock_async_db_connection)):
+        yield mock_async_db_connection
+
+
+@pytest.fixture(autouse=True)
+def clean_caches() -> Generator[None, None, None]:
+    """Start every test with empty in-process caches and zeroed counters."""
+    clear_all_caches()
+    yield
+    clear_all_caches()
+
+
+def cursor_of(conn: MagicMock) -> MagicMock:
+    return conn.cursor.return_value.__aenter__.return_value
+
+
+class TestCacheKey:
+    """Keys address (namespace, model, prompt version, inputs)."""
+
+    def test_deterministic_and_order_insensitive(self):
+        a = llm_cache_key("ns", "m", "1", {"x": 1, "y": [1, 2]})
+        b = llm_cache_key("ns", "m", "1", {"y": [1, 2], "x": 1})
+        assert a == b
+        assert len(a) == 64
+
+    @pytest.mark.parametrize(
+        "other",
+        [
+            ("other_ns", "m", "1", "q"),
+            ("ns", "other_model", "1", "q"),
+            ("ns", "m", "2", "q"),
+            ("ns", "m", "1", "q2"),
+        ],
+    )
+    def test_every_component_changes_the_key(self, other):
+        assert llm_cache_key("ns", "m", "1", "q") != llm_cache_key(*other)
+
+
+class TestLLMResponseCache:
+    """Reads, writes, eviction and metrics."""
+
+    async def test_hit_returns_value_without_writing(self, cache_conn):
+        cursor = cursor_of(cache_conn)
+        cursor.fetchone.return_value = {"value": {"aum_min": 1.0}}
+        cache = LLMResponseCache()
+
+        assert await cache.get("lp_search", "k") == {"aum_min": 1.0}
+
+        sql = cursor.execute.await_args.args[0]
+        assert sql.strip().startswith("SELECT value")
+        assert "expires_at > NOW()" in sql
+        assert cursor.execute.await_count == 1
+        cache_conn.commit.assert_not_awaited()
+        cache_conn.rollback.assert_awaited_once()
+        assert cache.stats.hits == 1
+        cache_conn.close.assert_awaited_once()
+
+    async def test_hits_recorded_with_next_write(self, cache_conn):
+        cursor = cursor_of(cache_conn)
+        cursor.fetchone.return_value = {"value": {"aum_min": 1.0}}
+        cache = LLMResponseCache()
+
+        await cache.get("lp_search", "a")
+        await cache.get("lp_search", "a")
+        await cache.get("lp_search", "b")
+        await cache.set("lp_search", "c", {}, "m", "1")
+
+        sql, params = cursor.execute.await_args.args
+        assert "hit_count = c.hit_count + h.hits" in sql
+        assert params == (["a", "b"], [2, 1])
+
+    async def test_hits_flushed_once_enough_keys_pending(self, cache_conn):
+        cursor = cursor_of(cache_conn)
+        cursor.fetchone.return_value = {"value": {}}
+        cache = LLMResponseCache(hit_flush_size=2)
+
+        await cache.get("ns", "a")
+        cache_conn.commit.assert_not_awaited()
+        await cache.get("ns", "b")
+
+        sql, params = cursor.execute.await_args.args
+        assert "unnest" in sql
+        assert params == (["a", "b"], [1, 1])
+        cache_conn.commit.assert_awaited_once()
+
+    async def test_miss(self, cache_conn):
+        cache = LLMResponseCache()
+        assert await cache.get("lp_search", "k") is None
+        assert cache.get_stats()["namespaces"]["lp_search"]["misses"] == 1
+
+    async def test_no_database_is_a_miss(self):
+        cache = LLMResponseCache()
+        with patch("src.llm_cache.get_async_db", new=AsyncMock(return_value=None)):
+            assert await cache.get("lp_search", "k") is None
+            await cache.set("lp_search", "k", {"a": 1}, "m", "1")
+        assert cache.stats.misses == 1
+        assert cache.stats.writes == 0
+
+    async def test_disabled_skips_database(self, cache_conn):
+        cache = LLMResponseCache()
+        with patch.object(get_settings(), "llm_cache_enabled", False):
+            assert await cache.get("lp_search", "k") is None
+            await cache.set("lp_search", "k", {"a": 1}, "m", "1")
+        cache_conn.cursor.assert_not_called()
+
+    async def test_set_upserts_with_ttl(self, cache_conn):
+        cursor = cursor_of(cache_conn)
+        cache = LLMResponseCache()
+
+        await cache.set("match_content", "k", CONTENT, "deepseek-r1:8b", "1")
+
+        sql, params = cursor.execute.await_args.args
+        assert "ON CONFLICT (cache_key)" in sql
+        assert params[:4] == ("k", "match_content", "deepseek-r1:8b", "1")
+        assert '"Cached fit"' in params[4]
+        assert params[5] == len(params[4])
+        assert params[6] == get_settings().llm_cache_ttl_seconds
+        cache_conn.commit.assert_awaited_once()
+        assert cache.stats.writes == 1
+
+    async def test_eviction_runs_every_interval(self, cache_conn):
+        cursor = cursor_of(cache_conn)
+        cursor.rowcount = 3
+        cache = LLMResponseCache(eviction_interval=2)
+
+        await cache.set("ns", "k1", {}, "m", "1")
+        assert cursor.execute.await_count == 1
+        await cache.set("ns", "k2", {}, "m", "1")
+
+        statements = [c.args[0] for c in cursor.execute.await_args_list]
+        assert "expires_at <= NOW()" in statements[2]
+        assert "ORDER BY last_hit_at DESC" in statements[3]
+        assert "SUM(size_bytes)" in statements[3]
+        settings = get_settings()
+        limits = (settings.llm_cache_max_entries, settings.llm_cache_max_bytes)
+        assert cursor.execute.await_args_list[3].args[1] == limits
+        assert cache.stats.evictions == 6
+
+    async def test_database_errors_are_counted_not_raised(self, cache_conn):
+        cursor_of(cache_conn).execute.side_effect = RuntimeError("relation does not exist")
+        cache = LLMResponseCache()
+
+        assert await cache.get("ns", "k") is None
+        await cache.set("ns", "k", {}, "m", "1")
+
+        assert cache.stats.errors == 2
+        assert cache.stats.misses == 1
+        assert cache_conn.close.await_count == 2
+
+
+@pytest.mark.usefixtures("llm_query_parsing")
+class TestCacheWiring:
+    """LLM call sites read and write the persistent cache."""
+
+    @pytest.mark.parametrize(
+        ("parse", "namespace"),
+        [(parse_lp_search_query, "lp_search"), (parse_gp_search_query, "gp_search")],
+    )
+    async def test_search_parse_persistent_hit_skips_ollama(self, parse, namespace):
+        stored = {"lp_type": "pension"}
+        with (
+            patch.object(llm_response_cache, "get", new=AsyncMock(return_value=stored)) as get,
+            patch("src.search.httpx.AsyncClient") as client,
+        ):
+            result = await parse(f"  Pension {namespace} ", use_cache=True)
+
+        client.assert_not_called()
+        assert result["lp_type"] == "pension"
+        assert result["_cache_hit"] is True
+        ns, key = get.await_args.args
+        assert ns == namespace
+
+        # Same normalized query -> same key; the hit also warmed the in-process cache
+        with patch.object(llm_response_cache, "get", new=AsyncMock()) as get_again:
+            again = await parse(f"pension {namespace}", use_cache=True)
+        get_again.assert_not_awaited()
+        assert again["_cache_hit"] is True
+
+    async def test_search_parse_writes_without_metadata(self):
+        response = MagicMock()
+        response.json.return_value = {"response": '{"aum_min": 0.05}'}
+        response.raise_for_status.return_value = None
+        written = []
+
+        async def record_set(namespace, key, value, model, version):
+            written.append((namespace, dict(value), model))
+
+        with (
+            patch.object(llm_response_cache, "get", new=AsyncMock(return_value=None)),
+            patch.object(llm_response_cache, "set", new=record_set),
+            patch("src.search.httpx.AsyncClient") as client,
+        ):
+            client.return_value.__aenter__.return_value.post = AsyncMock(return_value=response)
+            result = await parse_lp_search_query("aum over 50m", use_cache=True)
+
+        assert result["_cache_hit"] is False
+        assert written == [("lp_search", {"aum_min": 0.05}, get_settings().ollama_model)]
+
+    async def test_match_content_cached_by_prompt(self):
+        fund = {"name": "Fund I", "strategy": "buyout"}
+        lp = {"name": "Pension LP"}
+        llm_json = '{"explanation": "Fits", "talking_points": ["a"], "concerns": ["b"]}'
+        backend = httpx.MockTransport(lambda request: httpx.Response(200, json={"response": llm_json}))
+
+        with patch.object(llm_response_cache, "set", new=AsyncMock()) as set_:
+            async with httpx.AsyncClient(transport=backend) as client:
+                content = await generate_llm_match_content(fund, lp, {"strategy": 100}, client=client)
+
+        assert content is not None
+        namespace, key, value, model, version = set_.await_args.args
+        assert (namespace, value, version) == ("match_content", content, MATCH_CONTENT_PROMPT_VERSION)
+
+        with patch.object(llm_response_cache, "get", new=AsyncMock(return_value=CONTENT)) as get:
+            cached = await generate_llm_match_content(fund, lp, {"strategy": 100}, client=MagicMock())
+        assert cached == CONTENT
+        assert get.await_args.args[1] == key
+
+    async def test_pitch_deck_extraction_cached(self):
+        text = "Fund III targets $500M for growth equity in technology companies. " * 3
+        extracted = {"strategy_details": {"primary": "growth_equity"}}
+
+        with (
+            patch.object(llm_response_cache, "get", new=AsyncMock(return_value=None)),
+            patch.object(llm_response_cache, "set", new=AsyncMock()) as set_,
+            patch("src.pitch_deck_analyzer._analyze_with_ollama", new=AsyncMock(return_value=extracted)),
+        ):
+            assert await analyze_pitch_deck(text, use_openrouter=False) == extracted
+        namespace, key, value, model, _ = set_.await_args.args
+        assert (namespace, value, model) == ("pitch_deck", extracted, get_settings().ollama_model)
+
+        # Whitespace differences address the same entry
+        with (
+            patch.object(llm_response_cache, "get", new=AsyncMock(return_value=extracted)) as get,
+            patch("src.pitch_deck_analyzer._analyze_with_ollama", new=AsyncMock()) as analyze,
+        ):
+            assert await analyze_pitch_deck(text.replace(" ", "  "), use_openrouter=False) == extracted
+        analyze.assert_not_awaited()
+        assert get.await_args.args[1] == key
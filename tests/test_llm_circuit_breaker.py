@@ -0,0 +1,219 @@
+"""Tests for LLM backend circuit breakers and adaptive timeouts.
+
+Covers breaker state transitions, failure classification in llm_call(),
+background probes, immediate fallbacks at the call sites while a breaker
+is open, p99-based timeouts, and the /api/status exposure.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from src import llm_client as llm_client_module
+from src.cache import clear_all_caches
+from src.config import get_settings
+from src.llm_client import (
+    MIN_TIMEOUT_SAMPLES,
+    CircuitBreaker,
+    LLMBackendUnavailable,
+    close_llm_clients,
+    get_circuit_breaker,
+    llm_call,
+    llm_timeout,
+    reset_llm_client_stats,
+)
+from src.matching import generate_match_content
+from src.search import parse_lp_search_query
+
+MODEL = "test-model"
+
+
+@pytest.fixture(autouse=True)
+async def clean_state() -> AsyncGenerator[None, None]:
+    """Start every test with no latency samples or cached parses."""
+    reset_llm_client_stats()
+    clear_all_caches()
+    yield
+    await close_llm_clients()
+    reset_llm_client_stats()
+    clear_all_caches()
+
+
+async def fail(error: BaseException) -> None:
+    """Run one llm_call() whose request raises error."""
+    with pytest.raises(type(error)):
+        async with llm_call("ollama", MODEL):
+            raise error
+
+
+def trip_ollama() -> CircuitBreaker:
+    """Open the Ollama breaker without going through llm_call()."""
+    breaker = get_circuit_breaker("ollama")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == "open"
+    return breaker
+
+
+class TestCircuitBreaker:
+    """State transitions of a single breaker."""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3)
+        assert breaker.record_failure() is False
+        breaker.record_success()
+        assert [breaker.record_failure() for _ in range(3)] == [False, False, True]
+
+        assert breaker.state == "open"
+        assert breaker.allow() is False
+        assert breaker.as_dict()["rejected"] == 1
+        assert breaker.as_dict()["trips"] == 1
+
+    def test_half_open_trial_after_reset(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+        breaker.record_failure()
+
+        assert breaker.allow() is True
+        assert breaker.state == "half_open"
+        assert breaker.allow() is False  # One trial at a time
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_unfinished_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+        breaker.record_failure()
+        breaker.allow()
+
+        breaker.end_trial()
+
+        assert breaker.state == "open"
+
+
+class TestLlmCall:
+    """llm_call() feeds and enforces the backend's breaker."""
+
+    async def test_backend_failures_open_the_breaker(self):
+        threshold = get_settings().llm_breaker_failure_threshold
+        for _ in range(threshold):
+            await fail(httpx.ConnectError("refused"))
+
+        with pytest.raises(LLMBackendUnavailable):
+            async with llm_call("ollama", MODEL):
+                pytest.fail("Rejected calls must not run")
+
+        assert get_circuit_breaker("openrouter").state == "closed"
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            ValueError("bad JSON"),
+            httpx.HTTPStatusError(
+                "not found",
+                request=httpx.Request("POST", "http://ollama"),
+                response=httpx.Response(404),
+            ),
+        ],
+    )
+    async def test_other_errors_do_not_count(self, error):
+        for _ in range(get_settings().llm_breaker_failure_threshold):
+            await fail(error)
+
+        assert get_circuit_breaker("ollama").consecutive_failures == 0
+
+    async def test_success_resets_failures(self):
+        await fail(httpx.ReadTimeout("slow"))
+        async with llm_call("ollama", MODEL):
+            pass
+
+        assert get_circuit_breaker("ollama").consecutive_failures == 0
+
+    async def test_probe_closes_breaker(self):
+        with (
+            patch.object(llm_client_module, "_PROBE_INTERVAL_SECONDS", 0.0),
+            patch("src.llm_client._probe", new=AsyncMock(return_value=True)) as probe,
+        ):
+            for _ in range(get_settings().llm_breaker_failure_threshold):
+                await fail(httpx.ConnectError("refused"))
+            await llm_client_module._probe_tasks["ollama"]
+
+        probe.assert_awaited_with("ollama")
+        assert get_circuit_breaker("ollama").state == "closed"
+
+
+@pytest.mark.usefixtures("llm_query_parsing")
+class TestFallbacksWhileOpen:
+    """Call sites skip the LLM while the breaker is open."""
+
+    async def test_search_falls_back_to_text_search(self):
+        trip_ollama()
+        with patch("src.llm_client.httpx.AsyncClient") as temporary:
+            result = await parse_lp_search_query("pension funds", use_cache=False)
+
+        temporary.return_value.__aenter__.return_value.post.assert_not_called()
+        assert result["text_search"] == "pension funds"
+
+    async def test_match_content_falls_back_to_template(self):
+        trip_ollama()
+        fund = {"name": "Fund I", "strategy": "buyout"}
+        lp = {"name": "Pension LP"}
+
+        with patch("src.matching.llm_response_cache.get", new=AsyncMock(return_value=None)):
+            content = await generate_match_content(fund, lp, {"geography": 90, "sector": 90})
+
+        assert content["explanation"].startswith("Excellent fit")
+
+
+class TestAdaptiveTimeouts:
+    """Timeouts follow the operation's observed p99 latency."""
+
+    def record(self, seconds: float, count: int = MIN_TIMEOUT_SAMPLES) -> None:
+        for _ in range(count):
+            llm_client_module._record_recent("ollama", "search_parse", MODEL, seconds)
+
+    def test_default_until_enough_samples(self):
+        self.record(1.0, count=MIN_TIMEOUT_SAMPLES - 1)
+        assert llm_timeout("ollama", MODEL, "search_parse", 15.0) == 15.0
+
+    def test_p99_times_multiplier_within_bounds(self):
+        self.record(1.0)
+        settings = get_settings()
+        with (
+            patch.object(settings, "llm_timeout_p99_multiplier", 3.0),
+            patch.object(settings, "llm_timeout_min_seconds", 0.5),
+        ):
+            assert llm_timeout("ollama", MODEL, "search_parse", 15.0) == 3.0
+            assert llm_timeout("ollama", MODEL, "search_parse", 2.0) == 2.0  # Capped
+        with patch.object(settings, "llm_timeout_min_seconds", 5.0):
+            assert llm_timeout("ollama", MODEL, "search_parse", 15.0) == 5.0  # Floored
+
+    def test_disabled(self):
+        self.record(1.0)
+        with patch.object(get_settings(), "llm_adaptive_timeouts", False):
+            assert llm_timeout("ollama", MODEL, "search_parse", 15.0) == 15.0
+
+    async def test_calls_record_per_operation(self):
+        for _ in range(MIN_TIMEOUT_SAMPLES):
+            async with llm_call("ollama", MODEL, "search_parse"):
+                pass
+
+        assert len(llm_client_module._recent_latency[("ollama", "search_parse", MODEL)]) == MIN_TIMEOUT_SAMPLES
+        assert ("ollama", "match_content", MODEL) not in llm_client_module._recent_latency
+
+
+def test_api_status_exposes_breakers_and_timeouts(client):
+    trip_ollama()
+    llm_timeout("ollama", MODEL, "search_parse", 15.0)
+
+    stats = client.get("/api/status").json()["llm_clients"]
+
+    assert stats["ollama"]["breaker"]["state"] == "open"
+    assert stats["openrouter"]["breaker"]["state"] == "closed"
+    assert stats["ollama"]["timeouts"][f"search_parse:{MODEL}"] == {"samples": 0, "timeout_seconds": 15.0}
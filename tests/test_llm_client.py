@@ -0,0 +1,202 @@
+"""Tests for the shared LLM backend clients.
+
+Covers the client lifecycle and lifespan wiring, the temporary-client
+fallback, per-backend concurrency limits, per-model latency histograms,
+and the call sites that now reuse the shared clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src import llm_client as llm_client_module
+from src.cache import clear_all_caches
+from src.config import get_settings
+from src.llm_client import (
+    LatencyHistogram,
+    close_llm_clients,
+    get_llm_client,
+    get_llm_client_stats,
+    llm_call,
+    llm_client,
+    open_llm_clients,
+    reset_circuit_breakers,
+    reset_llm_client_stats,
+)
+from src.main import app
+from src.search import parse_lp_search_query
+
+
+@pytest.fixture(autouse=True)
+async def closed_clients() -> AsyncGenerator[None, None]:
+    """Start and end every test with the clients and breakers closed and no latency data.
+
+    Clients, concurrency limits and breakers are module-level, so anything a
+    test leaves open would leak into the next test on the same xdist worker.
+    """
+    await close_llm_clients()
+    reset_circuit_breakers()
+    reset_llm_client_stats()
+    clear_all_caches()
+    yield
+    await close_llm_clients()
+    reset_circuit_breakers()
+    reset_llm_client_stats()
+    clear_all_caches()
+
+
+class TestLatencyHistogram:
+    """Latency buckets are upper bounds with an overflow bucket."""
+
+    def test_observe_buckets_and_summary(self):
+        histogram = LatencyHistogram(buckets=(1.0, 5.0))
+        for seconds in (0.5, 1.0, 3.0, 9.0):
+            histogram.observe(seconds)
+
+        stats = histogram.as_dict()
+        assert stats["buckets"] == {"1.0": 2, "5.0": 1, "+Inf": 1}
+        assert stats["count"] == 4
+        assert stats["avg_seconds"] == 3.375
+        assert stats["max_seconds"] == 9.0
+
+
+class TestClientLifecycle:
+    """Opening, closing and lifespan wiring."""
+
+    async def test_open_creates_one_client_per_backend(self):
+        with patch.object(get_settings(), "openrouter_max_concurrency", 3):
+            open_llm_clients()
+
+        ollama = get_llm_client("ollama")
+        assert isinstance(ollama, httpx.AsyncClient)
+        assert get_llm_client("openrouter") is not ollama
+
+        stats = get_llm_client_stats()
+        assert stats["ollama"]["open"] is True
+        assert stats["ollama"]["max_concurrency"] == get_settings().ollama_max_concurrency
+        assert stats["openrouter"]["max_concurrency"] == 3
+
+    async def test_open_twice_reuses_clients(self):
+        open_llm_clients()
+        client = get_llm_client("ollama")
+        open_llm_clients()
+        assert get_llm_client("ollama") is client
+
+    @pytest.mark.parametrize("h2_installed", [True, False])
+    async def test_http2_only_for_openrouter(self, h2_installed):
+        with patch("src.llm_client.http2_available", return_value=h2_installed):
+            open_llm_clients()
+
+        stats = get_llm_client_stats()
+        assert stats["ollama"]["http2"] is False
+        assert stats["openrouter"]["http2"] is h2_installed
+
+    async def test_close_releases_clients(self):
+        open_llm_clients()
+        client = get_llm_client("ollama")
+
+        await close_llm_clients()
+
+        assert client.is_closed
+        assert get_llm_client("ollama") is None
+        assert get_llm_client_stats()["ollama"]["open"] is False
+
+    def test_lifespan_opens_and_closes_clients(self):
+        # Startup validation reads the cached settings, which another test
+        # on the same worker may have left in a state that fails it
+        with (
+            patch("src.main.validate_settings_on_startup"),
+            patch("src.main.open_llm_clients") as mock_open,
+            patch("src.main.close_llm_clients") as mock_close,
+        ):
+            with TestClient(app):
+                mock_open.assert_called_once()
+                mock_close.assert_not_called()
+            mock_close.assert_awaited_once()
+
+    def test_api_status_exposes_client_stats(self, client):
+        stats = client.get("/api/status").json()["llm_clients"]
+        assert set(stats) == {"ollama", "openrouter"}
+        assert stats["ollama"]["open"] is False
+
+
+class TestRequests:
+    """Client selection, concurrency limits and latency recording."""
+
+    async def test_shared_client_is_reused(self):
+        open_llm_clients()
+        async with llm_client("ollama") as first, llm_client("ollama") as second:
+            assert first is second is get_llm_client("ollama")
+        assert not first.is_closed
+
+    async def test_temporary_client_without_open_clients(self):
+        async with llm_client("ollama") as client:
+            assert client is not get_llm_client("ollama")
+        assert client.is_closed
+
+    async def test_concurrency_is_limited_per_backend(self):
+        in_flight = 0
+        peak = 0
+
+        async def request() -> None:
+            nonlocal in_flight, peak
+            async with llm_call("ollama", "m"):
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        with patch.object(get_settings(), "ollama_max_concurrency", 2):
+            open_llm_clients()
+        await asyncio.gather(*(request() for _ in range(6)))
+
+        assert peak == 2
+        assert get_llm_client_stats()["ollama"]["in_flight"] == 0
+
+    async def test_latency_and_errors_recorded_per_model(self):
+        async with llm_call("ollama", "model-a"):
+            pass
+        with pytest.raises(httpx.ConnectError):
+            async with llm_call("ollama", "model-a"):
+                raise httpx.ConnectError("refused")
+        async with llm_call("openrouter", "model-b"):
+            pass
+
+        stats = get_llm_client_stats()
+        assert stats["ollama"]["models"]["model-a"]["count"] == 1
+        assert stats["ollama"]["models"]["model-a"]["errors"] == 1
+        assert list(stats["openrouter"]["models"]) == ["model-b"]
+
+
+@pytest.mark.usefixtures("llm_query_parsing")
+class TestCallSites:
+    """LLM call sites reuse the shared client."""
+
+    async def test_search_parses_share_one_client(self):
+        requests: list[httpx.Request] = []
+
+        def backend(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"response": '{"lp_type": "pension"}'})
+
+        open_llm_clients()
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(backend))
+        with (
+            patch.dict(llm_client_module._clients, {"ollama": shared}),
+            patch("src.llm_client.httpx.AsyncClient") as temporary,
+        ):
+            await parse_lp_search_query("pension funds", use_cache=False)
+            await parse_lp_search_query("endowments", use_cache=False)
+        await shared.aclose()
+
+        temporary.assert_not_called()
+        assert len(requests) == 2
+        assert requests[0].extensions["timeout"]["read"] == 15.0
+        model_stats = get_llm_client_stats()["ollama"]["models"][get_settings().ollama_model]
+        assert model_stats["count"] == 2
@@ -0,0 +1,266 @@
+"""Tests for streamed LLM output.
+
+Covers consuming Ollama's NDJSON stream, incremental parsing of partial
+JSON, streamed match content, and the Server-Sent Events endpoints for
+pending match content and pitch generation.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from src import llm_client as llm_client_module
+from src.llm_client import stream_ollama_generate
+from src.match_content import TEMPLATE_MODEL_VERSION, stream_match_content
+from src.matching import PartialJSONParser, stream_llm_match_content
+
+MATCH_ID = "00000000-0000-0000-0000-0000000000aa"
+
+COMPLETION = '{"explanation": "Strong fit", "talking_points": ["Track record"], "concerns": ["Timing"]}'
+
+PITCH_ROW = {
+    "id": MATCH_ID,
+    "score": 88,
+    "explanation": "Strategy match",
+    "talking_points": ["Top quartile"],
+    "concerns": [],
+    "lp_name": "Pension LP",
+    "lp_city": "Sacramento",
+    "lp_type": "pension",
+    "total_aum_bn": 400,
+    "fund_name": "Fund I",
+    "target_size_mm": 500,
+    "gp_name": "Acme GP",
+}
+
+
+def ndjson(*tokens: str) -> bytes:
+    """An Ollama streaming reply producing the given tokens."""
+    lines = [json.dumps({"response": token, "done": False}) for token in tokens]
+    lines.append(json.dumps({"response": "", "done": True}))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def chunks(text: str, size: int = 7) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def tokens_of(*tokens: str):
+    """Replacement for stream_ollama_generate yielding fixed tokens."""
+
+    async def stream(*args, **kwargs) -> AsyncIterator[str]:
+        for token in tokens:
+            yield token
+
+    return stream
+
+
+def sse_events(body: str) -> list[tuple[str, object]]:
+    """Parse a Server-Sent Events body into (event, data) pairs."""
+    events = []
+    for message in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestStreamOllamaGenerate:
+    """NDJSON replies are turned into a token stream."""
+
+    async def test_yields_tokens_until_done(self):
+        requests: list[httpx.Request] = []
+
+        def backend(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, content=ndjson("Hello", ", ", "world") + b'{"response": "late"}\n')
+
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(backend))
+        with patch.dict(llm_client_module._clients, {"ollama": shared}):
+            tokens = [t async for t in stream_ollama_generate("http://ollama", "m", "hi", 30.0)]
+        await shared.aclose()
+
+        assert tokens == ["Hello", ", ", "world"]
+        assert json.loads(requests[0].content)["stream"] is True
+
+    async def test_error_in_stream_raises(self):
+        shared = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda r: httpx.Response(200, content=b'{"error": "model not found"}\n'))
+        )
+        with patch.dict(llm_client_module._clients, {"ollama": shared}), pytest.raises(ValueError):
+            async for _ in stream_ollama_generate("http://ollama", "m", "hi", 30.0):
+                pass
+        await shared.aclose()
+
+
+class TestPartialJSONParser:
+    """Truncated JSON is parsed as far as it goes."""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("Sure! ```json\n", None),
+            ('{"explanation": "Strong fi', {"explanation": "Strong fi"}),
+            ('{"explanation": "A \\"quoted\\', {"explanation": 'A "quoted'}),
+            ('{"explanation": "Done", "talk', {"explanation": "Done"}),
+            ('{"explanation": "Done", "talking_points": ["One", "Tw', {"explanation": "Done", "talking_points": ["One", "Tw"]}),
+            ('{"explanation": "Done",', {"explanation": "Done"}),
+        ],
+    )
+    def test_partial_text(self, text, expected):
+        assert PartialJSONParser().feed(text) == expected
+
+    def test_chunked_feed_matches_full_parse(self):
+        parser = PartialJSONParser()
+        for chunk in chunks("```json\n" + COMPLETION + "\n```"):
+            parser.feed(chunk)
+        assert parser.value() == json.loads(COMPLETION)
+
+
+class TestStreamLlmMatchContent:
+    """Match content is yielded as it is generated and cached when complete."""
+
+    async def test_updates_then_final_content(self):
+        with (
+            patch("src.matching.stream_ollama_generate", new=tokens_of(*chunks(COMPLETION))),
+            patch("src.matching.llm_response_cache.set", new=AsyncMock()) as cache_set,
+        ):
+            updates = [u async for u in stream_llm_match_content({}, {}, {}, use_cache=False)]
+
+        partial = [u["content"]["explanation"] for u in updates if not u["done"]]
+        assert "Stro" in partial  # Rendered before the string is closed
+        assert updates[-1] == {"content": json.loads(COMPLETION), "done": True}
+        assert sum(u["done"] for u in updates) == 1
+        cache_set.assert_awaited_once()
+
+    async def test_cache_hit_yields_single_final_update(self):
+        cached = json.loads(COMPLETION)
+        with (
+            patch("src.matching.llm_response_cache.get", new=AsyncMock(return_value=cached)),
+            patch("src.matching.stream_ollama_generate") as stream,
+        ):
+            updates = [u async for u in stream_llm_match_content({}, {}, {})]
+
+        stream.assert_not_called()
+        assert updates == [{"content": cached, "done": True}]
+
+    async def test_unavailable_backend_ends_without_final(self):
+        async def refused(*args, **kwargs) -> AsyncIterator[str]:
+            raise httpx.ConnectError("refused")
+            yield ""
+
+        with patch("src.matching.stream_ollama_generate", new=refused):
+            updates = [u async for u in stream_llm_match_content({}, {}, {}, use_cache=False)]
+
+        assert updates == []
+
+
+class TestStreamMatchContent:
+    """Streamed content for a pending match is persisted once complete."""
+
+    async def test_final_update_is_persisted(self, mock_async_db_connection):
+        cursor = mock_async_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = {
+            "id": MATCH_ID,
+            "score_breakdown": {},
+            "model_version": TEMPLATE_MODEL_VERSION,
+            "fund": {},
+            "lp": {},
+        }
+        final = json.loads(COMPLETION)
+        updates = [{"content": {**final, "explanation": "Str"}, "done": False}, {"content": final, "done": True}]
+
+        async def stream(*args, **kwargs):
+            for update in updates:
+                yield update
+
+        with patch("src.match_content.stream_llm_match_content", new=stream):
+            seen = [u async for u in stream_match_content(mock_async_db_connection, MATCH_ID)]
+
+        assert seen == updates
+        sql, params = cursor.execute.await_args_list[-1].args
+        assert "UPDATE fund_lp_matches" in sql
+        assert params[0] == "Strong fit"
+        mock_async_db_connection.commit.assert_awaited_once()
+
+
+class TestContentStreamEndpoint:
+    """GET /api/match/{id}/content/stream sends SSE updates."""
+
+    def test_streams_content_events(self, client_with_db, mock_async_db_connection):
+        final = json.loads(COMPLETION)
+
+        async def stream(conn, match_id):
+            yield {"content": {**final, "explanation": "Str"}, "done": False}
+            yield {"content": final, "done": True}
+
+        with patch("src.routers.matches.stream_match_content", new=stream):
+            response = client_with_db.get(f"/api/match/{MATCH_ID}/content/stream")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = sse_events(response.text)
+        assert [event for event, _ in events] == ["start", "content", "done"]
+        assert events[-1][1] == final
+        mock_async_db_connection.close.assert_awaited_once()
+
+    def test_failed_generation(self, client_with_db):
+        async def stream(conn, match_id):
+            return
+            yield
+
+        with patch("src.routers.matches.stream_match_content", new=stream):
+            response = client_with_db.get(f"/api/match/{MATCH_ID}/content/stream")
+
+        assert [event for event, _ in sse_events(response.text)] == ["start", "failed"]
+
+    def test_invalid_match_id(self, client):
+        assert client.get("/api/match/not-a-uuid/content/stream").status_code == 400
+
+
+class TestPitchStreamEndpoint:
+    """POST /api/match/{id}/generate-pitch/stream sends tokens, then the panel."""
+
+    def test_streams_tokens_then_panel(self, client_with_db, mock_async_db_connection):
+        cursor = mock_async_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = PITCH_ROW
+
+        with patch("src.routers.matches.stream_ollama_generate", new=tokens_of("Dear ", "Pension LP")):
+            response = client_with_db.post(
+                f"/api/match/{MATCH_ID}/generate-pitch/stream", data={"pitch_type": "email"}
+            )
+
+        assert response.status_code == 200
+        events = sse_events(response.text)
+        assert [event for event, _ in events] == ["start", "token", "token", "done"]
+        assert "Dear Pension LP" in events[-1][1]
+        assert "Generated Email" in events[-1][1]
+
+    def test_falls_back_to_template_pitch(self, client_with_db, mock_async_db_connection):
+        cursor = mock_async_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = PITCH_ROW
+
+        async def refused(*args, **kwargs) -> AsyncIterator[str]:
+            raise httpx.ConnectError("refused")
+            yield ""
+
+        with patch("src.routers.matches.stream_ollama_generate", new=refused):
+            response = client_with_db.post(
+                f"/api/match/{MATCH_ID}/generate-pitch/stream", data={"pitch_type": "summary"}
+            )
+
+        events = sse_events(response.text)
+        assert [event for event, _ in events] == ["start", "done"]
+        assert "Fund I presents a compelling opportunity for Pension LP" in events[-1][1]
+
+    def test_missing_match_returns_404(self, client_with_db):
+        response = client_with_db.post(f"/api/match/{MATCH_ID}/generate-pitch/stream")
+        assert response.status_code == 404
+
+    def test_invalid_match_id(self, client):
+        assert client.post("/api/match/not-a-uuid/generate-pitch/stream").status_code == 400
+
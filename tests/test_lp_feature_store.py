@@ -0,0 +1,349 @@
+"""Tests for the in-process LP feature store.
+
+Covers vocabulary coding, LPFeatures normalization, scoring from features,
+and the full/delta/skip refresh paths driven by the version manager.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.batch_matching import score_fund_against_lps
+from src.cache import version_manager
+from src.lp_feature_store import (
+    _DELTA_OVERLAP,
+    LPFeatures,
+    LPFeatureStore,
+    LPVocabulary,
+    Vocabulary,
+    lp_feature_store,
+    normalize_sector,
+)
+from src.matching import calculate_match_score
+from src.routers.insights import calculate_fund_match_score
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def lp_row(org_id: str, modified_at: datetime = T0, **fields) -> dict:
+    """An lp_profiles row as returned by the feature store query."""
+    row = {
+        "org_id": org_id,
+        "is_lp": True,
+        "strategies": ["Buyout"],
+        "geographic_preferences": ["North America"],
+        "sector_preferences": ["technology"],
+        "fund_size_min_mm": Decimal("100"),
+        "fund_size_max_mm": Decimal("1000"),
+        "check_size_min_mm": None,
+        "check_size_max_mm": None,
+        "min_fund_number": None,
+        "esg_required": False,
+        "emerging_manager_ok": True,
+        "modified_at": modified_at,
+    }
+    row.update(fields)
+    return row
+
+
+def make_conn(*results: list[dict]) -> tuple[MagicMock, MagicMock]:
+    """Mock connection whose successive fetchall() calls return results."""
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+    conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+    cursor.fetchall.side_effect = list(results)
+    return conn, cursor
+
+
+def set_versions(lp_count: int, lp_modified: datetime) -> None:
+    """Point the global version manager at the given LP table state."""
+    version_manager.update_from_db({
+        "lp": {"count": lp_count, "last_modified": lp_modified},
+        "organization": {"count": lp_count, "last_modified": lp_modified},
+    })
+
+
+@pytest.fixture(autouse=True)
+def no_version_polling() -> Generator[None, None, None]:
+    """Keep refresh() from polling the (mock) database for versions."""
+    saved = version_manager._versions, version_manager._combined_checksum
+    with patch("src.lp_feature_store.refresh_versions_if_stale"):
+        yield
+    version_manager._versions, version_manager._combined_checksum = saved
+
+
+class TestVocabulary:
+    """String <-> code vocabularies."""
+
+    def test_codes_are_stable_and_interned(self):
+        vocab = Vocabulary()
+        assert vocab.code("buyout") == 0
+        assert vocab.code("growth") == 1
+        assert vocab.code("buyout") == 0
+        assert vocab.lookup("venture") is None
+        assert vocab.term(vocab.code("".join(["ven", "ture"]))) is vocab.term(2)
+        assert len(vocab) == 3
+
+    def test_codes_are_distinct_in_first_seen_order(self):
+        vocab = Vocabulary()
+        assert vocab.codes(["b", "a", "b", "c"]) == (0, 1, 2)
+
+    def test_normalize_sector(self):
+        assert normalize_sector("Health_Care") == "health care"
+
+
+class TestLPFeatures:
+    """LPFeatures normalize a profile once."""
+
+    def test_from_profile_normalizes(self):
+        vocab = LPVocabulary()
+        features = LPFeatures.from_profile(
+            lp_row(
+                "lp-1",
+                strategies=["Buyout", "buyout", "Growth"],
+                geographic_preferences=["Global", "Europe"],
+                sector_preferences=["Health_Care"],
+                fund_size_max_mm=0,
+                min_fund_number=None,
+            ),
+            vocab,
+        )
+
+        assert [vocab.strategies.term(c) for c in features.strategy_codes] == ["buyout", "growth"]
+        assert features.strategy_names == ("Buyout", "buyout", "Growth")
+        assert features.geography_global is True
+        assert [vocab.sectors.term(c) for c in features.sector_codes] == ["health care"]
+        assert features.fund_size_min == 100.0
+        assert features.fund_size_max == float("inf")
+        assert features.min_fund_number == 1
+        assert features.check_size_max == float("inf")
+
+    def test_records_use_slots(self):
+        features = LPFeatures.from_profile({}, LPVocabulary())
+        assert not hasattr(features, "__dict__")
+
+    def test_match_score_same_for_features_and_dict(self):
+        fund = {
+            "strategy": "buyout",
+            "target_size_mm": 400,
+            "fund_number": 3,
+            "geographic_focus": ["north america", "Asia"],
+            "sector_focus": ["tech"],
+        }
+        row = lp_row("lp-1")
+        features = LPFeatures.from_profile(row, LPVocabulary())
+        assert calculate_match_score(fund, features) == calculate_match_score(fund, row)
+
+    def test_match_score_for_dict_does_not_grow_store_vocab(self):
+        """Ad-hoc LP dicts must not intern their strings into the shared vocabulary."""
+        vocab = lp_feature_store.vocab
+        sizes = (len(vocab.strategies), len(vocab.geographies), len(vocab.sectors))
+        lp = lp_row(
+            "adhoc",
+            strategies=["Novel Strategy"],
+            geographic_preferences=["Atlantis"],
+            sector_preferences=["Quantum_Widgets"],
+        )
+        result = calculate_match_score({"strategy": "novel strategy", "target_size_mm": 400}, lp)
+        assert result["score_breakdown"]["strategy"] == 100
+        assert (len(vocab.strategies), len(vocab.geographies), len(vocab.sectors)) == sizes
+
+
+class TestInsightsScoreFromFeatures:
+    """insights.calculate_fund_match_score reads LPFeatures."""
+
+    def test_mandate_dict_does_not_grow_store_vocab(self):
+        vocab = lp_feature_store.vocab
+        sizes = (len(vocab.strategies), len(vocab.geographies), len(vocab.sectors))
+        mandate = lp_row("adhoc", geographic_preferences=["Atlantis"], sector_preferences=["Quantum_Widgets"])
+
+        result = calculate_fund_match_score(mandate, {"geographic_focus": "Atlantis", "target_size_mm": 500})
+
+        assert result["breakdown"]["geography"] == 30
+        assert (len(vocab.strategies), len(vocab.geographies), len(vocab.sectors)) == sizes
+
+    def test_full_match(self):
+        mandate = lp_row("lp-1", check_size_min_mm=5, check_size_max_mm=25)
+        fund = {"strategy": "Buyout", "geographic_focus": "North America and Europe", "target_size_mm": 500}
+
+        result = calculate_fund_match_score(mandate, fund)
+
+        assert result["breakdown"] == {"strategy": 40, "geography": 30, "check_size": 20, "sector": 0}
+        assert result["total_score"] == 90
+
+    def test_strategy_comparison_is_case_sensitive(self):
+        fund = {"strategy": "buyout", "target_size_mm": 500}
+        result = calculate_fund_match_score(lp_row("lp-1"), fund)
+        assert result["breakdown"]["strategy"] == 0
+
+    def test_no_preferences_get_partial_credit(self):
+        mandate = lp_row("lp-1", strategies=[], geographic_preferences=None, sector_preferences=[])
+        result = calculate_fund_match_score(mandate, {"target_size_mm": 100})
+        assert result["breakdown"]["strategy"] == 20
+        assert result["breakdown"]["geography"] == 15
+        assert result["breakdown"]["sector"] == 5
+
+    def test_global_mandate(self):
+        mandate = lp_row("lp-1", geographic_preferences=["Global"])
+        result = calculate_fund_match_score(mandate, {"geographic_focus": "Asia", "target_size_mm": 100})
+        assert result["breakdown"]["geography"] == 25
+        result = calculate_fund_match_score(mandate, {"geographic_focus": "Global", "target_size_mm": 100})
+        assert result["breakdown"]["geography"] == 30
+
+    def test_dict_and_features_agree(self):
+        mandate = lp_row("lp-1", sector_preferences=["fintech"])
+        fund = {"strategy": "Buyout", "sectors": ["fintech"], "target_size_mm": 200}
+        features = LPFeatures.from_profile(mandate, LPVocabulary())
+        assert calculate_fund_match_score(features, fund) == calculate_fund_match_score(mandate, fund)
+
+
+class TestFeatureStoreRefresh:
+    """Full load, delta fetch, and skipped refreshes."""
+
+    def test_first_refresh_loads_everything(self):
+        store = LPFeatureStore()
+        conn, cursor = make_conn([lp_row("lp-1"), lp_row("lp-2")])
+        set_versions(2, T0)
+
+        assert store.refresh(conn) == 2
+        assert len(store) == 2
+        assert store.get("lp-1").org_id == "lp-1"
+        assert "WHERE" not in cursor.execute.call_args.args[0]
+        assert store.stats["full_loads"] == 1
+
+    def test_unchanged_versions_skip_the_query(self):
+        store = LPFeatureStore()
+        conn, cursor = make_conn([lp_row("lp-1")])
+        set_versions(1, T0)
+        store.refresh(conn)
+        cursor.execute.reset_mock()
+
+        assert store.refresh(conn) == 0
+        cursor.execute.assert_not_called()
+        assert store.stats["skipped_refreshes"] == 1
+
+    def test_changed_versions_fetch_only_the_delta(self):
+        store = LPFeatureStore()
+        t1 = T0 + timedelta(minutes=5)
+        conn, cursor = make_conn(
+            [lp_row("lp-1"), lp_row("lp-2")],
+            [lp_row("lp-2", modified_at=t1, strategies=["Venture"])],
+        )
+        set_versions(2, T0)
+        store.refresh(conn)
+
+        set_versions(2, t1)
+        assert store.refresh(conn) == 1
+
+        sql, params = cursor.execute.call_args.args
+        assert "GREATEST(lp.updated_at, o.updated_at) >= %s" in sql
+        assert params == (T0 - _DELTA_OVERLAP,)
+        assert store.get("lp-2").strategy_names == ("Venture",)
+        assert store.stats["delta_loads"] == 1
+
+    def test_late_commits_below_high_water_are_picked_up(self):
+        """A row stamped before the high-water mark but committed after it is not lost."""
+        store = LPFeatureStore()
+        t1 = T0 + timedelta(minutes=5)
+        late = t1 - timedelta(seconds=30)
+        conn, _ = make_conn(
+            [lp_row("lp-1", modified_at=t1)],
+            [lp_row("lp-1", modified_at=t1), lp_row("lp-2", modified_at=late)],
+        )
+        set_versions(1, T0)
+        store.refresh(conn)
+        matrix = store.lp_matrix()
+
+        set_versions(2, t1)
+        store.refresh(conn)
+
+        assert store.get("lp-2") is not None
+        assert store.lp_matrix() is not matrix
+        assert len(store.lp_matrix()) == 2
+
+    def test_refetching_unchanged_rows_keeps_the_matrix(self):
+        store = LPFeatureStore()
+        conn, _ = make_conn([lp_row("lp-1")], [lp_row("lp-1")])
+        set_versions(1, T0)
+        store.refresh(conn)
+        matrix = store.lp_matrix()
+
+        set_versions(1, T0 + timedelta(minutes=1))
+        store.refresh(conn)
+
+        assert store.lp_matrix() is matrix
+
+    def test_deleted_profiles_are_dropped(self):
+        store = LPFeatureStore()
+        t1 = T0 + timedelta(minutes=5)
+        conn, cursor = make_conn(
+            [lp_row("lp-1"), lp_row("lp-2")],
+            [],
+            [{"org_id": "lp-1"}],
+        )
+        set_versions(2, T0)
+        store.refresh(conn)
+
+        set_versions(1, t1)
+        store.refresh(conn)
+
+        assert len(store) == 1
+        assert store.get("lp-2") is None
+
+    def test_non_lp_organizations_are_held_but_not_scored(self):
+        store = LPFeatureStore()
+        conn, _ = make_conn([lp_row("lp-1"), lp_row("lp-2", is_lp=False)])
+        set_versions(2, T0)
+        store.refresh(conn)
+
+        assert len(store) == 2
+        assert [f.org_id for f in store.features()] == ["lp-1"]
+        assert len(store.lp_matrix()) == 1
+
+    def test_matrix_rebuilt_only_after_changes(self):
+        store = LPFeatureStore()
+        t1 = T0 + timedelta(minutes=5)
+        conn, _ = make_conn([lp_row("lp-1")], [lp_row("lp-2", modified_at=t1)])
+        set_versions(1, T0)
+        store.refresh(conn)
+
+        matrix = store.lp_matrix()
+        store.refresh(conn)  # versions unchanged: skipped
+        assert store.lp_matrix() is matrix
+
+        set_versions(2, t1)
+        store.refresh(conn)
+        assert store.lp_matrix() is not matrix
+        assert len(store.lp_matrix()) == 2
+
+    def test_store_matrix_scores_like_scalar(self):
+        store = LPFeatureStore()
+        rows = [
+            lp_row("lp-1"),
+            lp_row("lp-2", strategies=["growth"], esg_required=True),
+            lp_row("lp-3", geographic_preferences=["Global"], fund_size_max_mm=None),
+        ]
+        conn, _ = make_conn(rows)
+        set_versions(3, T0)
+        store.refresh(conn)
+        fund = {"strategy": "buyout", "target_size_mm": 500, "fund_number": 1, "geographic_focus": ["Europe"]}
+
+        scores = score_fund_against_lps(fund, store.lp_matrix())
+
+        assert list(scores.results()) == [calculate_match_score(fund, row) for row in rows]
+
+    def test_clear_forces_full_reload(self):
+        store = LPFeatureStore()
+        conn, _ = make_conn([lp_row("lp-1")], [lp_row("lp-1"), lp_row("lp-2")])
+        set_versions(1, T0)
+        store.refresh(conn)
+
+        store.clear()
+        assert store.refresh(conn) == 2
+        assert store.stats["full_loads"] == 2
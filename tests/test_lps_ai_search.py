@@ -22,12 +22,14 @@ def authenticated_client_with_db() -> Generator[TestClient, None, None]:
         "org_id": "c0000001-0000-0000-0000-000000000001",
     }
 
-    # Create mock cursor and connection
+    # Create mock async cursor and connection (/lps uses get_async_db)
     mock_cursor = MagicMock()
-    mock_cursor.__enter__ = MagicMock(return_value=mock_cursor)
-    mock_cursor.__exit__ = MagicMock(return_value=None)
+    mock_cursor.__aenter__ = AsyncMock(return_value=mock_cursor)
+    mock_cursor.__aexit__ = AsyncMock(return_value=None)
+    mock_cursor.execute = AsyncMock()
 
     # Mock LP types query result
+    mock_cursor.fetchall = AsyncMock()
     mock_cursor.fetchall.side_effect = [
         # First call: LP types
         [{"lp_type": "pension"}, {"lp_type": "endowment"}, {"lp_type": "family_office"}],
@@ -66,9 +68,10 @@ def authenticated_client_with_db() -> Generator[TestClient, None, None]:
 
     mock_conn = MagicMock()
     mock_conn.cursor.return_value = mock_cursor
+    mock_conn.close = AsyncMock()
 
     with patch("src.auth.get_current_user", return_value=mock_user):
-        with patch("src.routers.lps.get_db", return_value=mock_conn):
+        with patch("src.routers.lps.get_async_db", new=AsyncMock(return_value=mock_conn)):
             yield TestClient(app)
 
 
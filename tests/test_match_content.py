@@ -0,0 +1,268 @@
+"""Tests for deferred (on-demand) match explanations.
+
+Covers lazy generate-matches runs, content generation on first view of a
+match, and the background worker.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.config import get_settings
+from src.lp_feature_store import lp_feature_store
+from src.match_content import (
+    TEMPLATE_MODEL_VERSION,
+    MatchContentWorker,
+    ensure_match_content,
+)
+from src.matching import _generate_fallback_content, calculate_match_score
+
+MATCH_ID = "00000000-0000-0000-0000-0000000000aa"
+FUND_ID = "00000000-0000-0000-0000-000000000001"
+LP_ID = "00000000-0000-0000-0000-000000000002"
+
+LLM_CONTENT = {
+    "explanation": "Strong fit from the LLM",
+    "talking_points": ["Strategy match"],
+    "concerns": ["Timing"],
+}
+
+MOCK_USER = {
+    "id": "test-user-id",
+    "email": "test@example.com",
+    "name": "Test User",
+    "role": "gp",
+    "org_id": None,
+}
+
+
+def pending_row(model_version: str = TEMPLATE_MODEL_VERSION) -> dict:
+    """A fund_lp_matches row joined with its fund and LP profiles."""
+    return {
+        "id": MATCH_ID,
+        "score_breakdown": {"strategy": 100, "geography": 80},
+        "model_version": model_version,
+        "fund": {"name": "Fund I", "strategy": "buyout", "gp_name": "Acme GP"},
+        "lp": {"name": "Pension LP", "strategies": ["buyout"]},
+    }
+
+
+def async_cursor(conn: MagicMock) -> MagicMock:
+    return conn.cursor.return_value.__aenter__.return_value
+
+
+class TestEnsureMatchContent:
+    """On-view generation persists LLM content once."""
+
+    async def test_pending_match_is_generated_and_persisted(self, mock_async_db_connection):
+        cursor = async_cursor(mock_async_db_connection)
+        cursor.fetchone.return_value = pending_row()
+
+        with patch(
+            "src.match_content.generate_llm_match_content", new=AsyncMock(return_value=LLM_CONTENT)
+        ) as generate:
+            content = await ensure_match_content(mock_async_db_connection, MATCH_ID)
+
+        assert content == LLM_CONTENT
+        fund, lp, breakdown = generate.await_args.args
+        assert fund["gp_name"] == "Acme GP"
+        assert lp["name"] == "Pension LP"
+
+        sql, params = cursor.execute.await_args_list[-1].args
+        assert "UPDATE fund_lp_matches" in sql
+        assert "model_version = %s" in sql.split("WHERE")[1]
+        assert params[3] == get_settings().ollama_model
+        assert params[-2:] == (MATCH_ID, TEMPLATE_MODEL_VERSION)
+        mock_async_db_connection.commit.assert_awaited_once()
+
+    async def test_generated_match_is_left_alone(self, mock_async_db_connection):
+        async_cursor(mock_async_db_connection).fetchone.return_value = pending_row("deepseek-r1:8b")
+
+        with patch("src.match_content.generate_llm_match_content", new=AsyncMock()) as generate:
+            assert await ensure_match_content(mock_async_db_connection, MATCH_ID) is None
+
+        generate.assert_not_awaited()
+        mock_async_db_connection.commit.assert_not_awaited()
+
+    async def test_failed_generation_stays_pending(self, mock_async_db_connection):
+        cursor = async_cursor(mock_async_db_connection)
+        cursor.fetchone.return_value = pending_row()
+
+        with patch("src.match_content.generate_llm_match_content", new=AsyncMock(return_value=None)):
+            assert await ensure_match_content(mock_async_db_connection, MATCH_ID) is None
+
+        assert cursor.execute.await_count == 1  # the SELECT only
+        mock_async_db_connection.commit.assert_not_awaited()
+
+    async def test_read_transaction_ends_before_generation(self, mock_async_db_connection):
+        """The connection must not sit idle in transaction during the LLM call."""
+        async_cursor(mock_async_db_connection).fetchone.return_value = pending_row()
+
+        async def generate(*args, **kwargs):
+            mock_async_db_connection.rollback.assert_awaited_once()
+            return LLM_CONTENT
+
+        with patch("src.match_content.generate_llm_match_content", new=generate):
+            assert await ensure_match_content(mock_async_db_connection, MATCH_ID) == LLM_CONTENT
+
+
+class TestLazyGenerateMatches:
+    """Lazy match runs store template text without calling the LLM."""
+
+    def test_lazy_run_skips_llm_and_queues_worker(self, client_with_db, mock_db_connection):
+        fund = {"id": FUND_ID, "name": "Fund I", "strategy": "buyout", "target_size_mm": 500, "fund_number": 3}
+        lp_rows = [{"org_id": "lp-match", "name": "Match LP", "strategies": ["buyout"]}]
+        cursor = mock_db_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = fund
+        cursor.fetchall.return_value = lp_rows
+
+        lp_feature_store.clear()
+        with (
+            patch("src.lp_feature_store.refresh_versions_if_stale"),
+            patch.object(get_settings(), "match_content_mode", "lazy"),
+            patch("src.matching.generate_match_content", new=AsyncMock()) as generate,
+            patch("src.match_content.match_content_worker.enqueue_fund") as enqueue,
+        ):
+            response = client_with_db.post(f"/api/funds/{FUND_ID}/generate-matches")
+        lp_feature_store.clear()
+
+        assert response.status_code == 200
+        assert "Found 1 matching LPs" in response.text
+        generate.assert_not_awaited()
+        enqueue.assert_called_once_with(FUND_ID)
+
+        upsert = cursor.executemany.call_args.args[1][0]
+        breakdown = calculate_match_score(fund, lp_rows[0])["score_breakdown"]
+        fallback = _generate_fallback_content(fund, lp_rows[0], breakdown)
+        assert upsert[1] == "lp-match"
+        assert upsert[4:7] == (fallback["explanation"], fallback["talking_points"], fallback["concerns"])
+        assert upsert[7] == TEMPLATE_MODEL_VERSION
+
+
+class TestOnViewGeneration:
+    """Match views fill in deferred content."""
+
+    def test_detail_modal_generates_pending_content(self, client_with_db, mock_async_db_connection):
+        cursor = async_cursor(mock_async_db_connection)
+        cursor.fetchone.return_value = {
+            "id": MATCH_ID,
+            "score": 82,
+            "score_breakdown": {},
+            "explanation": "Template text",
+            "talking_points": [],
+            "concerns": [],
+            "model_version": TEMPLATE_MODEL_VERSION,
+            "lp_name": "Pension LP",
+            "fund_name": "Fund I",
+        }
+
+        with (
+            patch.object(get_settings(), "llm_streaming_enabled", False),
+            patch("src.routers.matches.ensure_match_content", new=AsyncMock(return_value=LLM_CONTENT)) as ensure,
+        ):
+            response = client_with_db.get(f"/api/match/{MATCH_ID}/detail")
+
+        assert response.status_code == 200
+        ensure.assert_awaited_once_with(mock_async_db_connection, MATCH_ID)
+        assert "Strong fit from the LLM" in response.text
+
+    def test_detail_modal_streams_pending_content(self, client_with_db, mock_async_db_connection):
+        async_cursor(mock_async_db_connection).fetchone.return_value = {
+            "id": MATCH_ID,
+            "score": 82,
+            "score_breakdown": {},
+            "explanation": "Template text",
+            "talking_points": [],
+            "concerns": [],
+            "model_version": TEMPLATE_MODEL_VERSION,
+            "lp_name": "Pension LP",
+            "fund_name": "Fund I",
+        }
+
+        with patch("src.routers.matches.ensure_match_content", new=AsyncMock()) as ensure:
+            response = client_with_db.get(f"/api/match/{MATCH_ID}/detail")
+
+        assert response.status_code == 200
+        ensure.assert_not_awaited()
+        assert "Template text" in response.text
+        assert f"/api/match/{MATCH_ID}/content/stream" in response.text
+
+    def test_detail_page_shows_stored_match(self, client_with_db, mock_async_db_connection):
+        async_cursor(mock_async_db_connection).fetchone.return_value = {
+            "id": MATCH_ID,
+            "score": 77,
+            "score_breakdown": {"strategy": 100, "size_fit": 60},
+            "explanation": "Template text",
+            "talking_points": ["Point"],
+            "concerns": ["Concern"],
+            "model_version": TEMPLATE_MODEL_VERSION,
+            "lp_name": "Pension LP",
+            "fund_name": "Fund I",
+            "target_size_mm": 500,
+        }
+
+        with (
+            patch("src.auth.get_current_user", return_value=MOCK_USER),
+            patch("src.routers.matches.ensure_match_content", new=AsyncMock(return_value=LLM_CONTENT)),
+        ):
+            response = client_with_db.get(f"/matches/{LP_ID}?fund_id={FUND_ID}")
+
+        assert response.status_code == 200
+        assert "Pension LP" in response.text
+        assert "Strong fit from the LLM" in response.text
+        assert "CalPERS" not in response.text
+
+    def test_detail_page_without_match_shows_demo(self, client_with_db):
+        with patch("src.auth.get_current_user", return_value=MOCK_USER):
+            response = client_with_db.get(f"/matches/{LP_ID}?fund_id={FUND_ID}")
+
+        assert response.status_code == 200
+        assert "CalPERS" in response.text
+
+
+class TestMatchContentWorker:
+    """Background worker fills in a fund's pending matches."""
+
+    async def test_process_fund_generates_highest_score_first(self, mock_async_db_connection):
+        cursor = async_cursor(mock_async_db_connection)
+        cursor.fetchall.return_value = [{"id": "m1"}, {"id": "m2"}]
+        cursor.fetchone.return_value = pending_row()
+        worker = MatchContentWorker()
+
+        with (
+            patch("src.match_content.get_async_db", new=AsyncMock(return_value=mock_async_db_connection)),
+            patch("src.match_content.generate_llm_match_content", new=AsyncMock(return_value=LLM_CONTENT)),
+        ):
+            assert await worker.process_fund(FUND_ID) == 2
+
+        assert "ORDER BY score DESC" in cursor.execute.await_args_list[0].args[0]
+        assert worker.generated == 2
+        mock_async_db_connection.close.assert_awaited_once()
+
+    async def test_process_fund_stops_when_llm_unavailable(self, mock_async_db_connection):
+        cursor = async_cursor(mock_async_db_connection)
+        cursor.fetchall.return_value = [{"id": "m1"}, {"id": "m2"}]
+        cursor.fetchone.return_value = pending_row()
+
+        with (
+            patch("src.match_content.get_async_db", new=AsyncMock(return_value=mock_async_db_connection)),
+            patch(
+                "src.match_content.generate_llm_match_content", new=AsyncMock(return_value=None)
+            ) as generate,
+        ):
+            assert await MatchContentWorker().process_fund(FUND_ID) == 0
+
+        generate.assert_awaited_once()
+
+    async def test_enqueue_requires_running_worker(self):
+        worker = MatchContentWorker()
+        assert worker.enqueue_fund(FUND_ID) is False
+
+        with patch.object(worker, "process_fund", new=AsyncMock(return_value=0)) as process:
+            worker.start()
+            assert worker.enqueue_fund(FUND_ID) is True
+            await worker._queue.join()
+            await worker.stop()
+
+        process.assert_awaited_once_with(FUND_ID)
+        assert not worker.running
@@ -11,6 +11,7 @@ Test Categories:
 - TestMatchingScoring: Core scoring algorithm tests
 - TestMatchingScoringEdgeCases: Edge cases in scoring
 - TestMatchingLLMGeneration: LLM content generation tests
+- TestConcurrentMatchContent: Bounded concurrent content generation tests
 - TestMatchingAPIEndpoint: API endpoint tests
 - TestMatchingScoreBreakdown: Score breakdown detail tests
 - TestMatchingStrategyVariations: Strategy matching variations
@@ -489,6 +490,91 @@ class TestMatchingLLMGeneration:
         assert isinstance(content["concerns"], list)
 
 
+class TestConcurrentMatchContent:
+    """Test bounded concurrent content generation for a match run."""
+
+    MATCHES = [
+        ({"name": "Fund I", "strategy": "buyout"}, {"name": f"LP {i}"}, {"strategy": 100})
+        for i in range(10)
+    ]
+
+    async def test_concurrency_is_bounded_and_order_preserved(self):
+        """At most max_concurrency calls should be in flight at once."""
+        import asyncio
+        from unittest.mock import patch
+
+        from src.matching import generate_match_contents
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_generate(fund, lp, breakdown, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"explanation": lp["name"], "talking_points": [], "concerns": []}
+
+        with patch("src.matching.generate_match_content", new=fake_generate):
+            contents = await generate_match_contents(self.MATCHES, max_concurrency=3)
+
+        assert peak == 3
+        assert [c["explanation"] for c in contents] == [f"LP {i}" for i in range(10)]
+
+    async def test_progress_reported_for_every_match(self):
+        """on_progress should count up to the total."""
+        from unittest.mock import AsyncMock, patch
+
+        from src.matching import generate_match_contents
+
+        progress = []
+        content = {"explanation": "", "talking_points": [], "concerns": []}
+        with patch("src.matching.generate_match_content", new=AsyncMock(return_value=content)):
+            await generate_match_contents(
+                self.MATCHES, on_progress=lambda done, total: progress.append((done, total))
+            )
+
+        assert progress == [(i, 10) for i in range(1, 11)]
+
+    async def test_deadline_falls_back_to_template(self):
+        """A call exceeding its deadline should return fallback content."""
+        import asyncio
+
+        import httpx
+
+        from src.matching import _generate_fallback_content, generate_match_content
+
+        async def slow_backend(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200, json={"response": "{}"})
+
+        fund, lp, breakdown = self.MATCHES[0]
+        async with httpx.AsyncClient(transport=httpx.MockTransport(slow_backend)) as client:
+            content = await generate_match_content(
+                fund, lp, breakdown, client=client, timeout_seconds=0.05
+            )
+
+        assert content == _generate_fallback_content(fund, lp, breakdown)
+
+    async def test_shared_client_used_for_llm_response(self):
+        """A successful response on the shared client should be parsed."""
+        import httpx
+
+        from src.matching import generate_match_content
+
+        llm_json = '{"explanation": "Strong fit", "talking_points": ["a"], "concerns": ["b"]}'
+
+        def backend(request):
+            return httpx.Response(200, json={"response": llm_json})
+
+        fund, lp, breakdown = self.MATCHES[0]
+        async with httpx.AsyncClient(transport=httpx.MockTransport(backend)) as client:
+            content = await generate_match_content(fund, lp, breakdown, client=client)
+
+        assert content["explanation"] == "Strong fit"
+
+
 class TestMatchingAPIEndpoint:
     """Test the generate-matches API endpoint."""
 
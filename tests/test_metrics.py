@@ -0,0 +1,95 @@
+"""Tests for the Prometheus metrics endpoint.
+
+Covers the /metrics exposition, request latency labelled by route
+template, per-request database query counts, cache counters copied from
+get_cache_stats(), and LLM call latency and errors.
+"""
+
+from __future__ import annotations
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.cache import page_cache
+from src.llm_client import llm_call
+from src.metrics import observe_db_query, start_request_tally, sync_process_metrics
+from src.middleware.metrics import route_label
+
+
+def sample(name: str, labels: dict[str, str] | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+class TestEndpoint:
+    """/metrics in the text exposition format."""
+
+    def test_exposes_request_latency_per_route(self, client):
+        labels = {"method": "GET", "route": "/health", "status": "2xx"}
+        before = sample("lpxgp_http_request_duration_seconds_count", labels)
+
+        client.get("/health")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "lpxgp_http_request_duration_seconds_bucket" in response.text
+        assert sample("lpxgp_http_request_duration_seconds_count", labels) == before + 1
+
+    def test_lists_every_metric_family(self, client):
+        text = client.get("/metrics").text
+
+        for family in ("lpxgp_db_queries_total", "lpxgp_cache_hits_total", "lpxgp_llm_request_duration_seconds"):
+            assert f"# TYPE {family.removesuffix('_total')}" in text
+
+
+@pytest.mark.parametrize(
+    ("scope", "expected"),
+    [
+        ({"route": type("Route", (), {"path": "/api/v1/lps/{lp_id}"})(), "path": "/api/v1/lps/1"}, "/api/v1/lps/{lp_id}"),
+        ({"path": "/static/css/app.css"}, "/static"),
+        ({"path": "/no-such-page"}, "unmatched"),
+    ],
+)
+def test_route_label_uses_templates(scope, expected):
+    assert route_label(scope) == expected
+
+
+def test_db_queries_counted_per_request():
+    before = sample("lpxgp_db_queries_total")
+    tally = start_request_tally()
+
+    observe_db_query(0.002)
+    observe_db_query(0.003)
+
+    assert (tally.queries, round(tally.seconds, 3)) == (2, 0.005)
+    assert sample("lpxgp_db_queries_total") == before + 2
+
+
+def test_cache_counters_follow_cache_stats():
+    sync_process_metrics(force=True)
+    before = sample("lpxgp_cache_hits_total", {"cache": "page"})
+
+    page_cache.set("k", 1)
+    page_cache.get("k")
+    page_cache.get("k")
+    sync_process_metrics(force=True)
+    page_cache.clear()  # Resets the source counters
+    page_cache.set("k", 1)
+    page_cache.get("k")
+    sync_process_metrics(force=True)
+
+    assert sample("lpxgp_cache_hits_total", {"cache": "page"}) == before + 3
+    assert sample("lpxgp_cache_bytes", {"cache": "page"}) > 0
+
+
+async def test_llm_latency_and_errors():
+    labels = {"backend": "ollama", "model": "metrics-test"}
+
+    async with llm_call("ollama", "metrics-test"):
+        pass
+    with pytest.raises(ValueError):
+        async with llm_call("ollama", "metrics-test"):
+            raise ValueError("bad response")
+
+    assert sample("lpxgp_llm_request_duration_seconds_count", labels) == 1
+    assert sample("lpxgp_llm_errors_total", labels) == 1
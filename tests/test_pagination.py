@@ -0,0 +1,242 @@
+"""Tests for keyset (cursor) pagination of the list APIs.
+
+Covers cursor tokens, the seek conditions built for each sort order,
+next_cursor handling in /api/v1/lps, /api/v1/gps and /api/v1/funds, the
+cached total, and a benchmark of page latency by depth against the seed
+data.
+
+Run the benchmark with: uv run pytest tests/test_pagination.py -v -s -m slow
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from decimal import Decimal
+from unittest.mock import patch
+from uuid import UUID
+
+import psycopg
+import pytest
+from psycopg.rows import dict_row
+
+from src.config import get_settings
+from src.pagination import (
+    InvalidCursor,
+    SortKey,
+    decode_cursor,
+    encode_cursor,
+    order_by_clause,
+    page_cursor,
+    seek_condition,
+)
+from src.routers.funds import FUND_API_ORDER
+from src.routers.lps import LP_API_ORDER
+
+MOCK_USER = {
+    "id": "test-user-id",
+    "email": "test@example.com",
+    "name": "Test User",
+    "role": "gp",
+    "org_id": None,
+}
+
+ORG_ID = UUID("7d9f1c2e-0000-4000-8000-000000000001")
+
+
+class TestCursorTokens:
+    """Opaque continuation tokens."""
+
+    def test_round_trip_keeps_exact_values(self):
+        token = encode_cursor([Decimal("12.35"), ORG_ID])
+
+        assert decode_cursor(token, 2) == ["12.35", str(ORG_ID)]
+
+    def test_no_token_is_first_page(self):
+        assert decode_cursor(None, 2) is None
+        assert decode_cursor("", 2) is None
+
+    @pytest.mark.parametrize("token", ["not-base64!", encode_cursor([1]), encode_cursor([{"a": 1}, 2]), "bnVsbA"])
+    def test_malformed_tokens_rejected(self, token):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(token, 2)
+
+
+class TestSeekCondition:
+    """WHERE conditions for the rows after a cursor."""
+
+    def test_uniform_order_uses_row_comparison(self):
+        sql, params = seek_condition(LP_API_ORDER, ["12.35", str(ORG_ID)])
+
+        assert sql == "(COALESCE(lp.total_aum_bn, -1), lp.org_id) < (%s::numeric, %s::uuid)"
+        assert params == ["12.35", str(ORG_ID)]
+        assert order_by_clause(LP_API_ORDER) == "COALESCE(lp.total_aum_bn, -1) DESC, lp.org_id DESC"
+
+    def test_first_page_has_no_condition(self):
+        assert seek_condition(LP_API_ORDER, None) == ("TRUE", [])
+
+    def test_nullable_first_key(self):
+        order = (SortKey("a", descending=True, nullable=True), SortKey("id", descending=True))
+
+        assert seek_condition(order, [5, 9]) == ("((a, id) < (%s, %s) OR a IS NULL)", [5, 9])
+        assert seek_condition(order, [None, 9]) == ("(a IS NULL AND (id) < (%s))", [9])
+
+    def test_mixed_directions_expand(self):
+        sql, params = seek_condition(FUND_API_ORDER, [2020, "Fund II", str(ORG_ID)])
+
+        assert sql == (
+            "(((f.vintage_year < %s OR f.vintage_year IS NULL))"
+            " OR (f.vintage_year = %s AND f.name > %s)"
+            " OR (f.vintage_year = %s AND f.name = %s AND f.id > %s::uuid))"
+        )
+        assert params == [2020, 2020, "Fund II", 2020, "Fund II", str(ORG_ID)]
+
+    def test_mixed_directions_after_null(self):
+        sql, params = seek_condition(FUND_API_ORDER, [None, "Fund II", str(ORG_ID)])
+
+        assert sql == "((f.vintage_year IS NULL AND f.name > %s) OR (f.vintage_year IS NULL AND f.name = %s AND f.id > %s::uuid))"
+        assert params == ["Fund II", "Fund II", str(ORG_ID)]
+
+
+def test_page_cursor_trims_look_ahead_row():
+    rows = [{"id": i} for i in range(3)]
+
+    token = page_cursor(rows, 2, lambda row: (row["id"],))
+
+    assert rows == [{"id": 0}, {"id": 1}]
+    assert decode_cursor(token, 1) == [1]
+    assert page_cursor(rows, 2, lambda row: (row["id"],)) is None
+
+
+class TestListApis:
+    """next_cursor in the /api/v1 list endpoints."""
+
+    def lp_rows(self, count: int) -> list[dict]:
+        return [
+            {"id": UUID(int=i), "name": f"LP {i}", "total_aum_bn": Decimal(100 - i) if i % 2 else None}
+            for i in range(count)
+        ]
+
+    def test_lps_next_cursor_continues_after_last_row(self, client_with_db, mock_async_db_connection):
+        cursor = mock_async_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = {"total": 50}
+        cursor.fetchall.return_value = self.lp_rows(11)
+
+        with patch("src.auth.get_current_user", return_value=MOCK_USER):
+            first = client_with_db.get("/api/v1/lps?per_page=10").json()
+            second = client_with_db.get(f"/api/v1/lps?per_page=10&cursor={first['next_cursor']}")
+
+        assert len(first["data"]) == 10
+        assert first["total"] == 50
+        assert decode_cursor(first["next_cursor"], 2) == ["91", str(UUID(int=9))]
+        query, params = cursor.execute.await_args.args
+        assert "(COALESCE(lp.total_aum_bn, -1), lp.org_id) < (%s::numeric, %s::uuid)" in query
+        assert "OFFSET" in query and params[-3:] == [str(UUID(int=9)), 11, 0]
+        assert second.status_code == 200
+
+    def test_total_counted_once_per_filter_set(self, client_with_db, mock_async_db_connection):
+        cursor = mock_async_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = {"total": 50}
+        cursor.fetchall.return_value = self.lp_rows(11)
+
+        with patch("src.auth.get_current_user", return_value=MOCK_USER):
+            token = client_with_db.get("/api/v1/lps?per_page=10").json()["next_cursor"]
+            again = client_with_db.get(f"/api/v1/lps?per_page=10&cursor={token}").json()
+            client_with_db.get("/api/v1/lps?per_page=10&page=2&include_total=false")
+
+        assert again["total"] == 50
+        counts = [call for call in cursor.execute.await_args_list if "COUNT(*)" in call.args[0]]
+        assert len(counts) == 1
+
+    def test_invalid_cursor_is_400(self, client_with_db):
+        with patch("src.auth.get_current_user", return_value=MOCK_USER):
+            for path in ("/api/v1/lps", "/api/v1/gps", "/api/v1/funds"):
+                response = client_with_db.get(f"{path}?cursor=garbage")
+                assert response.status_code == 400
+                assert response.json()["code"] == "INVALID_CURSOR"
+
+    def test_gps_and_funds_return_next_cursor(self, client_with_db, mock_db_connection):
+        cursor = mock_db_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = {"total": 3}
+        cursor.fetchall.return_value = [
+            {"id": UUID(int=i), "name": f"Name {i}", "vintage_year": 2020} for i in range(3)
+        ]
+
+        with patch("src.auth.get_current_user", return_value=MOCK_USER):
+            gps = client_with_db.get("/api/v1/gps?per_page=2").json()
+            funds = client_with_db.get("/api/v1/funds?per_page=2").json()
+
+        assert decode_cursor(gps["next_cursor"], 2) == ["Name 1", str(UUID(int=1))]
+        assert decode_cursor(funds["next_cursor"], 3) == [2020, "Name 1", str(UUID(int=1))]
+        assert len(gps["data"]) == len(funds["data"]) == 2
+
+
+# =============================================================================
+# Page Depth Benchmark
+# =============================================================================
+
+
+LP_PAGE_SQL = f"""
+    SELECT o.id, o.name, lp.total_aum_bn
+    FROM organizations o
+    JOIN lp_profiles lp ON lp.org_id = o.id
+    WHERE o.is_lp = TRUE AND {{seek}}
+    ORDER BY {order_by_clause(LP_API_ORDER)}
+    LIMIT %s OFFSET %s
+"""
+
+
+def _median_ms(conn: psycopg.Connection, query: str, params: list, runs: int = 15) -> float:
+    timings = []
+    with conn.cursor() as cur:
+        for _ in range(runs):
+            start = time.perf_counter()
+            cur.execute(query, params)
+            cur.fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+@pytest.mark.slow
+class TestPageDepthBenchmark:
+    """Page latency by depth on the 10k-LP seed data (scripts/generate_seed_data.py)."""
+
+    @pytest.fixture(scope="class")
+    def conn(self):
+        settings = get_settings()
+        if not settings.test_database_url:
+            pytest.skip("TEST_DATABASE_URL not configured")
+        with psycopg.connect(settings.test_database_url, row_factory=dict_row) as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT COUNT(*) AS n FROM lp_profiles")
+                if cur.fetchone()["n"] < 10_000:
+                    pytest.skip("Load the 10k seed data first (scripts/load_seed_data.py)")
+            yield conn
+
+    def test_keyset_latency_is_flat_across_depth(self, conn):
+        per_page = 20
+        depths = [1, 50, 250, 450]
+
+        # Walk the listing once to collect each page's cursor
+        cursors = {1: None}
+        after = None
+        with conn.cursor() as cur:
+            for page in range(1, max(depths)):
+                seek, params = seek_condition(LP_API_ORDER, after)
+                cur.execute(LP_PAGE_SQL.format(seek=seek), [*params, per_page, 0])
+                last = cur.fetchall()[-1]
+                aum = last["total_aum_bn"]
+                after = decode_cursor(encode_cursor([aum if aum is not None else -1, last["id"]]), 2)
+                cursors[page + 1] = after
+
+        print(f"\n  /api/v1/lps page latency, {per_page} rows per page (median ms):")
+        print("  " + "-" * 50)
+        keyset = {}
+        for depth in depths:
+            seek, params = seek_condition(LP_API_ORDER, cursors[depth])
+            keyset[depth] = _median_ms(conn, LP_PAGE_SQL.format(seek=seek), [*params, per_page, 0])
+            offset = _median_ms(conn, LP_PAGE_SQL.format(seek="TRUE"), [per_page, (depth - 1) * per_page])
+            print(f"    page {depth:4d}:  OFFSET {offset:7.2f}    keyset {keyset[depth]:7.2f}")
+
+        # Deep keyset pages cost about the same as the first page
+        assert keyset[max(depths)] < keyset[1] * 2 + 1.0
@@ -6,6 +6,7 @@ Tests cover:
 - SQL WHERE clause building
 - Ollama integration with mocking
 - Fallback behavior when Ollama unavailable
+- Rule-based fast path that skips Ollama
 """
 
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -13,11 +14,14 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import httpx
 import pytest
 
+from src.config import get_settings
 from src.search import (
     _extract_json,
     build_lp_search_sql,
     is_natural_language_query,
+    parse_gp_search_query,
     parse_lp_search_query,
+    parse_query_with_rules,
 )
 
 # =============================================================================
@@ -245,6 +249,7 @@ class TestBuildLpSearchSql:
 # =============================================================================
 
 
+@pytest.mark.usefixtures("llm_query_parsing")
 class TestParseLpSearchQuery:
     """Tests for Ollama-based query parsing with mocked responses."""
 
@@ -368,6 +373,137 @@ class TestParseLpSearchQuery:
             assert result.get("aum_min") == 0.05
 
 
+# =============================================================================
+# Tests for parse_query_with_rules() - Rule-Based Fast Path
+# =============================================================================
+
+
+class TestParseQueryWithRules:
+    """Tests for the deterministic query parser."""
+
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("50m or more aum", {"aum_min": 0.05}),
+            ("more than 100 million aum", {"aum_min": 0.1}),
+            ("investors with at least 1 billion aum", {"aum_min": 1.0}),
+            ("LPs under $500M assets under management", {"aum_max": 0.5}),
+            ("between 100m and 2.5bn aum", {"aum_min": 0.1, "aum_max": 2.5}),
+            ("aum 1-5b with 10-50m checks", {"aum_min": 1.0, "aum_max": 5.0, "check_size_min": 10.0, "check_size_max": 50.0}),
+            ("growth equity funds with 500m check size", {"check_size_min": 500.0, "strategies": ["growth"]}),
+            ("family offices in europe", {"lp_type": "family_office", "location": "Europe"}),
+            ("sovereign wealth funds", {"lp_type": "sovereign_wealth"}),
+            ("buyout and infrastructure investors", {"strategies": ["buyout", "infrastructure"]}),
+            ("funds based in new york", {"location": "New York"}),
+            (
+                "pension funds in california with over 100m aum focused on buyout",
+                {"aum_min": 0.1, "lp_type": "pension", "strategies": ["buyout"], "location": "California"},
+            ),
+        ],
+    )
+    def test_lp_queries_fully_parsed(self, query, expected):
+        """Common LP queries should be parsed with full confidence."""
+        result = parse_query_with_rules(query, "lp")
+        assert result.filters == expected
+        assert result.confidence == 1.0
+        assert result.unparsed == ()
+
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("buyout firms in NYC", {"strategy": "buyout", "location": "New York"}),
+            ("growth funds 200m-500m", {"fund_size_min": 200.0, "fund_size_max": 500.0, "strategy": "growth"}),
+            ("venture managers with 10+ years of experience", {"years_investing_min": 10, "strategy": "venture"}),
+            ("team of 15 credit firms", {"team_size_min": 15, "strategy": "credit"}),
+        ],
+    )
+    def test_gp_queries_fully_parsed(self, query, expected):
+        """Common GP queries should be parsed with full confidence."""
+        result = parse_query_with_rules(query, "gp")
+        assert result.filters == expected
+        assert result.confidence == 1.0
+
+    def test_unknown_words_lower_confidence(self):
+        """Names and other unrecognized words should be reported."""
+        result = parse_query_with_rules("CalPERS pension", "lp")
+        assert result.filters == {"lp_type": "pension"}
+        assert result.confidence == 0.5
+        assert result.unparsed == ("calpers",)
+
+    @pytest.mark.parametrize(
+        ("query", "kind"),
+        [
+            ("CalPERS", "lp"),  # Nothing recognized
+            ("pension funds not in california", "lp"),  # Negation
+            ("pensions or endowments", "lp"),  # Two values for one filter
+            ("buyout or growth managers", "gp"),
+        ],
+    )
+    def test_ambiguous_queries_have_zero_confidence(self, query, kind):
+        """Queries the filters cannot express should go to the LLM."""
+        assert parse_query_with_rules(query, kind).confidence == 0.0
+
+    def test_lp_only_vocabulary_is_not_used_for_gps(self):
+        """LP types mean nothing in a GP search."""
+        result = parse_query_with_rules("pension buyout managers", "gp")
+        assert "lp_type" not in result.filters
+        assert result.confidence < 1.0
+
+    def test_us_pronoun_is_not_a_location(self):
+        """The pronoun in "show us ..." must not be read as a US location filter."""
+        result = parse_query_with_rules("show us pension funds over 1b", "lp")
+        assert result.filters == {"aum_min": 1.0, "lp_type": "pension"}
+
+    @pytest.mark.parametrize("query", ["pension funds in us", "pension funds based in the usa", "u.s. pension funds"])
+    def test_us_location(self, query):
+        """The US is recognized after a preposition or when spelled unambiguously."""
+        result = parse_query_with_rules(query, "lp")
+        assert result.filters == {"lp_type": "pension", "location": "USA"}
+        assert result.confidence == 1.0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("parse", [parse_lp_search_query, parse_gp_search_query])
+    async def test_confident_parse_skips_ollama(self, parse):
+        """Fully parsed queries should never call Ollama."""
+        with patch("src.search.httpx.AsyncClient") as mock_client:
+            result = await parse("buyout funds in london", use_cache=False)
+
+        mock_client.assert_not_called()
+        assert result["location"] == "London"
+        assert result["_parser"] == "rules"
+        assert result["_cache_hit"] is False
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_falls_through_to_ollama(self):
+        """Queries with unrecognized words should still use Ollama."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"response": '{"text_search": "calpers", "lp_type": "pension"}'}
+        mock_response.raise_for_status.return_value = None
+
+        with patch("src.search.httpx.AsyncClient") as mock_client:
+            mock_instance = AsyncMock()
+            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_instance.post.return_value = mock_response
+
+            result = await parse_lp_search_query("calpers pension", use_cache=False)
+
+        mock_instance.post.assert_awaited_once()
+        assert result["_parser"] == "llm"
+        assert result["text_search"] == "calpers"
+
+    @pytest.mark.asyncio
+    async def test_confidence_threshold_is_configurable(self):
+        """A lower threshold should accept partially parsed queries."""
+        with (
+            patch.object(get_settings(), "search_rules_min_confidence", 0.5),
+            patch("src.search.httpx.AsyncClient") as mock_client,
+        ):
+            result = await parse_lp_search_query("calpers pension", use_cache=False)
+
+        mock_client.assert_not_called()
+        assert result["lp_type"] == "pension"
+
+
 # =============================================================================
 # Integration Tests - SQL Generation End-to-End
 # =============================================================================
@@ -422,6 +558,7 @@ class TestSqlGenerationIntegration:
 # =============================================================================
 
 
+@pytest.mark.usefixtures("llm_query_parsing")
 class TestBadModelResponses:
     """Tests for handling bad responses from smaller/weaker LLM models."""
 
@@ -7,6 +7,8 @@ Tests measure:
 - GP->LP matching performance
 - LP->GP matching performance
 - Cache hit/miss behavior
+- Coalescing of concurrent identical AI parses
+- Share of real queries the rule-based parser serves without an LLM call
 
 Run with: uv run pytest tests/test_search_speed_caching.py -v -s
 Skip slow tests: uv run pytest -m "not slow"
@@ -26,6 +28,7 @@ from psycopg.rows import dict_row
 from src.cache import (
     CacheVersionManager,
     DataVersion,
+    SingleFlight,
     VersionedLRUCache,
     clear_all_caches,
     get_cache_stats,
@@ -35,9 +38,53 @@ from src.cache import (
 from src.config import get_settings
 from src.matching import calculate_match_score
 from src.search import (
+    is_natural_language_query,
     parse_lp_search_query,
+    parse_query_with_rules,
 )
 
+# Searches seen in the live test script, e2e tests and demos, plus name and
+# free-text searches that should still go to the LLM
+LP_QUERY_CORPUS = [
+    "50m or more aum",
+    "investors with at least 1 billion aum",
+    "small funds under 100 million",
+    "pension funds",
+    "family offices in europe",
+    "endowments with growth strategy",
+    "investors in california",
+    "funds based in new york",
+    "european pension funds",
+    "buyout investors",
+    "growth equity funds with 500m check size",
+    "venture capital friendly LPs",
+    "pension funds in california with over 100m aum focused on buyout",
+    "family offices that accept emerging managers",
+    "pension funds with 100m aum in usa",
+    "buyout investors with 100m check size",
+    "sovereign wealth funds in asia",
+    "insurance companies with more than 5b aum",
+    "foundations investing in venture",
+    "endowments in massachusetts",
+    "fund of funds with 10-50m checks",
+    "LPs with aum between 1b and 10b",
+    "real estate investors in texas",
+    "infrastructure investors in the middle east",
+    "pension funds not in california",
+    "CalPERS pension",
+    "LPs that like first-time funds",
+    "investors who backed Sequoia",
+    "ESG focused family offices",
+    "pensions or endowments with buyout exposure",
+]
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sample."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
 # =============================================================================
 # Fixtures
 # =============================================================================
@@ -221,6 +268,7 @@ class TestKeywordSearchSpeed:
 
 
 @pytest.mark.slow
+@pytest.mark.usefixtures("llm_query_parsing")
 class TestAISearchSpeed:
     """Test AI-powered natural language search performance."""
 
@@ -328,6 +376,50 @@ class TestAISearchSpeed:
         assert second_time < 10, f"Cached call should be < 10ms, got {second_time}ms"
 
 
+# =============================================================================
+# Rule-Based Parser Coverage
+# =============================================================================
+
+
+@pytest.mark.slow
+class TestRuleParserCoverage:
+    """Benchmark the rule-based fast path over a corpus of real queries."""
+
+    def test_llm_free_share_and_latency(self):
+        """Report how many queries skip the LLM and how fast the rules are."""
+        settings = get_settings()
+        queries = [q for q in LP_QUERY_CORPUS if is_natural_language_query(q)]
+        iterations = 200
+
+        latencies_us: list[float] = []
+        served = []
+        for query in queries:
+            for _ in range(iterations):
+                start = time.perf_counter()
+                result = parse_query_with_rules(query, "lp")
+                latencies_us.append((time.perf_counter() - start) * 1_000_000)
+            if result.confidence >= settings.search_rules_min_confidence:
+                served.append(query)
+
+        share = len(served) / len(queries) * 100
+
+        print("\n  Rule-Based Parser Coverage:")
+        print("  " + "-" * 50)
+        print(f"    Natural language queries: {len(queries)}")
+        print(f"    Served without LLM:       {len(served)} ({share:.0f}%)")
+        for query in queries:
+            if query not in served:
+                print(f"    -> LLM: '{query}'")
+        print("  " + "-" * 50)
+        print(f"  Latency p50: {_percentile(latencies_us, 50):.1f}us")
+        print(f"  Latency p95: {_percentile(latencies_us, 95):.1f}us")
+        print(f"  Latency p99: {_percentile(latencies_us, 99):.1f}us")
+        print(f"  Latency max: {max(latencies_us):.1f}us")
+
+        assert share >= 50, f"Rules should serve most common queries, got {share:.0f}%"
+        assert _percentile(latencies_us, 50) < 1000, "Rule parsing should take well under 1ms"
+
+
 # =============================================================================
 # GP -> LP Matching Speed Tests
 # =============================================================================
@@ -520,6 +612,7 @@ class TestLPToGPMatchingSpeed:
 # =============================================================================
 
 
+@pytest.mark.usefixtures("llm_query_parsing")
 class TestCachingBehavior:
     """Test cache behavior for search and matching."""
 
@@ -776,6 +869,118 @@ class TestVersionedLRUCache:
         assert len(cache) == 0
 
 
+
+@pytest.mark.usefixtures("llm_query_parsing")
+class TestSingleFlight:
+    """Test coalescing of concurrent identical calls."""
+
+    async def test_concurrent_parses_share_one_ollama_call(self):
+        """Identical in-flight AI parses should make a single Ollama request."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"response": '{"lp_type": "pension"}'}
+        mock_response.raise_for_status.return_value = None
+
+        async def slow_post(*args: Any, **kwargs: Any) -> MagicMock:
+            await asyncio.sleep(0.05)
+            return mock_response
+
+        with patch("src.search.httpx.AsyncClient") as mock_client:
+            mock_instance = AsyncMock()
+            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_instance.post.side_effect = slow_post
+
+            results = await asyncio.gather(*(parse_lp_search_query("Pension funds") for _ in range(10)))
+
+        assert mock_instance.post.await_count == 1
+        assert all(r["lp_type"] == "pension" and r["_cache_hit"] is False for r in results)
+        # Each caller gets its own copy
+        assert len({id(r) for r in results}) == 10
+
+        stats = get_cache_stats()["ai_query"]
+        assert stats["coalesced"] == 9
+        assert stats["in_flight"] == 0
+
+    async def test_different_keys_are_not_coalesced(self):
+        """Calls with different keys should run independently."""
+        flight: SingleFlight[str] = SingleFlight(name="test")
+        calls = []
+
+        async def call(key: str) -> str:
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        results = await asyncio.gather(
+            flight.do("a", lambda: call("a")),
+            flight.do("b", lambda: call("b")),
+            flight.do("a", lambda: call("a")),
+        )
+
+        assert results == ["a", "b", "a"]
+        assert sorted(calls) == ["a", "b"]
+        assert flight.stats.leaders == 2
+        assert flight.stats.coalesced == 1
+
+    async def test_completed_calls_are_not_reused(self):
+        """Once a call completes, the next caller runs a new one."""
+        flight: SingleFlight[int] = SingleFlight(name="test")
+        fn = AsyncMock(side_effect=[1, 2])
+
+        assert await flight.do("k", fn) == 1
+        assert await flight.do("k", fn) == 2
+        assert flight.stats.coalesced == 0
+
+    async def test_errors_propagate_to_all_waiters(self):
+        """A failed call should raise in the leader and every waiter."""
+        flight: SingleFlight[int] = SingleFlight(name="test")
+
+        async def fail() -> int:
+            await asyncio.sleep(0.01)
+            raise ValueError("backend down")
+
+        results = await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.in_flight == 0
+
+    async def test_cancelled_leader_hands_over_to_waiter(self):
+        """If the leader is cancelled, a waiter should run the call itself."""
+        flight: SingleFlight[str] = SingleFlight(name="test")
+        started = asyncio.Event()
+
+        async def call() -> str:
+            started.set()
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.create_task(flight.do("k", call))
+        await started.wait()
+        waiter = asyncio.create_task(flight.do("k", call))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+
+        assert await waiter == "done"
+        assert leader.cancelled()
+        assert flight.stats.leaders == 2
+
+    async def test_uncached_parses_are_not_coalesced(self):
+        """use_cache=False should always call Ollama."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"response": '{"lp_type": "pension"}'}
+        mock_response.raise_for_status.return_value = None
+
+        with patch("src.search.httpx.AsyncClient") as mock_client:
+            mock_instance = AsyncMock()
+            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_instance.post.return_value = mock_response
+
+            await asyncio.gather(*(parse_lp_search_query("pension", use_cache=False) for _ in range(3)))
+
+        assert mock_instance.post.await_count == 3
+        assert get_cache_stats()["ai_query"]["coalesced"] == 0
+
+
 @pytest.mark.slow
 class TestVersionedCacheWithDatabase:
     """Test versioned cache with real database."""
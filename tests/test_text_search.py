@@ -0,0 +1,221 @@
+"""Tests for full-text LP/GP search (migration 021).
+
+Covers the text search condition and relevance rank built in
+src/search.py, their use by the query builders and the LP/GP pages, and a
+benchmark of search latency (p95) at 100k organizations against the
+leading-wildcard ILIKE search it replaces.
+
+Run the benchmark with: uv run pytest tests/test_text_search.py -v -s -m slow
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from unittest.mock import patch
+
+import psycopg
+import pytest
+from psycopg.rows import dict_row
+
+from src.config import get_settings
+from src.search import build_gp_search_sql, build_lp_search_sql, text_search_condition, text_search_rank
+
+MOCK_USER = {
+    "id": "test-user-id",
+    "email": "test@example.com",
+    "name": "Test User",
+    "role": "gp",
+    "org_id": None,
+}
+
+
+class TestTextSearchSql:
+    """Full-text condition and rank."""
+
+    def test_condition_uses_search_vector_with_trigram_fallbacks(self):
+        condition, params = text_search_condition("ontario teachers")
+
+        assert condition == (
+            "(o.search_vector @@ websearch_to_tsquery('english', %s)"
+            " OR o.name ILIKE %s OR o.name %% %s OR o.hq_city ILIKE %s)"
+        )
+        assert params == ["ontario teachers", "%ontario teachers%", "ontario teachers", "%ontario teachers%"]
+
+    def test_rank_combines_ts_rank_and_name_similarity(self):
+        rank, params = text_search_rank("calpers")
+
+        assert rank.startswith("(ts_rank(o.search_vector, websearch_to_tsquery('english', %s))")
+        assert "similarity(o.name, %s)" in rank
+        assert params == ["calpers", "calpers"]
+
+    @pytest.mark.parametrize("build", [build_lp_search_sql, build_gp_search_sql])
+    def test_builders_use_full_text_search(self, build):
+        where, params = build({"text_search": "infrastructure"})
+
+        assert "o.search_vector @@" in where
+        assert "investment_philosophy ILIKE" not in where
+        assert where.replace("%%", "").count("%s") == len(params)
+
+
+class TestPages:
+    """Text searches on /lps and /gps are ordered by relevance (src/hybrid_search.py)."""
+
+    def test_lps_page_ranks_text_search(self, client_with_db, mock_async_db_connection):
+        cursor = mock_async_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = []
+
+        with patch("src.auth.get_current_user", return_value=MOCK_USER):
+            response = client_with_db.get("/lps?search=calpers")
+
+        query, params = cursor.execute.await_args.args
+        assert response.status_code == 200
+        assert "(ts_rank(o.search_vector" in query
+        assert "ORDER BY hybrid_score DESC, lp.total_aum_bn DESC NULLS LAST" in query
+        assert params[:2] == ["calpers", "calpers"]
+
+    def test_gps_page_ranks_text_search(self, client_with_db, mock_db_connection):
+        cursor = mock_db_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = []
+
+        with patch("src.auth.get_current_user", return_value=MOCK_USER):
+            response = client_with_db.get("/gps?search=sequoia")
+
+        query, params = cursor.execute.call_args.args
+        assert response.status_code == 200
+        assert "o.search_vector @@ websearch_to_tsquery" in query
+        assert "ORDER BY hybrid_score DESC" in query
+        assert params[:2] == ["sequoia", "sequoia"]
+
+    def test_lps_page_without_search_orders_by_aum(self, client_with_db, mock_async_db_connection):
+        cursor = mock_async_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = []
+
+        with patch("src.auth.get_current_user", return_value=MOCK_USER):
+            client_with_db.get("/lps")
+
+        query, _ = cursor.execute.await_args.args
+        assert "ts_rank" not in query
+        assert "ORDER BY lp.total_aum_bn DESC NULLS LAST" in query
+
+
+# =============================================================================
+# Search Latency Benchmark
+# =============================================================================
+
+
+BENCH_ORGS = 100_000
+BENCH_TERMS = ["pension", "teachers retirement", "toronto", "infrastructure", "calpers", "singapore growth"]
+
+LEGACY_CONDITION = "(o.name ILIKE %s OR o.hq_city ILIKE %s OR o.hq_country ILIKE %s OR lp.mandate_description ILIKE %s)"
+
+SEARCH_SQL = """
+    SELECT o.id, o.name, lp.total_aum_bn
+    FROM organizations o
+    JOIN lp_profiles lp ON lp.org_id = o.id
+    WHERE o.is_lp = TRUE AND {condition}
+    ORDER BY {order_by}
+    LIMIT 100
+"""
+
+# Synthetic organizations: combinations of these give 100k distinct names
+SEED_SQL = """
+    INSERT INTO organizations (name, hq_city, hq_country, website, is_lp)
+    SELECT
+        (ARRAY['Ontario', 'Texas', 'Nordic', 'Pacific', 'Alpine', 'Harbor', 'Summit', 'Granite',
+               'Meridian', 'Cedar'])[1 + i % 10]
+        || ' ' || (ARRAY['Teachers', 'Municipal', 'Health', 'University', 'Family', 'State',
+                        'Sovereign', 'Mutual'])[1 + (i / 10) % 8]
+        || ' ' || (ARRAY['Retirement System', 'Pension Plan', 'Endowment', 'Foundation', 'Office',
+                        'Investment Board'])[1 + (i / 80) % 6]
+        || ' ' || i,
+        (ARRAY['Toronto', 'Austin', 'Oslo', 'Singapore', 'Zurich', 'Boston', 'London', 'Sydney',
+               'Tokyo', 'Chicago', 'Paris', 'Sacramento'])[1 + i % 12],
+        (ARRAY['Canada', 'USA', 'Norway', 'Singapore', 'Switzerland', 'UK', 'Australia', 'Japan',
+               'France'])[1 + i % 9],
+        'https://bench.example/' || i,
+        TRUE
+    FROM generate_series(1, %s) AS i
+"""
+
+SEED_PROFILES_SQL = """
+    INSERT INTO lp_profiles (org_id, lp_type, total_aum_bn, mandate_description)
+    SELECT
+        o.id,
+        (ARRAY['pension', 'endowment', 'foundation', 'family_office', 'sovereign_wealth'])[1 + n % 5],
+        (n % 500) + 0.5,
+        (ARRAY['Invests in buyout and growth equity across North America',
+               'Infrastructure and real assets with long-duration cash flows',
+               'Venture capital and early-stage technology managers',
+               'Private credit and secondaries, emerging managers welcome',
+               'Global diversified private equity program'])[1 + n % 5]
+    FROM (
+        SELECT id, row_number() OVER () AS n
+        FROM organizations
+        WHERE website LIKE 'https://bench.example/%'
+    ) o
+"""
+
+
+def _p95_ms(conn: psycopg.Connection, query: str, params: list, runs: int = 20) -> tuple[float, float]:
+    """Median and 95th percentile latency of a query in milliseconds."""
+    timings = []
+    with conn.cursor() as cur:
+        for _ in range(runs):
+            start = time.perf_counter()
+            cur.execute(query, params)
+            cur.fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), statistics.quantiles(timings, n=20)[-1]
+
+
+@pytest.mark.slow
+class TestSearchLatencyBenchmark:
+    """Search latency at 100k organizations, inside a rolled-back transaction."""
+
+    @pytest.fixture(scope="class")
+    def conn(self):
+        settings = get_settings()
+        if not settings.test_database_url:
+            pytest.skip("TEST_DATABASE_URL not configured")
+        with psycopg.connect(settings.test_database_url, row_factory=dict_row) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT 1 FROM information_schema.columns"
+                    " WHERE table_name = 'organizations' AND column_name = 'search_vector'"
+                )
+                if cur.fetchone() is None:
+                    pytest.skip("Apply migration 021_full_text_search.sql first")
+                cur.execute(SEED_SQL, [BENCH_ORGS])
+                cur.execute(SEED_PROFILES_SQL)
+                cur.execute("ANALYZE organizations")
+                cur.execute("ANALYZE lp_profiles")
+            yield conn
+            conn.rollback()
+
+    def test_full_text_p95(self, conn):
+        print(f"\n  LP text search at {BENCH_ORGS:,} organizations (ms):")
+        print("  " + "-" * 66)
+        p95s = {}
+        for term in BENCH_TERMS:
+            pattern = f"%{term}%"
+            legacy = _p95_ms(
+                conn,
+                SEARCH_SQL.format(condition=LEGACY_CONDITION, order_by="lp.total_aum_bn DESC NULLS LAST"),
+                [pattern] * 4,
+            )
+            condition, params = text_search_condition(term)
+            rank, rank_params = text_search_rank(term)
+            full_text = _p95_ms(
+                conn,
+                SEARCH_SQL.format(condition=condition, order_by=f"{rank} DESC, lp.total_aum_bn DESC NULLS LAST"),
+                [*params, *rank_params],
+            )
+            p95s[term] = full_text[1]
+            print(
+                f"    {term:22s} ILIKE p50 {legacy[0]:7.2f} p95 {legacy[1]:7.2f}"
+                f"   full-text p50 {full_text[0]:7.2f} p95 {full_text[1]:7.2f}"
+            )
+
+        # Interactive search budget
+        assert max(p95s.values()) < 250